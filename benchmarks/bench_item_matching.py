@@ -0,0 +1,166 @@
+"""
+bench_item_matching.py
+項目照合（SalaryReader._extract_items）のベンチマーク
+
+従来の「テキスト行 × 項目定義」の二重ループと、項目名索引(ItemDefinitions)による
+1回走査の照合を、項目定義数とページ数を変えて比較する。
+あわせて、座標抽出(LayoutExtractor.extract_page)を項目名を含むページと
+含まないページ（前処理で打ち切るページ）について計測する。
+
+実行方法（リポジトリのルートから）:
+    python benchmarks/bench_item_matching.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from definitions import ItemDefinitions  # noqa: E402
+from layout import LayoutExtractor  # noqa: E402
+
+
+# 1ページあたりのトークン数（給与明細1ページ分の目安）
+TOKENS_PER_PAGE = 300
+# 座標抽出で1行に並べるトークン数と文字・行の大きさ
+TOKENS_PER_ROW = 6
+CHAR_WIDTH = 10
+ROW_HEIGHT = 15
+DEFINITION_COUNTS = [10, 100, 500, 1000]
+PAGE_COUNTS = [1, 5, 20]
+REPEAT = 5
+
+
+def make_definitions(count: int) -> dict:
+    """ダミーの項目定義を作成する"""
+    return {
+        "deduction": [
+            {"name": f"項目{i}", "category": "大", "subcategory": "中"} for i in range(count)
+        ]
+    }
+
+
+def make_lines(pages: int, definition_count: int) -> list[str]:
+    """項目名と金額が混在するダミーのテキスト行を作成する"""
+    lines = []
+    for page in range(pages):
+        for i in range(TOKENS_PER_PAGE // 2):
+            if i % 10 == 0:
+                lines.append(f"項目{(page * 7 + i) % definition_count}")
+            else:
+                lines.append(f"ラベル{i}")
+            lines.append(f"{i * 100:,}")
+    return lines
+
+
+def match_nested(lines: list[str], item_defs: dict) -> int:
+    """従来の二重ループによる照合"""
+    count = 0
+    for line in lines:
+        for item_def in item_defs["deduction"]:
+            if line == item_def["name"]:
+                count += 1
+                break
+    return count
+
+
+def match_indexed(lines: list[str], definitions: ItemDefinitions) -> int:
+    """項目名索引による照合"""
+    return sum(1 for _ in definitions.match(lines))
+
+
+class FakeTextPage:
+    """トークンを格子状に並べたpdfiumテキストページの代用"""
+    
+    def __init__(self, tokens: list[str]) -> None:
+        self.text = ""
+        self.boxes: list[tuple[float, float, float, float]] = []
+        for i, token in enumerate(tokens):
+            if self.text:
+                self.text += "\r\n"
+                self.boxes.extend([(0, 0, 0, 0)] * 2)
+            x = (i % TOKENS_PER_ROW) * 100
+            y = 800 - (i // TOKENS_PER_ROW) * ROW_HEIGHT
+            for j, _ in enumerate(token):
+                left = x + j * CHAR_WIDTH
+                self.boxes.append((left, y, left + CHAR_WIDTH - 1, y + CHAR_WIDTH))
+            self.text += token
+    
+    def count_chars(self) -> int:
+        return len(self.text)
+    
+    def get_text_range(self, index: int, count: int) -> str:
+        return self.text[index:index + count]
+    
+    def get_charbox(self, index: int) -> tuple[float, float, float, float]:
+        return self.boxes[index]
+
+
+def make_page(definition_count: int, with_items: bool) -> FakeTextPage:
+    """1ページ分のダミーのテキストページを作成する"""
+    tokens = make_lines(1, definition_count)
+    if not with_items:
+        tokens = [token.replace("項目", "添付") for token in tokens]
+    return FakeTextPage(tokens)
+
+
+def prefilter_scan(extractor: LayoutExtractor, textpage: FakeTextPage) -> bool:
+    """従来の前処理（項目名ごとの部分文字列検索）"""
+    compact = "".join(textpage.text.split())
+    return any(name in compact for name in extractor.names)
+
+
+def prefilter_indexed(extractor: LayoutExtractor, textpage: FakeTextPage) -> bool:
+    """項目名索引による前処理"""
+    return extractor._contains_name("".join(textpage.text.split()))
+
+
+def best_of(func, *args) -> float:
+    """REPEAT回実行した最短時間(ミリ秒)"""
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    return min(timer.repeat(REPEAT, number)) / number * 1000
+
+
+def main() -> None:
+    print(f"{'定義数':>6} {'ページ':>6} {'二重ループ(ms)':>14} {'索引(ms)':>10} {'索引化(ms)':>10} {'倍率':>8}")
+    for definition_count in DEFINITION_COUNTS:
+        raw = make_definitions(definition_count)
+        compile_ms = best_of(ItemDefinitions, raw)
+        definitions = ItemDefinitions(raw)
+        
+        for pages in PAGE_COUNTS:
+            lines = make_lines(pages, definition_count)
+            assert match_nested(lines, raw) == match_indexed(lines, definitions)
+            
+            nested_ms = best_of(match_nested, lines, raw)
+            indexed_ms = best_of(match_indexed, lines, definitions)
+            print(
+                f"{definition_count:>8} {pages:>8} {nested_ms:>16.3f} {indexed_ms:>12.3f} "
+                f"{compile_ms:>12.3f} {nested_ms / indexed_ms:>9.1f}x"
+            )
+
+    
+    print()
+    print(
+        f"{'定義数':>6} {'前処理/走査(ms)':>15} {'前処理/索引(ms)':>15} "
+        f"{'項目なし(ms)':>12} {'項目あり(ms)':>12}"
+    )
+    for definition_count in DEFINITION_COUNTS:
+        extractor = LayoutExtractor(ItemDefinitions(make_definitions(definition_count)))
+        page = make_page(definition_count, with_items=True)
+        blank = make_page(definition_count, with_items=False)
+        assert prefilter_scan(extractor, blank) == prefilter_indexed(extractor, blank) is False
+        
+        scan_ms = best_of(prefilter_scan, extractor, blank)
+        indexed_ms = best_of(prefilter_indexed, extractor, blank)
+        blank_ms = best_of(extractor.extract_page, blank)
+        page_ms = best_of(extractor.extract_page, page)
+        print(
+            f"{definition_count:>8} {scan_ms:>18.3f} {indexed_ms:>18.3f} "
+            f"{blank_ms:>14.3f} {page_ms:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
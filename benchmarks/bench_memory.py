@@ -0,0 +1,119 @@
+"""
+bench_memory.py
+大量のPDF読み取り時のメモリ(RSS)推移のベンチマーク
+
+生成した給与明細形式のPDFを1プロセスで繰り返し読み取り、一定件数ごとのRSSを表示する。
+pdfiumのハンドル（ドキュメント・ページ・テキストページ）を明示的に閉じる現行の読み取りと、
+閉じずにガベージコレクションへ任せる従来の読み取りを比較する。
+
+実行方法（リポジトリのルートから）:
+    python benchmarks/bench_memory.py [件数]
+"""
+import ctypes
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pypdfium2 as pdfium  # noqa: E402
+import pypdfium2.raw as pdfium_c  # noqa: E402
+
+import config  # noqa: E402
+from common import SalaryKind  # noqa: E402
+from definitions import ItemDefinitions  # noqa: E402
+from layout import LayoutExtractor  # noqa: E402
+from memory import MemoryUsage  # noqa: E402
+from reader import SalaryReader  # noqa: E402
+
+
+DEFAULT_COUNT = 2000
+PAGES_PER_PDF = 3
+REPORT_STEPS = 10
+ITEM_NAMES = ["IncomeTax", "ResidentTax", "Health", "Pension", "Total"]
+
+
+class BenchConfig:
+    """ベンチマーク用の設定（config.iniを読まない）"""
+    
+    def get_pdf_password(self) -> str:
+        return ""
+    
+    def is_extraction_cache_enabled(self) -> bool:
+        return False
+
+
+def make_pdf(path: str) -> None:
+    """項目名の下に金額を並べた控除表を各ページに配置したPDFを作成する"""
+    pdf = pdfium.PdfDocument.new()
+    font = pdfium_c.FPDFText_LoadStandardFont(pdf.raw, b"Helvetica")
+    for page_no in range(PAGES_PER_PDF):
+        page = pdf.new_page(595, 842)
+        words = []
+        for column, name in enumerate(ITEM_NAMES):
+            words.append((name, 40 + column * 100, 700))
+            words.append((f"{(page_no + 1) * (column + 1) * 1000:,}", 50 + column * 100, 685))
+        for row in range(40):
+            words.append((f"Note line {row} for page {page_no}", 40, 600 - row * 12))
+        
+        for text, x, y in words:
+            obj = pdfium_c.FPDFPageObj_CreateTextObj(pdf.raw, font, 10.0)
+            buffer = ctypes.create_string_buffer((text + "\x00").encode("utf-16-le"))
+            pdfium_c.FPDFText_SetText(obj, ctypes.cast(buffer, ctypes.POINTER(pdfium_c.FPDF_WCHAR)))
+            pdfium_c.FPDFPageObj_Transform(obj, 1, 0, 0, 1, x, y)
+            pdfium_c.FPDFPage_InsertObject(page.raw, obj)
+        pdfium_c.FPDFPage_GenerateContent(page.raw)
+        page.close()
+    pdf.save(path)
+    pdf.close()
+
+
+def read_closed(reader: SalaryReader, filename: str, definitions: ItemDefinitions) -> None:
+    """現行の読み取り（ハンドルを明示的に閉じる）"""
+    reader._convert_pdf_to_text(filename, definitions)
+
+
+def read_unclosed(reader: SalaryReader, filename: str, definitions: ItemDefinitions) -> None:
+    """従来の読み取り（ハンドルを閉じない）"""
+    pdf = pdfium.PdfDocument(os.path.join(reader.salaryDir, filename), reader.pw)
+    extractor = LayoutExtractor(definitions)
+    for page in pdf:
+        extractor.extract_page(page.get_textpage())
+
+
+def run(label: str, read, reader: SalaryReader, filename: str, definitions, count: int) -> None:
+    """count回読み取り、一定件数ごとのRSSを表示する"""
+    start_rss = MemoryUsage.current_rss()
+    start = time.perf_counter()
+    step = max(count // REPORT_STEPS, 1)
+    
+    print(f"[{label}] 開始時RSS {start_rss / 1024 / 1024:.1f}MB")
+    for index in range(1, count + 1):
+        read(reader, filename, definitions)
+        if index % step == 0:
+            rss = MemoryUsage.current_rss()
+            print(f"  {index:>6}件: RSS {rss / 1024 / 1024:7.1f}MB (+{(rss - start_rss) / 1024 / 1024:.1f}MB)")
+    elapsed = time.perf_counter() - start
+    print(f"  {count / elapsed:.0f}件/秒")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    config.data = BenchConfig()
+    definitions = ItemDefinitions({"deduction": [
+        {"name": name, "category": "大", "subcategory": "中"} for name in ITEM_NAMES
+    ]})
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = "202401_kyuyo_bench.pdf"
+        make_pdf(os.path.join(tmpdir, filename))
+        reader = SalaryReader(2024, 1, "bench", SalaryKind.NORMAL, item_definitions=definitions)
+        reader.salaryDir = tmpdir
+        
+        run("ハンドルを閉じる", read_closed, reader, filename, definitions, count)
+        run("ハンドルを閉じない", read_unclosed, reader, filename, definitions, count)
+
+
+if __name__ == "__main__":
+    main()
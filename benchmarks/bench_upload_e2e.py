@@ -0,0 +1,175 @@
+"""
+bench_upload_e2e.py
+MoneyForwardへの登録全体（WebDriverの起動・ログイン・2段階認証・入力モーダル・カテゴリの取得・項目の登録）のベンチマーク
+
+MoneyForwardの模擬サーバー(standin.py)を起動し、登録先(MoneyForwardUrl)を模擬サーバーに向けて
+items.ymlの全項目を持つ給与明細を指定した件数・ワーカー数で登録する（ワーカー数1は1回のログインで順に登録する）。
+模擬サーバーが受け付けた項目数と登録する項目数を照合し、1項目の登録（uploader.item）あたりの
+WebDriverの呼び出し回数（ブラウザとの往復回数）と処理区間ごとの所要時間を表示する。
+応答遅延とゆらぎを変えて、回線の遅い環境や複数ワーカーでの負荷を再現できる。
+PDFの読み取りは対象外（bench_memory.py・bench_item_matching.pyを参照）。
+
+実行方法（リポジトリのルートから、Google Chromeが必要）:
+    python benchmarks/bench_upload_e2e.py [明細数] [ワーカー数] [応答遅延ms] [ゆらぎms]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pyotp  # noqa: E402
+import yaml  # noqa: E402
+from selenium.webdriver.remote.webdriver import WebDriver  # noqa: E402
+
+import config  # noqa: E402
+from common import SalaryKind, ItemNames, UIConstants  # noqa: E402
+from item import Item  # noqa: E402
+from logger import Timer  # noqa: E402
+from pool import UploadPool  # noqa: E402
+from salary import Salary  # noqa: E402
+from standin import StandInServer  # noqa: E402
+
+
+DEFAULT_COUNT = 3
+DEFAULT_WORKERS = 1
+DEFAULT_LATENCY_MS = 50
+DEFAULT_JITTER_MS = 20
+ITEMS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "userdata", "items.yml")
+
+
+class BenchConfig:
+    """ベンチマーク用の設定（config.iniを読まず、模擬サーバーへ登録する）"""
+    
+    def __init__(self, url: str, email: str, password: str, tfa_id: str) -> None:
+        self.url = url
+        self.email = email
+        self.password = password
+        self.tfaId = tfa_id
+    
+    def get_moneyforward_url(self) -> str:
+        return self.url
+    
+    def get_moneyforward_email(self) -> str:
+        return self.email
+    
+    def get_moneyforward_password(self) -> str:
+        return self.password
+    
+    def get_tfa_id(self) -> str:
+        return self.tfaId
+    
+    def get_wait_timeout(self) -> float:
+        return float(UIConstants.DEFAULT_WAIT_TIMEOUT)
+    
+    def is_headless_mode(self) -> bool:
+        return True
+    
+    def is_lean_browser(self) -> bool:
+        return True
+    
+    def is_browser_daemon_used(self) -> bool:
+        return False
+    
+    def is_session_kept(self) -> bool:
+        return False
+    
+    def is_registration_journal_used(self) -> bool:
+        return False
+    
+    def is_auto_approved(self) -> bool:
+        return False
+    
+    def is_existing_entry_skipped(self) -> bool:
+        return True
+    
+    def get_category_cache_ttl_seconds(self) -> float:
+        return 0.0
+
+
+class RoundTripCounter:
+    """項目の登録中（uploader.itemの区間内）に発行したWebDriverのコマンド数を数える"""
+    
+    def __init__(self) -> None:
+        self.count = 0
+        self.lock = threading.Lock()
+        self.execute = WebDriver.execute
+    
+    def __enter__(self) -> "RoundTripCounter":
+        counter = self
+        
+        def counting_execute(driver, driver_command, params=None):
+            if "uploader.item" in Timer._stack():
+                with counter.lock:
+                    counter.count += 1
+            return counter.execute(driver, driver_command, params)
+        
+        WebDriver.execute = counting_execute
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        WebDriver.execute = self.execute
+
+
+def make_salaries(count: int) -> list[Salary]:
+    """items.ymlの全項目を持つ給与明細を月ごとにcount件作成する（登録日は25日）"""
+    with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+        definitions = yaml.safe_load(f)[ItemNames.DEDUCTION_KEY]
+    
+    salaries = []
+    for index in range(count):
+        year, month = divmod(2024 * 12 + index, 12)
+        items = [
+            Item(d["name"], (no + 1) * 1000 + index, d["category"], d["subcategory"])
+            for no, d in enumerate(definitions) if d["name"] != ItemNames.DEDUCTION_SUM
+        ]
+        items.insert(0, Item(ItemNames.DEDUCTION_SUM, sum(item.amount for item in items), "収入", "給与"))
+        salary = Salary(year, month + 1, SalaryKind.NORMAL, items=items)
+        salary.set_date(25)
+        salaries.append(salary)
+    return salaries
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WORKERS
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_LATENCY_MS
+    jitter_ms = float(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_JITTER_MS
+    
+    tfa_id = pyotp.random_base32()
+    standin = StandInServer(latency_ms=latency_ms, jitter_ms=jitter_ms, tfa_secret=tfa_id)
+    url = standin.start()
+    config.data = BenchConfig(url, standin.email, standin.password, tfa_id)
+    try:
+        salaries = make_salaries(count)
+        expected = sum(len(salary.deductionItems) for salary in salaries)
+        
+        Timer.reset()
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory() as profile_root, RoundTripCounter() as round_trips:
+            results = UploadPool(salaries, workers, profile_root=profile_root).run()
+        elapsed = time.perf_counter() - start
+        registered = len(standin.registrations)
+        
+        print(
+            f"{count}明細・{expected}項目を{workers}ワーカーで登録"
+            f"（応答遅延 {latency_ms:.0f}±{jitter_ms:.0f}ms）: {elapsed:.1f}秒 "
+            f"({expected / elapsed * 60:.1f}項目/分)"
+        )
+        print(
+            f"模擬サーバーの登録数 {registered}/{expected}項目、"
+            f"リクエスト数 {standin.requests}、失敗明細 {sum(not result.is_ok() for result in results)}件"
+        )
+        print(
+            f"WebDriverの呼び出し {round_trips.count}回"
+            f"（1項目あたり {round_trips.count / max(registered, 1):.1f}回）"
+        )
+        Timer.report()
+    finally:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+bench_upload_wait.py
+MoneyForwardへの項目登録1件あたりの所要時間のベンチマーク
+
+MoneyForwardの入力フォーム(/cfの手入力モーダル)を模したページを模擬サーバー(standin.py)で配信し、
+ヘッドレスChromeで同じ項目を繰り返し登録する。
+固定時間の待機(time.sleep)を挟んでいた従来の登録、画面の状態（タブの選択・リンクの表示・
+通信の完了）を待ちながら1項目ずつ入力する登録、1回のスクリプト実行で入力する現行の登録を比較する。
+従来の登録は1項目ずつの入力に削除した待機を同じ位置で挿入して再現する。
+一括入力はカテゴリをドロップダウンから選択する場合と、カテゴリのIDを設定する場合を比較する。
+
+模擬ページはドロップダウンの表示や通信（中項目の読み込み・登録）を一定時間遅らせて応答する（既定50ms）。
+
+実行方法（リポジトリのルートから、Google Chromeが必要）:
+    python benchmarks/bench_upload_wait.py [件数] [模擬ページの応答遅延ms]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from selenium import webdriver  # noqa: E402
+from selenium.webdriver.common.action_chains import ActionChains  # noqa: E402
+from selenium.webdriver.common.by import By  # noqa: E402
+from selenium.webdriver.support import expected_conditions as EC  # noqa: E402
+
+import config  # noqa: E402
+from common import UIConstants  # noqa: E402
+from categories import CategoryTree  # noqa: E402
+from item import Item  # noqa: E402
+from uploader import Uploader  # noqa: E402
+from standin import StandInServer, build_categories  # noqa: E402
+
+
+DEFAULT_COUNT = 10
+DEFAULT_DELAY_MS = 50
+ITEM = Item("健康保険", 12345, "税・社会保障", "健康保険")
+CATEGORY_TREE = CategoryTree(build_categories())
+
+
+class BenchConfig:
+    """ベンチマーク用の設定（config.iniを読まない）"""
+    
+    def get_moneyforward_email(self) -> str:
+        return ""
+    
+    def get_moneyforward_password(self) -> str:
+        return ""
+    
+    def get_tfa_id(self) -> str:
+        return ""
+    
+    def get_wait_timeout(self) -> float:
+        return float(UIConstants.DEFAULT_WAIT_TIMEOUT)
+    
+    def is_session_kept(self) -> bool:
+        return False
+    
+    def is_registration_journal_used(self) -> bool:
+        return False
+    
+    def is_auto_approved(self) -> bool:
+        return False
+    
+    def is_existing_entry_skipped(self) -> bool:
+        return False
+    
+    def get_category_cache_ttl_seconds(self) -> float:
+        return 0.0
+    
+    def get_moneyforward_url(self) -> str:
+        return "http://127.0.0.1"
+
+
+class BenchSalary:
+    """登録日だけを持つ給与情報"""
+    deductionItems: list[Item] = []
+    
+    def get_payday(self) -> str:
+        return "2024/11/25"
+
+
+class StepUploader(Uploader):
+    """一括入力を使わず1項目ずつ入力するUploader"""
+    
+    def __init__(self, salary) -> None:
+        super().__init__(salary)
+        self.fastFill = False
+
+
+class CategoryIdUploader(Uploader):
+    """カテゴリをIDで設定するUploader（カテゴリを取得済みの場合）"""
+    
+    def __init__(self, salary) -> None:
+        super().__init__(salary)
+        self.categoryTree = CATEGORY_TREE
+
+
+class SleepingUploader(StepUploader):
+    """削除した固定時間の待機(time.sleep)を元の位置に挿入したUploader（従来の登録の再現）"""
+    
+    def _set_income_expense_type(self, is_income: bool) -> None:
+        time.sleep(UIConstants.SHORT_SLEEP)
+        super()._set_income_expense_type(is_income)
+        time.sleep(UIConstants.SHORT_SLEEP)
+    
+    def _set_categories(self, wait, item: Item) -> None:
+        time.sleep(UIConstants.SHORT_SLEEP * 3)
+        super()._set_categories(wait, item)
+    
+    def _submit_and_continue(self, wait, item_name: str, is_income: bool, on_submitted=None) -> None:
+        time.sleep(UIConstants.SHORT_SLEEP + UIConstants.LONG_SLEEP + UIConstants.SHORT_SLEEP)
+        super()._submit_and_continue(wait, item_name, is_income, on_submitted)
+
+
+def run(label: str, uploader: Uploader, url: str, count: int) -> None:
+    """手入力モーダルを開き、同じ項目をcount回登録して1件あたりの所要時間を表示する"""
+    uploader.driver.get(url)
+    uploader._wait_until_ready()
+    uploader.driver.find_element(By.ID, "open").click()
+    uploader._wait().until(EC.visibility_of_element_located((By.ID, "form-user-asset-act")))
+    
+    seconds = []
+    for _ in range(count):
+        start = time.perf_counter()
+        uploader._register_item_internal(ITEM, is_income=False)
+        seconds.append(time.perf_counter() - start)
+    
+    print(
+        f"[{label}] 平均 {statistics.mean(seconds) * 1000:7.1f}ms  "
+        f"中央値 {statistics.median(seconds) * 1000:7.1f}ms  最大 {max(seconds) * 1000:7.1f}ms"
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    delay_ms = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DELAY_MS
+    config.data = BenchConfig()
+    
+    standin = StandInServer(latency_ms=delay_ms, ui_delay_ms=delay_ms, require_login=False)
+    url = standin.start() + "/cf"
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    try:
+        print(f"{count}件登録（模擬ページの応答遅延 {delay_ms}ms）")
+        for label, uploader_class in [
+            ("固定待機(従来)", SleepingUploader),
+            ("1項目ずつ入力", StepUploader),
+            ("一括入力", Uploader),
+            ("一括入力+カテゴリID(現行)", CategoryIdUploader),
+        ]:
+            uploader = uploader_class(BenchSalary())
+            uploader.driver = driver
+            uploader.actions = ActionChains(driver)
+            run(label, uploader, url, count)
+    finally:
+        driver.quit()
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+"""
+standin.py
+MoneyForwardの模擬サーバー（ベンチマーク用）
+
+Uploaderが参照するページと要素IDを再現したページをローカルのHTTPサーバーで配信する。
+    /                 トップページ（メニューにマウスを重ねると表示される「ログイン」リンク）
+    /sign_in          ログイン（mfid_user[email] → mfid_user[password] → otp_attemptの順に入力）
+    /cf               手入力モーダル（カテゴリのドロップダウン、続けて入力するボタン）と
+                      登録済みの入出金の一覧（?year=&month=で指定した月、省略時はすべて）
+    /categories/<ID>  大項目の中項目一覧（大項目の選択時に読み込む）
+    /user_asset_act   項目の登録
+ログインしていない場合の/cfはログイン画面へリダイレクトする（HEADリクエストも同じ）。
+すべての応答を latency_ms ± jitter_ms 遅らせ、画面内のモーダル・ドロップダウンの表示を ui_delay_ms 遅らせる。
+登録された項目は StandInServer.registrations に記録する。
+
+単体で起動する場合（リポジトリのルートから）:
+    python benchmarks/standin.py [ポート] [応答遅延ms] [ゆらぎms]
+"""
+import html
+import json
+import random
+import secrets
+import sys
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs
+
+import pyotp
+
+
+SESSION_COOKIE = "_moneybook_session"
+
+# カテゴリ（大項目 → 中項目）。IDは大項目が連番、中項目が大項目ID×100+連番
+CATEGORY_NAMES = {
+    "収入": ["給与", "一時所得", "事業・副業", "年金", "配当所得", "不動産所得", "返金", "その他入金"],
+    "食費": ["食費", "食料品", "外食", "朝ご飯", "昼ご飯", "夜ご飯", "カフェ", "その他食費"],
+    "日用品": ["日用品", "子育て用品", "ドラッグストア", "おこづかい", "ペット用品", "たばこ", "その他日用品"],
+    "趣味・娯楽": ["アウトドア", "ゴルフ", "スポーツ", "映画・音楽・ゲーム", "本", "旅行", "秘密の趣味", "その他趣味・娯楽"],
+    "交通費": ["交通費", "電車", "バス", "タクシー", "飛行機", "その他交通費"],
+    "衣服・美容": ["衣服", "クリーニング", "美容院・理髪", "化粧品", "アクセサリー", "その他衣服・美容"],
+    "健康・医療": ["フィットネス", "ボディケア", "医療費", "薬", "その他健康・医療"],
+    "教養・教育": ["書籍", "新聞・雑誌", "習いごと", "学費", "塾", "その他教養・教育"],
+    "水道・光熱費": ["光熱費", "電気代", "ガス・灯油代", "水道代", "その他水道・光熱費"],
+    "通信費": ["携帯電話", "固定電話", "インターネット", "放送視聴料", "情報サービス", "宅配便・運送", "その他通信費"],
+    "住宅": ["住宅", "家賃・地代", "ローン返済", "管理費・積立金", "地震・火災保険", "その他住宅"],
+    "税・社会保障": [
+        "所得税・住民税", "年金保険料", "健康保険", "介護保険料", "雇用保険料", "諸会費", "その他税・社会保障"
+    ],
+    "保険": ["生命保険", "医療保険", "その他保険"],
+    "特別な支出": ["家具・家電", "住宅・リフォーム", "冠婚葬祭", "その他特別な支出"],
+}
+
+
+def build_categories() -> dict[str, dict]:
+    """カテゴリをCategoryTreeと同じ形式（大項目名 → {"id", "middles": {中項目名: ID}}）で作成する"""
+    categories = {}
+    for large_no, (large, middles) in enumerate(CATEGORY_NAMES.items(), start=1):
+        categories[large] = {
+            "id": str(large_no),
+            "middles": {middle: str(large_no * 100 + no) for no, middle in enumerate(middles, start=1)},
+        }
+    return categories
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>stand-in %(title)s</title>
+<style>
+.hidden { display: none; }
+#menu .login { display: none; }
+#menu li:hover .login, #menu li.hover .login { display: inline; }
+</style></head>
+<body>
+%(body)s
+</body></html>
+"""
+
+TOP_BODY = """<div id="before-login-corporate">
+<header>
+  <div>
+    <div><a href="/">MoneyForward</a></div>
+    <div><nav id="menu"><ul>
+      <li onmouseover="this.classList.add('hover')"><p>ログイン・新規登録</p><a class="login" href="/sign_in">ログイン</a></li>
+      <li><p>サービス</p></li>
+    </ul></nav></div>
+  </div>
+</header>
+</div>
+"""
+
+SIGN_IN_BODY = """<form method="post" action="%(action)s">
+  %(error)s
+  <label>%(label)s<input type="%(type)s" id="%(field)s" name="%(field)s" autocomplete="off"></label>
+  <button type="submit">次へ</button>
+</form>
+"""
+
+CF_BODY = """<button class="cf-new-btn modal-switch" id="open">手入力</button>
+<table id="cf-detail-table"><tbody>
+%(entries)s
+</tbody></table>
+<div id="user_asset_act_new" class="hidden">
+  <div class="modal-body">
+  <form id="form-user-asset-act" action="/user_asset_act">
+    <input type="hidden" id="user_asset_act_is_income_modal" value="0">
+    <input type="hidden" id="user_asset_act_is_income" value="0">
+    <input type="hidden" id="user_asset_act_large_category_id" value="0">
+    <input type="hidden" id="user_asset_act_middle_category_id" value="0">
+    <label><input type="radio" name="kind" class="minus-payment" checked>支出</label>
+    <label><input type="radio" name="kind" class="plus-payment">収入</label>
+    <select id="user_asset_act_sub_account_id_hash"><option value="1">財布</option><option value="0">なし</option></select>
+    <input id="appendedPrependedInput">
+    <a id="js-middle-category-selected" href="#">未分類</a>
+    <ul id="middle" class="hidden"></ul>
+    <a id="js-large-category-selected" href="#">未分類</a>
+    <ul id="large" class="hidden">
+%(categories)s
+    </ul>
+    <input id="js-content-field">
+    <input id="updated-at">
+  </form>
+  </div>
+  <button id="confirmation-button" class="hidden">続けて入力する</button>
+</div>
+<script>
+var DELAY = %(ui_delay)d;
+window.jQuery = { active: 0 };
+function byId(id) { return document.getElementById(id); }
+function later(fn) { setTimeout(fn, DELAY); }
+function show(id) { byId(id).classList.remove('hidden'); }
+function hide(id) { byId(id).classList.add('hidden'); }
+function request(method, url, body, fn) {
+  jQuery.active++;
+  var xhr = new XMLHttpRequest();
+  xhr.open(method, url);
+  xhr.setRequestHeader('Content-Type', 'application/json');
+  xhr.onloadend = function () { jQuery.active--; fn(xhr.status, xhr.responseText); };
+  xhr.send(body === null ? null : JSON.stringify(body));
+}
+function resetCategories() {
+  byId('user_asset_act_large_category_id').value = '0';
+  byId('user_asset_act_middle_category_id').value = '0';
+  byId('js-large-category-selected').textContent = '未分類';
+  byId('js-middle-category-selected').textContent = '未分類';
+  byId('middle').innerHTML = '';
+}
+function selectMiddle(a) {
+  hide('middle');
+  byId('user_asset_act_middle_category_id').value = a.dataset.id;
+  byId('js-middle-category-selected').textContent = a.textContent;
+}
+byId('open').onclick = function () { later(function () { show('user_asset_act_new'); }); };
+byId('js-large-category-selected').onclick = function () { later(function () { show('large'); }); };
+byId('js-middle-category-selected').onclick = function () { later(function () { show('middle'); }); };
+document.querySelectorAll('#large a.l_c_name').forEach(function (a) {
+  a.onclick = function () {
+    hide('large');
+    request('GET', '/categories/' + a.id, null, function (status, text) {
+      byId('user_asset_act_large_category_id').value = a.id;
+      byId('js-large-category-selected').textContent = a.textContent;
+      byId('middle').innerHTML = JSON.parse(text).map(function (middle) {
+        return '<li><a class="m_c_name" href="#" data-id="' + middle.id + '">' + middle.name + '</a></li>';
+      }).join('');
+      byId('middle').querySelectorAll('a').forEach(function (m) { m.onclick = function () { selectMiddle(m); }; });
+    });
+  };
+});
+byId('form-user-asset-act').addEventListener('submit', function (e) {
+  e.preventDefault();
+  request('POST', '/user_asset_act', {
+    is_income: byId('user_asset_act_is_income').value,
+    sub_account: byId('user_asset_act_sub_account_id_hash').value,
+    amount: byId('appendedPrependedInput').value,
+    large_category_id: byId('user_asset_act_large_category_id').value,
+    middle_category_id: byId('user_asset_act_middle_category_id').value,
+    content: byId('js-content-field').value,
+    updated_at: byId('updated-at').value
+  }, function (status) {
+    if (status === 200) show('confirmation-button');
+  });
+});
+byId('confirmation-button').onclick = function () {
+  later(function () {
+    hide('confirmation-button');
+    byId('form-user-asset-act').reset();
+    resetCategories();
+  });
+};
+</script>
+"""
+
+
+class StandInServer:
+    """MoneyForwardの模擬サーバー"""
+    
+    def __init__(
+        self,
+        latency_ms: float = 50,
+        jitter_ms: float = 0,
+        ui_delay_ms: int = 50,
+        email: str = "bench@example.com",
+        password: str = "bench-password",
+        tfa_secret: Optional[str] = None,
+        require_login: bool = True,
+        port: int = 0
+    ) -> None:
+        """
+        模擬サーバーの初期化
+        
+        Args:
+            latency_ms: 応答の遅延(ms)
+            jitter_ms: 応答の遅延のゆらぎ(ms、±jitter_msの一様分布)
+            ui_delay_ms: モーダル・ドロップダウンの表示の遅延(ms)
+            email: ログインできるメールアドレス
+            password: ログインできるパスワード
+            tfa_secret: 2段階認証の秘密鍵（省略時は6桁の数字であれば受け付ける）
+            require_login: /cfの表示・登録にログインを必要とするか
+            port: 待ち受けるポート（0は空いているポート）
+        """
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.uiDelayMs = ui_delay_ms
+        self.email = email
+        self.password = password
+        self.tfaSecret = tfa_secret
+        self.requireLogin = require_login
+        self.port = port
+        self.categories = build_categories()
+        self.sessions: set[str] = set()
+        self.registrations: list[dict] = []
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server: Optional[ThreadingHTTPServer] = None
+    
+    def start(self) -> str:
+        """別スレッドで配信を開始し、トップページのURLを返す"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler_class())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.url()
+    
+    def stop(self) -> None:
+        """配信を終了する"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+    
+    def url(self) -> str:
+        """トップページのURL"""
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+    
+    def delay(self) -> None:
+        """応答を遅らせる"""
+        seconds = self.latency + random.uniform(-self.jitter, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+    
+    def is_valid_otp(self, code: str) -> bool:
+        """2段階認証のコードを確認する"""
+        if self.tfaSecret:
+            return pyotp.TOTP(self.tfaSecret).verify(code, valid_window=1)
+        return len(code) == 6 and code.isdigit()
+    
+    def new_session(self) -> str:
+        """ログインセッションを作成する"""
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.sessions.add(token)
+        return token
+    
+    def register(self, data: dict) -> bool:
+        """項目を登録する（カテゴリが存在しない場合は登録しない）"""
+        names = self.category_names(data.get("large_category_id"), data.get("middle_category_id"))
+        if names is None:
+            return False
+        with self.lock:
+            self.registrations.append(dict(data, category=names[0], subcategory=names[1]))
+        return True
+    
+    def category_names(self, large_id: Optional[str], middle_id: Optional[str]) -> Optional[tuple[str, str]]:
+        """大項目・中項目のIDから名前を取得する"""
+        for large, entry in self.categories.items():
+            if entry["id"] != large_id:
+                continue
+            for middle, mid in entry["middles"].items():
+                if mid == middle_id:
+                    return large, middle
+        return None
+    
+    def render_cf(self, year: Optional[int] = None, month: Optional[int] = None) -> str:
+        """/cfの手入力モーダルと登録済みの入出金の一覧（指定した月のみ）のページ"""
+        prefix = f"{year}/{month:02}/" if year and month else ""
+        with self.lock:
+            registrations = [r for r in self.registrations if str(r.get("updated_at", "")).startswith(prefix)]
+        entries = []
+        for no, registration in enumerate(registrations):
+            amount = int(registration.get("amount") or 0) * (1 if registration.get("is_income") == "1" else -1)
+            entries.append(
+                f'<tr class="transaction_list"><td class="date" data-table-sortable-value='
+                f'"{html.escape(registration["updated_at"])}-{no}">{html.escape(registration["updated_at"][5:])}</td>'
+                f'<td class="content"><span>{html.escape(registration.get("content", ""))}</span></td>'
+                f'<td class="amount"><span class="offset">{amount:,}</span></td></tr>'
+            )
+        rows = []
+        for large, entry in self.categories.items():
+            middles = "".join(
+                f'<li><a class="m_c_name" id="{mid}" href="#">{html.escape(middle)}</a></li>'
+                for middle, mid in entry["middles"].items()
+            )
+            rows.append(
+                f'      <li class="dropdown-submenu"><a class="l_c_name" id="{entry["id"]}" href="#">'
+                f'{html.escape(large)}</a><ul class="sub_menu hidden">{middles}</ul></li>'
+            )
+        body = CF_BODY % {"entries": "\n".join(entries), "categories": "\n".join(rows), "ui_delay": self.uiDelayMs}
+        return PAGE_TEMPLATE % {"title": "/cf", "body": body}
+    
+    def _handler_class(self):
+        """リクエストハンドラーのクラスを作成する"""
+        standin = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_HEAD(self) -> None:
+                self._route(send_body=False)
+            
+            def do_GET(self) -> None:
+                self._route()
+            
+            def do_POST(self) -> None:
+                self._route()
+            
+            def log_message(self, *args) -> None:
+                pass
+            
+            def _route(self, send_body: bool = True) -> None:
+                standin.delay()
+                with standin.lock:
+                    standin.requests += 1
+                path = self.path.split("?")[0]
+                if self.command == "POST":
+                    length = int(self.headers.get("Content-Length") or 0)
+                    payload = self.rfile.read(length).decode("utf-8")
+                else:
+                    payload = ""
+                
+                if path == "/":
+                    return self._page("MoneyForward", TOP_BODY, send_body)
+                if path == "/sign_in" and self.command != "POST":
+                    return self._sign_in_page("/sign_in/email", "メールアドレス", "email", "mfid_user[email]")
+                if path == "/sign_in/email":
+                    email = self._form(payload).get("mfid_user[email]", "")
+                    if email != standin.email:
+                        return self._sign_in_page(
+                            "/sign_in/email", "メールアドレス", "email", "mfid_user[email]", "メールアドレスが違います"
+                        )
+                    return self._sign_in_page("/sign_in/password", "パスワード", "password", "mfid_user[password]")
+                if path == "/sign_in/password":
+                    if self._form(payload).get("mfid_user[password]", "") != standin.password:
+                        return self._sign_in_page(
+                            "/sign_in/password", "パスワード", "password", "mfid_user[password]", "パスワードが違います"
+                        )
+                    return self._sign_in_page("/sign_in/otp", "認証コード", "text", "otp_attempt")
+                if path == "/sign_in/otp":
+                    if not standin.is_valid_otp(self._form(payload).get("otp_attempt", "")):
+                        return self._sign_in_page(
+                            "/sign_in/otp", "認証コード", "text", "otp_attempt", "認証コードが違います"
+                        )
+                    return self._redirect("/", cookie=standin.new_session())
+                
+                if standin.requireLogin and not self._is_signed_in():
+                    if path == "/cf":
+                        return self._redirect("/sign_in")
+                    return self._send(401, "application/json", b'{"ok": false}', send_body)
+                if path == "/cf":
+                    query = parse_qs(self.path.partition("?")[2])
+                    page = standin.render_cf(
+                        int(query.get("year", ["0"])[0] or 0), int(query.get("month", ["0"])[0] or 0)
+                    )
+                    return self._send(200, "text/html; charset=utf-8", page.encode("utf-8"), send_body)
+                if path.startswith("/categories/"):
+                    large_id = path.rsplit("/", 1)[1]
+                    middles = next(
+                        ([{"id": mid, "name": name} for name, mid in entry["middles"].items()]
+                         for entry in standin.categories.values() if entry["id"] == large_id),
+                        []
+                    )
+                    return self._send(200, "application/json", json.dumps(middles).encode("utf-8"), send_body)
+                if path == "/user_asset_act" and self.command == "POST":
+                    try:
+                        ok = standin.register(json.loads(payload))
+                    except ValueError:
+                        ok = False
+                    return self._send(200 if ok else 422, "application/json", json.dumps({"ok": ok}).encode(), True)
+                return self._send(404, "text/plain", b"not found", send_body)
+            
+            def _is_signed_in(self) -> bool:
+                cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                return SESSION_COOKIE in cookie and cookie[SESSION_COOKIE].value in standin.sessions
+            
+            @staticmethod
+            def _form(payload: str) -> dict[str, str]:
+                return {key: values[0] for key, values in parse_qs(payload).items()}
+            
+            def _page(self, title: str, body: str, send_body: bool = True) -> None:
+                page = PAGE_TEMPLATE % {"title": title, "body": body}
+                self._send(200, "text/html; charset=utf-8", page.encode("utf-8"), send_body)
+            
+            def _sign_in_page(self, action: str, label: str, input_type: str, field: str, error: str = "") -> None:
+                body = SIGN_IN_BODY % {
+                    "action": action,
+                    "label": label,
+                    "type": input_type,
+                    "field": html.escape(field),
+                    "error": f'<p class="error">{error}</p>' if error else "",
+                }
+                self._page("sign in", body)
+            
+            def _redirect(self, location: str, cookie: Optional[str] = None) -> None:
+                self.send_response(302)
+                self.send_header("Location", location)
+                if cookie:
+                    self.send_header("Set-Cookie", f"{SESSION_COOKIE}={cookie}; Path=/; HttpOnly")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            
+            def _send(self, status: int, content_type: str, body: bytes, send_body: bool) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+        
+        return Handler
+
+
+def main() -> None:
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+    jitter_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+    standin = StandInServer(latency_ms=latency_ms, jitter_ms=jitter_ms, port=port)
+    url = standin.start()
+    print(f"{url} で配信しています（メールアドレス {standin.email}、パスワード {standin.password}、"
+          f"認証コードは6桁の数字、Ctrl+Cで終了）")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import mmap
+import os
+import struct
+import zipfile
+from typing import Final, NamedTuple, Optional
+
+from reader import SalaryReader
+from source import BufferStream, PdfSource
+from common import SalaryKind
+
+
+class ArchiveMember(NamedTuple):
+    """ZIPファイル内の給与明細PDF"""
+    name: str
+    year: int
+    month: int
+    kind: SalaryKind
+    number: str
+
+
+class PayslipArchive:
+    """
+    ZIPにまとめられた給与明細PDFを展開せずに読み取るクラス
+    
+    無圧縮で格納されたPDFはmmapしたZIPファイル上の範囲をそのままpdfiumへ渡し、
+    圧縮されたPDFはzipfileの展開ストリームからpdfiumが必要な範囲だけを読み込む。
+    いずれも一時ファイルは作成しない。
+    """
+    
+    # ローカルファイルヘッダー（シグネチャ, ファイル名長の位置, 固定長部分のサイズ）
+    LOCAL_HEADER_SIGNATURE: Final[bytes] = b"PK\x03\x04"
+    LOCAL_HEADER_NAME_LENGTH_OFFSET: Final[int] = 26
+    LOCAL_HEADER_SIZE: Final[int] = 30
+    # 暗号化されたエントリを表すフラグ
+    FLAG_ENCRYPTED: Final[int] = 0x1
+    
+    # エラーメッセージ
+    ERROR_MEMBER_NOT_FOUND: Final[str] = "{member}がZIPファイル内に見つかりません。"
+    ERROR_BROKEN_HEADER: Final[str] = "ZIPファイル内の{member}のヘッダーが不正です。"
+    
+    def __init__(self, zip_path: str) -> None:
+        """
+        ZIPファイルを開く
+        
+        Args:
+            zip_path: ZIPファイルのパス
+        
+        Raises:
+            FileNotFoundError: ZIPファイルが存在しない場合
+            zipfile.BadZipFile: ZIPファイルとして読み込めない場合
+        """
+        self.zipPath = zip_path
+        self.file = open(zip_path, "rb")
+        self.map: Optional[mmap.mmap] = None
+        self.streams: list[BufferStream] = []
+        try:
+            self.zip = zipfile.ZipFile(self.file)
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self.file.close()
+            raise
+    
+    def __enter__(self) -> "PayslipArchive":
+        return self
+    
+    def __exit__(self, *args) -> None:
+        self.close()
+    
+    def members(self) -> list[ArchiveMember]:
+        """
+        ZIPファイル内の給与明細PDFを取得する
+        
+        ファイル名（ディレクトリ部分を除く）が給与明細の命名規則に一致するものを対象とする。
+        
+        Returns:
+            給与明細PDFの一覧（ZIP内の格納順）
+        """
+        members = []
+        for info in self.zip.infolist():
+            if info.is_dir():
+                continue
+            parsed = SalaryReader.parse_pdf_filename(os.path.basename(info.filename))
+            if parsed is not None:
+                members.append(ArchiveMember(info.filename, *parsed))
+        return members
+    
+    def open(self, name: str) -> PdfSource:
+        """
+        ZIPファイル内のPDFをpdfiumへ渡せる読み込み元として開く
+        
+        Args:
+            name: ZIPファイル内のパス
+        
+        Returns:
+            PDFの読み込み元（使い終わったらcloseする）
+        
+        Raises:
+            FileNotFoundError: 指定したPDFがZIPファイル内にない場合
+        """
+        try:
+            info = self.zip.getinfo(name)
+        except KeyError:
+            raise FileNotFoundError(self.ERROR_MEMBER_NOT_FOUND.format(member=name))
+        
+        if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & self.FLAG_ENCRYPTED:
+            return self.zip.open(info)
+        
+        # 無圧縮のデータはZIPファイル上の範囲をコピーせずに参照する
+        self.streams = [stream for stream in self.streams if not stream.closed]
+        start = self._data_offset(info)
+        with memoryview(self.map) as view:
+            with view[start:start + info.file_size] as data:
+                stream = BufferStream(data)
+        self.streams.append(stream)
+        return stream
+    
+    def _data_offset(self, info: zipfile.ZipInfo) -> int:
+        """ローカルファイルヘッダーからエントリのデータ開始位置を求める"""
+        offset = info.header_offset
+        header = self.map[offset:offset + self.LOCAL_HEADER_SIZE]
+        if len(header) < self.LOCAL_HEADER_SIZE or header[:4] != self.LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(self.ERROR_BROKEN_HEADER.format(member=info.filename))
+        
+        name_length, extra_length = struct.unpack_from(
+            "<HH", header, self.LOCAL_HEADER_NAME_LENGTH_OFFSET
+        )
+        return offset + self.LOCAL_HEADER_SIZE + name_length + extra_length
+    
+    def close(self) -> None:
+        """開いたストリームとZIPファイルを閉じる"""
+        for stream in self.streams:
+            stream.close()
+        self.streams.clear()
+        self.zip.close()
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
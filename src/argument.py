@@ -4,6 +4,7 @@ import argparse
 
 from logger import Logger
 from common import SalaryKind
+from payday import PaydayRule
 
 
 class Arguments:
@@ -11,7 +12,7 @@ class Arguments:
     
     # 引数数の定数
     MIN_ARGS: Final[int] = 3
-    MAX_ARGS: Final[int] = 4
+    MAX_ARGS: Final[int] = 9
     
     # メッセージテンプレート
     USAGE_EXAMPLE: Final[str] = "python upload.py 2024 11"
@@ -22,6 +23,7 @@ class Arguments:
         self.year: Optional[int] = None
         self.month: Optional[int] = None
         self.kind: Optional[SalaryKind] = None
+        self.approval = ApprovalArguments()
         self.parser: Optional[argparse.ArgumentParser] = None
 
         self._register_args()
@@ -37,6 +39,7 @@ class Arguments:
         self.parser.add_argument(
             "-b", "--bonus", action="store_true", help="賞与登録であるか"
         )
+        ApprovalArguments.register(self.parser)
 
     def _validate_args(self) -> bool:
         """引数チェック"""
@@ -65,6 +68,7 @@ class Arguments:
             self.year = args.year
             self.month = args.month
             self.kind = SalaryKind.BONUS if args.bonus else SalaryKind.NORMAL
+            self.approval.parse(args)
             return True
         except (Exception, SystemExit):
             Logger.logWarning(self.USAGE_MSG_INVALID)
@@ -93,6 +97,10 @@ class Arguments:
         """給与設定種別を取得する"""
         return self.kind
     
+    def get_approval(self) -> "ApprovalArguments":
+        """登録日の確認を省略する指定を取得する"""
+        return self.approval
+    
     # 後方互換性のためのエイリアス（非推奨）
     def isValid(self) -> bool:
         return self.is_valid()
@@ -105,3 +113,409 @@ class Arguments:
     
     def getKind(self) -> SalaryKind:
         return self.get_kind()
+
+
+class BatchArguments:
+    """一括読み取り(batch.py)の起動引数管理クラス"""
+    
+    # メッセージテンプレート
+    USAGE_EXAMPLE: Final[str] = (
+        "python batch.py --from 202401 --to 202412 または python batch.py --all "
+        "または python batch.py --zip 2024.zip"
+    )
+    USAGE_MSG_INVALID: Final[str] = "読み取る期間(YYYYMM)、--allまたは--zipを正しく指定してください"
+    
+    def __init__(self) -> None:
+        self.start: Optional[tuple[int, int]] = None
+        self.end: Optional[tuple[int, int]] = None
+        self.kind: SalaryKind = SalaryKind.NORMAL
+        self.all: bool = False
+        self.numbers: list[str] = []
+        self.workers: Optional[int] = None
+        self.maxRssMb: Optional[int] = None
+        self.archive: Optional[str] = None
+        self.parser: Optional[argparse.ArgumentParser] = None
+        
+        self._register_args()
+        self.isOk = self._parse_args()
+    
+    def _register_args(self) -> None:
+        """起動引数情報を設定する"""
+        description = "給与明細PDFを複数プロセスで一括読み取りします。"
+        self.parser = argparse.ArgumentParser(description=description)
+        
+        self.parser.add_argument("-f", "--from", dest="start", help="読み取り開始年月(YYYYMM)")
+        self.parser.add_argument("-t", "--to", dest="end", help="読み取り終了年月(YYYYMM)")
+        self.parser.add_argument(
+            "-a", "--all", action="store_true", help="salaryData内のすべての明細を読み取るか"
+        )
+        self.parser.add_argument(
+            "-z", "--zip", dest="archive", help="給与明細PDFをまとめたZIPファイル（展開せずにすべて読み取る）"
+        )
+        self.parser.add_argument(
+            "-b", "--bonus", action="store_true", help="賞与明細を対象とするか"
+        )
+        self.parser.add_argument(
+            "-e", "--employee", action="append", default=[], help="対象の社員番号（複数指定可）"
+        )
+        self.parser.add_argument("-j", "--jobs", type=int, help="並列プロセス数")
+        self.parser.add_argument(
+            "-m", "--max-rss", dest="max_rss", type=int,
+            help="ワーカー1プロセスあたりのメモリ(RSS)上限MB（超えたワーカーは再起動、0で無制限）"
+        )
+    
+    def _parse_args(self) -> bool:
+        """引数をパースして値を設定する"""
+        try:
+            args = self.parser.parse_args()
+            self.all = args.all
+            self.kind = SalaryKind.BONUS if args.bonus else SalaryKind.NORMAL
+            self.numbers = args.employee
+            self.workers = args.jobs
+            self.maxRssMb = args.max_rss
+            self.archive = args.archive
+            if self.maxRssMb is not None and self.maxRssMb < 0:
+                raise ValueError(f"RSS上限が不正です: {self.maxRssMb}")
+            
+            if not self.all and not self.archive:
+                self.start = self._parse_year_month(args.start)
+                self.end = self._parse_year_month(args.end or args.start)
+                if self.start > self.end:
+                    raise ValueError(f"{args.start} > {args.end}")
+            return True
+        except (Exception, SystemExit):
+            Logger.logWarning(self.USAGE_MSG_INVALID)
+            Logger.logWarning(f"例：{self.USAGE_EXAMPLE}")
+            return False
+    
+    @staticmethod
+    def _parse_year_month(value: Optional[str]) -> tuple[int, int]:
+        """YYYYMM形式の文字列を(年, 月)へ変換する"""
+        if value is None or len(value) != 6 or not value.isdigit():
+            raise ValueError(f"年月の形式が不正です: {value}")
+        year, month = int(value[:4]), int(value[4:])
+        if not 1 <= month <= 12:
+            raise ValueError(f"月の値が不正です: {value}")
+        return year, month
+    
+    def is_valid(self) -> bool:
+        """起動引数が問題ないか"""
+        return self.isOk
+    
+    def is_all(self) -> bool:
+        """salaryData内のすべての明細を対象とするか"""
+        return self.all
+    
+    def get_start(self) -> tuple[int, int]:
+        """読み取り開始の(年, 月)を取得する"""
+        return self.start
+    
+    def get_end(self) -> tuple[int, int]:
+        """読み取り終了の(年, 月)を取得する"""
+        return self.end
+    
+    def get_kind(self) -> SalaryKind:
+        """給与設定種別を取得する"""
+        return self.kind
+    
+    def get_numbers(self) -> list[str]:
+        """対象の社員番号を取得する"""
+        return self.numbers
+    
+    def get_workers(self) -> Optional[int]:
+        """並列プロセス数を取得する"""
+        return self.workers
+    
+    def get_archive(self) -> Optional[str]:
+        """読み取り対象のZIPファイルのパスを取得する（未指定の場合None）"""
+        return self.archive
+    
+    def get_max_rss_bytes(self) -> Optional[int]:
+        """ワーカーのRSS上限(バイト)を取得する（未指定の場合None）"""
+        if self.maxRssMb is None:
+            return None
+        return self.maxRssMb * 1024 * 1024
+
+
+class WatchArguments:
+    """監視モード(upload.py watch)の起動引数管理クラス"""
+    
+    # 監視モードを指定するサブコマンド
+    COMMAND: Final[str] = "watch"
+    
+    # メッセージテンプレート
+    USAGE_EXAMPLE: Final[str] = "python upload.py watch または python upload.py watch --debounce 5"
+    USAGE_MSG_INVALID: Final[str] = "監視モードの引数を正しく指定してください"
+    
+    def __init__(self) -> None:
+        self.debounce: Optional[float] = None
+        self.poll: bool = False
+        self.approval = ApprovalArguments()
+        self.parser: Optional[argparse.ArgumentParser] = None
+        
+        self._register_args()
+        self.isOk = self._parse_args()
+    
+    @classmethod
+    def is_requested(cls) -> bool:
+        """起動引数で監視モードが指定されているか"""
+        return len(sys.argv) > 1 and sys.argv[1] == cls.COMMAND
+    
+    def _register_args(self) -> None:
+        """起動引数情報を設定する"""
+        description = "salaryDataを監視し、追加された給与明細PDFを読み取ってMoneyForwardへアップロードします。"
+        self.parser = argparse.ArgumentParser(prog=f"upload.py {self.COMMAND}", description=description)
+        
+        self.parser.add_argument(
+            "-d", "--debounce", type=float, help="最後の書き込みから読み取りまで待つ秒数"
+        )
+        self.parser.add_argument(
+            "-p", "--poll", action="store_true", help="inotifyを使わず一定間隔でディレクトリを走査するか"
+        )
+        ApprovalArguments.register(self.parser)
+    
+    def _parse_args(self) -> bool:
+        """引数をパースして値を設定する"""
+        try:
+            args = self.parser.parse_args(sys.argv[2:])
+            self.debounce = args.debounce
+            self.poll = args.poll
+            self.approval.parse(args)
+            if self.debounce is not None and self.debounce < 0:
+                raise ValueError(f"デバウンス時間が不正です: {self.debounce}")
+            return True
+        except (Exception, SystemExit):
+            Logger.logWarning(self.USAGE_MSG_INVALID)
+            Logger.logWarning(f"例：{self.USAGE_EXAMPLE}")
+            return False
+    
+    def is_valid(self) -> bool:
+        """起動引数が問題ないか"""
+        return self.isOk
+    
+    def get_debounce(self) -> Optional[float]:
+        """デバウンス時間(秒)を取得する（未指定の場合None）"""
+        return self.debounce
+    
+    def is_polling(self) -> bool:
+        """inotifyを使わず走査するか"""
+        return self.poll
+    
+    def get_approval(self) -> "ApprovalArguments":
+        """登録日の確認を省略する指定を取得する"""
+        return self.approval
+
+
+class RangeArguments:
+    """複数月の一括登録(upload.py range)の起動引数管理クラス"""
+    
+    # 複数月の一括登録を指定するサブコマンド
+    COMMAND: Final[str] = "range"
+    
+    # メッセージテンプレート
+    USAGE_EXAMPLE: Final[str] = "python upload.py range --from 202509 --to 202511 --bonus"
+    USAGE_MSG_INVALID: Final[str] = "登録する期間(YYYYMM)を正しく指定してください"
+    
+    def __init__(self) -> None:
+        self.start: Optional[tuple[int, int]] = None
+        self.end: Optional[tuple[int, int]] = None
+        self.kinds: list[SalaryKind] = []
+        self.jobs: int = 1
+        self.approval = ApprovalArguments()
+        self.parser: Optional[argparse.ArgumentParser] = None
+        
+        self._register_args()
+        self.isOk = self._parse_args()
+    
+    @classmethod
+    def is_requested(cls) -> bool:
+        """起動引数で複数月の一括登録が指定されているか"""
+        return len(sys.argv) > 1 and sys.argv[1] == cls.COMMAND
+    
+    def _register_args(self) -> None:
+        """起動引数情報を設定する"""
+        description = "複数月の給与明細PDFを読み取り、1回のログインでMoneyForwardへアップロードします。"
+        self.parser = argparse.ArgumentParser(prog=f"upload.py {self.COMMAND}", description=description)
+        
+        self.parser.add_argument("-f", "--from", dest="start", required=True, help="登録開始年月(YYYYMM)")
+        self.parser.add_argument("-t", "--to", dest="end", help="登録終了年月(YYYYMM、省略時は開始年月のみ)")
+        self.parser.add_argument(
+            "-b", "--bonus", action="store_true", help="賞与明細がある月は賞与も登録するか"
+        )
+        self.parser.add_argument(
+            "-s", "--special", action="store_true", help="特別金明細がある月は特別金も登録するか"
+        )
+        self.parser.add_argument(
+            "-j", "--jobs", type=int, default=1, help="同時に起動するブラウザ(ワーカー)の数"
+        )
+        ApprovalArguments.register(self.parser)
+    
+    def _parse_args(self) -> bool:
+        """引数をパースして値を設定する"""
+        try:
+            args = self.parser.parse_args(sys.argv[2:])
+            self.start = BatchArguments._parse_year_month(args.start)
+            self.end = BatchArguments._parse_year_month(args.end or args.start)
+            if self.start > self.end:
+                raise ValueError(f"{args.start} > {args.end}")
+            self.kinds = [SalaryKind.NORMAL]
+            if args.bonus:
+                self.kinds.append(SalaryKind.BONUS)
+            if args.special:
+                self.kinds.append(SalaryKind.SPECIAL)
+            self.jobs = args.jobs
+            if self.jobs < 1:
+                raise ValueError(f"ワーカー数が不正です: {self.jobs}")
+            self.approval.parse(args)
+            return True
+        except (Exception, SystemExit):
+            Logger.logWarning(self.USAGE_MSG_INVALID)
+            Logger.logWarning(f"例：{self.USAGE_EXAMPLE}")
+            return False
+    
+    def is_valid(self) -> bool:
+        """起動引数が問題ないか"""
+        return self.isOk
+    
+    def get_months(self) -> list[tuple[int, int]]:
+        """登録する(年, 月)の一覧を取得する（古い順）"""
+        start_year, start_month = self.start
+        end_year, end_month = self.end
+        months = []
+        for month_index in range(start_year * 12 + start_month - 1, end_year * 12 + end_month):
+            year, month = divmod(month_index, 12)
+            months.append((year, month + 1))
+        return months
+    
+    def get_kinds(self) -> list[SalaryKind]:
+        """登録する給与種別を取得する"""
+        return self.kinds
+    
+    def get_jobs(self) -> int:
+        """同時に起動するブラウザ(ワーカー)の数を取得する"""
+        return self.jobs
+    
+    def get_approval(self) -> "ApprovalArguments":
+        """登録日の確認を省略する指定を取得する"""
+        return self.approval
+
+
+class DaemonArguments:
+    """常駐ブラウザ(upload.py daemon)の起動引数管理クラス"""
+    
+    # 常駐ブラウザを指定するサブコマンド
+    COMMAND: Final[str] = "daemon"
+    
+    # メッセージテンプレート
+    USAGE_EXAMPLE: Final[str] = "python upload.py daemon --idle 120 または python upload.py daemon --stop"
+    USAGE_MSG_INVALID: Final[str] = "常駐ブラウザの引数を正しく指定してください"
+    
+    def __init__(self) -> None:
+        self.idle: Optional[float] = None
+        self.stop: bool = False
+        self.status: bool = False
+        self.parser: Optional[argparse.ArgumentParser] = None
+        
+        self._register_args()
+        self.isOk = self._parse_args()
+    
+    @classmethod
+    def is_requested(cls) -> bool:
+        """起動引数で常駐ブラウザが指定されているか"""
+        return len(sys.argv) > 1 and sys.argv[1] == cls.COMMAND
+    
+    def _register_args(self) -> None:
+        """起動引数情報を設定する"""
+        description = "ログイン済みのChromeを起動したまま常駐し、upload.pyの実行時にChromeの起動とログインを省略します。"
+        self.parser = argparse.ArgumentParser(prog=f"upload.py {self.COMMAND}", description=description)
+        
+        group = self.parser.add_mutually_exclusive_group()
+        group.add_argument(
+            "-i", "--idle", type=float, help="使用されない場合に終了するまでの分数（0は終了しない）"
+        )
+        group.add_argument("--stop", action="store_true", help="起動中の常駐ブラウザを終了するか")
+        group.add_argument("--status", action="store_true", help="起動中の常駐ブラウザの状態を表示するか")
+    
+    def _parse_args(self) -> bool:
+        """引数をパースして値を設定する"""
+        try:
+            args = self.parser.parse_args(sys.argv[2:])
+            self.idle = args.idle
+            self.stop = args.stop
+            self.status = args.status
+            if self.idle is not None and self.idle < 0:
+                raise ValueError(f"終了までの分数が不正です: {self.idle}")
+            return True
+        except (Exception, SystemExit):
+            Logger.logWarning(self.USAGE_MSG_INVALID)
+            Logger.logWarning(f"例：{self.USAGE_EXAMPLE}")
+            return False
+    
+    def is_valid(self) -> bool:
+        """起動引数が問題ないか"""
+        return self.isOk
+    
+    def get_idle_minutes(self) -> Optional[float]:
+        """使用されない場合に終了するまでの分数を取得する（未指定の場合None）"""
+        return self.idle
+    
+    def is_stop(self) -> bool:
+        """起動中の常駐ブラウザを終了するか"""
+        return self.stop
+    
+    def is_status(self) -> bool:
+        """起動中の常駐ブラウザの状態を表示するか"""
+        return self.status
+
+
+class ApprovalArguments:
+    """
+    登録日の確認を省略する起動引数（upload.pyの単月・watch・rangeで共通）
+    
+    -y/--yesを指定すると登録日を入力・確認せず、給料日の決め方（--payday・--adjust、
+    省略時は設定ファイルのDefaultDate・PaydayAdjustment）で決めた登録日で登録する。
+    """
+    
+    def __init__(self) -> None:
+        self.yes: bool = False
+        self.payday: Optional[int] = None
+        self.adjust: Optional[str] = None
+    
+    @staticmethod
+    def register(parser: argparse.ArgumentParser) -> None:
+        """起動引数情報を設定する"""
+        parser.add_argument(
+            "-y", "--yes", action="store_true", help="登録日を確認せずに登録するか（cron・一括実行用）"
+        )
+        parser.add_argument(
+            "--payday", type=int, help="-y指定時の給料日の日にち（省略時は設定ファイルのDefaultDate）"
+        )
+        parser.add_argument(
+            "--adjust", choices=PaydayRule.ADJUSTMENTS,
+            help="-y指定時、給料日が土日・祝日の場合の調整（省略時は設定ファイルのPaydayAdjustment）"
+        )
+    
+    def parse(self, args: argparse.Namespace) -> None:
+        """
+        パースした引数から値を設定する
+        
+        Raises:
+            ValueError: 給料日の日にちが不正な場合
+        """
+        self.yes = args.yes
+        self.payday = args.payday
+        self.adjust = args.adjust
+        if self.payday is not None and not 1 <= self.payday <= 31:
+            raise ValueError(f"給料日の日にちが不正です: {self.payday}")
+    
+    def is_auto_approved(self) -> bool:
+        """登録日を確認せずに登録するか"""
+        return self.yes
+    
+    def get_payday(self) -> Optional[int]:
+        """給料日の日にちを取得する（未指定の場合None）"""
+        return self.payday
+    
+    def get_adjustment(self) -> Optional[str]:
+        """給料日が土日・祝日の場合の調整を取得する（未指定の場合None）"""
+        return self.adjust
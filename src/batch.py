@@ -0,0 +1,437 @@
+import gc
+import multiprocessing
+import os
+import queue
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Final, Iterable, NamedTuple, Optional
+
+from logger import Logger, Timer
+from memory import MemoryUsage
+from item import Item
+from reader import SalaryReader
+from archive import PayslipArchive
+from index import SalaryIndex
+from definitions import ItemDefinitions
+from argument import BatchArguments
+from common import SalaryKind, DirectoryNames, FileNames, ItemNames
+import config
+
+
+class BatchTarget(NamedTuple):
+    """
+    一括読み取りの対象となる明細（年, 月, 給与種別, 社員番号）
+    
+    ZIPファイル内の明細の場合はZIPファイルのパスとZIP内のパスを持つ。
+    """
+    year: int
+    month: int
+    kind: SalaryKind
+    number: str
+    archive: Optional[str] = None
+    member: Optional[str] = None
+    
+    def __str__(self) -> str:
+        return f"{self.year}年{self.month:02}月の{self.kind.value}明細({self.number})"
+
+
+class BatchResult(NamedTuple):
+    """一括読み取りの結果（1明細分）"""
+    target: BatchTarget
+    items: list[Item]
+    error: Optional[str] = None
+    
+    def is_ok(self) -> bool:
+        """読み取りに成功したか"""
+        return self.error is None
+
+
+class BatchReader:
+    """
+    複数の給与明細PDFをプロセスプールで並列に読み取るクラス
+    
+    ワーカーごとのRSS上限を指定した場合は、明細を読み取るたびにワーカーがRSSを報告し、
+    上限を超えたワーカーは終了して新しいワーカーに置き換える（大量の再読み込み向け）。
+    """
+    
+    # ログメッセージ
+    LOG_START: Final[str] = "{count}件の明細を{workers}プロセスで読み取ります。"
+    LOG_DONE: Final[str] = "読み取り完了: 成功={ok}件, 失敗={ng}件"
+    LOG_RECYCLE: Final[str] = "ワーカー(pid={pid})のRSSが上限を超えたため再起動します: {rss_mb:.1f}MB"
+    
+    # エラーメッセージ
+    ERROR_WORKER_DIED: Final[str] = "ワーカープロセスが異常終了しました(終了コード: {code})"
+    
+    # RSS上限モードで明細を読み取っていないワーカーを表す値
+    IDLE: Final[int] = -1
+    # ワーカーの異常終了を確認する間隔(秒)
+    POLL_INTERVAL: Final[float] = 0.5
+    
+    # ワーカープロセス内で保持する項目定義（ワーカー起動時に1度だけ読み込む）
+    _worker_definitions: Optional[ItemDefinitions] = None
+    # ワーカープロセス内で開いたZIPファイル（パス → ZIPファイル）
+    _worker_archives: dict[str, PayslipArchive] = {}
+    
+    def __init__(
+        self,
+        targets: Iterable[BatchTarget],
+        max_workers: Optional[int] = None,
+        max_rss_bytes: Optional[int] = None
+    ) -> None:
+        """
+        一括読み取りの初期化
+        
+        Args:
+            targets: 読み取り対象の明細
+            max_workers: 最大プロセス数（省略時はCPU数）
+            max_rss_bytes: ワーカー1プロセスあたりのRSS上限（省略時または0は無制限）
+        """
+        self.targets: list[BatchTarget] = sorted(
+            dict.fromkeys(targets),
+            key=lambda t: (t.year, t.month, t.kind.name, t.number)
+        )
+        self.maxWorkers = max_workers or os.cpu_count() or 1
+        self.maxRssBytes = max_rss_bytes or 0
+        self.itemsFile = os.path.join(DirectoryNames.USERDATA, FileNames.ITEMS_YAML)
+    
+    @classmethod
+    def from_directory(
+        cls,
+        salary_dir: Optional[str] = None,
+        numbers: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+        max_rss_bytes: Optional[int] = None
+    ) -> "BatchReader":
+        """
+        給与明細ディレクトリ内のすべてのPDFを対象とする（ファイル名の索引から取得する）
+        
+        Args:
+            salary_dir: 給与明細ディレクトリ（省略時はuserdata/salaryData）
+            numbers: 対象とする社員番号（省略時はすべて）
+            max_workers: 最大プロセス数
+            max_rss_bytes: ワーカー1プロセスあたりのRSS上限
+        
+        Returns:
+            BatchReader
+        """
+        index = SalaryIndex(salary_dir)
+        index.refresh()
+        targets = [BatchTarget(*key) for key in index.targets(numbers)]
+        return cls(targets, max_workers, max_rss_bytes)
+    
+    @classmethod
+    def from_archive(
+        cls,
+        zip_path: str,
+        numbers: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+        max_rss_bytes: Optional[int] = None
+    ) -> "BatchReader":
+        """
+        ZIPファイル内のすべての給与明細PDFを対象とする（展開はしない）
+        
+        Args:
+            zip_path: ZIPファイルのパス
+            numbers: 対象とする社員番号（省略時はすべて）
+            max_workers: 最大プロセス数
+            max_rss_bytes: ワーカー1プロセスあたりのRSS上限
+        
+        Returns:
+            BatchReader
+        """
+        allowed = set(numbers) if numbers else None
+        
+        with PayslipArchive(zip_path) as archive:
+            targets = [
+                BatchTarget(
+                    member.year, member.month, member.kind, member.number,
+                    archive=zip_path, member=member.name
+                )
+                for member in archive.members()
+                if allowed is None or member.number in allowed
+            ]
+        return cls(targets, max_workers, max_rss_bytes)
+    
+    def read_all(self) -> list[BatchResult]:
+        """
+        すべての対象明細を並列に読み取る
+        
+        Returns:
+            対象明細ごとの読み取り結果（対象の並び順）
+        """
+        if not self.targets:
+            return []
+        
+        workers = min(self.maxWorkers, len(self.targets))
+        Logger.logInfo(self.LOG_START.format(count=len(self.targets), workers=workers))
+        
+        if self.maxRssBytes:
+            results = self._read_all_bounded(workers)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=BatchReader._init_worker,
+                initargs=(self.itemsFile,)
+            ) as executor:
+                results = list(executor.map(BatchReader._read_target, self.targets))
+        
+        ok = sum(1 for result in results if result.is_ok())
+        Logger.logInfo(self.LOG_DONE.format(ok=ok, ng=len(results) - ok))
+        return results
+    
+    def _read_all_bounded(self, workers: int) -> list[BatchResult]:
+        """
+        RSS上限を超えたワーカーを置き換えながらすべての対象明細を読み取る
+        
+        Args:
+            workers: 同時に動かすワーカー数
+        
+        Returns:
+            対象明細ごとの読み取り結果（対象の並び順）
+        
+        Raises:
+            RuntimeError: ワーカーが明細の読み取り以外で異常終了した場合
+        """
+        context = multiprocessing.get_context()
+        tasks = context.Queue()
+        outputs = context.Queue()
+        for index, target in enumerate(self.targets):
+            tasks.put((index, target))
+        # 終了の合図はワーカー数分（上限超過で終了したワーカーは合図を消費しない）
+        for _ in range(workers):
+            tasks.put(None)
+        
+        # ワーカーごとに読み取り中の明細のインデックスを共有メモリで保持する
+        # （キューと異なり、ワーカーが異常終了しても書き込み済みの値は失われない）
+        current = context.Array("i", [self.IDLE] * workers, lock=False)
+        processes: dict[int, multiprocessing.Process] = {}
+        
+        def start_worker(slot: int) -> None:
+            process = context.Process(
+                target=BatchReader._bounded_worker,
+                args=(self.itemsFile, self.maxRssBytes, slot, current, tasks, outputs),
+                daemon=True
+            )
+            process.start()
+            processes[slot] = process
+        
+        results: list[Optional[BatchResult]] = [None] * len(self.targets)
+        remaining = len(self.targets)
+        for slot in range(workers):
+            start_worker(slot)
+        
+        try:
+            while remaining:
+                try:
+                    slot, index, result, rss, retire = outputs.get(timeout=self.POLL_INTERVAL)
+                except queue.Empty:
+                    for slot, exitcode in self._reap_dead_workers(processes):
+                        index = current[slot]
+                        error = self.ERROR_WORKER_DIED.format(code=exitcode)
+                        if index == self.IDLE:
+                            raise RuntimeError(error)
+                        current[slot] = self.IDLE
+                        if results[index] is None:
+                            results[index] = BatchResult(self.targets[index], [], error)
+                            remaining -= 1
+                        start_worker(slot)
+                    continue
+                
+                if results[index] is None:
+                    results[index] = result
+                    remaining -= 1
+                if retire:
+                    pid = processes.pop(slot).pid
+                    Logger.logInfo(self.LOG_RECYCLE.format(pid=pid, rss_mb=rss / 1024 / 1024))
+                    if remaining:
+                        start_worker(slot)
+        finally:
+            for process in processes.values():
+                process.join(timeout=self.POLL_INTERVAL)
+                if process.is_alive():
+                    process.terminate()
+        return results
+    
+    @staticmethod
+    def _reap_dead_workers(processes: dict) -> list[tuple[int, int]]:
+        """
+        異常終了したワーカーを管理対象から外す
+        
+        Args:
+            processes: 管理中のワーカー（スロット番号 → プロセス）
+        
+        Returns:
+            異常終了したワーカーの(スロット番号, 終了コード)
+        """
+        dead = []
+        for slot, process in list(processes.items()):
+            if process.is_alive() or process.exitcode == 0:
+                continue
+            del processes[slot]
+            dead.append((slot, process.exitcode))
+        return dead
+    
+    @staticmethod
+    def _bounded_worker(
+        items_file: str,
+        max_rss_bytes: int,
+        slot: int,
+        current,
+        tasks,
+        outputs
+    ) -> None:
+        """
+        RSS上限モードのワーカープロセスの処理
+        
+        明細を1件読み取るたびにRSSを報告し、上限を超えた場合は終了する。
+        
+        Args:
+            items_file: 項目定義ファイルのパス
+            max_rss_bytes: RSS上限
+            slot: ワーカーのスロット番号
+            current: スロットごとの読み取り中の明細のインデックス（共有メモリ）
+            tasks: (インデックス, 対象)を受け取るキュー（Noneで終了）
+            outputs: (スロット番号, インデックス, 結果, RSS, 終了するか)を返すキュー
+        """
+        BatchReader._init_worker(items_file)
+        
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            index, target = task
+            current[slot] = index
+            
+            result = BatchReader._read_target(target)
+            gc.collect()
+            rss = MemoryUsage.current_rss()
+            retire = rss > max_rss_bytes
+            outputs.put((slot, index, result, rss, retire))
+            current[slot] = BatchReader.IDLE
+            if retire:
+                return
+    
+    @staticmethod
+    def _init_worker(items_file: str) -> None:
+        """
+        ワーカープロセスの初期化（pdfiumの読み込みはreaderのimport時に完了している）
+        
+        Args:
+            items_file: 項目定義ファイルのパス
+        """
+        BatchReader._worker_definitions = SalaryReader.load_item_definitions_file(items_file)
+    
+    @staticmethod
+    def _read_target(target: BatchTarget) -> BatchResult:
+        """
+        ワーカープロセスで1明細を読み取る
+        
+        Args:
+            target: 読み取り対象
+        
+        Returns:
+            読み取り結果（例外はメッセージとして格納する）
+        """
+        # ワーカーは処理時間を出力しないため、明細ごとに計測結果を破棄して溜め込まない
+        Timer.reset()
+        try:
+            if target.archive is None:
+                reader = SalaryReader(
+                    target.year, target.month, target.number, target.kind,
+                    item_definitions=BatchReader._worker_definitions
+                )
+                return BatchResult(target, reader.readDeduction())
+            
+            archive = BatchReader._worker_archives.get(target.archive)
+            if archive is None:
+                archive = PayslipArchive(target.archive)
+                BatchReader._worker_archives[target.archive] = archive
+            with archive.open(target.member) as source:
+                reader = SalaryReader(
+                    target.year, target.month, target.number, target.kind,
+                    item_definitions=BatchReader._worker_definitions,
+                    source=source
+                )
+                return BatchResult(target, reader.readDeduction())
+        except Exception as e:
+            return BatchResult(target, [], str(e))
+
+
+def _build_targets(args: BatchArguments, index: SalaryIndex) -> list[BatchTarget]:
+    """
+    起動引数の期間のうち、給与明細PDFがある明細の一覧を作成する
+    
+    Args:
+        args: 起動引数
+        index: 給与明細ディレクトリの索引
+    
+    Returns:
+        読み取り対象の明細（PDFがない明細は警告を出して除く）
+    """
+    numbers = args.get_numbers() or [config.data.get_employee_number()]
+    start_year, start_month = args.get_start()
+    end_year, end_month = args.get_end()
+    
+    targets = []
+    for month_index in range(start_year * 12 + start_month - 1, end_year * 12 + end_month):
+        year, month = divmod(month_index, 12)
+        for number in numbers:
+            target = BatchTarget(year, month + 1, args.get_kind(), number)
+            if index.lookup(target.year, target.month, target.kind, target.number) is None:
+                Logger.logWarning(f"{target}のPDFがないため対象外とします。")
+                continue
+            targets.append(target)
+    return targets
+
+
+def main() -> None:
+    """一括読み取りのメインメソッド"""
+    args = BatchArguments()
+    
+    if not args.is_valid():
+        sys.exit(1)
+    
+    try:
+        max_rss_bytes = args.get_max_rss_bytes()
+        if max_rss_bytes is None:
+            max_rss_bytes = config.data.get_worker_max_rss_bytes()
+        
+        if args.get_archive():
+            reader = BatchReader.from_archive(
+                args.get_archive(),
+                numbers=args.get_numbers(),
+                max_workers=args.get_workers(),
+                max_rss_bytes=max_rss_bytes
+            )
+        elif args.is_all():
+            reader = BatchReader.from_directory(
+                numbers=args.get_numbers(),
+                max_workers=args.get_workers(),
+                max_rss_bytes=max_rss_bytes
+            )
+        else:
+            index = SalaryIndex()
+            index.refresh()
+            reader = BatchReader(_build_targets(args, index), args.get_workers(), max_rss_bytes)
+        results = reader.read_all()
+    except Exception as e:
+        Logger.logError(str(e))
+        traceback.print_exc()
+        sys.exit(1)
+    
+    for result in results:
+        if not result.is_ok():
+            Logger.logError(f"{result.target}: {result.error}")
+            continue
+        total = next(
+            (item.amount for item in result.items if item.name == ItemNames.DEDUCTION_SUM), 0
+        )
+        Logger.logInfo(f"{result.target}: 控除合計 {total:,}円 ({len(result.items) - 1}項目)")
+    
+    if not all(result.is_ok() for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
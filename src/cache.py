@@ -0,0 +1,225 @@
+import base64
+import hashlib
+import json
+import mmap
+import os
+from typing import Final, Optional
+
+from logger import Logger
+from salt import SaltFile
+from item import Item
+from source import PdfSource
+from common import DirectoryNames
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    # 暗号化ライブラリがない場合はキャッシュを無効化する（平文では保存しない）
+    Fernet = None
+    InvalidToken = Exception
+
+
+class ExtractionCache:
+    """
+    PDFから抽出したテキスト行と項目を保存するディスクキャッシュ
+    
+    キーはPDFの内容ハッシュ・items.ymlのハッシュ・パーサーバージョンから作成し、
+    内容はPDFパスワードから導出した鍵で暗号化して保存する。
+    合計サイズが上限を超えた場合は最終利用日時の古いものから削除する。
+    """
+    
+    # ファイル名
+    ENTRY_EXTENSION: Final[str] = ".bin"
+    SALT_FILENAME: Final[str] = "extraction.salt"
+    
+    # 鍵導出・ハッシュ設定
+    KDF_ITERATIONS: Final[int] = 100_000
+    SALT_SIZE: Final[int] = 16
+    HASH_CHUNK_SIZE: Final[int] = 1024 * 1024
+    
+    # 既定のキャッシュ上限サイズ
+    DEFAULT_MAX_BYTES: Final[int] = 32 * 1024 * 1024
+    
+    # ログメッセージ
+    LOG_DISABLED: Final[str] = "cryptographyがインストールされていないため抽出キャッシュを無効化します。"
+    LOG_BROKEN: Final[str] = "抽出キャッシュを復号できないため破棄します: {key}"
+    
+    # 導出済みの鍵（同一プロセス内での再計算を避ける）
+    _derived_keys: dict[tuple[str, bytes], bytes] = {}
+    
+    def __init__(
+        self,
+        password: str,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """
+        抽出キャッシュの初期化
+        
+        Args:
+            password: 暗号鍵の導出に使うPDFパスワード
+            cache_dir: キャッシュディレクトリ（省略時はuserdata/cache）
+            max_bytes: キャッシュ全体の上限サイズ
+        """
+        self.password = password
+        self.cacheDir = cache_dir or os.path.join(DirectoryNames.USERDATA, DirectoryNames.CACHE)
+        self.maxBytes = max_bytes
+        self.fernet = None
+        
+        if Fernet is None:
+            Logger.logWarning(self.LOG_DISABLED)
+    
+    def is_enabled(self) -> bool:
+        """キャッシュが利用可能か"""
+        return Fernet is not None and self.maxBytes > 0
+    
+    @classmethod
+    def make_key(cls, pdf: str | PdfSource, definitions_digest: str, parser_version: str) -> str:
+        """
+        キャッシュキーを作成する
+        
+        Args:
+            pdf: PDFファイルのパス、またはメモリ上のPDF（bytes, memoryview, mmap, ファイルオブジェクト）
+            definitions_digest: 使用する項目定義の内容のハッシュ(ItemDefinitions.digest())
+            parser_version: パーサーのバージョン
+        
+        Returns:
+            キャッシュキー（16進文字列）
+        
+        Raises:
+            OSError: ファイルが読み込めない場合
+        """
+        digest = hashlib.sha256()
+        digest.update(cls._hash_file(pdf) if isinstance(pdf, str) else cls._hash_source(pdf))
+        digest.update(definitions_digest.encode())
+        digest.update(parser_version.encode())
+        return digest.hexdigest()
+    
+    @classmethod
+    def _hash_file(cls, path: str) -> bytes:
+        """ファイル内容のSHA-256ハッシュを計算する"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(cls.HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.digest()
+    
+    @classmethod
+    def _hash_source(cls, source: PdfSource) -> bytes:
+        """メモリ上のPDFのSHA-256ハッシュを計算する（ファイルオブジェクトは先頭に戻す）"""
+        if not hasattr(source, "readinto") or isinstance(source, mmap.mmap):
+            return hashlib.sha256(memoryview(source)).digest()
+        
+        digest = hashlib.sha256()
+        source.seek(0)
+        for chunk in iter(lambda: source.read(cls.HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        source.seek(0)
+        return digest.digest()
+    
+    def get(self, key: str) -> Optional[tuple[list[str], list[Item]]]:
+        """
+        キャッシュから抽出結果を取得する
+        
+        Args:
+            key: キャッシュキー
+        
+        Returns:
+            (テキスト行, 項目リスト)、キャッシュがない場合None
+        """
+        if not self.is_enabled():
+            return None
+        
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                token = f.read()
+        except FileNotFoundError:
+            return None
+        
+        try:
+            payload = json.loads(self._get_fernet().decrypt(token))
+        except (InvalidToken, ValueError):
+            Logger.logWarning(self.LOG_BROKEN.format(key=key))
+            self._remove(path)
+            return None
+        
+        # 最終利用日時を更新（削除順の判定に使う）
+        os.utime(path)
+        items = [Item(name, amount, main, sub) for name, amount, main, sub in payload["items"]]
+        return payload["lines"], items
+    
+    def put(self, key: str, lines: list[str], items: list[Item]) -> None:
+        """
+        抽出結果をキャッシュへ保存する
+        
+        Args:
+            key: キャッシュキー
+            lines: PDFから抽出したテキスト行
+            items: 抽出した項目リスト
+        """
+        if not self.is_enabled():
+            return
+        
+        payload = {
+            "lines": lines,
+            "items": [[i.name, i.amount, i.category, i.subcategory] for i in items],
+        }
+        token = self._get_fernet().encrypt(json.dumps(payload, ensure_ascii=False).encode())
+        
+        os.makedirs(self.cacheDir, exist_ok=True)
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(token)
+        os.replace(tmp_path, path)
+        
+        self._evict()
+    
+    def _evict(self) -> None:
+        """合計サイズが上限以下になるまで最終利用日時の古いエントリを削除する"""
+        entries = []
+        with os.scandir(self.cacheDir) as it:
+            for entry in it:
+                if not entry.name.endswith(self.ENTRY_EXTENSION):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.maxBytes:
+                break
+            self._remove(path)
+            total -= size
+    
+    def _entry_path(self, key: str) -> str:
+        """キャッシュエントリのパスを取得する"""
+        return os.path.join(self.cacheDir, f"{key}{self.ENTRY_EXTENSION}")
+    
+    def _remove(self, path: str) -> None:
+        """キャッシュエントリを削除する（既に削除済みの場合は無視）"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    def _get_fernet(self):
+        """PDFパスワードとソルトから導出した鍵で暗号化器を作成する"""
+        if self.fernet is None:
+            salt = self._load_salt()
+            cache_key = (self.password, salt)
+            if cache_key not in self._derived_keys:
+                raw_key = hashlib.pbkdf2_hmac(
+                    "sha256", self.password.encode(), salt, self.KDF_ITERATIONS
+                )
+                self._derived_keys[cache_key] = base64.urlsafe_b64encode(raw_key)
+            self.fernet = Fernet(self._derived_keys[cache_key])
+        return self.fernet
+    
+    def _load_salt(self) -> bytes:
+        """鍵導出用のソルトを読み込む（なければ作成する）"""
+        return SaltFile(os.path.join(self.cacheDir, self.SALT_FILENAME), self.SALT_SIZE).load()
@@ -0,0 +1,144 @@
+import json
+import os
+import time
+from typing import Final, Iterable, Optional
+
+from logger import Logger
+from item import Item
+from common import DirectoryNames
+
+
+class CategoryTree:
+    """
+    MoneyForwardのカテゴリ（大項目・中項目）と内部IDの対応
+    
+    入力フォームのドロップダウンから取得し、カテゴリをドロップダウンを開かずにIDで設定するために使う。
+    """
+    
+    def __init__(self, categories: dict[str, dict]) -> None:
+        """
+        カテゴリの初期化
+        
+        Args:
+            categories: 大項目名 → {"id": 大項目ID, "middles": {中項目名: 中項目ID}}
+        """
+        self.categories = categories
+    
+    def ids(self, category: Optional[str], subcategory: Optional[str]) -> Optional[tuple[str, str]]:
+        """
+        大項目・中項目のIDを取得する
+        
+        Args:
+            category: 大項目名
+            subcategory: 中項目名
+        
+        Returns:
+            (大項目ID, 中項目ID)、該当するカテゴリがない場合None
+        """
+        large = self.categories.get(category)
+        if large is None or subcategory not in large["middles"]:
+            return None
+        return large["id"], large["middles"][subcategory]
+    
+    def find_unknown(self, items: Iterable[Item]) -> list[tuple[str, str]]:
+        """
+        MoneyForwardにないカテゴリを取得する
+        
+        Args:
+            items: 登録する項目
+        
+        Returns:
+            存在しない(大項目, 中項目)の一覧（重複は除く）
+        """
+        unknown = []
+        for item in items:
+            if item.category is None:
+                continue
+            pair = (item.category, item.subcategory)
+            if self.ids(*pair) is None and pair not in unknown:
+                unknown.append(pair)
+        return unknown
+    
+    def is_valid(self) -> bool:
+        """IDで設定できるカテゴリを取得できているか（画面構成が異なる場合は取得できない）"""
+        return bool(self.categories) and all(
+            large["id"] and all(large["middles"].values()) for large in self.categories.values()
+        )
+
+
+class CategoryCache:
+    """
+    MoneyForwardのカテゴリ(CategoryTree)をディスクへ保存するクラス
+    
+    保存してから有効期間(CategoryCacheTtlHours)が経過したものは使わず、入力フォームから取得し直す。
+    """
+    
+    # キャッシュファイル
+    CACHE_FILENAME: Final[str] = "categories.json"
+    CACHE_VERSION: Final[int] = 1
+    
+    # ログメッセージ
+    LOG_CACHE_BROKEN: Final[str] = "カテゴリのキャッシュを読み込めないため取得し直します: {path}"
+    
+    def __init__(self, ttl_seconds: float, cache_dir: Optional[str] = None) -> None:
+        """
+        キャッシュの初期化
+        
+        Args:
+            ttl_seconds: 有効期間(秒、0以下はキャッシュしない)
+            cache_dir: 保存先ディレクトリ（省略時はuserdata/cache）
+        """
+        self.ttlSeconds = ttl_seconds
+        self.cacheDir = cache_dir or os.path.join(DirectoryNames.USERDATA, DirectoryNames.CACHE)
+        self.cacheFile = os.path.join(self.cacheDir, self.CACHE_FILENAME)
+    
+    def load(self) -> Optional[CategoryTree]:
+        """
+        保存したカテゴリを取得する
+        
+        Returns:
+            有効期間内のカテゴリ、保存していない・期限切れの場合None
+        """
+        if self.ttlSeconds <= 0:
+            return None
+        try:
+            with open(self.cacheFile, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            Logger.logWarning(self.LOG_CACHE_BROKEN.format(path=self.cacheFile))
+            return None
+        
+        try:
+            if data["version"] != self.CACHE_VERSION or time.time() - data["saved_at"] > self.ttlSeconds:
+                return None
+            return CategoryTree(data["categories"])
+        except (KeyError, TypeError):
+            Logger.logWarning(self.LOG_CACHE_BROKEN.format(path=self.cacheFile))
+            return None
+    
+    def save(self, tree: CategoryTree) -> None:
+        """カテゴリを保存する（保存できない場合は無視する）"""
+        if self.ttlSeconds <= 0:
+            return
+        data = {
+            "version": self.CACHE_VERSION,
+            "saved_at": time.time(),
+            "categories": tree.categories,
+        }
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            tmp_path = f"{self.cacheFile}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cacheFile)
+        except OSError:
+            pass
+    
+    def clear(self) -> None:
+        """保存したカテゴリを削除する"""
+        try:
+            os.remove(self.cacheFile)
+        except FileNotFoundError:
+            pass
@@ -13,6 +13,7 @@ class FileNames:
     """ファイル名関連の定数"""
     PDF_SALARY_INFIX: Final[str] = "_kyuyo_"
     PDF_BONUS_INFIX: Final[str] = "_syoyo_"
+    PDF_SPECIAL_INFIX: Final[str] = "_tokubetsu_"
     PDF_EXTENSION: Final[str] = ".pdf"
     ITEMS_YAML: Final[str] = "items.yml"
     CONFIG_INI: Final[str] = "config.ini"
@@ -22,6 +23,7 @@ class DirectoryNames:
     """ディレクトリ名関連の定数"""
     USERDATA: Final[str] = "../userdata"
     SALARY_DATA: Final[str] = "salaryData"
+    CACHE: Final[str] = "cache"
 
 
 class ItemNames:
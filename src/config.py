@@ -2,7 +2,7 @@ import configparser
 import os
 from logger import Logger
 from distutils.util import strtobool
-from typing import Final
+from typing import Final, Optional
 
 
 class Config:
@@ -19,6 +19,40 @@ class Config:
     KEY_HEADLESS_MODE: Final[str] = "UseHeadlessMode"
     KEY_DEFAULT_DATE: Final[str] = "DefaultDate"
     KEY_TFA_ID: Final[str] = "TfaId"
+    KEY_EXTRACTION_CACHE: Final[str] = "UseExtractionCache"
+    KEY_EXTRACTION_CACHE_MAX_MB: Final[str] = "ExtractionCacheMaxMB"
+    KEY_WORKER_MAX_RSS_MB: Final[str] = "WorkerMaxRssMB"
+    KEY_TIMING_REPORT_FILE: Final[str] = "TimingReportFile"
+    KEY_WAIT_TIMEOUT: Final[str] = "WaitTimeoutSeconds"
+    KEY_KEEP_SESSION: Final[str] = "KeepLoginSession"
+    KEY_UPLOAD_ITEMS_PER_MINUTE: Final[str] = "UploadItemsPerMinute"
+    KEY_CATEGORY_CACHE_TTL_HOURS: Final[str] = "CategoryCacheTtlHours"
+    KEY_LEAN_BROWSER: Final[str] = "UseLeanBrowser"
+    KEY_BROWSER_DAEMON: Final[str] = "UseBrowserDaemon"
+    KEY_BROWSER_DAEMON_IDLE_MINUTES: Final[str] = "BrowserDaemonIdleMinutes"
+    KEY_MONEYFORWARD_URL: Final[str] = "MoneyForwardUrl"
+    KEY_REGISTRATION_JOURNAL: Final[str] = "UseRegistrationJournal"
+    KEY_SKIP_EXISTING_ENTRIES: Final[str] = "SkipExistingEntries"
+    KEY_AUTO_APPROVE: Final[str] = "AutoApprove"
+    KEY_PAYDAY_ADJUSTMENT: Final[str] = "PaydayAdjustment"
+    
+    # 省略可能な設定の既定値
+    DEFAULT_EXTRACTION_CACHE: Final[str] = "true"
+    DEFAULT_EXTRACTION_CACHE_MAX_MB: Final[str] = "32"
+    DEFAULT_WORKER_MAX_RSS_MB: Final[str] = "0"
+    DEFAULT_TIMING_REPORT_FILE: Final[str] = ""
+    DEFAULT_WAIT_TIMEOUT: Final[str] = "5"
+    DEFAULT_KEEP_SESSION: Final[str] = "true"
+    DEFAULT_UPLOAD_ITEMS_PER_MINUTE: Final[str] = "60"
+    DEFAULT_CATEGORY_CACHE_TTL_HOURS: Final[str] = "168"
+    DEFAULT_LEAN_BROWSER: Final[str] = "false"
+    DEFAULT_BROWSER_DAEMON: Final[str] = "true"
+    DEFAULT_BROWSER_DAEMON_IDLE_MINUTES: Final[str] = "60"
+    DEFAULT_MONEYFORWARD_URL: Final[str] = "https://moneyforward.com"
+    DEFAULT_REGISTRATION_JOURNAL: Final[str] = "true"
+    DEFAULT_SKIP_EXISTING_ENTRIES: Final[str] = "true"
+    DEFAULT_AUTO_APPROVE: Final[str] = "false"
+    DEFAULT_PAYDAY_ADJUSTMENT: Final[str] = "none"
     
     # ファイルパス
     USERDATA_DIR: Final[str] = "../userdata"
@@ -70,6 +104,99 @@ class Config:
         """2段階認証の生成用IDを取得します"""
         return self.config[self.DEFAULT][self.KEY_TFA_ID]
     
+    def is_extraction_cache_enabled(self) -> bool:
+        """PDF抽出結果のキャッシュを使用するかを取得します"""
+        value = self.config[self.DEFAULT].get(
+            self.KEY_EXTRACTION_CACHE, self.DEFAULT_EXTRACTION_CACHE
+        )
+        return bool(strtobool(value.upper()))
+
+    def get_extraction_cache_max_bytes(self) -> int:
+        """PDF抽出結果のキャッシュ上限サイズ(バイト)を取得します"""
+        value = self.config[self.DEFAULT].get(
+            self.KEY_EXTRACTION_CACHE_MAX_MB, self.DEFAULT_EXTRACTION_CACHE_MAX_MB
+        )
+        return int(value) * 1024 * 1024
+
+    def get_worker_max_rss_bytes(self) -> int:
+        """一括読み取りのワーカー1プロセスあたりのRSS上限(バイト、0は無制限)を取得します"""
+        value = self.config[self.DEFAULT].get(
+            self.KEY_WORKER_MAX_RSS_MB, self.DEFAULT_WORKER_MAX_RSS_MB
+        )
+        return int(value) * 1024 * 1024
+
+    def get_timing_report_file(self) -> Optional[str]:
+        """処理時間の計測結果(JSON Lines)の出力先を取得します（未設定の場合None）"""
+        value = self.config[self.DEFAULT].get(
+            self.KEY_TIMING_REPORT_FILE, self.DEFAULT_TIMING_REPORT_FILE
+        ).strip()
+        return value or None
+
+    def get_wait_timeout(self) -> float:
+        """MoneyForwardの画面の表示・通信完了を待つ上限時間(秒)を取得します"""
+        value = self.config[self.DEFAULT].get(self.KEY_WAIT_TIMEOUT, self.DEFAULT_WAIT_TIMEOUT)
+        return float(value)
+
+    def is_session_kept(self) -> bool:
+        """MoneyForwardのログインセッションを保存して次回のログインを省略するかを取得します"""
+        value = self.config[self.DEFAULT].get(self.KEY_KEEP_SESSION, self.DEFAULT_KEEP_SESSION)
+        return bool(strtobool(value.upper()))
+
+    def get_upload_items_per_minute(self) -> float:
+        """複数ワーカーで登録する際の全ワーカー合計の1分あたりの登録項目数の上限を取得します（0は無制限）"""
+        value = self.config[self.DEFAULT].get(
+            self.KEY_UPLOAD_ITEMS_PER_MINUTE, self.DEFAULT_UPLOAD_ITEMS_PER_MINUTE
+        )
+        return float(value)
+
+    def get_category_cache_ttl_seconds(self) -> float:
+        """MoneyForwardのカテゴリのキャッシュの有効期間(秒、0はキャッシュしない)を取得します"""
+        value = self.config[self.DEFAULT].get(
+            self.KEY_CATEGORY_CACHE_TTL_HOURS, self.DEFAULT_CATEGORY_CACHE_TTL_HOURS
+        )
+        return float(value) * 3600
+
+    def is_lean_browser(self) -> bool:
+        """画像・フォント・解析用スクリプトなどの読み込みを止めた省メモリのブラウザで登録するかを取得します"""
+        value = self.config[self.DEFAULT].get(self.KEY_LEAN_BROWSER, self.DEFAULT_LEAN_BROWSER)
+        return bool(strtobool(value.upper()))
+
+    def is_browser_daemon_used(self) -> bool:
+        """常駐ブラウザ(upload.py daemon)が起動していればChromeを起動せずに使うかを取得します"""
+        value = self.config[self.DEFAULT].get(self.KEY_BROWSER_DAEMON, self.DEFAULT_BROWSER_DAEMON)
+        return bool(strtobool(value.upper()))
+
+    def get_browser_daemon_idle_seconds(self) -> float:
+        """常駐ブラウザが使用されない場合に終了するまでの時間(秒、0は終了しない)を取得します"""
+        value = self.config[self.DEFAULT].get(
+            self.KEY_BROWSER_DAEMON_IDLE_MINUTES, self.DEFAULT_BROWSER_DAEMON_IDLE_MINUTES
+        )
+        return float(value) * 60
+
+    def get_moneyforward_url(self) -> str:
+        """登録先のMoneyForwardのURLを取得します（模擬サーバーで試験・計測する場合に変更する）"""
+        value = self.config[self.DEFAULT].get(self.KEY_MONEYFORWARD_URL, self.DEFAULT_MONEYFORWARD_URL)
+        return value.rstrip("/")
+
+    def is_registration_journal_used(self) -> bool:
+        """登録済みの項目を記録し、再実行時に登録済みの項目を省略するかを取得します"""
+        value = self.config[self.DEFAULT].get(self.KEY_REGISTRATION_JOURNAL, self.DEFAULT_REGISTRATION_JOURNAL)
+        return bool(strtobool(value.upper()))
+
+    def is_existing_entry_skipped(self) -> bool:
+        """MoneyForwardに同じ日付・金額・内容の入出金が登録済みの項目を登録しないかを取得します"""
+        value = self.config[self.DEFAULT].get(self.KEY_SKIP_EXISTING_ENTRIES, self.DEFAULT_SKIP_EXISTING_ENTRIES)
+        return bool(strtobool(value.upper()))
+
+    def is_auto_approved(self) -> bool:
+        """登録日を確認せず、DefaultDate（PaydayAdjustmentで調整）を登録日として登録するかを取得します"""
+        value = self.config[self.DEFAULT].get(self.KEY_AUTO_APPROVE, self.DEFAULT_AUTO_APPROVE)
+        return bool(strtobool(value.upper()))
+
+    def get_payday_adjustment(self) -> str:
+        """登録日が土日・祝日の場合の調整（none: しない, before: 前の営業日, after: 次の営業日）を取得します"""
+        return self.config[self.DEFAULT].get(self.KEY_PAYDAY_ADJUSTMENT, self.DEFAULT_PAYDAY_ADJUSTMENT)
+    
     # 後方互換性のためのエイリアス（非推奨）
     def getPdfPassword(self) -> str:
         return self.get_pdf_password()
@@ -0,0 +1,398 @@
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Final, Optional
+
+from logger import Logger
+from common import DirectoryNames
+
+
+# 常駐ブラウザの接続先（ローカルのみ）
+DAEMON_HOST: Final[str] = "127.0.0.1"
+# 常駐ブラウザの接続先とトークンを書き出すファイル（userdata/cache内）
+STATE_FILENAME: Final[str] = "daemon.json"
+
+
+def default_state_file() -> str:
+    """常駐ブラウザの状態ファイルの既定のパスを取得する"""
+    return os.path.join(DirectoryNames.USERDATA, DirectoryNames.CACHE, STATE_FILENAME)
+
+
+class DaemonClient:
+    """
+    常駐ブラウザ(upload.py daemon)へ要求を送るクラス
+    
+    状態ファイルから接続先とトークンを読み込み、1行1要求のJSONで通信する。
+    常駐ブラウザが起動していない・応答しない場合は各メソッドがNone/Falseを返す（呼び出し側は自分でChromeを起動する）。
+    """
+    
+    # 通信の上限時間（秒）
+    CONNECT_TIMEOUT: Final[float] = 1.0
+    # Chromeを借りる際の上限時間（秒、Chromeが終了していた場合は起動し直してログインするため長め）
+    ACQUIRE_TIMEOUT: Final[float] = 120.0
+    
+    def __init__(self, state_file: Optional[str] = None) -> None:
+        """
+        クライアントの初期化
+        
+        Args:
+            state_file: 状態ファイル（省略時はuserdata/cache/daemon.json）
+        """
+        self.stateFile = state_file or default_state_file()
+        self.token = ""
+        # Chromeを借りている間の接続（切断すると常駐ブラウザは返却されたものとみなす）
+        self.connection: Optional[socket.socket] = None
+        self.stream = None
+    
+    def ping(self) -> Optional[dict]:
+        """
+        常駐ブラウザの状態を取得する
+        
+        Returns:
+            状態（pid, busy, alive）、常駐ブラウザが起動していない場合None
+        """
+        return self._request_once("ping")
+    
+    def stop(self) -> bool:
+        """常駐ブラウザを終了させる（起動していない場合False）"""
+        response = self._request_once("stop")
+        return bool(response and response.get("ok"))
+    
+    def acquire(self) -> Optional[str]:
+        """
+        常駐ブラウザのChromeを借りる
+        
+        Returns:
+            Chromeのリモートデバッグの接続先（host:port）、借りられない場合None
+        """
+        try:
+            connection, stream = self._connect()
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            connection.settimeout(self.ACQUIRE_TIMEOUT)
+            response = self._exchange(stream, "acquire")
+        except (OSError, ValueError):
+            self._close(connection, stream)
+            return None
+        
+        if not response.get("ok"):
+            Logger.logFine(f"常駐ブラウザを使用できません: {response.get('error')}")
+            self._close(connection, stream)
+            return None
+        self.connection = connection
+        self.stream = stream
+        return response["debuggerAddress"]
+    
+    def release(self) -> None:
+        """借りたChromeを返却する"""
+        if self.connection is None:
+            return
+        try:
+            self._exchange(self.stream, "release")
+        except (OSError, ValueError):
+            # 接続が切れていれば常駐ブラウザ側で返却済みとなる
+            pass
+        finally:
+            self._close(self.connection, self.stream)
+            self.connection = None
+            self.stream = None
+    
+    def _request_once(self, command: str) -> Optional[dict]:
+        """接続して1つの要求を送り、応答を受け取って切断する"""
+        try:
+            connection, stream = self._connect()
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            return self._exchange(stream, command)
+        except (OSError, ValueError):
+            return None
+        finally:
+            self._close(connection, stream)
+    
+    def _connect(self):
+        """状態ファイルの接続先へ接続する"""
+        with open(self.stateFile, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        self.token = state["token"]
+        connection = socket.create_connection((DAEMON_HOST, state["port"]), timeout=self.CONNECT_TIMEOUT)
+        return connection, connection.makefile("rwb")
+    
+    @staticmethod
+    def _close(connection: socket.socket, stream) -> None:
+        """接続を閉じる（ストリームも閉じないとソケットが閉じられない）"""
+        try:
+            stream.close()
+        except OSError:
+            pass
+        connection.close()
+    
+    def _exchange(self, stream, command: str) -> dict:
+        """要求を送り、応答を受け取る"""
+        request = {"token": self.token, "command": command}
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+        line = stream.readline()
+        if not line:
+            raise ValueError("常駐ブラウザが応答しませんでした")
+        response = json.loads(line)
+        if not isinstance(response, dict):
+            raise ValueError("常駐ブラウザの応答が不正です")
+        return response
+
+
+class BrowserDaemon:
+    """
+    ログイン済みのChromeを起動したまま常駐し、upload.pyの各実行に貸し出すクラス
+    
+    Chromeはリモートデバッグを有効にして起動・ログインし、ローカルのソケットで次の要求を受け付ける。
+    接続先と要求に付けるトークンは状態ファイル(userdata/cache/daemon.json)に書き出す。
+        ping:    Chromeの状態を返す
+        acquire: Chromeを貸し出す（返却するか接続が切れるまで他の実行には貸し出さない）
+        release: 貸し出したChromeを返却する
+        stop:    常駐を終了する
+    貸し出していない間は一定間隔でChromeの応答を確認し、終了していた場合は起動し直してログインする。
+    一定時間(BrowserDaemonIdleMinutes)貸し出しがない場合はChromeを終了して常駐を終える。
+    """
+    
+    # ChromeのプロファイルDIR名（userdata/cache/profiles内）
+    PROFILE_DIRNAME: Final[str] = "daemon"
+    # Chromeの応答を確認する間隔（秒）
+    CHECK_SECONDS: Final[float] = 30.0
+    
+    # エラーメッセージ
+    ERROR_BUSY: Final[str] = "他の実行がChromeを使用中です"
+    ERROR_TOKEN: Final[str] = "トークンが一致しません"
+    ERROR_COMMAND: Final[str] = "不明な要求です: {command}"
+    
+    # ログメッセージ
+    LOG_STARTED: Final[str] = "常駐ブラウザを起動しました（pid={pid}, port={port}）。"
+    LOG_STOPPED: Final[str] = "常駐ブラウザを終了しました。"
+    LOG_IDLE: Final[str] = "{minutes:.0f}分間使用されなかったため常駐ブラウザを終了します。"
+    LOG_RESTART: Final[str] = "Chromeが応答しないため起動し直します。"
+    LOG_RESTART_FAILED: Final[str] = "Chromeを起動し直せませんでした: {error}"
+    
+    def __init__(
+        self,
+        create_uploader: Callable[[], Any],
+        idle_seconds: float,
+        state_file: Optional[str] = None,
+        profile_dir: Optional[str] = None,
+        check_seconds: float = CHECK_SECONDS
+    ) -> None:
+        """
+        常駐ブラウザの初期化
+        
+        Args:
+            create_uploader: Chromeの起動・ログインに使うUploaderを作成する処理
+            idle_seconds: 貸し出しがない場合に終了するまでの秒数（0以下は終了しない）
+            state_file: 状態ファイル（省略時はuserdata/cache/daemon.json）
+            profile_dir: Chromeのプロファイルディレクトリ（省略時はuserdata/cache/profiles/daemon）
+            check_seconds: Chromeの応答を確認する間隔（秒）
+        """
+        self.createUploader = create_uploader
+        self.idleSeconds = idle_seconds
+        self.stateFile = state_file or default_state_file()
+        self.profileDir = profile_dir or os.path.join(
+            DirectoryNames.USERDATA, DirectoryNames.CACHE, "profiles", self.PROFILE_DIRNAME
+        )
+        self.checkSeconds = check_seconds
+        self.token = secrets.token_hex(16)
+        self.uploader = None
+        self.debugPort = 0
+        self.busy = False
+        self.lastUsed = time.monotonic()
+        self.lock = threading.Lock()
+        self.stopEvent = threading.Event()
+    
+    def serve(self) -> None:
+        """Chromeを起動してログインし、終了を要求されるか一定時間使われなくなるまで要求を受け付ける"""
+        try:
+            self._start_browser()
+        except Exception:
+            self._stop_browser()
+            raise
+        server = _DaemonServer((DAEMON_HOST, 0), _DaemonHandler)
+        server.browserDaemon = self
+        threading.Thread(target=server.serve_forever, name="browser-daemon", daemon=True).start()
+        try:
+            self._write_state(server.server_address[1])
+            Logger.logInfo(self.LOG_STARTED.format(pid=os.getpid(), port=server.server_address[1]))
+            while not self.stopEvent.wait(self.checkSeconds):
+                self._check()
+        finally:
+            server.shutdown()
+            server.server_close()
+            self._remove_state()
+            self._stop_browser()
+            Logger.logInfo(self.LOG_STOPPED)
+    
+    def handle(self, command: Optional[str]) -> dict:
+        """
+        要求を処理する（releaseは貸し出した接続ごとに_DaemonHandlerで処理する）
+        
+        Args:
+            command: 要求
+        
+        Returns:
+            応答
+        """
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid(), "busy": self.busy, "alive": self._is_browser_alive()}
+        if command == "acquire":
+            return self._acquire()
+        if command == "stop":
+            self.stopEvent.set()
+            return {"ok": True}
+        return {"ok": False, "error": self.ERROR_COMMAND.format(command=command)}
+    
+    def release(self) -> None:
+        """貸し出したChromeを返却する"""
+        with self.lock:
+            self.busy = False
+            self.lastUsed = time.monotonic()
+    
+    def _acquire(self) -> dict:
+        """Chromeを貸し出す（応答しない場合は起動し直してから貸し出す）"""
+        with self.lock:
+            if self.busy:
+                return {"ok": False, "error": self.ERROR_BUSY}
+            if not self._is_browser_alive():
+                Logger.logWarning(self.LOG_RESTART)
+                try:
+                    self._restart_browser()
+                except Exception as e:
+                    Logger.logError(self.LOG_RESTART_FAILED.format(error=e))
+                    return {"ok": False, "error": str(e)}
+            self.busy = True
+            self.lastUsed = time.monotonic()
+        return {"ok": True, "debuggerAddress": f"{DAEMON_HOST}:{self.debugPort}"}
+    
+    def _check(self) -> None:
+        """貸し出していない間にChromeの応答と未使用の時間を確認する"""
+        with self.lock:
+            if self.busy:
+                return
+            idle = time.monotonic() - self.lastUsed
+            if self.idleSeconds > 0 and idle >= self.idleSeconds:
+                Logger.logInfo(self.LOG_IDLE.format(minutes=idle / 60))
+                self.stopEvent.set()
+                return
+            if not self._is_browser_alive():
+                Logger.logWarning(self.LOG_RESTART)
+                try:
+                    self._restart_browser()
+                except Exception as e:
+                    # 次回の確認か貸し出し時に再度起動する
+                    Logger.logError(self.LOG_RESTART_FAILED.format(error=e))
+    
+    def _start_browser(self) -> None:
+        """リモートデバッグを有効にしたChromeを起動してログインする"""
+        uploader = self.createUploader()
+        uploader.profileDir = self.profileDir
+        uploader.debugPort = _find_free_port()
+        self.uploader = uploader
+        self.debugPort = uploader.debugPort
+        uploader._start_session()
+    
+    def _restart_browser(self) -> None:
+        """Chromeを終了して起動し直す"""
+        self._stop_browser()
+        self._start_browser()
+    
+    def _stop_browser(self) -> None:
+        """Chromeを終了する"""
+        if self.uploader is None or self.uploader.driver is None:
+            return
+        try:
+            self.uploader.driver.quit()
+        except Exception:
+            # 既に終了している場合は無視
+            pass
+        self.uploader.driver = None
+    
+    def _is_browser_alive(self) -> bool:
+        """Chromeが応答するか"""
+        if self.uploader is None or self.uploader.driver is None:
+            return False
+        try:
+            self.uploader.driver.window_handles
+            return True
+        except Exception:
+            # Chrome・chromedriverの終了はWebDriverException以外（接続エラー）でも通知される
+            return False
+    
+    def _write_state(self, port: int) -> None:
+        """接続先とトークンを所有者のみ読み書きできる状態ファイルに書き出す"""
+        state = {"pid": os.getpid(), "port": port, "token": self.token}
+        os.makedirs(os.path.dirname(self.stateFile) or ".", exist_ok=True)
+        tmp_path = f"{self.stateFile}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.stateFile)
+    
+    def _remove_state(self) -> None:
+        """状態ファイルを削除する"""
+        try:
+            os.remove(self.stateFile)
+        except FileNotFoundError:
+            pass
+
+
+class _DaemonServer(socketserver.ThreadingTCPServer):
+    """常駐ブラウザの要求を受け付けるサーバー"""
+    daemon_threads = True
+    allow_reuse_address = True
+    browserDaemon: BrowserDaemon
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """1接続分の要求を処理する（Chromeを貸し出した接続が切れた場合は返却されたものとみなす）"""
+    
+    def handle(self) -> None:
+        daemon = self.server.browserDaemon
+        acquired = False
+        try:
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                    token = str(request.get("token", ""))
+                    command = request.get("command")
+                except (ValueError, AttributeError):
+                    return
+                if not secrets.compare_digest(token, daemon.token):
+                    self._respond({"ok": False, "error": BrowserDaemon.ERROR_TOKEN})
+                    return
+                
+                if command == "release":
+                    if acquired:
+                        daemon.release()
+                        acquired = False
+                    response = {"ok": True}
+                else:
+                    response = daemon.handle(command)
+                    acquired = acquired or (command == "acquire" and response["ok"])
+                self._respond(response)
+        except OSError:
+            pass
+        finally:
+            if acquired:
+                daemon.release()
+    
+    def _respond(self, response: dict) -> None:
+        """応答を送る"""
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+def _find_free_port() -> int:
+    """Chromeのリモートデバッグに使う空きポートを取得する"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind((DAEMON_HOST, 0))
+        return probe.getsockname()[1]
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import marshal
+import os
+import sys
+from typing import Final, Iterable, Iterator, Optional
+import yaml
+
+from logger import Logger
+from common import DirectoryNames, ItemNames
+
+
+class ItemDefinitions:
+    """
+    項目定義(items.yml)を項目名で索引化したクラス
+    
+    テキスト行との照合を項目名→定義のハッシュ参照で行うため、
+    照合コストは定義数によらずテキスト行数に比例する。
+    """
+    
+    # 定義のキー名
+    KEY_NAME: Final[str] = "name"
+    KEY_CATEGORY: Final[str] = "category"
+    KEY_SUBCATEGORY: Final[str] = "subcategory"
+    REQUIRED_KEYS: Final[tuple[str, ...]] = (KEY_NAME, KEY_CATEGORY, KEY_SUBCATEGORY)
+    
+    # スナップショット（解析済み定義のバイナリ保存）
+    SNAPSHOT_PREFIX: Final[str] = "items."
+    SNAPSHOT_EXTENSION: Final[str] = ".snapshot"
+    SNAPSHOT_FORMAT: Final[int] = 1
+    
+    # エラーメッセージ
+    ERROR_INVALID: Final[str] = "項目定義ファイルの形式が不正です: {detail}"
+    
+    # ログメッセージ
+    LOG_SNAPSHOT_BROKEN: Final[str] = "項目定義のスナップショットを読み込めないため再作成します: {path}"
+    
+    # 読み込み済みの項目定義（絶対パス → (更新日時, サイズ, ハッシュ, 定義)）
+    _loaded: dict[str, tuple[int, int, str, "ItemDefinitions"]] = {}
+    
+    def __init__(self, raw: dict) -> None:
+        """
+        項目定義の索引化
+        
+        Args:
+            raw: items.ymlを読み込んだ辞書
+        """
+        self.raw = raw
+        self.deductions: list[dict] = list(raw[ItemNames.DEDUCTION_KEY] or [])
+        
+        # 同名の定義が複数ある場合は先に定義されたものを優先する
+        self.index: dict[str, dict] = {}
+        for item_def in self.deductions:
+            self.index.setdefault(item_def[self.KEY_NAME], item_def)
+        # 定義内容のハッシュ（digest()で初回に計算する）
+        self.digestValue: Optional[str] = None
+    
+    @classmethod
+    def load(cls, items_file: str, snapshot_dir: Optional[str] = None) -> "ItemDefinitions":
+        """
+        項目定義ファイルを読み込み、索引化する
+        
+        解析済みの定義はプロセス内とスナップショットファイルに保持し、
+        ファイルの更新日時とサイズが変わっていなければYAMLを解析しない。
+        更新日時が変わっていても内容のハッシュが同じであれば解析結果を再利用する。
+        
+        Args:
+            items_file: 項目定義ファイル(items.yml)のパス
+            snapshot_dir: スナップショットの保存先（省略時はuserdata/cache）
+        
+        Returns:
+            索引化済みの項目定義
+        
+        Raises:
+            FileNotFoundError: 項目定義ファイルが存在しない場合
+            ValueError: 項目定義の形式が不正な場合
+        """
+        path = os.path.abspath(items_file)
+        stat = os.stat(path)
+        
+        loaded = cls._loaded.get(path)
+        if loaded and loaded[:2] == (stat.st_mtime_ns, stat.st_size):
+            return loaded[3]
+        
+        snapshot_path = cls._snapshot_path(path, snapshot_dir)
+        snapshot = cls._read_snapshot(snapshot_path)
+        if snapshot and snapshot[:2] == (stat.st_mtime_ns, stat.st_size):
+            digest, raw = snapshot[2], snapshot[3]
+        else:
+            with open(path, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            
+            if loaded and loaded[2] == digest:
+                raw = loaded[3].raw
+            elif snapshot and snapshot[2] == digest:
+                raw = snapshot[3]
+            else:
+                raw = yaml.safe_load(data.decode("utf-8"))
+                cls.validate(raw)
+            cls._write_snapshot(snapshot_path, (stat.st_mtime_ns, stat.st_size, digest, raw))
+        
+        definitions = loaded[3] if loaded and loaded[2] == digest else cls(raw)
+        cls._loaded[path] = (stat.st_mtime_ns, stat.st_size, digest, definitions)
+        return definitions
+    
+    @classmethod
+    def validate(cls, raw: object) -> None:
+        """
+        項目定義の形式を検証する
+        
+        Args:
+            raw: items.ymlを読み込んだ値
+        
+        Raises:
+            ValueError: 形式が不正な場合
+        """
+        if not isinstance(raw, dict) or ItemNames.DEDUCTION_KEY not in raw:
+            raise ValueError(cls.ERROR_INVALID.format(detail=f"{ItemNames.DEDUCTION_KEY}がありません"))
+        
+        deductions = raw[ItemNames.DEDUCTION_KEY] or []
+        if not isinstance(deductions, list):
+            raise ValueError(cls.ERROR_INVALID.format(detail=f"{ItemNames.DEDUCTION_KEY}がリストではありません"))
+        
+        for index, item_def in enumerate(deductions):
+            if not isinstance(item_def, dict):
+                raise ValueError(cls.ERROR_INVALID.format(detail=f"{index + 1}番目の定義"))
+            for key in cls.REQUIRED_KEYS:
+                if not isinstance(item_def.get(key), str):
+                    raise ValueError(
+                        cls.ERROR_INVALID.format(detail=f"{index + 1}番目の定義の{key}")
+                    )
+    
+    @classmethod
+    def _snapshot_path(cls, items_path: str, snapshot_dir: Optional[str]) -> str:
+        """項目定義ファイルごとのスナップショットのパスを取得する"""
+        snapshot_dir = snapshot_dir or os.path.join(DirectoryNames.USERDATA, DirectoryNames.CACHE)
+        name = hashlib.sha256(items_path.encode()).hexdigest()[:16]
+        return os.path.join(snapshot_dir, f"{cls.SNAPSHOT_PREFIX}{name}{cls.SNAPSHOT_EXTENSION}")
+    
+    @classmethod
+    def _read_snapshot(cls, snapshot_path: str) -> Optional[tuple]:
+        """
+        スナップショットを読み込む
+        
+        Returns:
+            (更新日時, サイズ, ハッシュ, 定義)、存在しないか読み込めない場合None
+        """
+        try:
+            with open(snapshot_path, "rb") as f:
+                header, snapshot = marshal.load(f)
+        except FileNotFoundError:
+            return None
+        except (EOFError, ValueError, TypeError):
+            Logger.logWarning(cls.LOG_SNAPSHOT_BROKEN.format(path=snapshot_path))
+            return None
+        
+        # 形式やPythonのバージョン（marshal形式）が異なる場合は使わない
+        if header != (cls.SNAPSHOT_FORMAT, sys.version_info[:2]):
+            return None
+        return snapshot
+    
+    @classmethod
+    def _write_snapshot(cls, snapshot_path: str, snapshot: tuple) -> None:
+        """スナップショットを保存する（保存できない場合は無視する）"""
+        try:
+            os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+            tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump(((cls.SNAPSHOT_FORMAT, sys.version_info[:2]), snapshot), f)
+            os.replace(tmp_path, snapshot_path)
+        except OSError:
+            pass
+    
+    @classmethod
+    def compile(cls, item_defs: "dict | ItemDefinitions") -> "ItemDefinitions":
+        """
+        項目定義を索引化する（索引化済みの場合はそのまま返す）
+        
+        Args:
+            item_defs: items.ymlを読み込んだ辞書、または索引化済みの項目定義
+        
+        Returns:
+            索引化済みの項目定義
+        """
+        if isinstance(item_defs, cls):
+            return item_defs
+        return cls(item_defs)
+    
+    def find(self, name: str) -> Optional[dict]:
+        """
+        項目名に一致する定義を取得する
+        
+        Args:
+            name: 項目名
+        
+        Returns:
+            項目定義、一致しない場合None
+        """
+        return self.index.get(name)
+    
+    def match(self, lines: Iterable[str]) -> Iterator[tuple[int, dict]]:
+        """
+        テキスト行のうち項目名に一致する行を1回の走査で列挙する
+        
+        Args:
+            lines: PDFから読み取ったテキスト行
+        
+        Yields:
+            (行のインデックス, 項目定義)
+        """
+        index = self.index
+        for idx, line in enumerate(lines):
+            item_def = index.get(line)
+            if item_def is not None:
+                yield idx, item_def
+    
+    def digest(self) -> str:
+        """
+        定義内容のSHA-256ハッシュを取得する（ファイルの書式やパスによらず内容が同じであれば同じ値）
+        
+        Returns:
+            ハッシュ（16進文字列）
+        """
+        if self.digestValue is None:
+            canonical = json.dumps(self.raw, sort_keys=True, ensure_ascii=False, default=str)
+            self.digestValue = hashlib.sha256(canonical.encode()).hexdigest()
+        return self.digestValue
+    
+    def names(self) -> set[str]:
+        """定義されている項目名の集合を取得する"""
+        return set(self.index)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    # 読み込んだ辞書と同様に参照できるようにする（後方互換）
+    def __contains__(self, key: str) -> bool:
+        return key in self.raw
+    
+    def __getitem__(self, key: str):
+        return self.raw[key]
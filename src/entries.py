@@ -0,0 +1,70 @@
+import re
+from collections import Counter
+from typing import Final, Iterable, Optional
+
+
+# 登録済みの入出金のキー（日付(YYYY/MM/DD), 金額（支出は負）, 内容）
+EntryKey = tuple[str, int, str]
+
+
+class EntryIndex:
+    """
+    MoneyForwardに登録済みの入出金（/cfの月ごとの一覧）の索引
+    
+    (日付, 金額, 内容)ごとの件数を保持し、登録する項目と同じ入出金があれば1件ずつ消し込む。
+    同じ入出金が一覧に1件だけある場合、同じ内容の項目を2件登録すると2件目は登録する。
+    """
+    
+    # 一覧の日付（"2024/11/25-123"などの並べ替え用の値、または"11/25(月)"などの表示）
+    DATE_PATTERN: Final[re.Pattern] = re.compile(r"(?:(\d{4})/)?(\d{1,2})/(\d{1,2})")
+    
+    def __init__(self, rows: Iterable[dict], year: int) -> None:
+        """
+        索引の初期化
+        
+        Args:
+            rows: 一覧の各行（"date", "amount", "content"の文字列）
+            year: 一覧の年（日付に年がない場合に使う）
+        """
+        self.counts: Counter[EntryKey] = Counter()
+        for row in rows:
+            key = self._parse(row, year)
+            if key is not None:
+                self.counts[key] += 1
+    
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+    
+    def take(self, date: str, amount: int, content: str) -> bool:
+        """
+        同じ入出金が登録済みであれば1件消し込む
+        
+        Args:
+            date: 日付(YYYY/MM/DD)
+            amount: 金額（支出は負）
+            content: 内容
+        
+        Returns:
+            登録済みの入出金があった場合True
+        """
+        key = (date, amount, self._normalize(content))
+        if self.counts[key] <= 0:
+            return False
+        self.counts[key] -= 1
+        return True
+    
+    @classmethod
+    def _parse(cls, row: dict, year: int) -> Optional[EntryKey]:
+        """一覧の1行をキーへ変換する（日付・金額を読めない行はNone）"""
+        match = cls.DATE_PATTERN.search(str(row.get("date") or ""))
+        amount = re.sub(r"[^0-9-]", "", str(row.get("amount") or ""))
+        if match is None or not re.fullmatch(r"-?\d+", amount):
+            return None
+        entry_year, month, day = match.groups()
+        date = f"{entry_year or year}/{int(month):02}/{int(day):02}"
+        return date, int(amount), cls._normalize(str(row.get("content") or ""))
+    
+    @staticmethod
+    def _normalize(content: str) -> str:
+        """内容の前後・連続する空白を除く"""
+        return " ".join(content.split())
@@ -0,0 +1,176 @@
+import json
+import os
+import time
+from typing import Final, Iterable, Optional
+
+from logger import Logger
+from reader import SalaryReader
+from common import SalaryKind, DirectoryNames
+
+
+# 索引のキー（年, 月, 給与種別, 社員番号）
+SalaryKey = tuple[int, int, SalaryKind, str]
+
+
+class SalaryIndex:
+    """
+    給与明細ディレクトリ(salaryData)のPDFファイル名の索引
+    
+    ディレクトリを1回走査してファイル名を(年, 月, 給与種別, 社員番号)へ解析し、
+    メモリ上の辞書とディスク上のJSONファイルに保持する。
+    ディレクトリの更新日時が変わっていなければ走査せず、変わっている場合も
+    解析済みのファイル名は再利用して差分だけを更新する。
+    """
+    
+    # 索引ファイル
+    INDEX_FILENAME: Final[str] = "salary_index.json"
+    INDEX_VERSION: Final[int] = 1
+    
+    # 走査直後の同じ更新日時の間に追加されたファイルを見逃さないよう、
+    # 更新日時が走査時刻に近い場合は次回も走査する
+    RACY_WINDOW_NS: Final[int] = 2_000_000_000
+    
+    # ログメッセージ
+    LOG_INDEX_BROKEN: Final[str] = "給与明細の索引ファイルを読み込めないため再作成します: {path}"
+    
+    def __init__(self, salary_dir: Optional[str] = None, index_file: Optional[str] = None) -> None:
+        """
+        索引の初期化（ディスク上の索引があれば読み込む）
+        
+        Args:
+            salary_dir: 給与明細ディレクトリ（省略時はuserdata/salaryData）
+            index_file: 索引ファイルのパス（省略時は給与明細ディレクトリと同じ階層のcache内）
+        """
+        self.salaryDir = salary_dir or os.path.join(DirectoryNames.USERDATA, DirectoryNames.SALARY_DATA)
+        self.indexFile = index_file or os.path.join(
+            os.path.dirname(os.path.abspath(self.salaryDir)), DirectoryNames.CACHE, self.INDEX_FILENAME
+        )
+        self.mtimeNs: Optional[int] = None
+        self.scannedNs = 0
+        self.entries: dict[str, SalaryKey] = {}
+        self.files: dict[SalaryKey, str] = {}
+        self._load()
+    
+    def refresh(self) -> bool:
+        """
+        ディレクトリの変更を索引へ反映する
+        
+        Returns:
+            ディレクトリを走査した場合True（変更がなく走査しなかった場合False）
+        """
+        try:
+            mtime_ns = os.stat(self.salaryDir).st_mtime_ns
+        except FileNotFoundError:
+            changed = bool(self.entries) or self.mtimeNs is not None
+            self._set_entries({}, None, 0)
+            return changed
+        
+        if mtime_ns == self.mtimeNs and self.scannedNs - mtime_ns > self.RACY_WINDOW_NS:
+            return False
+        
+        scanned_ns = time.time_ns()
+        entries = {}
+        with os.scandir(self.salaryDir) as it:
+            for entry in it:
+                key = self.entries.get(entry.name)
+                if key is None:
+                    parsed = SalaryReader.parse_pdf_filename(entry.name)
+                    if parsed is None or not entry.is_file():
+                        continue
+                    key = parsed
+                entries[entry.name] = key
+        
+        self._set_entries(entries, mtime_ns, scanned_ns)
+        self._save()
+        return True
+    
+    def lookup(self, year: int, month: int, kind: SalaryKind, number: str) -> Optional[str]:
+        """
+        給与明細のPDFファイル名を取得する
+        
+        Args:
+            year: 年
+            month: 月
+            kind: 給与種別
+            number: 社員番号
+        
+        Returns:
+            PDFファイル名、該当するPDFがない場合None
+        """
+        return self.files.get((year, month, kind, number))
+    
+    def targets(
+        self,
+        numbers: Optional[Iterable[str]] = None,
+        kind: Optional[SalaryKind] = None
+    ) -> list[SalaryKey]:
+        """
+        索引にある給与明細の一覧を取得する
+        
+        Args:
+            numbers: 対象とする社員番号（省略時はすべて）
+            kind: 対象とする給与種別（省略時はすべて）
+        
+        Returns:
+            (年, 月, 給与種別, 社員番号)の一覧（年月順）
+        """
+        allowed = set(numbers) if numbers else None
+        return sorted(
+            (key for key in self.files
+             if (allowed is None or key[3] in allowed) and (kind is None or key[2] == kind)),
+            key=lambda key: (key[0], key[1], key[2].name, key[3])
+        )
+    
+    def __len__(self) -> int:
+        return len(self.files)
+    
+    def _set_entries(self, entries: dict[str, SalaryKey], mtime_ns: Optional[int], scanned_ns: int) -> None:
+        """索引の内容を置き換える"""
+        self.entries = entries
+        self.files = {key: filename for filename, key in sorted(entries.items())}
+        self.mtimeNs = mtime_ns
+        self.scannedNs = scanned_ns
+    
+    def _load(self) -> None:
+        """ディスク上の索引を読み込む（対象ディレクトリが異なる場合は使わない）"""
+        try:
+            with open(self.indexFile, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            Logger.logWarning(self.LOG_INDEX_BROKEN.format(path=self.indexFile))
+            return
+        
+        try:
+            if data["version"] != self.INDEX_VERSION or \
+                    data["directory"] != os.path.abspath(self.salaryDir):
+                return
+            entries = {
+                filename: (year, month, SalaryKind[kind], number)
+                for filename, (year, month, kind, number) in data["entries"].items()
+            }
+            self._set_entries(entries, data["mtime_ns"], data["scanned_ns"])
+        except (KeyError, TypeError, ValueError):
+            Logger.logWarning(self.LOG_INDEX_BROKEN.format(path=self.indexFile))
+    
+    def _save(self) -> None:
+        """索引をディスクへ保存する（保存できない場合は無視する）"""
+        data = {
+            "version": self.INDEX_VERSION,
+            "directory": os.path.abspath(self.salaryDir),
+            "mtime_ns": self.mtimeNs,
+            "scanned_ns": self.scannedNs,
+            "entries": {
+                filename: [year, month, kind.name, number]
+                for filename, (year, month, kind, number) in self.entries.items()
+            },
+        }
+        try:
+            os.makedirs(os.path.dirname(self.indexFile), exist_ok=True)
+            tmp_path = f"{self.indexFile}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.indexFile)
+        except OSError:
+            pass
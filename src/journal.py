@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Final, Optional
+
+from logger import Logger
+from salary import Salary
+from item import Item
+from common import DirectoryNames
+
+
+# 記録のキー（社員番号, 年, 月, 給与種別, 項目名, 金額, 同じ項目名・金額の出現順）
+JournalKey = tuple[str, int, int, str, str, int, int]
+
+
+class RegistrationJournal:
+    """
+    MoneyForwardへ登録した項目の記録（SQLite）
+    
+    項目の登録（送信）に成功するたびに(社員番号, 年, 月, 給与種別, 項目名, 金額)を記録し、
+    途中で失敗した明細を再実行する際は記録にある項目を省略して未登録の項目から再開する。
+    同じ明細に項目名・金額が同じ項目が複数ある場合は出現順で区別する。
+    記録を読み書きできない場合は警告を表示し、記録せずに登録を続ける。
+    """
+    
+    # 記録ファイル
+    JOURNAL_FILENAME: Final[str] = "registrations.sqlite3"
+    
+    # 他のプロセス・ワーカーが書き込み中の場合に待つ時間(秒)
+    LOCK_TIMEOUT: Final[float] = 30.0
+    
+    SQL_CREATE: Final[str] = """
+        CREATE TABLE IF NOT EXISTS registrations (
+            employee TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            amount INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            payday TEXT,
+            registered_at REAL NOT NULL,
+            PRIMARY KEY (employee, year, month, kind, name, amount, seq)
+        )
+    """
+    SQL_SELECT: Final[str] = (
+        "SELECT 1 FROM registrations WHERE employee = ? AND year = ? AND month = ? AND kind = ? "
+        "AND name = ? AND amount = ? AND seq = ?"
+    )
+    SQL_INSERT: Final[str] = (
+        "INSERT OR IGNORE INTO registrations "
+        "(employee, year, month, kind, name, amount, seq, payday, registered_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    
+    # ログメッセージ
+    LOG_UNAVAILABLE: Final[str] = "登録済みの項目の記録を使用できません: {error}"
+    
+    def __init__(self, number: str, journal_file: Optional[str] = None) -> None:
+        """
+        記録の初期化（ファイルは最初に読み書きする際に作成する）
+        
+        Args:
+            number: 社員番号
+            journal_file: 記録ファイルのパス（省略時はuserdata/cache内）
+        """
+        self.number = number
+        self.journalFile = journal_file or os.path.join(
+            DirectoryNames.USERDATA, DirectoryNames.CACHE, self.JOURNAL_FILENAME
+        )
+        self.isCreated = False
+    
+    def is_registered(self, salary: Salary, item: Item) -> bool:
+        """
+        項目が登録済みかを取得する
+        
+        Args:
+            salary: 項目を含む給与情報
+            item: 項目
+        
+        Returns:
+            登録済みの場合True（記録を読み込めない場合はFalse）
+        """
+        try:
+            with closing(self._connect()) as connection:
+                row = connection.execute(self.SQL_SELECT, self.key(salary, item)).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            Logger.logWarning(self.LOG_UNAVAILABLE.format(error=e))
+            return False
+        return row is not None
+    
+    def record(self, salary: Salary, item: Item) -> None:
+        """
+        項目を登録済みとして記録する（記録できない場合は警告のみ）
+        
+        Args:
+            salary: 項目を含む給与情報
+            item: 登録した項目
+        """
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute(self.SQL_INSERT, (*self.key(salary, item), salary.get_payday(), time.time()))
+        except (sqlite3.Error, OSError) as e:
+            Logger.logWarning(self.LOG_UNAVAILABLE.format(error=e))
+    
+    def key(self, salary: Salary, item: Item) -> JournalKey:
+        """
+        項目の記録のキーを作成する
+        
+        Args:
+            salary: 項目を含む給与情報
+            item: 項目
+        
+        Returns:
+            (社員番号, 年, 月, 給与種別, 項目名, 金額, 同じ項目名・金額の出現順)
+        """
+        seq = 0
+        for other in salary.deductionItems:
+            if other is item:
+                break
+            if other.name == item.name and other.amount == item.amount:
+                seq += 1
+        return (self.number, salary.year, salary.month, salary.kind.name, item.name, item.amount, seq)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """記録ファイルへ接続する（初回はファイルとテーブルを作成する）"""
+        if not self.isCreated:
+            os.makedirs(os.path.dirname(os.path.abspath(self.journalFile)), exist_ok=True)
+        connection = sqlite3.connect(self.journalFile, timeout=self.LOCK_TIMEOUT)
+        if not self.isCreated:
+            try:
+                connection.execute(self.SQL_CREATE)
+                connection.commit()
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self.isCreated = True
+        return connection
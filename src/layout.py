@@ -0,0 +1,305 @@
+import unicodedata
+from typing import Final, NamedTuple, Optional
+
+from definitions import ItemDefinitions
+
+
+class TextBox(NamedTuple):
+    """PDF上の単語とその外接矩形（PDF座標系: 原点は左下）"""
+    text: str
+    left: float
+    bottom: float
+    right: float
+    top: float
+    
+    @property
+    def height(self) -> float:
+        return self.top - self.bottom
+    
+    @property
+    def center_x(self) -> float:
+        return (self.left + self.right) / 2
+    
+    @property
+    def center_y(self) -> float:
+        return (self.bottom + self.top) / 2
+    
+    def extend(self, other: "TextBox") -> "TextBox":
+        """他の単語を後ろに連結した単語を作成する"""
+        return TextBox(
+            self.text + other.text,
+            min(self.left, other.left),
+            min(self.bottom, other.bottom),
+            max(self.right, other.right),
+            max(self.top, other.top),
+        )
+
+
+class LayoutExtractor:
+    """
+    pdfiumの文字座標から控除項目名と金額を位置関係で対応付けるクラス
+    
+    ページ全体のテキストを空白で分割して「項目名の次のトークンが金額」とみなす代わりに、
+    文字の外接矩形から単語を組み立て、項目名と同じ行の右側または同じ列の直下にある
+    最も近い数値を金額とする。複数の単語に分かれた項目名も同じ行内で連結して照合する。
+    """
+    
+    # 単語の区切りとみなす文字間隔（文字高さに対する比）
+    WORD_GAP_RATIO: Final[float] = 0.6
+    # 同じ行とみなす縦方向のずれ（文字高さに対する比）
+    ROW_TOLERANCE_RATIO: Final[float] = 0.5
+    # 項目名の直下で金額を探す範囲（文字高さに対する比）
+    MAX_BELOW_RATIO: Final[float] = 4.0
+    # 隣の項目名がない場合に列とみなす横方向の幅（項目名の幅に対する比）
+    LONE_COLUMN_RATIO: Final[float] = 1.0
+    
+    # 金額の記号
+    AMOUNT_SEPARATOR: Final[str] = ","
+    AMOUNT_MINUS: Final[str] = "-"
+    
+    def __init__(self, definitions: ItemDefinitions) -> None:
+        """
+        抽出処理の初期化
+        
+        Args:
+            definitions: 索引化済みの項目定義
+        """
+        self.definitions = definitions
+        self.names = definitions.names()
+        self.maxNameLength = max((len(name) for name in self.names), default=0)
+        # 前処理の判定用: 項目名の先頭文字と長さの種類（項目定義数に依存しない照合に使う）
+        self.nameHeads = {name[0] for name in self.names if name}
+        self.nameLengths = sorted({len(name) for name in self.names if name})
+    
+    def extract_page(self, textpage) -> list[str]:
+        """
+        1ページ分の項目名と金額を抽出する
+        
+        Args:
+            textpage: pdfiumのテキストページ
+        
+        Returns:
+            [項目名, 金額, 項目名, 金額, ...] の順に並べたテキスト行
+            （金額が見つからない項目は金額を空文字とする）
+        """
+        char_count = textpage.count_chars()
+        text = textpage.get_text_range(0, char_count)
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", errors="ignore")
+        
+        # 項目名を含まないページ（添付ページ等）は文字座標を取得しない
+        if not self._contains_name("".join(text.split())):
+            return []
+        
+        words = self._collect_words(textpage, text)
+        rows = self._group_rows(words)
+        labels = self._find_labels(rows)
+        if not labels:
+            return []
+        
+        amounts = self._amounts_in_region(words, labels)
+        lines = []
+        used: set[int] = set()
+        for label, row in labels:
+            amount = self._pair_amount(label, row, amounts, used)
+            lines.append(label.text)
+            lines.append(self._normalize_amount(amount.text) if amount else "")
+        return lines
+    
+    def _contains_name(self, compact: str) -> bool:
+        """
+        空白を除いたページテキストにいずれかの項目名が含まれるか判定する
+        
+        項目名の先頭文字に一致する位置だけ、項目名の長さごとに索引を引く
+        （項目定義数ではなく、テキスト長 × 項目名の長さの種類に比例する）
+        
+        Args:
+            compact: 空白を除いたページテキスト
+        
+        Returns:
+            項目名を含む場合True
+        """
+        for start, char in enumerate(compact):
+            if char not in self.nameHeads:
+                continue
+            for length in self.nameLengths:
+                if compact[start:start + length] in self.names:
+                    return True
+        return False
+    
+    def _collect_words(self, textpage, text: str) -> list[TextBox]:
+        """
+        文字の外接矩形から単語を組み立てる
+        
+        Args:
+            textpage: pdfiumのテキストページ
+            text: ページ全体のテキスト（文字インデックスと対応）
+        
+        Returns:
+            ページ内の単語一覧
+        """
+        words = []
+        current: Optional[TextBox] = None
+        
+        for index, char in enumerate(text):
+            if char.isspace() or char == "\x00":
+                if current:
+                    words.append(current)
+                current = None
+                continue
+            
+            left, bottom, right, top = textpage.get_charbox(index)
+            box = TextBox(char, left, bottom, right, top)
+            if current and self._is_continuation(current, box):
+                current = current.extend(box)
+            else:
+                if current:
+                    words.append(current)
+                current = box
+        
+        if current:
+            words.append(current)
+        return words
+    
+    def _is_continuation(self, word: TextBox, char: TextBox) -> bool:
+        """文字が直前の単語の続きか（縦方向に重なり、間隔が狭い）"""
+        height = max(word.height, char.height, 1e-6)
+        # カンマ等の小さい文字も同じ行とみなすため、中心ではなく重なりで判定する
+        same_row = min(word.top, char.top) > max(word.bottom, char.bottom)
+        gap = char.left - word.right
+        return same_row and -height * self.WORD_GAP_RATIO <= gap <= height * self.WORD_GAP_RATIO
+    
+    def _group_rows(self, words: list[TextBox]) -> list[list[TextBox]]:
+        """単語を行ごとにまとめ、上の行から左→右の順に並べる"""
+        rows: list[list[TextBox]] = []
+        for word in sorted(words, key=lambda w: (-w.center_y, w.left)):
+            row = rows[-1] if rows else None
+            if row and abs(row[0].center_y - word.center_y) <= \
+                    max(row[0].height, word.height) * self.ROW_TOLERANCE_RATIO:
+                row.append(word)
+            else:
+                rows.append([word])
+        
+        for row in rows:
+            row.sort(key=lambda w: w.left)
+        return rows
+    
+    def _find_labels(self, rows: list[list[TextBox]]) -> list[tuple[TextBox, list[TextBox]]]:
+        """
+        行内の単語（連続する複数単語を含む）から項目名を探す
+        
+        Returns:
+            (項目名の単語, 項目名を含む行の項目名一覧) のリスト
+        """
+        labels = []
+        for row in rows:
+            row_labels = []
+            start = 0
+            while start < len(row):
+                match = None
+                joined = row[start]
+                for end in range(start, len(row)):
+                    if end > start:
+                        joined = joined.extend(row[end])
+                    if len(joined.text) > self.maxNameLength:
+                        break
+                    if self.definitions.find(joined.text) is not None:
+                        match = (joined, end)
+                
+                if match:
+                    row_labels.append(match[0])
+                    start = match[1] + 1
+                else:
+                    start += 1
+            
+            labels.extend((label, row_labels) for label in row_labels)
+        return labels
+    
+    def _amounts_in_region(
+        self,
+        words: list[TextBox],
+        labels: list[tuple[TextBox, list[TextBox]]]
+    ) -> list[TextBox]:
+        """項目名の周辺（控除表の範囲）にある数値の単語を取得する"""
+        height = max(label.height for label, _ in labels)
+        bottom = min(label.bottom for label, _ in labels) - height * self.MAX_BELOW_RATIO
+        top = max(label.top for label, _ in labels) + height
+        return [
+            word for word in words
+            if bottom <= word.center_y <= top and self._is_amount(word.text)
+        ]
+    
+    def _pair_amount(
+        self,
+        label: TextBox,
+        row_labels: list[TextBox],
+        amounts: list[TextBox],
+        used: set[int]
+    ) -> Optional[TextBox]:
+        """
+        項目名に対応する金額を位置関係から探す
+        
+        同じ行の右側にある金額、または項目名の列の直下にある金額のうち、
+        最も近いものを対応付ける。
+        """
+        height = max(label.height, 1e-6)
+        column_left, column_right = self._column_span(label, row_labels)
+        
+        best = None
+        best_distance = float("inf")
+        for index, amount in enumerate(amounts):
+            if index in used:
+                continue
+            
+            if abs(amount.center_y - label.center_y) <= height * self.ROW_TOLERANCE_RATIO:
+                if amount.left < label.right - height * self.WORD_GAP_RATIO:
+                    continue
+                distance = amount.left - label.right
+            elif amount.top <= label.bottom + height * self.ROW_TOLERANCE_RATIO:
+                if not column_left <= amount.center_x <= column_right:
+                    continue
+                distance = label.bottom - amount.top
+                if distance > height * self.MAX_BELOW_RATIO:
+                    continue
+            else:
+                continue
+            
+            if distance < best_distance:
+                best, best_distance = index, distance
+        
+        if best is None:
+            return None
+        used.add(best)
+        return amounts[best]
+    
+    def _column_span(self, label: TextBox, row_labels: list[TextBox]) -> tuple[float, float]:
+        """
+        項目名の列の横方向の範囲を取得する
+        
+        同じ行の隣り合う項目名との中間を列の境界とする。
+        """
+        index = row_labels.index(label)
+        left = right = None
+        if index > 0:
+            left = (row_labels[index - 1].center_x + label.center_x) / 2
+        if index < len(row_labels) - 1:
+            right = (label.center_x + row_labels[index + 1].center_x) / 2
+        
+        # 端の列は反対側の列幅と同じ幅とみなす（隣がない場合は項目名の幅を基準にする）
+        if left is None and right is None:
+            margin = (label.right - label.left) * self.LONE_COLUMN_RATIO
+            return label.left - margin, label.right + margin
+        if left is None:
+            left = label.center_x - (right - label.center_x)
+        if right is None:
+            right = label.center_x + (label.center_x - left)
+        return left, right
+    
+    def _is_amount(self, text: str) -> bool:
+        """単語が金額（カンマ区切りの整数）か"""
+        normalized = self._normalize_amount(text)
+        return normalized.lstrip(self.AMOUNT_MINUS).replace(self.AMOUNT_SEPARATOR, "").isdigit()
+    
+    def _normalize_amount(self, text: str) -> str:
+        """全角数字・記号を半角へ正規化する"""
+        return unicodedata.normalize("NFKC", text)
@@ -1,4 +1,9 @@
-from typing import Final
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Final, Iterator, NamedTuple, Optional
 
 
 class FColors:
@@ -17,6 +22,9 @@ class FColors:
 class Logger:
     """ログ出力用クラス"""
     log_level: int = 1
+    # 出力を保留しているスレッドのログ（スレッドID → (テキスト, 前景色)のリスト）
+    _held: dict[int, list[tuple[str, str]]] = {}
+    _heldLock = threading.Lock()
 
     @classmethod
     def logFine(cls, text: str) -> None:
@@ -43,6 +51,43 @@ class Logger:
         """エラーレベルのログを出力"""
         cls._log_print(f"[ERROR] {text}", FColors.FAIL)
 
+    @classmethod
+    def hold(cls, thread_id: int) -> None:
+        """
+        指定したスレッドのログを出力せずに保留する（release()で出力する）
+        
+        別スレッドのログが入力のプロンプトに混ざらないようにする。
+        
+        Args:
+            thread_id: スレッドID(threading.get_ident())
+        """
+        with cls._heldLock:
+            cls._held.setdefault(thread_id, [])
+    
+    @classmethod
+    def release(cls, thread_id: Optional[int]) -> None:
+        """
+        保留したスレッドのログを出力し、以降は保留しない
+        
+        Args:
+            thread_id: スレッドID（保留していない場合は何もしない）
+        """
+        with cls._heldLock:
+            held = cls._held.pop(thread_id, [])
+        for text, color in held:
+            print(f"{color}{text}{FColors.ENDC}")
+
+    @classmethod
+    def span(cls, name: str, label: Optional[str] = None):
+        """
+        処理区間の所要時間を計測する（Timer.spanの省略形）
+        
+        Args:
+            name: 区間名（例: reader.open）
+            label: 区間の補足（登録した項目名など）
+        """
+        return Timer.span(name, label)
+
     @classmethod
     def _log_print(cls, text: str, color: str = FColors.ENDC) -> None:
         """
@@ -52,4 +97,204 @@ class Logger:
             text: 出力するテキスト
             color: 前景色のANSIエスケープシーケンス
         """
+        with cls._heldLock:
+            held = cls._held.get(threading.get_ident())
+            if held is not None:
+                held.append((text, color))
+                return
         print(f"{color}{text}{FColors.ENDC}")
+
+
+class Span(NamedTuple):
+    """計測した処理区間"""
+    name: str
+    label: Optional[str]
+    parent: Optional[str]
+    start: float
+    seconds: float
+
+
+class PhaseSummary(NamedTuple):
+    """区間名ごとの所要時間の集計"""
+    name: str
+    count: int
+    seconds: float
+    maxSeconds: float
+
+
+class Timer:
+    """
+    処理区間(span)の所要時間を計測・集計するクラス
+    
+    with Timer.span("reader.open"): のように囲んだ区間の経過時間を記録し、
+    実行終了時に区間名ごとの内訳の表示やJSON形式での出力を行う。
+    区間は入れ子にでき、スレッドごとに親の区間を記録する。
+    保持する区間はMAX_SPANS件までとし、超えた分は古い区間から区間名ごとの集計へ畳み込む。
+    """
+    
+    # JSON出力の形式のバージョン
+    REPORT_VERSION: Final[int] = 1
+    # 個別に保持する区間の上限（監視モード等の長時間の実行でも記録が増え続けないようにする）
+    MAX_SPANS: Final[int] = 10000
+    
+    # ログメッセージ
+    LOG_HEADER: Final[str] = "--- 処理時間の内訳 ---"
+    LOG_PHASE: Final[str] = "{name:<24} {count:>4}回 {total:>9.1f}ms (最大 {max:.1f}ms, {share:>5.1f}%)"
+    LOG_TOTAL: Final[str] = "計測時間: {total:.1f}ms"
+    LOG_FOOTER: Final[str] = "--------- end --------"
+    
+    _spans: list[Span] = []
+    # 畳み込んだ区間の集計（区間名 → [回数, 合計秒, 最大秒, 最初の開始時刻]）
+    _folded: dict[str, list] = {}
+    _origin: float = time.perf_counter()
+    _lock = threading.Lock()
+    _local = threading.local()
+    
+    @classmethod
+    @contextmanager
+    def span(cls, name: str, label: Optional[str] = None) -> Iterator[None]:
+        """
+        囲んだ処理の所要時間を記録する（例外で抜けた場合も記録する）
+        
+        Args:
+            name: 区間名
+            label: 区間の補足
+        """
+        stack = cls._stack()
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            with cls._lock:
+                cls._spans.append(Span(name, label, parent, start - cls._origin, end - start))
+                if len(cls._spans) > cls.MAX_SPANS:
+                    cls._fold(len(cls._spans) - cls.MAX_SPANS // 2)
+    
+    @classmethod
+    def _fold(cls, count: int) -> None:
+        """
+        終了の古い区間から指定件数を区間名ごとの集計へ畳み込む（ロックを取得して呼び出す）
+        
+        Args:
+            count: 畳み込む区間の件数
+        """
+        for span in cls._spans[:count]:
+            phase = cls._folded.setdefault(span.name, [0, 0.0, 0.0, span.start])
+            phase[0] += 1
+            phase[1] += span.seconds
+            phase[2] = max(phase[2], span.seconds)
+            phase[3] = min(phase[3], span.start)
+        del cls._spans[:count]
+    
+    @classmethod
+    def reset(cls) -> None:
+        """記録した区間を破棄し、計測を開始し直す"""
+        with cls._lock:
+            cls._spans = []
+            cls._folded = {}
+            cls._origin = time.perf_counter()
+    
+    @classmethod
+    def spans(cls) -> list[Span]:
+        """記録した区間を終了順に取得する（畳み込んだ区間は含まない）"""
+        with cls._lock:
+            return list(cls._spans)
+    
+    @classmethod
+    def summary(cls) -> list[PhaseSummary]:
+        """
+        区間名ごとに所要時間を集計する
+        
+        Returns:
+            区間名ごとの集計（最初に開始した順、畳み込んだ区間を含む）
+        """
+        with cls._lock:
+            phases = {name: list(phase) for name, phase in cls._folded.items()}
+            spans = list(cls._spans)
+        for span in spans:
+            phase = phases.setdefault(span.name, [0, 0.0, 0.0, span.start])
+            phase[0] += 1
+            phase[1] += span.seconds
+            phase[2] = max(phase[2], span.seconds)
+            phase[3] = min(phase[3], span.start)
+        ordered = sorted(phases.items(), key=lambda item: item[1][3])
+        return [PhaseSummary(name, *phase[:3]) for name, phase in ordered]
+    
+    @classmethod
+    def elapsed(cls) -> float:
+        """計測開始からの経過秒数を取得する"""
+        return time.perf_counter() - cls._origin
+    
+    @classmethod
+    def report(cls) -> None:
+        """区間名ごとの所要時間の内訳をログ出力する（区間がない場合は何もしない）"""
+        summary = cls.summary()
+        if not summary:
+            return
+        
+        total = cls.elapsed()
+        Logger.logFine(cls.LOG_HEADER)
+        for phase in summary:
+            Logger.logFine(cls.LOG_PHASE.format(
+                name=phase.name,
+                count=phase.count,
+                total=phase.seconds * 1000,
+                max=phase.maxSeconds * 1000,
+                share=phase.seconds / total * 100 if total > 0 else 0.0,
+            ))
+        Logger.logFine(cls.LOG_TOTAL.format(total=total * 1000))
+        Logger.logFine(cls.LOG_FOOTER)
+    
+    @classmethod
+    def to_dict(cls) -> dict:
+        """計測結果をJSONへ変換できる辞書で取得する（時間はミリ秒）"""
+        return {
+            "version": cls.REPORT_VERSION,
+            "timestamp": time.time(),
+            "total_ms": round(cls.elapsed() * 1000, 3),
+            "phases": [
+                {
+                    "name": phase.name,
+                    "count": phase.count,
+                    "total_ms": round(phase.seconds * 1000, 3),
+                    "max_ms": round(phase.maxSeconds * 1000, 3),
+                }
+                for phase in cls.summary()
+            ],
+            "spans": [
+                {
+                    "name": span.name,
+                    "label": span.label,
+                    "parent": span.parent,
+                    "start_ms": round(span.start * 1000, 3),
+                    "duration_ms": round(span.seconds * 1000, 3),
+                }
+                for span in sorted(cls.spans(), key=lambda span: span.start)
+            ],
+        }
+    
+    @classmethod
+    def write_json(cls, path: str) -> None:
+        """
+        計測結果をJSON Lines形式でファイルへ追記する（1回の実行が1行）
+        
+        Args:
+            path: 出力先のファイルパス
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(cls.to_dict(), ensure_ascii=False) + "\n")
+    
+    @classmethod
+    def _stack(cls) -> list[str]:
+        """現在のスレッドで計測中の区間名のスタックを取得する"""
+        stack = getattr(cls._local, "stack", None)
+        if stack is None:
+            stack = cls._local.stack = []
+        return stack
@@ -0,0 +1,82 @@
+import os
+import sys
+from typing import Final, Optional
+
+
+class MemoryUsage:
+    """
+    プロセスの常駐メモリ(RSS)を取得するクラス
+    
+    Linuxでは/proc/self/statm、WindowsではGetProcessMemoryInfoから現在値を取得する。
+    どちらも使えない環境ではresourceモジュールの最大RSS（現在値ではない）を返す。
+    """
+    
+    # Linuxの常駐ページ数の取得元
+    STATM_PATH: Final[str] = "/proc/self/statm"
+    
+    @classmethod
+    def current_rss(cls) -> int:
+        """
+        現在のRSS(バイト)を取得する
+        
+        Returns:
+            RSS(バイト)、取得できない場合0
+        """
+        rss = cls._rss_from_statm()
+        if rss is None and sys.platform == "win32":
+            rss = cls._rss_from_windows()
+        if rss is None:
+            rss = cls._rss_from_resource()
+        return rss or 0
+    
+    @classmethod
+    def _rss_from_statm(cls) -> Optional[int]:
+        """/proc/self/statmの常駐ページ数からRSSを計算する"""
+        try:
+            with open(cls.STATM_PATH, "rb") as f:
+                resident_pages = int(f.read().split()[1])
+            return resident_pages * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError, AttributeError):
+            return None
+    
+    @classmethod
+    def _rss_from_windows(cls) -> Optional[int]:
+        """GetProcessMemoryInfoのWorkingSetSizeを取得する"""
+        try:
+            import ctypes
+            from ctypes import wintypes
+            
+            class ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+            
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if not ctypes.windll.psapi.GetProcessMemoryInfo(
+                process, ctypes.byref(counters), counters.cb
+            ):
+                return None
+            return counters.WorkingSetSize
+        except (ImportError, AttributeError, OSError):
+            return None
+    
+    @classmethod
+    def _rss_from_resource(cls) -> Optional[int]:
+        """resourceモジュールの最大RSSを取得する（macOSはバイト、その他はKB単位）"""
+        try:
+            import resource
+        except ImportError:
+            return None
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
@@ -0,0 +1,82 @@
+import calendar
+import datetime
+from typing import Final
+
+try:
+    import jpholiday
+except ImportError:
+    # 祝日のライブラリがない場合は土日だけを休日とする
+    jpholiday = None
+
+
+class PaydayRule:
+    """
+    給料日の決め方（日にちと、土日・祝日の場合の営業日への調整）
+    
+    日にちが月の日数を超える場合は月末とし、休日であれば調整方法に従って前後の営業日へずらす。
+    調整先が前後の月になる場合は反対方向の営業日とする（登録日は明細の月内に限るため）。
+    祝日はjpholidayがインストールされている場合のみ考慮する。
+    """
+    
+    # 休日の調整方法
+    ADJUST_NONE: Final[str] = "none"
+    ADJUST_BEFORE: Final[str] = "before"
+    ADJUST_AFTER: Final[str] = "after"
+    ADJUSTMENTS: Final[tuple[str, ...]] = (ADJUST_NONE, ADJUST_BEFORE, ADJUST_AFTER)
+    
+    # エラーメッセージ
+    ERROR_INVALID_DATE: Final[str] = "給料日の日にちが不正です: {date}"
+    ERROR_INVALID_ADJUSTMENT: Final[str] = "給料日の調整方法が不正です: {adjustment}（none, before, afterのいずれか）"
+    
+    def __init__(self, date: int | str, adjustment: str = ADJUST_NONE) -> None:
+        """
+        給料日の決め方の初期化
+        
+        Args:
+            date: 日にち（1〜31、月の日数を超える場合は月末）
+            adjustment: 土日・祝日の場合の調整（none: しない, before: 前の営業日, after: 次の営業日）
+        
+        Raises:
+            ValueError: 日にち・調整方法が不正な場合
+        """
+        try:
+            self.date = int(date)
+        except (TypeError, ValueError):
+            raise ValueError(self.ERROR_INVALID_DATE.format(date=date)) from None
+        if not 1 <= self.date <= 31:
+            raise ValueError(self.ERROR_INVALID_DATE.format(date=date))
+        self.adjustment = adjustment.strip().lower()
+        if self.adjustment not in self.ADJUSTMENTS:
+            raise ValueError(self.ERROR_INVALID_ADJUSTMENT.format(adjustment=adjustment))
+    
+    def resolve(self, year: int, month: int) -> int:
+        """
+        指定した月の給料日を取得する
+        
+        Args:
+            year: 年
+            month: 月
+        
+        Returns:
+            給料日の日にち
+        """
+        day = datetime.date(year, month, min(self.date, calendar.monthrange(year, month)[1]))
+        if self.adjustment == self.ADJUST_NONE or self.is_business_day(day):
+            return day.day
+        
+        step = -1 if self.adjustment == self.ADJUST_BEFORE else 1
+        for direction in (step, -step):
+            candidate = day
+            while candidate.month == month:
+                if self.is_business_day(candidate):
+                    return candidate.day
+                candidate += datetime.timedelta(days=direction)
+        # 月内に営業日がない場合（通常はない）は調整しない
+        return day.day
+    
+    @staticmethod
+    def is_business_day(day: datetime.date) -> bool:
+        """営業日（土日・祝日以外）か"""
+        if day.weekday() >= 5:
+            return False
+        return jpholiday is None or not jpholiday.is_holiday(day)
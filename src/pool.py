@@ -0,0 +1,246 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from typing import Final, NamedTuple, Optional
+
+from logger import Logger
+from salary import Salary
+from uploader import Uploader
+from session import SessionStore
+from categories import CategoryTree
+from common import DirectoryNames
+
+
+class PoolResult(NamedTuple):
+    """複数ワーカーでの登録結果（1明細分）"""
+    salary: Salary
+    worker: Optional[int]
+    seconds: float
+    error: Optional[str] = None
+    
+    def is_ok(self) -> bool:
+        """登録に成功したか"""
+        return self.error is None
+
+
+class RateLimiter:
+    """
+    全ワーカーで共有する流量制限
+    
+    処理の開始間隔が一定以上空くよう、呼び出したスレッドを待機させる。
+    """
+    
+    def __init__(self, per_minute: float) -> None:
+        """
+        流量制限の初期化
+        
+        Args:
+            per_minute: 1分あたりの処理数の上限（0以下は無制限）
+        """
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.nextTime = 0.0
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """前回の処理開始から一定間隔が経過するまで待つ"""
+        if self.interval <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.nextTime)
+            self.nextTime = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class UploadPool:
+    """
+    複数のWebDriverセッション（ワーカー）で給与情報を並列にMoneyForwardへ登録するクラス
+    
+    明細（年, 月, 給与種別）単位でワーカーへ割り振り、各ワーカーは専用のChromeプロファイルで
+    ログインして入力モーダルを開いたまま、割り振られた明細の項目を
+    Uploader._register_item_internal()で登録する。
+    ログインは同時に行わず（2段階認証のコードを重複して使わないため）、先にログインしたワーカーが
+    保存したセッションを後のワーカーが復元する（KeepLoginSessionが無効の場合は実行中だけ一時的に保存する）。
+    項目の登録は全ワーカー合計で設定した流量(UploadItemsPerMinute)を超えないよう間隔を空ける。
+    """
+    
+    # ワーカーごとのChromeプロファイルの保存先（userdata/cache内）
+    PROFILE_DIRNAME: Final[str] = "profiles"
+    
+    # ログメッセージ
+    LOG_START: Final[str] = "{count}件の明細を{workers}ワーカーで登録します。"
+    LOG_WORKER_FAILED: Final[str] = "ワーカー{worker}を開始できませんでした: {error}"
+    LOG_SALARY_FAILED: Final[str] = "ワーカー{worker}: {payday}の{kind}の登録に失敗しました: {error}"
+    LOG_NOT_REGISTERED: Final[str] = "登録できるワーカーがないため未登録です"
+    LOG_THROUGHPUT: Final[str] = (
+        "登録完了: 成功={ok}件, 失敗={ng}件, {items}項目, {seconds:.1f}秒 "
+        "({salaries_per_minute:.1f}明細/分, {items_per_minute:.1f}項目/分)"
+    )
+    LOG_WORKER_THROUGHPUT: Final[str] = "  ワーカー{worker}: {count}明細, {items}項目"
+    
+    def __init__(
+        self,
+        salaries: list[Salary],
+        workers: int = 1,
+        items_per_minute: float = 0.0,
+        profile_root: Optional[str] = None
+    ) -> None:
+        """
+        ワーカープールの初期化
+        
+        Args:
+            salaries: 登録する給与情報（登録日を設定済みであること）
+            workers: ワーカー数（同時に起動するWebDriverの数）
+            items_per_minute: 全ワーカー合計の1分あたりの登録項目数の上限（0以下は無制限）
+            profile_root: Chromeプロファイルの保存先（省略時はuserdata/cache/profiles）
+        """
+        self.salaries = salaries
+        self.workers = max(1, min(workers, len(salaries)))
+        self.limiter = RateLimiter(items_per_minute)
+        self.profileRoot = profile_root or os.path.join(
+            DirectoryNames.USERDATA, DirectoryNames.CACHE, self.PROFILE_DIRNAME
+        )
+        self.queue: "queue.Queue[Salary]" = queue.Queue()
+        self.loginLock = threading.Lock()
+        self.results: list[PoolResult] = []
+        self.resultsLock = threading.Lock()
+        self.categoryTree: Optional[CategoryTree] = None
+        # ワーカー間で共有するログインセッション（KeepLoginSessionが無効の場合のみ一時的に作成する）
+        self.sessionStore: Optional[SessionStore] = None
+    
+    def run(self) -> list[PoolResult]:
+        """
+        すべての明細を登録する
+        
+        Returns:
+            明細ごとの登録結果（指定した明細の順）
+        
+        Raises:
+            ValueError: 保存したカテゴリにない項目のカテゴリがある場合
+        """
+        # カテゴリの誤りはワーカーを起動する前に確認する
+        checker = Uploader()
+        checker.check_categories(self.salaries)
+        self.categoryTree = checker.categoryTree
+        
+        Logger.logInfo(self.LOG_START.format(count=len(self.salaries), workers=self.workers))
+        for salary in self.salaries:
+            self.queue.put(salary)
+        
+        session_dir = None
+        if checker.sessionStore is None:
+            # セッションを保存しない設定でも、後のワーカーがログインせずに済むよう実行中だけ共有する
+            session_dir = tempfile.mkdtemp(prefix="session-")
+            self.sessionStore = SessionStore(checker.pw, cache_dir=session_dir)
+        
+        start = time.perf_counter()
+        try:
+            threads = [
+                threading.Thread(target=self._work, args=(worker,), name=f"upload-worker-{worker}")
+                for worker in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            if session_dir is not None:
+                shutil.rmtree(session_dir, ignore_errors=True)
+        elapsed = time.perf_counter() - start
+        
+        # すべてのワーカーが開始できなかった場合などに残った明細
+        while not self.queue.empty():
+            self._add_result(PoolResult(self.queue.get_nowait(), None, 0.0, self.LOG_NOT_REGISTERED))
+        
+        order = {id(salary): i for i, salary in enumerate(self.salaries)}
+        results = sorted(self.results, key=lambda result: order[id(result.salary)])
+        self._report(results, elapsed)
+        return results
+    
+    def _create_uploader(self, worker: int) -> Uploader:
+        """ワーカー専用のChromeプロファイルを使うUploaderを作成する"""
+        uploader = Uploader()
+        uploader.profileDir = os.path.join(self.profileRoot, f"worker{worker}")
+        uploader.throttle = self.limiter.acquire
+        uploader.categoryTree = self.categoryTree
+        if self.sessionStore is not None:
+            uploader.sessionStore = self.sessionStore
+        return uploader
+    
+    def _work(self, worker: int) -> None:
+        """ワーカー: ログインして入力モーダルを開き、明細がなくなるまで登録する"""
+        uploader = self._create_uploader(worker)
+        try:
+            try:
+                with Logger.span("pool.start", label=f"worker{worker}"):
+                    with Logger.span("uploader.webdriver"):
+                        uploader._init_webdriver()
+                    with self.loginLock:
+                        uploader._sign_in()
+                    uploader._close_modal_if_present()
+                    uploader._navigate_to_input_page()
+                    uploader._prepare_categories(self.salaries)
+            except Exception as e:
+                Logger.logError(self.LOG_WORKER_FAILED.format(worker=worker, error=e))
+                return
+            
+            while True:
+                try:
+                    salary = self.queue.get_nowait()
+                except queue.Empty:
+                    return
+                if not self._register(uploader, worker, salary):
+                    # 入力モーダルを開き直せないワーカーは終了し、残りの明細は他のワーカーが登録する
+                    try:
+                        uploader._navigate_to_input_page()
+                    except Exception as e:
+                        Logger.logError(self.LOG_WORKER_FAILED.format(worker=worker, error=e))
+                        return
+        finally:
+            uploader.close()
+    
+    def _register(self, uploader: Uploader, worker: int, salary: Salary) -> bool:
+        """1明細分の控除項目を登録する（成功した場合True）"""
+        uploader.salary = salary
+        start = time.perf_counter()
+        try:
+            with Logger.span("uploader.salary", label=salary.get_payday()):
+                uploader._register_deduction_sum_as_income()
+                uploader._register_deduction_items()
+        except Exception as e:
+            Logger.logError(self.LOG_SALARY_FAILED.format(
+                worker=worker, payday=salary.get_payday(), kind=salary.kind.value, error=e
+            ))
+            self._add_result(PoolResult(salary, worker, time.perf_counter() - start, str(e)))
+            return False
+        
+        self._add_result(PoolResult(salary, worker, time.perf_counter() - start))
+        return True
+    
+    def _add_result(self, result: PoolResult) -> None:
+        """登録結果を記録する"""
+        with self.resultsLock:
+            self.results.append(result)
+    
+    def _report(self, results: list[PoolResult], elapsed: float) -> None:
+        """登録件数とスループット（1分あたりの明細数・項目数）をワーカーごとに表示する"""
+        ok = [result for result in results if result.is_ok()]
+        items = sum(len(result.salary.deductionItems) for result in ok)
+        minutes = elapsed / 60 if elapsed > 0 else 0.0
+        Logger.logInfo(self.LOG_THROUGHPUT.format(
+            ok=len(ok),
+            ng=len(results) - len(ok),
+            items=items,
+            seconds=elapsed,
+            salaries_per_minute=len(ok) / minutes if minutes else 0.0,
+            items_per_minute=items / minutes if minutes else 0.0
+        ))
+        for worker in range(self.workers):
+            done = [result for result in ok if result.worker == worker]
+            Logger.logInfo(self.LOG_WORKER_THROUGHPUT.format(
+                worker=worker, count=len(done), items=sum(len(r.salary.deductionItems) for r in done)
+            ))
@@ -1,10 +1,15 @@
 import os
-from typing import Optional, Final
-import yaml
+import re
+from itertools import chain
+from typing import Iterable, Iterator, Optional, Final
 import pypdfium2 as pdfium
 
 from logger import Logger
 from item import Item
+from cache import ExtractionCache
+from definitions import ItemDefinitions
+from layout import LayoutExtractor
+from source import BufferStream, PdfSource
 from common import SalaryKind, DirectoryNames, FileNames, ItemNames
 import config
 
@@ -20,11 +25,42 @@ class SalaryReader:
     # ログメッセージ
     LOG_PDF_NAME: Final[str] = "読み出し元PDF: {filename}"
     LOG_AMOUNT_MATCH: Final[str] = "控除合計額が一致しました: {amount:,}円"
+    LOG_CACHE_HIT: Final[str] = "抽出キャッシュを使用します: {filename}"
+    LOG_EARLY_STOP: Final[str] = "すべての項目が見つかったため{page}ページ目以降の読み取りを省略します。"
+    LOG_LEGACY_FILENAME: Final[str] = "{filename}が見つからないため旧形式のファイル名の{legacy}を読み込みます。"
     
     # エンコーディング
     ENCODING_UTF8: Final[str] = "utf-8"
     
-    def __init__(self, year: int, month: int, number: str, kind: SalaryKind) -> None:
+    # 抽出処理のバージョン（抽出結果が変わる修正時に更新し、キャッシュを無効化する）
+    PARSER_VERSION: Final[str] = "3"
+    
+    # 給与種別ごとのPDFファイル名の接頭辞
+    KIND_INFIXES: Final[dict[SalaryKind, str]] = {
+        SalaryKind.NORMAL: FileNames.PDF_SALARY_INFIX,
+        SalaryKind.BONUS: FileNames.PDF_BONUS_INFIX,
+        SalaryKind.SPECIAL: FileNames.PDF_SPECIAL_INFIX,
+    }
+    # 特別金の明細に賞与のファイル名を使っていた頃のファイル名（互換のため読み込み可能とする）
+    LEGACY_KIND_INFIXES: Final[dict[SalaryKind, str]] = {
+        SalaryKind.SPECIAL: FileNames.PDF_BONUS_INFIX,
+    }
+    
+    # PDFファイル名の解析パターン（例: 202411_kyuyo_12345.pdf）
+    PDF_FILENAME_PATTERN: Final[re.Pattern] = re.compile(
+        rf"^(\d{{4}})(\d{{2}})({'|'.join(map(re.escape, KIND_INFIXES.values()))})"
+        rf"(.+){re.escape(FileNames.PDF_EXTENSION)}$"
+    )
+    
+    def __init__(
+        self, 
+        year: int, 
+        month: int, 
+        number: str, 
+        kind: SalaryKind,
+        item_definitions: Optional[dict | ItemDefinitions] = None,
+        source: Optional[PdfSource] = None
+    ) -> None:
         """
         給与データ読み取りの初期化
         
@@ -33,16 +69,28 @@ class SalaryReader:
             month: 月
             number: 社員番号
             kind: 給与種別
+            item_definitions: 読み込み済みの項目定義（省略時はitems.ymlを読み込む）
+            source: PDFの読み込み元（bytes, memoryview, mmap, ファイルオブジェクト。
+                省略時はsalaryData内のPDFファイルを読み込む）
         """
         self.year = year
         self.month = month
         self.number = number
         self.kind = kind
         self.pw = config.data.get_pdf_password()
+        self.itemDefinitions = item_definitions
+        self.source = source
 
         # 各パス設定
         self.itemsFile = os.path.join(DirectoryNames.USERDATA, FileNames.ITEMS_YAML)
         self.salaryDir = os.path.join(DirectoryNames.USERDATA, DirectoryNames.SALARY_DATA)
+        
+        # 抽出結果キャッシュ
+        self.cache: Optional[ExtractionCache] = None
+        if config.data.is_extraction_cache_enabled():
+            self.cache = ExtractionCache(
+                self.pw, max_bytes=config.data.get_extraction_cache_max_bytes()
+            )
 
     def _get_pdf_filename(self) -> str:
         """
@@ -57,15 +105,53 @@ class SalaryReader:
         try:
             year_str = f"{self.year}"
             month_str = f"{self.month:0>2}"
-            kind_infix = (
-                FileNames.PDF_SALARY_INFIX 
-                if self.kind == SalaryKind.NORMAL 
-                else FileNames.PDF_BONUS_INFIX
-            )
+            kind_infix = self.KIND_INFIXES[self.kind]
             return f"{year_str}{month_str}{kind_infix}{self.number}{FileNames.PDF_EXTENSION}"
         except Exception as e:
             raise ValueError(f"{self.ERROR_PDF_NAME_FAILED}: {str(e)}")
 
+    @classmethod
+    def parse_pdf_filename(cls, filename: str) -> Optional[tuple[int, int, SalaryKind, str]]:
+        """
+        給与明細のPDFファイル名から登録対象を解析する
+        
+        Args:
+            filename: PDFファイル名
+            
+        Returns:
+            (年, 月, 給与種別, 社員番号)、給与明細のファイル名でない場合None
+        """
+        match = cls.PDF_FILENAME_PATTERN.match(filename)
+        if not match:
+            return None
+        
+        year, month, infix, number = match.groups()
+        kind = next(kind for kind, kind_infix in cls.KIND_INFIXES.items() if kind_infix == infix)
+        return int(year), int(month), kind, number
+    
+    def _resolve_pdf_filename(self) -> str:
+        """
+        読み出し元となる給与明細のPDFファイル名を決定する
+        
+        現行のファイル名のPDFがなく、旧形式のファイル名（特別金に賞与の接頭辞）のPDFが
+        ある場合は旧形式のファイル名を使う。
+        
+        Returns:
+            PDFファイル名
+        """
+        filename = self._get_pdf_filename()
+        legacy_infix = self.LEGACY_KIND_INFIXES.get(self.kind)
+        if self.source is not None or legacy_infix is None:
+            return filename
+        if os.path.exists(os.path.join(self.salaryDir, filename)):
+            return filename
+        
+        legacy = filename.replace(self.KIND_INFIXES[self.kind], legacy_infix, 1)
+        if not os.path.exists(os.path.join(self.salaryDir, legacy)):
+            return filename
+        Logger.logWarning(self.LOG_LEGACY_FILENAME.format(filename=filename, legacy=legacy))
+        return legacy
+
     def readDeduction(self) -> list[Item]:
         """
         PDFから控除合計を読み出す
@@ -73,46 +159,163 @@ class SalaryReader:
         Returns:
             控除項目のリスト
         """
-        pdf_name = self._get_pdf_filename()
+        pdf_name = self._resolve_pdf_filename()
         Logger.logFine(self.LOG_PDF_NAME.format(filename=pdf_name))
         
-        item_definitions = self._load_item_definitions()
-        text_lines = self._convert_pdf_to_text(pdf_name)
+        with Logger.span("reader.definitions"):
+            item_definitions = self._load_item_definitions()
+        with Logger.span("reader.cache"):
+            cache_key = self._get_cache_key(pdf_name, item_definitions)
+            cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            Logger.logFine(self.LOG_CACHE_HIT.format(filename=pdf_name))
+            return cached[1]
+        
+        pages = self._iter_page_lines(pdf_name, item_definitions)
         
-        items, sum_item = self._extract_items(text_lines, item_definitions)
+        # 読み取ったページのテキスト行（キャッシュ保存用）
+        text_lines: list[str] = []
+        items, sum_item = self._collect_items(pages, item_definitions, text_lines)
         self._validate_total_amount(items, sum_item)
         
         items.append(sum_item)
+        if cache_key:
+            self.cache.put(cache_key, text_lines, items)
         return items
     
-    def _load_item_definitions(self) -> dict:
+    def _get_cache_key(self, filename: str, item_definitions: dict | ItemDefinitions) -> Optional[str]:
+        """
+        抽出キャッシュのキーを作成する
+        
+        項目定義は指定されたもの（BatchReaderのワーカーなど）を含め、実際に使う定義の内容から作成する。
+        
+        Args:
+            filename: PDFファイル名
+            item_definitions: 使用する項目定義
+            
+        Returns:
+            キャッシュキー、キャッシュを使用しない場合None
+        """
+        if self.cache is None or not self.cache.is_enabled():
+            return None
+        
+        pdf = self.source if self.source is not None else os.path.join(self.salaryDir, filename)
+        try:
+            digest = ItemDefinitions.compile(item_definitions).digest()
+            return ExtractionCache.make_key(pdf, digest, self.PARSER_VERSION)
+        except OSError:
+            # PDFが存在しない場合のエラーは通常の読み込み処理で報告する
+            return None
+    
+    def _load_item_definitions(self) -> ItemDefinitions:
         """項目定義ファイルを読み込む"""
-        with open(self.itemsFile, "r", encoding=self.ENCODING_UTF8) as yml:
-            return yaml.safe_load(yml)
+        if self.itemDefinitions is not None:
+            return ItemDefinitions.compile(self.itemDefinitions)
+        return self.load_item_definitions_file(self.itemsFile)
     
-    def _extract_items(self, lines: list[str], item_defs: dict) -> tuple[list[Item], Item]:
+    @classmethod
+    def load_item_definitions_file(cls, items_file: str) -> ItemDefinitions:
+        """
+        指定した項目定義ファイルを読み込み、項目名で索引化する
+        
+        解析結果はファイルの更新日時・内容のハッシュで無効化されるキャッシュから取得する。
+        
+        Args:
+            items_file: 項目定義ファイル(items.yml)のパス
+            
+        Returns:
+            索引化済みの項目定義
+        """
+        return ItemDefinitions.load(items_file)
+    
+    def _extract_items(
+        self, 
+        lines: list[str], 
+        item_defs: dict | ItemDefinitions
+    ) -> tuple[list[Item], Item]:
         """
         PDFテキストから項目を抽出する
         
+        Args:
+            lines: PDFから読み取ったテキスト行
+            item_defs: 項目定義（辞書の場合はここで索引化する）
+        
+        Returns:
+            (控除項目リスト, 控除合計項目)
+        """
+        return self._collect_items([lines], item_defs)
+    
+    def _collect_items(
+        self, 
+        pages: Iterable[list[str]], 
+        definitions: dict | ItemDefinitions,
+        text_lines: Optional[list[str]] = None
+    ) -> tuple[list[Item], Item]:
+        """
+        ページごとのテキスト行から項目を抽出し、控除項目と控除合計に振り分ける
+        
+        Args:
+            pages: ページごとのテキスト行
+            definitions: 項目定義（辞書の場合はここで索引化する）
+            text_lines: 読み取ったテキスト行の格納先（省略可）
+        
         Returns:
             (控除項目リスト, 控除合計項目)
         """
         items = []
         sum_item = None
         
-        for idx, line in enumerate(lines):
-            for item_def in item_defs[ItemNames.DEDUCTION_KEY]:
-                if line == item_def["name"]:
-                    item = self._create_item(item_def, lines, idx)
-                    
-                    if line == ItemNames.DEDUCTION_SUM:
-                        sum_item = item
-                    else:
-                        items.append(item)
-                    break
+        for item in self._iter_items(pages, definitions, text_lines):
+            if item.name == ItemNames.DEDUCTION_SUM:
+                sum_item = item
+            else:
+                items.append(item)
         
         return items, sum_item
     
+    def _iter_items(
+        self, 
+        pages: Iterable[list[str]], 
+        definitions: dict | ItemDefinitions,
+        text_lines: Optional[list[str]] = None
+    ) -> Iterator[Item]:
+        """
+        ページごとのテキスト行から項目を順次取り出す
+        
+        定義されたすべての項目（控除合計を含む）が見つかった時点で終了し、
+        以降のページは読み込まない。
+        
+        Args:
+            pages: ページごとのテキスト行
+            definitions: 項目定義（辞書の場合はここで索引化する）
+            text_lines: 読み取ったテキスト行の格納先（省略可）
+        
+        Yields:
+            項目
+        """
+        definitions = ItemDefinitions.compile(definitions)
+        remaining = definitions.names()
+        page_iter = iter(pages)
+        try:
+            for page_no, page_lines in enumerate(page_iter, start=1):
+                if text_lines is not None:
+                    text_lines.extend(page_lines)
+                
+                with Logger.span("reader.match"):
+                    matches = list(definitions.match(page_lines))
+                for idx, item_def in matches:
+                    remaining.discard(item_def["name"])
+                    yield self._create_item(item_def, page_lines, idx)
+                
+                if not remaining:
+                    Logger.logFine(self.LOG_EARLY_STOP.format(page=page_no + 1))
+                    break
+        finally:
+            # 読み込み途中のPDFを閉じる
+            close = getattr(page_iter, "close", None)
+            if close:
+                close()
+    
     def _validate_total_amount(self, items: list[Item], sum_item: Item) -> None:
         """控除合計額と各項目の合計が一致するか確認"""
         total = sum(item.amount for item in items)
@@ -146,12 +349,19 @@ class SalaryReader:
         
         return Item(item_def["name"], amount, category, category_sub)
 
-    def _convert_pdf_to_text(self, filename: str) -> list[str]:
+    def _convert_pdf_to_text(
+        self, 
+        filename: str, 
+        item_defs: Optional[dict | ItemDefinitions] = None
+    ) -> list[str]:
         """
-        給与明細PDFをテキストデータへ変換
+        給与明細PDFから項目名と金額をテキストデータとして取り出す
+        
+        文字の座標から項目名と金額を対応付け、[項目名, 金額, ...] の順に並べる。
         
         Args:
             filename: PDFファイル名
+            item_defs: 項目定義（省略時はitems.ymlを読み込む）
             
         Returns:
             テキスト行のリスト
@@ -159,25 +369,67 @@ class SalaryReader:
         Raises:
             FileNotFoundError: PDFファイルが見つからない場合
         """
-        pdf_path = os.path.join(self.salaryDir, filename)
+        return list(chain.from_iterable(self._iter_page_lines(filename, item_defs)))
+    
+    def _iter_page_lines(
+        self, 
+        filename: str, 
+        item_defs: Optional[dict | ItemDefinitions] = None
+    ) -> Iterator[list[str]]:
+        """
+        給与明細PDFを1ページずつ開き、項目名と金額のテキスト行を返す
+        
+        ページは必要になった時点で開くため、途中で反復を止めると以降のページは読み込まない。
+        テキストページ・ページ・ドキュメントのpdfiumハンドルは使い終わった時点で明示的に閉じ、
+        ネイティブメモリの解放をガベージコレクションに任せない。
+        
+        読み込み元(source)が指定されている場合はファイルではなくメモリ上のデータから読み込む。
+        
+        Args:
+            filename: PDFファイル名
+            item_defs: 項目定義（省略時はitems.ymlを読み込む）
+            
+        Yields:
+            1ページ分のテキスト行
+            
+        Raises:
+            FileNotFoundError: PDFファイルが見つからない場合
+        """
+        if self.source is not None:
+            document_input = BufferStream.wrap(self.source)
+        else:
+            document_input = os.path.join(self.salaryDir, filename)
         
         try:
-            pdf = pdfium.PdfDocument(pdf_path, self.pw)
+            with Logger.span("reader.open"):
+                pdf = pdfium.PdfDocument(document_input, self.pw)
         except FileNotFoundError:
             raise FileNotFoundError(self.ERROR_PDF_NOT_FOUND.format(filename=filename))
-
-        lines = []
-        for page in pdf:
-            textpage = page.get_textpage()
-            text = textpage.get_text_bounded()
-            
-            # 日本語文字対応のためUTF-8でデコード
-            if isinstance(text, bytes):
-                text = text.decode(self.ENCODING_UTF8, errors='ignore')
-            
-            lines.extend(text.split())
         
-        return lines
+        try:
+            definitions = (
+                ItemDefinitions.compile(item_defs) 
+                if item_defs is not None 
+                else self._load_item_definitions()
+            )
+            extractor = LayoutExtractor(definitions)
+            for index in range(len(pdf)):
+                with Logger.span("reader.extract"):
+                    page = pdf[index]
+                    try:
+                        textpage = page.get_textpage()
+                        try:
+                            lines = extractor.extract_page(textpage)
+                        finally:
+                            textpage.close()
+                    finally:
+                        page.close()
+                yield lines
+        finally:
+            pdf.close()
+            # 変換時に作成したストリームはバッファ（mmap等）の参照を解放する
+            if isinstance(document_input, BufferStream) and document_input is not self.source:
+                document_input.close()
     
     # 後方互換性のためのエイリアス（非推奨）
     def getPdfFileName(self) -> str:
@@ -19,7 +19,13 @@ class Salary:
     LOG_HEADER: Final[str] = "--- 登録する控除項目一覧 ---"
     LOG_FOOTER: Final[str] = "--------- end ----------"
     
-    def __init__(self, year: int, month: int, kind: SalaryKind = SalaryKind.NORMAL) -> None:
+    def __init__(
+        self,
+        year: int,
+        month: int,
+        kind: SalaryKind = SalaryKind.NORMAL,
+        items: Optional[list[Item]] = None
+    ) -> None:
         """
         給与情報の初期化
         
@@ -27,6 +33,7 @@ class Salary:
             year: 年
             month: 月
             kind: 給与種別（デフォルトは通常給与）
+            items: 読み取り済みの控除項目（省略時はPDFから読み込む）
         """
         self.year = year
         self.month = month
@@ -34,14 +41,18 @@ class Salary:
         self.kind = kind
         self.deductionItems: list[Item] = []
         
-        self._load_salary_data()
+        if items is None:
+            self._load_salary_data()
+        else:
+            self.deductionItems = items
         self._show_deduction_info()
     
     def _load_salary_data(self) -> None:
         """給与データをPDFから読み込む"""
-        employee_number = config.data.get_employee_number()
-        reader = SalaryReader(self.year, self.month, employee_number, self.kind)
-        self.deductionItems = reader.readDeduction()
+        with Logger.span("salary.load"):
+            employee_number = config.data.get_employee_number()
+            reader = SalaryReader(self.year, self.month, employee_number, self.kind)
+            self.deductionItems = reader.readDeduction()
 
     def _show_deduction_info(self) -> None:
         """控除項目の一覧を標準出力へ表示する"""
@@ -0,0 +1,85 @@
+import os
+import time
+from typing import Final
+
+from logger import Logger
+
+
+class SaltFile:
+    """
+    鍵導出用のソルトをファイルで共有するクラス
+    
+    並列実行中の他プロセスが書き込み途中のソルトを読まないよう、一時ファイルに書き込んでから
+    os.linkで配置する（既にある場合は置き換えない）。長さが不正なソルトは読み込み直し、
+    それでも不正な場合は壊れたものとして作成し直す。
+    """
+    
+    # 書き込み途中のソルトを読み込み直す回数と間隔
+    READ_RETRIES: Final[int] = 5
+    RETRY_INTERVAL_SECONDS: Final[float] = 0.05
+    
+    # ログメッセージ
+    LOG_BROKEN: Final[str] = "鍵導出用のソルトが壊れているため作成し直します: {path}"
+    
+    def __init__(self, path: str, size: int) -> None:
+        """
+        ソルトファイルの初期化
+        
+        Args:
+            path: ソルトのパス
+            size: ソルトのバイト数
+        """
+        self.path = path
+        self.size = size
+    
+    def load(self) -> bytes:
+        """
+        ソルトを読み込む（なければ作成する）
+        
+        Returns:
+            ソルト（長さは常にsize）
+        """
+        for _ in range(self.READ_RETRIES):
+            try:
+                with open(self.path, "rb") as f:
+                    salt = f.read()
+            except FileNotFoundError:
+                return self._create()
+            if len(salt) == self.size:
+                return salt
+            time.sleep(self.RETRY_INTERVAL_SECONDS)
+        
+        Logger.logWarning(self.LOG_BROKEN.format(path=self.path))
+        return self._create(replace=True)
+    
+    def _create(self, replace: bool = False) -> bytes:
+        """
+        ソルトを作成して配置する
+        
+        Args:
+            replace: 既にあるソルトを置き換えるか（壊れている場合）
+        
+        Returns:
+            配置されたソルト（他プロセスが先に配置した場合はそのソルト）
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(os.urandom(self.size))
+        try:
+            if replace:
+                os.replace(tmp_path, self.path)
+            else:
+                # 書き込み済みのファイルを配置する（他プロセスが先に配置した場合は置き換えない）
+                os.link(tmp_path, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+        with open(self.path, "rb") as f:
+            return f.read()
@@ -0,0 +1,123 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from typing import Final, Optional
+
+from logger import Logger
+from salt import SaltFile
+from common import DirectoryNames
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    # 暗号化ライブラリがない場合はセッションを保存しない（平文では保存しない）
+    Fernet = None
+    InvalidToken = Exception
+
+
+class SessionStore:
+    """
+    MoneyForwardのログイン済みセッション(Cookie)を実行間で保持するクラス
+    
+    ログイン後のCookieをMoneyForwardのパスワードから導出した鍵で暗号化して保存し、
+    次回の実行ではCookieを復元してログイン(メールアドレス・パスワード・2段階認証)を省略する。
+    """
+    
+    # ファイル名
+    SESSION_FILENAME: Final[str] = "session.bin"
+    SALT_FILENAME: Final[str] = "session.salt"
+    
+    # 鍵導出設定
+    KDF_ITERATIONS: Final[int] = 100_000
+    SALT_SIZE: Final[int] = 16
+    
+    # ログメッセージ
+    LOG_DISABLED: Final[str] = "cryptographyがインストールされていないためログインセッションを保存しません。"
+    LOG_BROKEN: Final[str] = "保存したログインセッションを復号できないため破棄します。"
+    
+    def __init__(self, password: str, cache_dir: Optional[str] = None) -> None:
+        """
+        セッション保存先の初期化
+        
+        Args:
+            password: 暗号鍵の導出に使うMoneyForwardのパスワード
+            cache_dir: 保存先ディレクトリ（省略時はuserdata/cache）
+        """
+        self.password = password
+        self.cacheDir = cache_dir or os.path.join(DirectoryNames.USERDATA, DirectoryNames.CACHE)
+        self.sessionFile = os.path.join(self.cacheDir, self.SESSION_FILENAME)
+        self.fernet = None
+        
+        if Fernet is None:
+            Logger.logWarning(self.LOG_DISABLED)
+    
+    def is_enabled(self) -> bool:
+        """セッションを保存できるか"""
+        return Fernet is not None
+    
+    def load(self) -> list[dict]:
+        """
+        保存したCookieを取得する（有効期限切れのCookieは除く）
+        
+        Returns:
+            Cookieのリスト（保存していない場合は空）
+        """
+        if not self.is_enabled():
+            return []
+        
+        try:
+            with open(self.sessionFile, "rb") as f:
+                token = f.read()
+        except FileNotFoundError:
+            return []
+        
+        try:
+            cookies = json.loads(self._get_fernet().decrypt(token))
+        except (InvalidToken, ValueError):
+            Logger.logWarning(self.LOG_BROKEN)
+            self.clear()
+            return []
+        
+        now = time.time()
+        return [cookie for cookie in cookies if cookie.get("expiry", now + 1) > now]
+    
+    def save(self, cookies: list[dict]) -> None:
+        """
+        Cookieを暗号化して保存する
+        
+        Args:
+            cookies: WebDriverから取得したCookieのリスト
+        """
+        if not self.is_enabled():
+            return
+        
+        token = self._get_fernet().encrypt(json.dumps(cookies, ensure_ascii=False).encode())
+        os.makedirs(self.cacheDir, exist_ok=True)
+        tmp_path = f"{self.sessionFile}.{os.getpid()}.tmp"
+        # Cookieはログイン情報に相当するため所有者のみ読み書きできるようにする
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(token)
+        os.replace(tmp_path, self.sessionFile)
+    
+    def clear(self) -> None:
+        """保存したセッションを削除する"""
+        try:
+            os.remove(self.sessionFile)
+        except FileNotFoundError:
+            pass
+    
+    def _get_fernet(self):
+        """パスワードとソルトから導出した鍵で暗号化器を作成する"""
+        if self.fernet is None:
+            raw_key = hashlib.pbkdf2_hmac(
+                "sha256", self.password.encode(), self._load_salt(), self.KDF_ITERATIONS
+            )
+            self.fernet = Fernet(base64.urlsafe_b64encode(raw_key))
+        return self.fernet
+    
+    def _load_salt(self) -> bytes:
+        """鍵導出用のソルトを読み込む（なければ作成する）"""
+        return SaltFile(os.path.join(self.cacheDir, self.SALT_FILENAME), self.SALT_SIZE).load()
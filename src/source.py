@@ -0,0 +1,83 @@
+import io
+import mmap
+import os
+from typing import BinaryIO, Union
+
+
+# SalaryReaderが受け付けるPDFの読み込み元（ファイルパス以外）
+PdfSource = Union[bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+
+
+class BufferStream(io.RawIOBase):
+    """
+    メモリ上のバッファ(bytearray, memoryview, mmap等)を読み取り専用ストリームとして扱うクラス
+    
+    pdfiumにはストリームとして渡し、pdfiumが要求した範囲だけをバッファから直接読み込ませる。
+    バッファ全体をbytesへ複製しないため、mmapしたファイルやZIP内の無圧縮データもそのまま読める。
+    """
+    
+    def __init__(self, buffer) -> None:
+        """
+        ストリームの初期化
+        
+        Args:
+            buffer: バッファプロトコルに対応したオブジェクト
+        """
+        super().__init__()
+        self.view = memoryview(buffer).cast("B")
+        self.position = 0
+    
+    @classmethod
+    def wrap(cls, source: PdfSource):
+        """
+        PDFの読み込み元をpdfiumが受け付ける形式に変換する
+        
+        bytesとファイルオブジェクトはそのまま、その他のバッファはBufferStreamで包む。
+        
+        Args:
+            source: PDFの読み込み元
+        
+        Returns:
+            pdfium.PdfDocumentへ渡せる入力
+        """
+        if isinstance(source, bytes):
+            return source
+        if all(callable(getattr(source, name, None)) for name in ("seek", "tell", "read", "readinto")) \
+                and not isinstance(source, mmap.mmap):
+            return source
+        return cls(source)
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self.position + offset
+        elif whence == os.SEEK_END:
+            position = len(self.view) + offset
+        else:
+            raise ValueError(f"whenceの値が不正です: {whence}")
+        if position < 0:
+            raise ValueError(f"負の位置には移動できません: {position}")
+        self.position = position
+        return position
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def readinto(self, buffer) -> int:
+        size = max(min(len(buffer), len(self.view) - self.position), 0)
+        buffer[:size] = self.view[self.position:self.position + size]
+        self.position += size
+        return size
+    
+    def close(self) -> None:
+        """バッファの参照を解放する（mmapを閉じる前に呼び出す）"""
+        if not self.closed:
+            self.view.release()
+        super().close()
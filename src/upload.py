@@ -2,40 +2,248 @@ import sys
 import traceback
 from typing import Final
 
-from logger import Logger
+from logger import Logger, Timer
 from uploader import Uploader
+from pool import UploadPool
 from salary import Salary
-from argument import Arguments
+from watcher import SalaryWatcher
+from index import SalaryIndex
+from argument import Arguments, WatchArguments, RangeArguments, DaemonArguments, ApprovalArguments
+from daemon import BrowserDaemon, DaemonClient
+from common import SalaryKind
+import config
 
 
 # 定数
 PRINT_TRACE: Final[bool] = True
 TRACEBACK_HEADER: Final[str] = "--- traceback ---"
 TRACEBACK_FOOTER: Final[str] = "---    end    ---"
+LOG_WATCH_INTERRUPTED: Final[str] = "監視を中断しました。"
+LOG_TIMING_WRITE_FAILED: Final[str] = "処理時間の計測結果を出力できませんでした({path}): {error}"
+LOG_RANGE_MISSING: Final[str] = "{year}年{month:02}月の{kind}明細のPDFがないため対象外とします。"
+LOG_RANGE_EMPTY: Final[str] = "指定された期間に登録する給与明細がありません。"
+LOG_DAEMON_NOT_RUNNING: Final[str] = "常駐ブラウザは起動していません。"
+LOG_DAEMON_RUNNING: Final[str] = "常駐ブラウザは起動しています（pid={pid}, 使用中={busy}, Chrome応答={alive}）。"
+LOG_DAEMON_STOPPED: Final[str] = "常駐ブラウザに終了を要求しました。"
+LOG_DAEMON_INTERRUPTED: Final[str] = "常駐ブラウザを中断しました。"
+
+
+def print_traceback() -> None:
+    """例外のトレースを表示する"""
+    if PRINT_TRACE:
+        print(TRACEBACK_HEADER)
+        traceback.print_exc()
+        print(TRACEBACK_FOOTER)
+
+
+def report_timing() -> None:
+    """処理時間の内訳を表示し、設定されていればJSON Linesで出力する"""
+    Timer.report()
+    report_file = config.data.get_timing_report_file()
+    if report_file:
+        try:
+            Timer.write_json(report_file)
+        except OSError as e:
+            Logger.logWarning(LOG_TIMING_WRITE_FAILED.format(path=report_file, error=e))
+
+
+def apply_approval(uploader: Uploader, approval: ApprovalArguments) -> Uploader:
+    """
+    起動引数の登録日の確認の省略(-y)と給料日の指定をUploaderへ設定する
+    
+    Args:
+        uploader: 登録に使うUploader
+        approval: 起動引数
+    
+    Returns:
+        設定したUploader
+    """
+    if approval.is_auto_approved():
+        uploader.autoApprove = True
+    uploader.paydayDate = approval.get_payday()
+    uploader.paydayAdjustment = approval.get_adjustment()
+    return uploader
+
+
+def watch() -> None:
+    """監視モード: 追加された給与明細を読み取り、読み取った順にアップロードする"""
+    args = WatchArguments()
+
+    if not args.is_valid():
+        sys.exit(1)
+    
+    debounce = args.get_debounce()
+    watcher = SalaryWatcher(
+        debounce=SalaryWatcher.DEBOUNCE_SECONDS if debounce is None else debounce,
+        use_inotify=not args.is_polling()
+    )
+    Timer.reset()
+    watcher.start()
+    try:
+        while True:
+            salary = watcher.queue.get()
+            try:
+                apply_approval(Uploader(salary), args.get_approval()).upload()
+            except Exception as e:
+                # 1件の登録失敗で監視は止めない
+                Logger.logError(str(e))
+                print_traceback()
+            # 登録ごとに監視開始からの累計の内訳を出力する
+            report_timing()
+    except KeyboardInterrupt:
+        Logger.logInfo(LOG_WATCH_INTERRUPTED)
+    finally:
+        watcher.stop()
+
+
+def build_salaries(args: RangeArguments, index: SalaryIndex) -> list[Salary]:
+    """
+    起動引数の期間のうち、給与明細PDFがある明細を読み込む
+    
+    Args:
+        args: 起動引数
+        index: 給与明細ディレクトリの索引
+    
+    Returns:
+        給与情報（年月順、同じ月は給与→賞与→特別金の順）
+    """
+    number = config.data.get_employee_number()
+    salaries = []
+    for year, month in args.get_months():
+        for kind in args.get_kinds():
+            if index.lookup(year, month, kind, number) is None:
+                # 賞与・特別金はない月の方が多いため給与がない場合だけ警告する
+                if kind == SalaryKind.NORMAL:
+                    Logger.logWarning(LOG_RANGE_MISSING.format(year=year, month=month, kind=kind.value))
+                continue
+            salaries.append(Salary(year, month, kind))
+    return salaries
+
+
+def upload_range() -> None:
+    """複数月の一括登録: 期間内の給与明細を読み取り、1回のログインでアップロードする"""
+    args = RangeArguments()
+
+    if not args.is_valid():
+        sys.exit(1)
+    
+    Timer.reset()
+    try:
+        index = SalaryIndex()
+        index.refresh()
+        if args.get_jobs() == 1:
+            # PDFの読み込み・登録日の確認と並行してWebDriverを起動し、ログインする
+            uploader = apply_approval(Uploader(), args.get_approval())
+            uploader.start_session_in_background()
+            try:
+                salaries = build_salaries(args, index)
+            except BaseException:
+                uploader.close()
+                raise
+            if not salaries:
+                uploader.close()
+                Logger.logError(LOG_RANGE_EMPTY)
+                sys.exit(1)
+            uploader.upload_all(salaries)
+            return
+        
+        salaries = build_salaries(args, index)
+        if not salaries:
+            Logger.logError(LOG_RANGE_EMPTY)
+            sys.exit(1)
+        
+        # 複数のブラウザで並列に登録する（登録日は開始前にまとめて確認する）
+        salaries = apply_approval(Uploader(), args.get_approval()).confirm(salaries)
+        if not salaries:
+            return
+        results = UploadPool(salaries, args.get_jobs(), config.data.get_upload_items_per_minute()).run()
+        if not all(result.is_ok() for result in results):
+            sys.exit(1)
+
+    except Exception as e:
+        Logger.logError(str(e))
+        print_traceback()
+        sys.exit(1)
+    finally:
+        report_timing()
+
+
+def run_daemon() -> None:
+    """常駐ブラウザ: ログイン済みのChromeを起動したまま、upload.pyの各実行に貸し出す"""
+    args = DaemonArguments()
+
+    if not args.is_valid():
+        sys.exit(1)
+    
+    client = DaemonClient()
+    if args.is_status():
+        state = client.ping()
+        if state is None:
+            Logger.logInfo(LOG_DAEMON_NOT_RUNNING)
+            sys.exit(1)
+        Logger.logInfo(LOG_DAEMON_RUNNING.format(pid=state.get("pid"), busy=state.get("busy"), alive=state.get("alive")))
+        return
+    if args.is_stop():
+        if not client.stop():
+            Logger.logInfo(LOG_DAEMON_NOT_RUNNING)
+            sys.exit(1)
+        Logger.logInfo(LOG_DAEMON_STOPPED)
+        return
+    
+    state = client.ping()
+    if state is not None:
+        Logger.logInfo(LOG_DAEMON_RUNNING.format(pid=state.get("pid"), busy=state.get("busy"), alive=state.get("alive")))
+        return
+    
+    idle_minutes = args.get_idle_minutes()
+    idle_seconds = config.data.get_browser_daemon_idle_seconds() if idle_minutes is None else idle_minutes * 60
+    try:
+        BrowserDaemon(Uploader, idle_seconds).serve()
+    except KeyboardInterrupt:
+        Logger.logInfo(LOG_DAEMON_INTERRUPTED)
+    except Exception as e:
+        Logger.logError(str(e))
+        print_traceback()
+        sys.exit(1)
 
 
 def main() -> None:
     """メインメソッド"""
+    if DaemonArguments.is_requested():
+        run_daemon()
+        return
+    if WatchArguments.is_requested():
+        watch()
+        return
+    if RangeArguments.is_requested():
+        upload_range()
+        return
+    
     args = Arguments()
 
     if not args.is_valid():
         sys.exit(1)
     
+    Timer.reset()
     try:
+        # PDFの読み込み・登録日の確認と並行してWebDriverを起動し、ログインする
+        uploader = apply_approval(Uploader(), args.get_approval())
+        uploader.start_session_in_background()
         # 給与データ読み込み
-        salary = Salary(args.get_year(), args.get_month(), args.get_kind())
+        try:
+            uploader.salary = Salary(args.get_year(), args.get_month(), args.get_kind())
+        except BaseException:
+            uploader.close()
+            raise
         # 給与データ登録
-        Uploader(salary).upload()
+        uploader.upload()
 
     except Exception as e:
         Logger.logError(str(e))
-        
-        if PRINT_TRACE:
-            print(TRACEBACK_HEADER)
-            traceback.print_exc()
-            print(TRACEBACK_FOOTER)
-        
+        print_traceback()
         sys.exit(1)
+    finally:
+        report_timing()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
+import os
+import threading
 import time
-from typing import Final
+from typing import Callable, Final, Optional
 
 from logger import Logger
 from selenium import webdriver
@@ -8,11 +10,17 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
 from salary import Salary
+from session import SessionStore
+from daemon import DaemonClient
+from categories import CategoryCache, CategoryTree
+from journal import RegistrationJournal
+from entries import EntryIndex
+from payday import PaydayRule
 from item import Item
-from common import UIConstants, ItemNames
+from common import UIConstants, ItemNames, DirectoryNames
 import config
 import pyotp
 
@@ -22,8 +30,12 @@ class Uploader:
     MoneyForwardへの給与情報アップロードを行うクラス
     """
     
-    # URL定数
+    # URL定数（既定の登録先、MoneyForwardUrlで変更できる）
     MONEYFORWARD_URL: Final[str] = "https://moneyforward.com"
+    CF_URL: Final[str] = "https://moneyforward.com/cf"
+    CF_PATH: Final[str] = "/cf"
+    # /cfの月ごとの入出金一覧
+    CF_MONTH_QUERY: Final[str] = "?from={year}/{month:02}/01&month={month}&year={year}"
     
     # XPath定数
     XPATH_MAIN_MENU: Final[str] = '//*[@id="before-login-corporate"]/header/div[1]/div[2]/nav/ul/li[1]/p'
@@ -36,6 +48,8 @@ class Uploader:
     ID_AMOUNT: Final[str] = "appendedPrependedInput"
     ID_LARGE_CATEGORY: Final[str] = "js-large-category-selected"
     ID_MIDDLE_CATEGORY: Final[str] = "js-middle-category-selected"
+    ID_LARGE_CATEGORY_FIELD: Final[str] = "user_asset_act_large_category_id"
+    ID_MIDDLE_CATEGORY_FIELD: Final[str] = "user_asset_act_middle_category_id"
     ID_CONTENT: Final[str] = "js-content-field"
     ID_DATE: Final[str] = "updated-at"
     ID_IS_INCOME: Final[str] = "user_asset_act_is_income"
@@ -51,6 +65,235 @@ class Uploader:
     # 選択オプション
     OPTION_NONE: Final[str] = "なし"
     
+    # 待機条件のスクリプト（ページの読み込み完了とjQueryの通信がないこと）
+    SCRIPT_PAGE_READY: Final[str] = (
+        "return document.readyState === 'complete' && "
+        "(typeof jQuery === 'undefined' || jQuery.active === 0);"
+    )
+    # 項目の一括入力スクリプト（収入/支出・出所・金額・カテゴリ・内容・日付を入力して送信し、
+    # 登録の完了（続けて入力するボタンの表示）までを1回の呼び出しで行う）
+    # 結果は {ok: true} または {ok: false, step: 失敗した処理, error: 理由, submitted: 送信したか} を返す
+    SCRIPT_FILL_ITEM: Final[str] = """
+        var args = arguments[0], ids = args.ids, done = arguments[arguments.length - 1];
+        var deadline = Date.now() + args.timeoutMs, submitted = false;
+        function fail(step, error) { done({ok: false, step: step, error: String(error), submitted: submitted}); }
+        function byId(id) { return document.getElementById(id); }
+        function isVisible(elem) {
+            return !!elem && elem.getClientRects().length > 0 && window.getComputedStyle(elem).visibility !== 'hidden';
+        }
+        function setValue(elem, value) {
+            elem.value = value;
+            elem.dispatchEvent(new Event('input', {bubbles: true}));
+            elem.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+        function setIncome() {
+            [ids.isIncomeModal, ids.isIncome].forEach(function (id) {
+                var elem = byId(id);
+                if (elem) elem.value = args.isIncome;
+            });
+        }
+        function findLink(cls, text) {
+            var links = document.querySelectorAll('a.' + cls);
+            for (var i = 0; i < links.length; i++) {
+                if (links[i].textContent.trim() === text && links[i].offsetParent !== null) return links[i];
+            }
+            return null;
+        }
+        function waitFor(step, condition, next) {
+            (function poll() {
+                var result;
+                try { result = condition(); } catch (e) { return fail(step, e); }
+                if (result) {
+                    try { return next(result); } catch (e) { return fail(step, e); }
+                }
+                if (Date.now() > deadline) return fail(step, 'timeout');
+                setTimeout(poll, 20);
+            })();
+        }
+        function setCategoryIds(next) {
+            var large = byId(ids.largeField), middle = byId(ids.middleField);
+            if (!large || !middle) return fail('category', 'category field not found');
+            setValue(large, args.categoryIds[0]);
+            setValue(middle, args.categoryIds[1]);
+            [[ids.large, args.category], [ids.middle, args.subcategory]].forEach(function (pair) {
+                var button = byId(pair[0]);
+                if (button) button.textContent = pair[1];
+            });
+            next();
+        }
+        function selectCategories(next) {
+            selectCategory('large', ids.large, 'l_c_name', args.category, function () {
+                selectCategory('middle', ids.middle, 'm_c_name', args.subcategory, next);
+            });
+        }
+        function selectCategory(step, buttonId, linkClass, text, next) {
+            var button = byId(buttonId);
+            if (!button) return fail(step, 'button not found');
+            button.click();
+            waitFor(step, function () { return findLink(linkClass, text); }, function (link) {
+                link.click();
+                waitFor(step, function () { return byId(buttonId).textContent.indexOf(text) >= 0; }, next);
+            });
+        }
+        function submit() {
+            // WebElement.submit()と同じく送信イベントを発行する（画面側の処理で非同期に送信される）
+            var form = byId(ids.content).form;
+            if (!form) return fail('submit', 'form not found');
+            var event = document.createEvent('Event');
+            event.initEvent('submit', true, true);
+            submitted = true;
+            if (form.dispatchEvent(event)) HTMLFormElement.prototype.submit.call(form);
+            // 登録の完了を待つ上限時間は入力とは別に数える
+            deadline = Date.now() + args.timeoutMs;
+            waitFor('submit', function () {
+                var button = byId(ids.confirmation);
+                return isVisible(button) && !button.disabled;
+            }, function () { done({ok: true}); });
+        }
+        var tab = null;
+        try {
+            setIncome();
+            tab = document.querySelector('input.' + args.tabClass);
+            if (tab) {
+                tab.click();
+                var label = tab.closest('label');
+                if (label) label.click();
+            }
+            var account = byId(ids.subAccount);
+            if (account) {
+                for (var i = 0; i < account.options.length; i++) {
+                    if (account.options[i].text.trim() === args.optionNone || account.options[i].value === '0') {
+                        account.selectedIndex = i;
+                        account.dispatchEvent(new Event('change', {bubbles: true}));
+                        break;
+                    }
+                }
+            }
+            var amount = byId(ids.amount);
+            if (!amount) return fail('amount', 'field not found');
+            setValue(amount, args.amount);
+        } catch (e) {
+            return fail('form', e);
+        }
+        // クリックしたタブが選択状態になるまで待つ（タブがない画面では待たない）
+        waitFor('tab', function () { return !tab || tab.checked; }, function () {
+            // カテゴリのIDが分かっている場合はドロップダウンを開かずに設定する
+            (args.categoryIds ? setCategoryIds : selectCategories)(function () {
+                var content = byId(ids.content), date = byId(ids.date);
+                if (!content || !date) return fail('content', 'field not found');
+                setValue(content, args.content);
+                setValue(date, args.date);
+                setIncome();
+                submit();
+            });
+        });
+    """
+    # 続けて入力するボタンを押し、次の入力フォームが表示されて通信が終わるまで待つスクリプト
+    # 結果は {ok: true} または {ok: false, error: 理由} を返す
+    SCRIPT_CONTINUE_INPUT: Final[str] = """
+        var args = arguments[0], done = arguments[arguments.length - 1];
+        var deadline = Date.now() + args.timeoutMs;
+        function isVisible(elem) {
+            return !!elem && elem.getClientRects().length > 0 && window.getComputedStyle(elem).visibility !== 'hidden';
+        }
+        var button = document.getElementById(args.buttonId);
+        if (!button) return done({ok: false, error: 'button not found'});
+        button.click();
+        (function poll() {
+            if (!isVisible(document.getElementById(args.buttonId)) && document.readyState === 'complete'
+                    && (typeof jQuery === 'undefined' || jQuery.active === 0)) {
+                return done({ok: true});
+            }
+            if (Date.now() > deadline) return done({ok: false, error: 'timeout'});
+            setTimeout(poll, 20);
+        })();
+    """
+    # カテゴリの取得スクリプト（大項目名 → {id: 大項目ID, middles: {中項目名: 中項目ID}}）
+    SCRIPT_CATEGORY_TREE: Final[str] = """
+        var tree = {};
+        document.querySelectorAll('a.l_c_name').forEach(function (large) {
+            var name = large.textContent.trim();
+            var entry = tree[name] || (tree[name] = {id: large.id, middles: {}});
+            var parent = large.closest('li');
+            if (!parent) return;
+            parent.querySelectorAll('a.m_c_name').forEach(function (middle) {
+                var middleName = middle.textContent.trim();
+                if (!(middleName in entry.middles)) entry.middles[middleName] = middle.id;
+            });
+        });
+        return tree;
+    """
+    # ログインセッションの確認スクリプト（未ログインの場合はログイン画面へリダイレクトされる）
+    SCRIPT_SESSION_CHECK: Final[str] = (
+        "var done = arguments[arguments.length - 1]; "
+        "fetch(arguments[0], {method: 'HEAD', credentials: 'include', redirect: 'manual'})"
+        ".then(function (response) { done(response.status === 200); })"
+        ".catch(function () { done(false); });"
+    )
+    # 月ごとの入出金一覧を取得し、各行の日付・金額・内容を返すスクリプト（一覧がない・取得できない場合はnull）
+    SCRIPT_EXISTING_ENTRIES: Final[str] = """
+        var done = arguments[arguments.length - 1];
+        fetch(arguments[0], {credentials: 'include'}).then(function (response) {
+            if (!response.ok) throw new Error('HTTP ' + response.status);
+            return response.text();
+        }).then(function (html) {
+            var table = new DOMParser().parseFromString(html, 'text/html').querySelector('#cf-detail-table');
+            if (!table) { done(null); return; }
+            done(Array.prototype.map.call(table.querySelectorAll('tr.transaction_list'), function (row) {
+                function text(selector) {
+                    var cell = row.querySelector(selector);
+                    return cell ? cell.textContent : '';
+                }
+                var date = row.querySelector('td.date');
+                return {
+                    date: date ? (date.getAttribute('data-table-sortable-value') || date.textContent) : '',
+                    amount: text('td.amount'),
+                    content: text('td.content')
+                };
+            }));
+        }).catch(function () { done(null); });
+    """
+    
+    # 入力フォームを開いたことを確認するセレクタ（いずれかが表示されていればよい）
+    FORM_SELECTORS: Final[tuple[str, ...]] = (
+        "#form-user-asset-act",
+        "#appendedPrependedInput",
+        "#user_asset_act_is_income_modal",
+        "#user_asset_act_new .modal-body",
+        "form[action*='user_asset_act']",
+    )
+    # 前回一致したセレクタの保存先（userdata/cache内）
+    FORM_SELECTOR_FILENAME: Final[str] = "form_selector.txt"
+    # 候補のセレクタを順に確認し、最初に表示されているもののセレクタを返すスクリプト（なければnull）
+    SCRIPT_FIND_FORM: Final[str] = """
+        var selectors = arguments[0];
+        for (var i = 0; i < selectors.length; i++) {
+            var element = document.querySelector(selectors[i]);
+            if (element && element.getClientRects().length > 0
+                    && window.getComputedStyle(element).visibility !== 'hidden') {
+                return selectors[i];
+            }
+        }
+        return null;
+    """
+    
+    # 省メモリのブラウザ(UseLeanBrowser)で読み込まないURL（画像・フォント・動画、解析・広告・SNSのスクリプト）
+    LEAN_BLOCKED_URLS: Final[tuple[str, ...]] = (
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+        "*.mp4", "*.webm",
+        "*google-analytics.com*", "*googletagmanager.com*", "*googleadservices.com*",
+        "*doubleclick.net*", "*googlesyndication.com*", "*facebook.net*", "*ads-twitter.com*",
+        "*hotjar.com*", "*clarity.ms*", "*karte.io*", "*nr-data.net*", "*criteo.com*",
+    )
+    # 省メモリのブラウザの設定（画像・通知・位置情報などを使わない）
+    LEAN_PREFS: Final[dict[str, int]] = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_setting_values.geolocation": 2,
+        "profile.default_content_setting_values.media_stream": 2,
+    }
+    
     # デバッグファイルパス
     DEBUG_HTML_PATH: Final[str] = "../userdata/debug_page.html"
     DEBUG_SCREENSHOT_PATH: Final[str] = "../userdata/debug_screenshot.png"
@@ -61,20 +304,80 @@ class Uploader:
     MSG_CONFIRM_PAYDAY: Final[str] = "{payday}を給料日として登録します。よろしいですか。(Y/n): "
     MSG_CANCELLED: Final[str] = "給与登録をキャンセルしました。"
     MSG_INVALID_DATE: Final[str] = "指定された日付は誤っています。正しい日付を入力してください。"
+    LOG_AUTO_APPROVED: Final[str] = "{payday}を給料日として登録します。（自動承認）"
+    LOG_ALREADY_REGISTERED: Final[str] = "{name} は登録済みのため省略します。"
+    LOG_ALREADY_EXISTS: Final[str] = "{name} はMoneyForwardに同じ入出金があるため省略します。"
+    LOG_EXISTING_ENTRIES: Final[str] = "{year}年{month:02}月の登録済みの入出金: {count}件"
+    LOG_EXISTING_ENTRIES_FAILED: Final[str] = "登録済みの入出金を取得できないため、すべての項目を登録します: {error}"
+    
+    # 起動・ログインを中止した場合に別スレッドの終了を待つ上限時間（秒）
+    SESSION_CANCEL_TIMEOUT_SECONDS: Final[float] = 3.0
+    LOG_SESSION_CANCELLED: Final[str] = "WebDriverの起動・ログインを中止しました。"
+    LOG_TOTP_WAIT: Final[str] = "2段階認証のコードが更新されるまで{seconds:.1f}秒待ちます。"
+    
+    # 直前のログインで使った2段階認証のステップ（同じコードでの連続ログインを避けるためプロセス内で共有する）
+    _lastTotpStep: int = -1
+    _totpLock = threading.Lock()
+    
+    # エラーメッセージ
+    ERROR_UNKNOWN_CATEGORIES: Final[str] = (
+        "items.ymlのカテゴリがMoneyForwardにありません: {categories}"
+        "（MoneyForwardでカテゴリを追加・変更した場合は再実行してください）"
+    )
 
-    def __init__(self, salary: Salary) -> None:
+    def __init__(self, salary: Optional[Salary] = None) -> None:
         """
         Uploaderの初期化
         
         Args:
-            salary: 登録する給与情報
+            salary: 登録する給与情報（upload_all()で複数の給与情報を登録する場合は省略可）
         """
         self.salary = salary
         self.email = config.data.get_moneyforward_email()
         self.pw = config.data.get_moneyforward_password()
         self.tfaid = config.data.get_tfa_id()
+        self.waitTimeout = config.data.get_wait_timeout()
+        self.moneyforwardUrl = config.data.get_moneyforward_url()
+        self.cfUrl = self.moneyforwardUrl + self.CF_PATH
+        self.sessionStore = SessionStore(self.pw) if config.data.is_session_kept() else None
         self.driver = None
         self.actions = None
+        # Chromeのプロファイルディレクトリ（Noneの場合は一時プロファイル）
+        self.profileDir: Optional[str] = None
+        # Chromeのリモートデバッグのポート（常駐ブラウザとして起動する場合のみ）
+        self.debugPort: Optional[int] = None
+        # 別スレッドで開始したWebDriverの起動・ログイン（start_session_in_background()）とその例外
+        self.sessionThread: Optional[threading.Thread] = None
+        self.sessionError: Optional[BaseException] = None
+        # 起動・ログインの中止（close()）と、別スレッドの終了・WebDriverの終了を別スレッドに任せたか
+        self.sessionCancel = threading.Event()
+        self.sessionLock = threading.Lock()
+        self.sessionFinished = False
+        self.sessionAbandoned = False
+        # 借りている常駐ブラウザ(upload.py daemon)（Noneの場合はChromeを起動する）
+        self.daemon: Optional[DaemonClient] = None
+        # 項目を登録する直前に呼び出す処理（複数ワーカーで登録する際の流量制限）
+        self.throttle: Optional[Callable[[], None]] = None
+        # 一括入力を使うか（画面構成が異なり失敗した場合は以降1項目ずつ入力する）
+        self.fastFill = True
+        # MoneyForwardのカテゴリ（保存したものか入力フォームから取得したもの）
+        self.categoryCache = CategoryCache(config.data.get_category_cache_ttl_seconds())
+        self.categoryTree: Optional[CategoryTree] = None
+        # 登録済みの項目の記録（Noneの場合は記録せず、すべての項目を登録する）
+        self.journal: Optional[RegistrationJournal] = None
+        if config.data.is_registration_journal_used():
+            self.journal = RegistrationJournal(config.data.get_employee_number())
+        # 登録済みの入出金の索引（年, 月ごと、取得できなかった月はNone）
+        self.skipExisting = config.data.is_existing_entry_skipped()
+        self.existingEntries: dict[tuple[int, int], Optional[EntryIndex]] = {}
+        # 登録日を確認せずに登録するか（AutoApprove、upload.py -y）と登録日の指定（Noneは設定ファイルの値）
+        self.autoApprove = config.data.is_auto_approved()
+        self.paydayDate: Optional[int] = None
+        self.paydayAdjustment: Optional[str] = None
+        # 入力フォームの確認で前回一致したセレクタ（次回以降に優先して確認する）
+        self.formSelectorFile = os.path.join(
+            DirectoryNames.USERDATA, DirectoryNames.CACHE, self.FORM_SELECTOR_FILENAME
+        )
 
     def upload(self, is_deduction_only: bool = True) -> None:
         """
@@ -83,28 +386,218 @@ class Uploader:
         Args:
             is_deduction_only: 給与控除のみを対象とするか
         """
-        if not self._confirm_registration():
-            return
-
         try:
-            self._init_webdriver()
-            self._access_moneyforward()
-            self._login()
-            self._register_deductions()
+            if not self._confirm_registration():
+                return
+            self.check_categories([self.salary])
+            self._await_session()
+            with Logger.span("uploader.register"):
+                self._register_deductions()
+            # 登録中に更新されたCookieを次回に引き継ぐ
+            self._save_session()
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.close()
 
         # MEMO: 現状は控除項目のみで問題なし
         # 将来的に総支給等も登録する場合はここで実装
 
+    def upload_all(self, salaries: list[Salary]) -> None:
+        """
+        複数月・複数種別の給与情報を1回のWebDriverセッション（1回のログイン）でアップロードする
+        
+        入力モーダルは最初に1回だけ開き、給与情報ごとに登録日だけを切り替えて登録する。
+        
+        Args:
+            salaries: 登録する給与情報（指定した順に登録する）
+        """
+        try:
+            targets = self.confirm(salaries)
+            if not targets:
+                return
+            self.check_categories(targets)
+            self._await_session()
+            with Logger.span("uploader.register"):
+                Logger.logInfo(f"{len(targets)}件の給与情報の控除項目を登録します。")
+                self._close_modal_if_present()
+                self._navigate_to_input_page()
+                self._prepare_categories(targets)
+                for salary in targets:
+                    self.salary = salary
+                    with Logger.span("uploader.salary", label=salary.get_payday()):
+                        Logger.logInfo(f"{salary.get_payday()}の{salary.kind.value}の控除項目を登録します。")
+                        self._register_deduction_sum_as_income()
+                        self._register_deduction_items()
+                Logger.logInfo("すべての控除項目の登録が完了しました。")
+            self._save_session()
+        finally:
+            self.close()
+
+    def confirm(self, salaries: list[Salary]) -> list[Salary]:
+        """
+        給与情報ごとに登録日を確認する
+        
+        Args:
+            salaries: 登録する給与情報
+        
+        Returns:
+            登録日を確定した給与情報（キャンセルしたものは除く）
+        """
+        targets = []
+        for salary in salaries:
+            self.salary = salary
+            if self._confirm_registration():
+                targets.append(salary)
+        return targets
+
+    def check_categories(self, salaries: list[Salary]) -> None:
+        """
+        登録する項目のカテゴリがMoneyForwardにあるかを保存したカテゴリで確認する（ブラウザの起動前）
+        
+        保存したカテゴリがない・期限切れの場合は、入力フォームを開いた後に取得して確認する。
+        
+        Args:
+            salaries: 登録する給与情報
+        
+        Raises:
+            ValueError: MoneyForwardにないカテゴリがある場合
+        """
+        self.categoryTree = self.categoryCache.load()
+        if self.categoryTree is None:
+            return
+        unknown = self.categoryTree.find_unknown(item for salary in salaries for item in salary.deductionItems)
+        if unknown:
+            # MoneyForwardでカテゴリを追加した場合に備え、次回は入力フォームから取得し直す
+            self.categoryCache.clear()
+            raise ValueError(self._format_unknown_categories(unknown))
+
+    def _prepare_categories(self, salaries: list[Salary]) -> None:
+        """
+        カテゴリを保存していない場合は入力フォームから取得して保存し、登録する項目のカテゴリを確認する
+        
+        Args:
+            salaries: 登録する給与情報
+        
+        Raises:
+            ValueError: MoneyForwardにないカテゴリがある場合
+        """
+        if self.categoryTree is not None:
+            return
+        tree = self._scrape_category_tree()
+        if tree is None:
+            return
+        self.categoryTree = tree
+        self.categoryCache.save(tree)
+        unknown = tree.find_unknown(item for salary in salaries for item in salary.deductionItems)
+        if unknown:
+            raise ValueError(self._format_unknown_categories(unknown))
+
+    def _scrape_category_tree(self) -> Optional[CategoryTree]:
+        """入力フォームのドロップダウンからカテゴリとIDを取得する（取得できない場合None）"""
+        try:
+            categories = self.driver.execute_script(self.SCRIPT_CATEGORY_TREE)
+        except WebDriverException as e:
+            Logger.logFine(f"カテゴリの取得に失敗: {e}")
+            return None
+        if not isinstance(categories, dict):
+            return None
+        tree = CategoryTree(categories)
+        if not tree.is_valid():
+            Logger.logFine("カテゴリのIDを取得できないためドロップダウンから選択します。")
+            return None
+        Logger.logFine(f"{len(categories)}件の大項目を取得しました。")
+        return tree
+
+    def _format_unknown_categories(self, unknown: list[tuple[str, str]]) -> str:
+        """MoneyForwardにないカテゴリのエラーメッセージを作成する"""
+        categories = ", ".join(f"{category}/{subcategory}" for category, subcategory in unknown)
+        return self.ERROR_UNKNOWN_CATEGORIES.format(categories=categories)
+
+    def start_session_in_background(self) -> None:
+        """
+        WebDriverの起動とMoneyForwardへのログインを別スレッドで開始する
+        
+        PDFの読み込みや登録日の確認と並行して行い、upload()・upload_all()は完了を待ってから登録する。
+        起動・ログインの失敗はupload()・upload_all()で送出する。
+        別スレッドのログは登録日の確認のプロンプトに混ざらないよう、完了を待つまで出力を保留する。
+        """
+        if self.sessionThread is not None or self.driver is not None:
+            return
+        self.sessionCancel.clear()
+        self.sessionFinished = False
+        self.sessionAbandoned = False
+        # プロセスの終了時に中止したWebDriverの終了を待つため、デーモンスレッドにしない
+        self.sessionThread = threading.Thread(target=self._run_session_thread, name="uploader-session")
+        self.sessionThread.start()
+    
+    def _run_session_thread(self) -> None:
+        """
+        別スレッド: WebDriverを起動してログインする（例外は登録時に送出するため保持する）
+        
+        中止された場合は起動・ページへのアクセス・ログインの次の段階へ進まない。
+        close()が完了を待たずに戻った場合は、このスレッドでWebDriverを終了する。
+        """
+        Logger.hold(threading.get_ident())
+        try:
+            self._start_session()
+        except Exception as e:
+            self.sessionError = e
+        finally:
+            with self.sessionLock:
+                self.sessionFinished = True
+                abandoned = self.sessionAbandoned
+            if abandoned:
+                self._close_browser()
+    
+    def _await_session(self) -> None:
+        """WebDriverの起動とログインを完了させる（別スレッドで開始済みの場合は完了を待つ）"""
+        if self.sessionThread is None:
+            self._start_session()
+            return
+        with Logger.span("uploader.session_wait"):
+            self.sessionThread.join()
+        Logger.release(self.sessionThread.ident)
+        self.sessionThread = None
+        if self.sessionError is not None:
+            error, self.sessionError = self.sessionError, None
+            raise error
+    
+    def _start_session(self) -> None:
+        """WebDriverを起動し、MoneyForwardへログインする（保存したセッションが有効であればログインを省略する）"""
+        with Logger.span("uploader.webdriver"):
+            self._init_webdriver()
+        if self.sessionCancel.is_set():
+            return
+        self._sign_in()
+
+    def _sign_in(self) -> None:
+        """MoneyForwardへアクセスしてログインする（保存したセッションが有効であればログインを省略する）"""
+        if self.daemon is not None and self._is_session_valid():
+            # 常駐ブラウザはログイン済みのため、ページを読み込み直さずに使う
+            Logger.logInfo("常駐ブラウザのログインセッションを使用します。")
+            return
+        with Logger.span("uploader.access"):
+            self._access_moneyforward()
+        if self.sessionCancel.is_set():
+            # 使わない2段階認証のコードでログインしない
+            return
+        with Logger.span("uploader.login"):
+            if not self._restore_session():
+                self._login()
+                self._save_session()
+
     def _confirm_registration(self) -> bool:
         """
         給与登録の確認を行います
         
         Returns:
             登録を続行する場合True、キャンセルする場合False
+        
+        Raises:
+            ValueError: 自動承認で登録日の決め方が不正な場合
         """
+        if self.autoApprove:
+            return self._approve_automatically()
+        
         default_date = config.data.get_default_date()
         date_input = input(f"{self.MSG_CONFIRM_REGISTRATION}({default_date}日): ") or default_date
 
@@ -121,6 +614,26 @@ class Uploader:
             print(self.MSG_CANCELLED)
             return False
 
+    def _approve_automatically(self) -> bool:
+        """
+        登録日を給料日の決め方（DefaultDate・PaydayAdjustment、起動引数の指定を優先）で決め、確認せずに登録する
+        
+        Returns:
+            登録日を設定できた場合True
+        
+        Raises:
+            ValueError: 登録日の決め方が不正な場合
+        """
+        rule = PaydayRule(
+            self.paydayDate if self.paydayDate is not None else config.data.get_default_date(),
+            self.paydayAdjustment or config.data.get_payday_adjustment()
+        )
+        if not self.salary.set_date(rule.resolve(self.salary.year, self.salary.month)):
+            Logger.logError(self.MSG_INVALID_DATE)
+            return False
+        Logger.logInfo(self.LOG_AUTO_APPROVED.format(payday=self.salary.get_payday()))
+        return True
+
     def _init_webdriver(self) -> None:
         """
         WebDriverの初期化を行います
@@ -129,20 +642,31 @@ class Uploader:
             Exception: WebDriverの初期化に失敗した場合
         """
         Logger.logFine("WebDriverの初期化を行います。")
+        if self.profileDir is None and config.data.is_browser_daemon_used() and self._attach_browser_daemon():
+            return
         
         try:
             options = webdriver.ChromeOptions()
             
             if config.data.is_headless_mode():
                 options = self._add_headless_settings(options)
+            if config.data.is_lean_browser():
+                options = self._add_lean_settings(options)
+            if self.profileDir:
+                options.add_argument(f"--user-data-dir={os.path.abspath(self.profileDir)}")
+            if self.debugPort:
+                options.add_argument(f"--remote-debugging-port={self.debugPort}")
             
             self.driver = webdriver.Chrome(options=options)
-            self.driver.implicitly_wait(UIConstants.DEFAULT_WAIT_TIMEOUT)
+            # 要素の出現は明示的な待機条件で待つ（暗黙の待機は要素がない場合に毎回待たされる）
+            self.driver.implicitly_wait(0)
             self.driver.set_window_size(
                 UIConstants.WINDOW_WIDTH, 
                 UIConstants.WINDOW_HEIGHT
             )
             self.actions = ActionChains(self.driver)
+            if config.data.is_lean_browser():
+                self._block_resources()
             
             Logger.logFine("WebDriverの初期化に成功しました。")
         except Exception as e:
@@ -150,6 +674,61 @@ class Uploader:
                 self.driver.quit()
             raise Exception(f"WebDriverの初期化に失敗しました: {str(e)}")
 
+    def _attach_browser_daemon(self) -> bool:
+        """
+        常駐ブラウザ(upload.py daemon)が起動していれば、そのChromeを借りて接続する
+        
+        Returns:
+            接続した場合True、常駐ブラウザがない・使用中・接続できない場合False
+        """
+        client = DaemonClient()
+        address = client.acquire()
+        if address is None:
+            return False
+        
+        try:
+            options = webdriver.ChromeOptions()
+            options.add_experimental_option("debuggerAddress", address)
+            self.driver = webdriver.Chrome(options=options)
+        except Exception as e:
+            Logger.logWarning(f"常駐ブラウザに接続できないためChromeを起動します: {e}")
+            client.release()
+            self.driver = None
+            return False
+        
+        self.daemon = client
+        self.driver.implicitly_wait(0)
+        self.actions = ActionChains(self.driver)
+        if config.data.is_lean_browser():
+            self._block_resources()
+        Logger.logInfo(f"常駐ブラウザに接続しました({address})。")
+        return True
+
+    def close(self) -> None:
+        """起動・ログインを中止してWebDriverを終了する（常駐ブラウザの場合はChromeを終了せずに返却する）"""
+        if self.sessionThread is not None:
+            # 登録せずに終了する場合は起動・ログインを中止し、実行中の段階の終了を一定時間だけ待つ
+            self.sessionCancel.set()
+            self.sessionThread.join(self.SESSION_CANCEL_TIMEOUT_SECONDS)
+            Logger.release(self.sessionThread.ident)
+            self.sessionThread = None
+            with self.sessionLock:
+                # 終了していない場合は、実行中の段階が終わり次第、別スレッドでWebDriverを終了する
+                self.sessionAbandoned = not self.sessionFinished
+            Logger.logFine(self.LOG_SESSION_CANCELLED)
+            if self.sessionAbandoned:
+                return
+        self._close_browser()
+    
+    def _close_browser(self) -> None:
+        """WebDriverを終了し、借りている常駐ブラウザを返却する"""
+        if self.driver:
+            # 常駐ブラウザに接続したセッションはquit()でもChromeを終了しない（chromedriverのみ終了する）
+            self.driver.quit()
+        if self.daemon is not None:
+            self.daemon.release()
+            self.daemon = None
+
     def _add_headless_settings(self, options: webdriver.ChromeOptions) -> webdriver.ChromeOptions:
         """
         ヘッドレスモード(画面非表示)の設定を追加する
@@ -179,17 +758,54 @@ class Uploader:
         options.add_argument("--disable-blink-features=AutomationControlled")
         return options
 
+    def _add_lean_settings(self, options: webdriver.ChromeOptions) -> webdriver.ChromeOptions:
+        """
+        省メモリのブラウザ(UseLeanBrowser)の設定を追加する
+        
+        画像を読み込まず、登録に使わない機能（拡張機能・同期・翻訳・バックグラウンド通信など）を止めて
+        レンダラーのメモリ使用量を抑える。複数ワーカーで登録する場合に1台で起動できるセッション数が増える。
+        
+        Args:
+            options: Chromeオプション
+        
+        Returns:
+            省メモリの設定を追加したChromeオプション
+        """
+        options.add_experimental_option("prefs", dict(self.LEAN_PREFS))
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-sync")
+        options.add_argument("--disable-default-apps")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--disable-component-update")
+        options.add_argument("--disable-features=Translate,OptimizationHints,MediaRouter,AutofillServerCommunication")
+        options.add_argument("--renderer-process-limit=2")
+        options.add_argument("--mute-audio")
+        return options
+
+    def _block_resources(self) -> None:
+        """
+        登録に不要なURL(LEAN_BLOCKED_URLS)の読み込みをDevToolsプロトコルで止める
+        
+        ブロックできない場合（Chrome以外など）は警告して通常どおり読み込む。
+        """
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(self.LEAN_BLOCKED_URLS)})
+        except (AttributeError, WebDriverException) as e:
+            Logger.logWarning(f"不要なリソースの読み込みを止められませんでした: {e}")
+
     def _access_moneyforward(self) -> None:
         """Webページへのアクセスを行います"""
         Logger.logFine("MoneyForwardのページにアクセスしています。")
-        self.driver.get(self.MONEYFORWARD_URL)
-        self.driver.implicitly_wait(10)
+        self.driver.get(self.moneyforwardUrl)
+        self._wait_until_ready()
         Logger.logFine("MoneyForwardのページにアクセス完了しました。")
 
     def _login(self) -> None:
         """MoneyForwardMeサービスへのログインを行います"""
         Logger.logInfo("ログインしています。")
-        wait = WebDriverWait(self.driver, UIConstants.DEFAULT_WAIT_TIMEOUT)
+        wait = self._wait()
 
         # 初期ページ > ログイン遷移
         main_menu = wait.until(
@@ -215,24 +831,93 @@ class Uploader:
 
         # 2段階認証
         elem = wait.until(EC.presence_of_element_located((By.ID, self.ID_OTP)))
-        totp = pyotp.TOTP(self.tfaid)
-        elem.send_keys(totp.now())
+        elem.send_keys(self._next_totp_code())
         elem.submit()
-        time.sleep(UIConstants.MEDIUM_SLEEP)
+        # ログイン後のページへの遷移完了を待つ
+        wait.until(EC.staleness_of(elem))
+        self._wait_until_ready()
 
         Logger.logInfo("ログインが完了しました。")
 
+    def _next_totp_code(self) -> str:
+        """
+        2段階認証のコードを取得する
+        
+        同じプロセス内の直前のログイン（複数ワーカーでの登録等）と同じステップの場合は、
+        使用済みのコードを再び送らないよう次のステップまで待つ。
+        
+        Returns:
+            2段階認証のコード
+        """
+        totp = pyotp.TOTP(self.tfaid)
+        with Uploader._totpLock:
+            now = time.time()
+            next_step_time = (Uploader._lastTotpStep + 1) * totp.interval
+            if now < next_step_time:
+                Logger.logInfo(self.LOG_TOTP_WAIT.format(seconds=next_step_time - now))
+                time.sleep(next_step_time - now)
+                now = max(time.time(), next_step_time)
+            Uploader._lastTotpStep = int(now // totp.interval)
+            return totp.at(int(now))
+    
+    def _restore_session(self) -> bool:
+        """
+        保存したログインセッション(Cookie)を復元する
+        
+        Returns:
+            復元したセッションでログイン済みの場合True、ログインが必要な場合False
+        """
+        if self.sessionStore is None:
+            return False
+        cookies = self.sessionStore.load()
+        if not cookies:
+            return False
+        
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except WebDriverException:
+                # 現在のページと異なるドメインのCookieは設定できないため除く
+                continue
+        
+        if self._is_session_valid():
+            Logger.logInfo("保存したログインセッションを使用します（ログインを省略します）。")
+            return True
+        
+        Logger.logInfo("保存したログインセッションが無効なためログインします。")
+        self.sessionStore.clear()
+        self.driver.delete_all_cookies()
+        self._access_moneyforward()
+        return False
+
+    def _is_session_valid(self) -> bool:
+        """/cfページへのHEADリクエスト1回でログイン済みかを確認する"""
+        self.driver.set_script_timeout(self.waitTimeout)
+        try:
+            return bool(self.driver.execute_async_script(self.SCRIPT_SESSION_CHECK, self.cfUrl))
+        except WebDriverException as e:
+            Logger.logFine(f"ログインセッションの確認に失敗: {e}")
+            return False
+
+    def _save_session(self) -> None:
+        """ログインセッション(Cookie)を保存する（保存できない場合は次回ログインする）"""
+        if self.sessionStore is None:
+            return
+        try:
+            self.sessionStore.save(self.driver.get_cookies())
+        except (OSError, WebDriverException) as e:
+            Logger.logWarning(f"ログインセッションを保存できませんでした: {e}")
+
     def _register_deductions(self) -> None:
         """給与控除の登録を行います"""
         Logger.logInfo("控除項目の登録を行います。")
-
-        time.sleep(UIConstants.LONG_SLEEP)
         
         # モーダルを閉じる（高速化）
         self._close_modal_if_present()
         
         # 給与登録ページへ遷移
         self._navigate_to_input_page()
+        self._prepare_categories([self.salary])
 
         # 控除合計→控除項目の順に登録
         self._register_deduction_sum_as_income()
@@ -249,7 +934,7 @@ class Uploader:
             )
             if close_buttons and close_buttons[0].is_displayed():
                 close_buttons[0].click()
-                time.sleep(UIConstants.SHORT_SLEEP)
+                self._wait().until(EC.invisibility_of_element(close_buttons[0]))
         except Exception:
             # モーダルが存在しない場合は無視
             pass
@@ -257,13 +942,12 @@ class Uploader:
     def _navigate_to_input_page(self) -> None:
         """給与入力ページへ遷移する"""
         try:
-            wait = WebDriverWait(self.driver, UIConstants.DEFAULT_WAIT_TIMEOUT)
+            wait = self._wait()
             
             # まず /cf ページにアクセス
-            cf_url = "https://moneyforward.com/cf"
-            Logger.logFine(f"/cfページへアクセス: {cf_url}")
-            self.driver.get(cf_url)
-            time.sleep(UIConstants.LONG_SLEEP)
+            Logger.logFine(f"/cfページへアクセス: {self.cfUrl}")
+            self.driver.get(self.cfUrl)
+            self._wait_until_ready()
             
             Logger.logFine(f"現在のURL: {self.driver.current_url}")
             
@@ -275,10 +959,7 @@ class Uploader:
                 manual_input_btn = wait.until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, "button.cf-new-btn.modal-switch"))
                 )
-                # クリック前に少し待機
-                time.sleep(UIConstants.SHORT_SLEEP)
                 self.driver.execute_script("arguments[0].click();", manual_input_btn)
-                time.sleep(UIConstants.LONG_SLEEP)
                 Logger.logFine("手入力ボタンをクリックしました。")
                 
                 # Bootstrap モーダルを明示的に表示
@@ -287,35 +968,18 @@ class Uploader:
                         $('#user_asset_act_new').modal('show');
                     }
                 """)
-                time.sleep(UIConstants.MEDIUM_SLEEP)
                 modal_opened = True
             except Exception as e:
                 Logger.logFine(f"手入力ボタンのクリック失敗: {e}")
             
-            # モーダルフォームの確認（複数のセレクタを試行）
-            form_found = False
-            form_selectors = [
-                (By.ID, "form-user-asset-act"),
-                (By.ID, self.ID_AMOUNT),
-                (By.ID, self.ID_IS_INCOME_MODAL),
-                (By.CSS_SELECTOR, "#user_asset_act_new .modal-body"),
-                (By.CSS_SELECTOR, "form[action*='user_asset_act']"),
-            ]
-            
-            for selector_type, selector_value in form_selectors:
-                try:
-                    elem = wait.until(EC.visibility_of_element_located((selector_type, selector_value)))
-                    form_found = True
-                    Logger.logFine(f"フォーム要素を確認: {selector_value}")
-                    break
-                except Exception:
-                    continue
-            
-            if not form_found:
+            # モーダルフォームの確認（すべての候補セレクタを1つの待機でまとめて確認）
+            selector = self._wait_for_input_form()
+            if selector is None:
                 # デバッグ用にHTMLを保存
                 Logger.logError("モーダルフォームが見つかりません。")
                 self._save_debug_html(self.DEBUG_HTML_PATH)
                 raise Exception("モーダルフォームが表示されていません")
+            Logger.logFine(f"フォーム要素を確認: {selector}")
                 
         except Exception as e:
             Logger.logError(f"入力ページへの遷移に失敗: {e}")
@@ -323,6 +987,52 @@ class Uploader:
             Logger.logInfo(f"ページのHTMLを {self.DEBUG_HTML_PATH} に保存しました。")
             raise
 
+    def _wait_for_input_form(self) -> Optional[str]:
+        """
+        入力フォームが表示されるまで待つ
+        
+        候補のセレクタを1回のスクリプト実行でまとめて確認するため、フォームが表示されない場合も
+        上限時間(WaitTimeoutSeconds)1回分で判定できる。前回一致したセレクタは先に確認し、次回のために保存する。
+        
+        Returns:
+            最初に一致したセレクタ、上限時間内に表示されなかった場合None
+        """
+        selectors = self._ordered_form_selectors()
+        try:
+            selector = self._wait().until(
+                lambda driver: driver.execute_script(self.SCRIPT_FIND_FORM, selectors)
+            )
+        except TimeoutException:
+            return None
+        
+        if selector in self.FORM_SELECTORS and selector != selectors[0]:
+            self._save_form_selector(selector)
+        return selector
+    
+    def _ordered_form_selectors(self) -> list[str]:
+        """前回一致したセレクタを先頭にした候補のセレクタを取得する"""
+        selectors = list(self.FORM_SELECTORS)
+        try:
+            with open(self.formSelectorFile, "r", encoding="utf-8") as f:
+                preferred = f.read().strip()
+        except OSError:
+            return selectors
+        if preferred in selectors:
+            selectors.remove(preferred)
+            selectors.insert(0, preferred)
+        return selectors
+    
+    def _save_form_selector(self, selector: str) -> None:
+        """一致したセレクタを保存する（保存できない場合は無視する）"""
+        try:
+            os.makedirs(os.path.dirname(self.formSelectorFile), exist_ok=True)
+            tmp_path = f"{self.formSelectorFile}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(selector)
+            os.replace(tmp_path, self.formSelectorFile)
+        except OSError:
+            pass
+
     def _register_deduction_sum_as_income(self) -> None:
         """控除項目の合計を収入として登録します"""
         sum_item = next(
@@ -350,8 +1060,147 @@ class Uploader:
             item: 登録する項目
             is_income: 収入として登録するか
         """
-        wait = WebDriverWait(self.driver, UIConstants.DEFAULT_WAIT_TIMEOUT)
+        if self.journal and self.journal.is_registered(self.salary, item):
+            Logger.logInfo(self.LOG_ALREADY_REGISTERED.format(name=item.name))
+            return
+        if self._is_existing_entry(item, is_income):
+            Logger.logInfo(self.LOG_ALREADY_EXISTS.format(name=item.name))
+            return
+        
+        wait = self._wait()
+        if self.throttle:
+            self.throttle()
+        
+        with Logger.span("uploader.item", label=item.name):
+            if self._fill_item(item, is_income):
+                # 一括入力では送信と登録の完了の確認まで行っている（次の入力フォームを待つ前に記録する）
+                self._record_registration(item)
+                self._continue_input()
+            else:
+                self._fill_item_step_by_step(wait, item, is_income)
+                self._submit_and_continue(
+                    wait, item.name, is_income, on_submitted=lambda: self._record_registration(item)
+                )
+    
+    def _record_registration(self, item: Item) -> None:
+        """登録が完了した項目を記録する（記録しない設定の場合は何もしない）"""
+        if self.journal:
+            self.journal.record(self.salary, item)
+    
+    def _is_existing_entry(self, item: Item, is_income: bool) -> bool:
+        """
+        同じ日付・金額・内容の入出金がMoneyForwardに登録済みかを確認する（該当する入出金は消し込む）
         
+        Args:
+            item: 登録する項目
+            is_income: 収入として登録するか
+        
+        Returns:
+            登録済みの場合True（確認しない設定・一覧を取得できない場合はFalse）
+        """
+        if not self.skipExisting:
+            return False
+        index = self._existing_entries(self.salary.year, self.salary.month)
+        if index is None:
+            return False
+        amount = abs(item.amount) if is_income else -abs(item.amount)
+        return index.take(self.salary.get_payday(), amount, item.name)
+    
+    def _existing_entries(self, year: int, month: int) -> Optional[EntryIndex]:
+        """
+        月ごとの入出金一覧を1回だけ取得して索引を作成する
+        
+        入力モーダルを開いたまま、ブラウザ内で/cfの月の一覧を読み込んで表の各行を取得する。
+        
+        Args:
+            year: 年
+            month: 月
+        
+        Returns:
+            登録済みの入出金の索引（取得できない場合None）
+        """
+        if (year, month) in self.existingEntries:
+            return self.existingEntries[(year, month)]
+        
+        url = self.cfUrl + self.CF_MONTH_QUERY.format(year=year, month=month)
+        self.driver.set_script_timeout(self.waitTimeout)
+        error: object = "一覧がありません"
+        with Logger.span("uploader.existing", label=f"{year}/{month:02}"):
+            try:
+                rows = self.driver.execute_async_script(self.SCRIPT_EXISTING_ENTRIES, url)
+            except WebDriverException as e:
+                rows, error = None, e
+        
+        index = None
+        if isinstance(rows, list):
+            index = EntryIndex(rows, year)
+            Logger.logInfo(self.LOG_EXISTING_ENTRIES.format(year=year, month=month, count=len(index)))
+        else:
+            Logger.logWarning(self.LOG_EXISTING_ENTRIES_FAILED.format(error=error))
+        self.existingEntries[(year, month)] = index
+        return index
+    
+    def _fill_item(self, item: Item, is_income: bool) -> bool:
+        """
+        1回のスクリプト実行(SCRIPT_FILL_ITEM)で項目を入力して送信し、登録の完了を待つ
+        
+        Args:
+            item: 登録する項目
+            is_income: 収入として登録するか
+        
+        Returns:
+            登録できた場合True、一括入力を使わない・送信前に失敗した場合False（1項目ずつ入力し直す）
+        
+        Raises:
+            TimeoutException: 送信後に登録の完了を確認できなかった場合（二重登録を避けるため入力し直さない）
+            WebDriverException: スクリプトを実行できなかった場合（送信したか分からないため入力し直さない）
+        """
+        if not self.fastFill:
+            return False
+        
+        args = {
+            "ids": {
+                "isIncome": self.ID_IS_INCOME,
+                "isIncomeModal": self.ID_IS_INCOME_MODAL,
+                "subAccount": self.ID_SUB_ACCOUNT,
+                "amount": self.ID_AMOUNT,
+                "large": self.ID_LARGE_CATEGORY,
+                "middle": self.ID_MIDDLE_CATEGORY,
+                "largeField": self.ID_LARGE_CATEGORY_FIELD,
+                "middleField": self.ID_MIDDLE_CATEGORY_FIELD,
+                "content": self.ID_CONTENT,
+                "date": self.ID_DATE,
+                "confirmation": self.ID_CONFIRMATION_BTN,
+            },
+            "isIncome": '1' if is_income else '0',
+            "tabClass": self.CLASS_PLUS_PAYMENT if is_income else self.CLASS_MINUS_PAYMENT,
+            "optionNone": self.OPTION_NONE,
+            "amount": str(abs(item.amount)),
+            "category": item.category,
+            "subcategory": item.subcategory,
+            "categoryIds": self.categoryTree.ids(item.category, item.subcategory) if self.categoryTree else None,
+            "content": item.name,
+            "date": self.salary.get_payday(),
+            "timeoutMs": int(self.waitTimeout * 1000),
+        }
+        # スクリプト内の入力・送信の待機が上限時間で失敗を返せるよう、呼び出しの上限は余裕を持たせる
+        self.driver.set_script_timeout(self.waitTimeout * 2 + 1)
+        result = self.driver.execute_async_script(self.SCRIPT_FILL_ITEM, args)
+        
+        if isinstance(result, dict) and result.get("ok") is True:
+            income_type = '収入' if is_income else '支出'
+            Logger.logFine(f"{item.name} ({income_type}) の登録に成功しました。")
+            return True
+        
+        step, error = (result.get("step"), result.get("error")) if isinstance(result, dict) else (None, result)
+        if isinstance(result, dict) and result.get("submitted"):
+            raise TimeoutException(f"{item.name} の登録の完了を確認できませんでした({step}): {error}")
+        Logger.logFine(f"一括入力に失敗したため1項目ずつ入力します({step}): {error}")
+        self.fastFill = False
+        return False
+    
+    def _fill_item_step_by_step(self, wait: WebDriverWait, item: Item, is_income: bool) -> None:
+        """項目を1つずつ入力する（画面の要素ごとに操作と待機を行う）"""
         try:
             self._set_income_expense_type(is_income)
             self._set_sub_account(wait)
@@ -365,43 +1214,26 @@ class Uploader:
         self._set_content(wait, item.name)
         self._set_date(wait)
         self._confirm_income_expense_field(is_income)
-        self._submit_and_continue(wait, item.name, is_income)
     
     def _set_income_expense_type(self, is_income: bool) -> None:
         """収入/支出の切り替え"""
         # モーダル用のIDを使用（/cfページのフォーム）
         field_id = self.ID_IS_INCOME_MODAL
         
-        # まずhidden fieldの値を設定
+        # hidden fieldの値を設定し、タブをクリックして切り替える
         value = '1' if is_income else '0'
-        self.driver.execute_script(
+        tab_class = self.CLASS_PLUS_PAYMENT if is_income else self.CLASS_MINUS_PAYMENT
+        tab = self.driver.execute_script(
             f"var elem = document.getElementById('{field_id}'); "
-            f"if (elem) elem.value = '{value}';"
+            f"if (elem) elem.value = '{value}'; "
+            f"var tab = document.querySelector('input.{tab_class}'); "
+            f"if (tab) {{ tab.click(); var label = tab.closest('label'); if (label) label.click(); }} "
+            f"return tab;"
         )
         
-        # タブをクリックして切り替え
-        time.sleep(UIConstants.SHORT_SLEEP)
-        if is_income:
-            # 収入タブをクリック
-            self.driver.execute_script("""
-                var tab = document.querySelector('input.plus-payment');
-                if (tab) {
-                    tab.click();
-                    var label = tab.closest('label');
-                    if (label) label.click();
-                }
-            """)
-        else:
-            # 支出タブをクリック
-            self.driver.execute_script("""
-                var tab = document.querySelector('input.minus-payment');
-                if (tab) {
-                    tab.click();
-                    var label = tab.closest('label');
-                    if (label) label.click();
-                }
-            """)
-        time.sleep(UIConstants.SHORT_SLEEP)
+        # クリックしたタブが選択状態になるまで待つ（タブがない画面では待たない）
+        if tab is not None:
+            self._wait().until(lambda driver: tab.is_selected())
     
     def _set_sub_account(self, wait: WebDriverWait) -> None:
         """支出・収入金額の出所を'なし'へ設定"""
@@ -432,26 +1264,26 @@ class Uploader:
     
     def _set_categories(self, wait: WebDriverWait, item: Item) -> None:
         """大カテゴリと中カテゴリを設定"""
-        # 大項目
+        # 大項目（ドロップダウンが開いてリンクが表示されてからクリックする）
         large_btn = wait.until(EC.presence_of_element_located((By.ID, self.ID_LARGE_CATEGORY)))
         self.driver.execute_script("arguments[0].click();", large_btn)
-        time.sleep(UIConstants.SHORT_SLEEP)
         
-        large_link = wait.until(EC.presence_of_element_located(
+        large_link = wait.until(EC.visibility_of_element_located(
             (By.XPATH, f'//a[text()="{item.category}" and @class="l_c_name"]')
         ))
         self.driver.execute_script("arguments[0].click();", large_link)
+        # 大項目の選択が反映され、中項目の一覧が切り替わるまで待つ
+        wait.until(EC.text_to_be_present_in_element((By.ID, self.ID_LARGE_CATEGORY), item.category))
 
         # 中項目
-        time.sleep(UIConstants.SHORT_SLEEP)
         middle_btn = wait.until(EC.presence_of_element_located((By.ID, self.ID_MIDDLE_CATEGORY)))
         self.driver.execute_script("arguments[0].click();", middle_btn)
-        time.sleep(UIConstants.SHORT_SLEEP)
         
-        middle_link = wait.until(EC.presence_of_element_located(
+        middle_link = wait.until(EC.visibility_of_element_located(
             (By.XPATH, f'//a[text()="{item.subcategory}" and @class="m_c_name"]')
         ))
         self.driver.execute_script("arguments[0].click();", middle_link)
+        wait.until(EC.text_to_be_present_in_element((By.ID, self.ID_MIDDLE_CATEGORY), item.subcategory))
     
     def _set_content(self, wait: WebDriverWait, content: str) -> None:
         """内容を設定"""
@@ -476,23 +1308,69 @@ class Uploader:
             f"if (elem) elem.value = '{value}';"
         )
     
-    def _submit_and_continue(self, wait: WebDriverWait, item_name: str, is_income: bool) -> None:
-        """フォームを送信し、続けて入力する"""
+    def _submit_and_continue(
+        self,
+        wait: WebDriverWait,
+        item_name: str,
+        is_income: bool,
+        on_submitted: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        フォームを送信し、続けて入力する
+        
+        Args:
+            wait: 待機に使うWebDriverWait
+            item_name: 項目名
+            is_income: 収入として登録するか
+            on_submitted: 登録の完了（続けて入力するボタンの表示）を確認した時点で呼び出す処理
+        """
         # 登録
-        time.sleep(UIConstants.SHORT_SLEEP)
         elem = wait.until(EC.presence_of_element_located((By.ID, self.ID_CONTENT)))
         elem.submit()
         
         income_type = '収入' if is_income else '支出'
         Logger.logFine(f"{item_name} ({income_type}) の登録に成功しました。")
 
-        # 続けて入力する
-        time.sleep(UIConstants.LONG_SLEEP)
+        # 続けて入力する（登録完了後に表示されるボタン）
         confirm_btn = wait.until(
             EC.element_to_be_clickable((By.ID, self.ID_CONFIRMATION_BTN))
         )
+        # ボタンの表示で登録の完了が分かるため、以降の待機が失敗しても登録済みとして扱う
+        if on_submitted:
+            on_submitted()
         confirm_btn.click()
-        time.sleep(UIConstants.SHORT_SLEEP)
+        # 次の入力フォームが表示され、通信が終わるまで待つ
+        wait.until(EC.invisibility_of_element_located((By.ID, self.ID_CONFIRMATION_BTN)))
+        self._wait_until_ready()
+    
+    def _continue_input(self) -> None:
+        """
+        続けて入力するボタンを押し、次の入力フォームが表示されて通信が終わるまで待つ（1回のスクリプト実行）
+        
+        Raises:
+            TimeoutException: 上限時間内に次の入力フォームが表示されなかった場合
+        """
+        self.driver.set_script_timeout(self.waitTimeout + 1)
+        result = self.driver.execute_async_script(
+            self.SCRIPT_CONTINUE_INPUT,
+            {"buttonId": self.ID_CONFIRMATION_BTN, "timeoutMs": int(self.waitTimeout * 1000)}
+        )
+        if not (isinstance(result, dict) and result.get("ok") is True):
+            error = result.get("error") if isinstance(result, dict) else result
+            raise TimeoutException(f"次の入力フォームが表示されませんでした: {error}")
+    
+    def _wait(self) -> WebDriverWait:
+        """設定した上限時間(WaitTimeoutSeconds)まで条件を待つWebDriverWaitを作成する"""
+        return WebDriverWait(self.driver, self.waitTimeout)
+    
+    def _wait_until_ready(self) -> None:
+        """
+        ページの読み込み完了と通信の終了(jQuery.activeが0)を待つ
+        
+        Raises:
+            TimeoutException: 上限時間内に完了しなかった場合
+        """
+        self._wait().until(lambda driver: driver.execute_script(self.SCRIPT_PAGE_READY))
     
     def _save_debug_html(self, filepath: str) -> None:
         """デバッグ用にHTMLを保存"""
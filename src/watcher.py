@@ -0,0 +1,309 @@
+import ctypes
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Final, NamedTuple, Optional
+
+import pypdfium2 as pdfium
+
+from logger import Logger
+from reader import SalaryReader
+from salary import Salary
+from common import SalaryKind, DirectoryNames
+import config
+
+
+class PendingFile(NamedTuple):
+    """取り込み待ちの給与明細PDF"""
+    since: float
+    size: int
+    mtimeNs: int
+    attempts: int = 0
+
+
+class Inotify:
+    """
+    inotify(Linux)でディレクトリ内のファイルの書き込み完了・移動を監視するクラス
+    
+    libcの関数をctypesで呼び出す。inotifyが使えない環境では生成時にOSErrorを送出する。
+    """
+    
+    # inotify_init1のフラグ
+    IN_NONBLOCK: Final[int] = 0o4000
+    IN_CLOEXEC: Final[int] = 0o2000000
+    # 監視するイベント（書き込み、書き込み完了、移動による追加）
+    IN_MODIFY: Final[int] = 0x00000002
+    IN_CLOSE_WRITE: Final[int] = 0x00000008
+    IN_MOVED_TO: Final[int] = 0x00000080
+    WATCH_MASK: Final[int] = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO
+    
+    # inotify_event構造体のヘッダー（wd, mask, cookie, len）
+    EVENT_HEADER: Final[struct.Struct] = struct.Struct("iIII")
+    READ_SIZE: Final[int] = 64 * 1024
+    
+    def __init__(self, directory: str) -> None:
+        """
+        ディレクトリの監視を開始する
+        
+        Args:
+            directory: 監視するディレクトリ
+        
+        Raises:
+            OSError: inotifyが使えない場合
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotifyはLinuxでのみ使用できます。")
+        
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), self.WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, os.strerror(errno), directory)
+    
+    def read(self, timeout: float) -> list[str]:
+        """
+        イベントが発生したファイル名を取得する
+        
+        Args:
+            timeout: イベントを待つ最大秒数
+        
+        Returns:
+            イベントが発生したファイル名（イベントがない場合は空）
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, self.READ_SIZE)
+        except BlockingIOError:
+            return []
+        
+        names = []
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\x00")
+            offset += length
+            if name:
+                names.append(os.fsdecode(name))
+        return names
+    
+    def close(self) -> None:
+        """監視を終了する"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class SalaryWatcher:
+    """
+    給与明細ディレクトリ(salaryData)を監視し、追加された給与明細PDFを読み取るクラス
+    
+    inotifyが使える環境ではイベント、使えない環境では一定間隔の走査で追加・更新を検知する。
+    最後の変更から一定時間(デバウンス)経過し、サイズと更新日時が変わらずPDFとして開ける
+    ことを確認してから読み取る（書き込み途中のファイルは読み取らない）。
+    読み取り（控除合計の照合を含む）に成功した明細はSalaryとしてキューへ追加する。
+    """
+    
+    # 最後の変更から読み取りまで待つ秒数
+    DEBOUNCE_SECONDS: Final[float] = 2.0
+    # inotifyが使えない場合の走査間隔(秒)
+    POLL_INTERVAL: Final[float] = 1.0
+    # PDFとして開けない場合に再確認する回数
+    MAX_ATTEMPTS: Final[int] = 5
+    
+    # ログメッセージ
+    LOG_START: Final[str] = "{directory}の監視を開始します（{mode}）。"
+    LOG_STOP: Final[str] = "{directory}の監視を終了します。"
+    LOG_POLLING: Final[str] = "inotifyを使用できないため一定間隔で走査します: {error}"
+    LOG_DETECTED: Final[str] = "{filename}を読み取ります。"
+    LOG_QUEUED: Final[str] = "{filename}を登録待ちに追加しました。"
+    LOG_INCOMPLETE: Final[str] = "{filename}をPDFとして開けないため書き込み完了を待ちます。"
+    LOG_GIVE_UP: Final[str] = "{filename}をPDFとして開けないため読み取りを中止します。"
+    LOG_READ_FAILED: Final[str] = "{filename}の読み取りに失敗しました: {error}"
+    
+    def __init__(
+        self,
+        salary_dir: Optional[str] = None,
+        number: Optional[str] = None,
+        debounce: float = DEBOUNCE_SECONDS,
+        use_inotify: bool = True
+    ) -> None:
+        """
+        監視の初期化（監視開始時点で存在するPDFは対象外とする）
+        
+        Args:
+            salary_dir: 監視するディレクトリ（省略時はuserdata/salaryData）
+            number: 対象の社員番号（省略時は設定ファイルの社員番号）
+            debounce: 最後の変更から読み取りまで待つ秒数
+            use_inotify: inotifyを使うか（Falseの場合は常に走査する）
+        """
+        self.salaryDir = salary_dir or os.path.join(DirectoryNames.USERDATA, DirectoryNames.SALARY_DATA)
+        self.number = number or config.data.get_employee_number()
+        self.debounce = debounce
+        self.useInotify = use_inotify
+        self.pw = config.data.get_pdf_password()
+        self.queue: "queue.Queue[Salary]" = queue.Queue()
+        self.pending: dict[str, PendingFile] = {}
+        self.known: dict[str, tuple[int, int]] = self._scan()
+        self.stopEvent = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """別スレッドで監視を開始する（呼び出し後に追加されたPDFは必ず検知する）"""
+        self.stopEvent.clear()
+        inotify = self._open_inotify()
+        self.thread = threading.Thread(target=self._watch, args=(inotify,), daemon=True)
+        self.thread.start()
+    
+    def stop(self) -> None:
+        """監視を終了する（監視スレッドの終了を待つ）"""
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+    
+    def run(self) -> None:
+        """stop()が呼ばれるまで監視する"""
+        self._watch(self._open_inotify())
+    
+    def _watch(self, inotify: Optional[Inotify]) -> None:
+        """stop()が呼ばれるまでinotifyまたは走査で監視する"""
+        mode = "inotify" if inotify else f"{self.POLL_INTERVAL}秒間隔の走査"
+        Logger.logInfo(self.LOG_START.format(directory=self.salaryDir, mode=mode))
+        try:
+            while not self.stopEvent.is_set():
+                timeout = self.debounce / 2 if self.pending else self.POLL_INTERVAL
+                if inotify:
+                    for name in inotify.read(timeout):
+                        self._touch(name)
+                else:
+                    self.stopEvent.wait(timeout)
+                    self._poll()
+                self._process_pending(time.monotonic())
+        finally:
+            if inotify:
+                inotify.close()
+            Logger.logInfo(self.LOG_STOP.format(directory=self.salaryDir))
+    
+    def _open_inotify(self) -> Optional[Inotify]:
+        """inotifyを開く（使えない場合None）"""
+        if not self.useInotify:
+            return None
+        try:
+            return Inotify(self.salaryDir)
+        except (OSError, AttributeError) as e:
+            Logger.logWarning(self.LOG_POLLING.format(error=e))
+            return None
+    
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        """ディレクトリ内の対象PDFの(サイズ, 更新日時)を取得する"""
+        files = {}
+        try:
+            with os.scandir(self.salaryDir) as it:
+                for entry in it:
+                    if self._parse(entry.name) is None or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return files
+    
+    def _poll(self) -> None:
+        """ディレクトリを走査し、追加・更新されたPDFを取り込み待ちにする"""
+        files = self._scan()
+        for name, stat in files.items():
+            if self.known.get(name) != stat:
+                self._touch(name)
+        self.known = files
+    
+    def _parse(self, name: str) -> Optional[tuple[int, int, SalaryKind, str]]:
+        """対象の社員番号の給与明細のファイル名を解析する（対象外の場合None）"""
+        parsed = SalaryReader.parse_pdf_filename(name)
+        if parsed is None or parsed[3] != self.number:
+            return None
+        return parsed
+    
+    def _touch(self, name: str) -> None:
+        """ファイルの変更を記録する（最後の変更から改めてデバウンスする）"""
+        if self._parse(name) is None:
+            return
+        try:
+            stat = os.stat(os.path.join(self.salaryDir, name))
+        except FileNotFoundError:
+            self.pending.pop(name, None)
+            return
+        attempts = self.pending[name].attempts if name in self.pending else 0
+        self.pending[name] = PendingFile(time.monotonic(), stat.st_size, stat.st_mtime_ns, attempts)
+    
+    def _process_pending(self, now: float) -> None:
+        """
+        デバウンス時間が経過し、書き込みが完了した取り込み待ちのPDFを読み取る
+        
+        Args:
+            now: 現在時刻(time.monotonic())
+        """
+        for name, pending in list(self.pending.items()):
+            if now - pending.since < self.debounce:
+                continue
+            
+            path = os.path.join(self.salaryDir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                del self.pending[name]
+                continue
+            
+            # 前回の確認からサイズか更新日時が変わっていれば書き込み中とみなす
+            if (stat.st_size, stat.st_mtime_ns) != (pending.size, pending.mtimeNs):
+                self.pending[name] = PendingFile(now, stat.st_size, stat.st_mtime_ns, pending.attempts)
+                continue
+            
+            if not self._can_open(path):
+                attempts = pending.attempts + 1
+                if attempts >= self.MAX_ATTEMPTS:
+                    Logger.logError(self.LOG_GIVE_UP.format(filename=name))
+                    del self.pending[name]
+                else:
+                    Logger.logFine(self.LOG_INCOMPLETE.format(filename=name))
+                    self.pending[name] = pending._replace(since=now, attempts=attempts)
+                continue
+            
+            del self.pending[name]
+            self._read(name)
+    
+    def _can_open(self, path: str) -> bool:
+        """PDFとして開けるか（書き込み途中のPDFは末尾の相互参照表がなく開けない）"""
+        try:
+            pdf = pdfium.PdfDocument(path, self.pw)
+        except (pdfium.PdfiumError, OSError):
+            return False
+        pdf.close()
+        return True
+    
+    def _read(self, name: str) -> None:
+        """PDFを読み取り、控除合計が一致すれば登録待ちのキューへ追加する"""
+        year, month, kind, number = self._parse(name)
+        Logger.logInfo(self.LOG_DETECTED.format(filename=name))
+        try:
+            reader = SalaryReader(year, month, number, kind)
+            reader.salaryDir = self.salaryDir
+            items = reader.readDeduction()
+            salary = Salary(year, month, kind, items=items)
+        except Exception as e:
+            Logger.logError(self.LOG_READ_FAILED.format(filename=name, error=e))
+            return
+        
+        self.queue.put(salary)
+        Logger.logInfo(self.LOG_QUEUED.format(filename=name))
@@ -28,3 +28,36 @@ def pytest_configure(config):
             f.write("UseHeadlessMode=true\n")
             f.write("DefaultDate=25\n")
             f.write("TfaId=TEST_TFA_ID\n")
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """
+    文字列を指定座標に配置したPDFを作成するフィクスチャ
+    
+    引数には1ページごとの [(テキスト, x, y), ...] のリストを渡す。
+    標準フォント(Helvetica)を使うため、テキストは半角英数字のみ指定できる。
+    """
+    import ctypes
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+    
+    def _make_pdf(pages, filename="test.pdf", font_size=10.0):
+        pdf = pdfium.PdfDocument.new()
+        font = pdfium_c.FPDFText_LoadStandardFont(pdf.raw, b"Helvetica")
+        for words in pages:
+            page = pdf.new_page(595, 842)
+            for text, x, y in words:
+                obj = pdfium_c.FPDFPageObj_CreateTextObj(pdf.raw, font, font_size)
+                buffer = ctypes.create_string_buffer((text + "\x00").encode("utf-16-le"))
+                pdfium_c.FPDFText_SetText(obj, ctypes.cast(buffer, ctypes.POINTER(pdfium_c.FPDF_WCHAR)))
+                pdfium_c.FPDFPageObj_Transform(obj, 1, 0, 0, 1, x, y)
+                pdfium_c.FPDFPage_InsertObject(page.raw, obj)
+            pdfium_c.FPDFPage_GenerateContent(page.raw)
+            page.close()
+        path = tmp_path / filename
+        pdf.save(str(path))
+        pdf.close()
+        return path
+    
+    return _make_pdf
@@ -0,0 +1,102 @@
+"""
+test_archive.py
+archive.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+import zipfile
+from unittest.mock import patch
+from archive import PayslipArchive, ArchiveMember
+from source import BufferStream
+from common import SalaryKind
+
+
+@pytest.fixture
+def make_zip(tmp_path):
+    """指定した内容のZIPファイルを作成するフィクスチャ"""
+    def _make_zip(entries, compression=zipfile.ZIP_STORED, filename="bundle.zip"):
+        path = tmp_path / filename
+        with zipfile.ZipFile(path, "w", compression) as bundle:
+            for name, data in entries:
+                bundle.writestr(name, data)
+        return str(path)
+    return _make_zip
+
+
+class TestMembers:
+    """membersメソッドのテスト"""
+    
+    def test_members(self, make_zip):
+        """給与明細の命名規則に一致するPDFのみ対象とする"""
+        zip_path = make_zip([
+            ("2024/", b""),
+            ("2024/202401_kyuyo_1.pdf", b"%PDF-1"),
+            ("2024/202406_syoyo_1.pdf", b"%PDF-2"),
+            ("readme.txt", b"text"),
+        ])
+        
+        with PayslipArchive(zip_path) as archive:
+            assert archive.members() == [
+                ArchiveMember("2024/202401_kyuyo_1.pdf", 2024, 1, SalaryKind.NORMAL, "1"),
+                ArchiveMember("2024/202406_syoyo_1.pdf", 2024, 6, SalaryKind.BONUS, "1"),
+            ]
+
+
+class TestOpen:
+    """openメソッドのテスト"""
+    
+    def test_open_stored(self, make_zip):
+        """無圧縮のPDFはZIPファイル上のデータを直接参照する"""
+        data = b"%PDF-1.7 stored payslip"
+        zip_path = make_zip([("202401_kyuyo_1.pdf", data)])
+        
+        with PayslipArchive(zip_path) as archive:
+            source = archive.open("202401_kyuyo_1.pdf")
+            assert isinstance(source, BufferStream)
+            assert source.read() == data
+    
+    def test_open_deflated(self, make_zip):
+        """圧縮されたPDFは展開ストリームとして開く"""
+        data = b"%PDF-1.7 " + b"deflated " * 100
+        zip_path = make_zip([("202401_kyuyo_1.pdf", data)], zipfile.ZIP_DEFLATED)
+        
+        with PayslipArchive(zip_path) as archive:
+            with archive.open("202401_kyuyo_1.pdf") as source:
+                assert not isinstance(source, BufferStream)
+                assert source.read() == data
+    
+    def test_open_not_found(self, make_zip):
+        """ZIP内にないPDFは例外"""
+        with PayslipArchive(make_zip([("a.pdf", b"")])) as archive:
+            with pytest.raises(FileNotFoundError):
+                archive.open("202401_kyuyo_1.pdf")
+    
+    def test_open_broken_header(self, make_zip):
+        """ローカルファイルヘッダーが壊れている場合は例外"""
+        zip_path = make_zip([("202401_kyuyo_1.pdf", b"%PDF")])
+        with PayslipArchive(zip_path) as archive:
+            info = archive.zip.getinfo("202401_kyuyo_1.pdf")
+            with patch.object(info, 'header_offset', 1):
+                with pytest.raises(zipfile.BadZipFile):
+                    archive.open("202401_kyuyo_1.pdf")
+    
+    def test_close_releases_streams(self, make_zip):
+        """閉じていないストリームがあってもZIPファイルを閉じられる"""
+        zip_path = make_zip([("202401_kyuyo_1.pdf", b"%PDF")])
+        archive = PayslipArchive(zip_path)
+        first = archive.open("202401_kyuyo_1.pdf")
+        first.close()
+        second = archive.open("202401_kyuyo_1.pdf")
+        assert archive.streams == [second]
+        
+        archive.close()
+        assert second.closed is True
+        assert archive.map.closed is True
+    
+    def test_invalid_zip(self, tmp_path):
+        """ZIPファイルでない場合は例外"""
+        path = tmp_path / "broken.zip"
+        path.write_bytes(b"not a zip")
+        with pytest.raises(zipfile.BadZipFile):
+            PayslipArchive(str(path))
@@ -7,7 +7,7 @@ C0, C1, C2カバレッジ100%を目指したテストケース
 import pytest
 import sys
 from unittest.mock import patch, MagicMock
-from argument import Arguments
+from argument import Arguments, BatchArguments, WatchArguments, RangeArguments, DaemonArguments
 from common import SalaryKind
 
 
@@ -42,6 +42,19 @@ class TestArgumentsInitialization:
             assert args.year == 2024
             assert args.month == 6
             assert args.kind == SalaryKind.BONUS
+    
+    def test_init_unattended(self):
+        """登録日の確認を省略する指定（すべての引数を指定しても引数の数の上限内）"""
+        test_args = ['upload.py', '2024', '11', '-b', '-y', '--payday', '31', '--adjust', 'after']
+        with patch.object(sys, 'argv', test_args):
+            args = Arguments()
+            assert args.isOk is True
+            assert args.get_approval().is_auto_approved() is True
+            assert args.get_approval().get_payday() == 31
+            assert args.get_approval().get_adjustment() == "after"
+        
+        with patch.object(sys, 'argv', ['upload.py', '2024', '11']):
+            assert Arguments().get_approval().is_auto_approved() is False
 
 
 class TestArgumentsValidation:
@@ -246,7 +259,7 @@ class TestArgumentsConstants:
     
     def test_max_args(self):
         """最大引数数"""
-        assert Arguments.MAX_ARGS == 4
+        assert Arguments.MAX_ARGS == 9
     
     def test_usage_example(self):
         """使用例メッセージ"""
@@ -292,3 +305,219 @@ class TestArgumentsEdgeCases:
         with patch.object(sys, 'argv', test_args):
             args = Arguments()
             assert args.year == 9999
+
+
+class TestBatchArguments:
+    """BatchArgumentsクラスのテスト"""
+    
+    def test_range(self):
+        """期間指定"""
+        test_args = ['batch.py', '--from', '202401', '--to', '202412', '-j', '4']
+        with patch.object(sys, 'argv', test_args):
+            args = BatchArguments()
+            assert args.is_valid() is True
+            assert args.get_start() == (2024, 1)
+            assert args.get_end() == (2024, 12)
+            assert args.get_kind() == SalaryKind.NORMAL
+            assert args.get_workers() == 4
+            assert args.is_all() is False
+            assert args.get_max_rss_bytes() is None
+    
+    def test_zip(self):
+        """ZIPファイル指定の場合は期間の指定は不要"""
+        test_args = ['batch.py', '--zip', '2024.zip']
+        with patch.object(sys, 'argv', test_args):
+            args = BatchArguments()
+            assert args.is_valid() is True
+            assert args.get_archive() == '2024.zip'
+            assert args.get_start() is None
+    
+    def test_max_rss(self):
+        """ワーカーのRSS上限指定(MB)"""
+        test_args = ['batch.py', '--all', '--max-rss', '512']
+        with patch.object(sys, 'argv', test_args):
+            args = BatchArguments()
+            assert args.is_valid() is True
+            assert args.get_max_rss_bytes() == 512 * 1024 * 1024
+    
+    def test_single_month(self):
+        """開始年月のみ指定した場合は1ヶ月分"""
+        test_args = ['batch.py', '-f', '202406', '-b']
+        with patch.object(sys, 'argv', test_args):
+            args = BatchArguments()
+            assert args.get_start() == args.get_end() == (2024, 6)
+            assert args.get_kind() == SalaryKind.BONUS
+    
+    def test_all_with_employees(self):
+        """--all指定と社員番号の複数指定"""
+        test_args = ['batch.py', '--all', '-e', '1', '-e', '2']
+        with patch.object(sys, 'argv', test_args):
+            args = BatchArguments()
+            assert args.is_valid() is True
+            assert args.is_all() is True
+            assert args.get_numbers() == ['1', '2']
+    
+    @pytest.mark.parametrize("argv", [
+        ['batch.py'],
+        ['batch.py', '--from', '2024'],
+        ['batch.py', '--from', '202413'],
+        ['batch.py', '--from', '202412', '--to', '202401'],
+        ['batch.py', '--jobs', 'x', '--all'],
+        ['batch.py', '--all', '-m', '-1'],
+    ])
+    def test_invalid(self, argv):
+        """不正な引数"""
+        with patch.object(sys, 'argv', argv):
+            with patch('argument.Logger.logWarning') as mock_warn:
+                args = BatchArguments()
+                assert args.is_valid() is False
+                assert mock_warn.call_count == 2
+
+
+class TestWatchArguments:
+    """WatchArgumentsクラスのテスト"""
+    
+    @pytest.mark.parametrize("argv, expected", [
+        (['upload.py', 'watch'], True),
+        (['upload.py', 'watch', '--poll'], True),
+        (['upload.py', '2024', '11'], False),
+        (['upload.py'], False),
+    ])
+    def test_is_requested(self, argv, expected):
+        """監視モードのサブコマンド判定"""
+        with patch.object(sys, 'argv', argv):
+            assert WatchArguments.is_requested() is expected
+    
+    def test_default(self):
+        """オプションなし"""
+        with patch.object(sys, 'argv', ['upload.py', 'watch']):
+            args = WatchArguments()
+            assert args.is_valid() is True
+            assert args.get_debounce() is None
+            assert args.is_polling() is False
+    
+    def test_options(self):
+        """デバウンス時間と走査モードの指定"""
+        with patch.object(sys, 'argv', ['upload.py', 'watch', '-d', '5', '--poll']):
+            args = WatchArguments()
+            assert args.is_valid() is True
+            assert args.get_debounce() == 5.0
+            assert args.is_polling() is True
+    
+    @pytest.mark.parametrize("argv", [
+        ['upload.py', 'watch', '--debounce', 'x'],
+        ['upload.py', 'watch', '--debounce', '-1'],
+        ['upload.py', 'watch', '2024'],
+    ])
+    def test_invalid(self, argv):
+        """不正な引数"""
+        with patch.object(sys, 'argv', argv):
+            with patch('argument.Logger.logWarning') as mock_warn:
+                args = WatchArguments()
+                assert args.is_valid() is False
+                assert mock_warn.call_count == 2
+
+
+class TestRangeArguments:
+    """RangeArgumentsクラスのテスト"""
+    
+    def test_is_requested(self):
+        """複数月の一括登録のサブコマンド判定"""
+        with patch.object(sys, 'argv', ['upload.py', 'range', '--from', '202409']):
+            assert RangeArguments.is_requested() is True
+        with patch.object(sys, 'argv', ['upload.py', '2024', '11']):
+            assert RangeArguments.is_requested() is False
+    
+    def test_months_across_year(self):
+        """年をまたぐ期間の月の一覧"""
+        with patch.object(sys, 'argv', ['upload.py', 'range', '--from', '202411', '--to', '202502']):
+            args = RangeArguments()
+            assert args.is_valid() is True
+            assert args.get_months() == [(2024, 11), (2024, 12), (2025, 1), (2025, 2)]
+            assert args.get_kinds() == [SalaryKind.NORMAL]
+            assert args.get_jobs() == 1
+    
+    def test_single_month_with_kinds(self):
+        """終了年月の省略と賞与・特別金の指定"""
+        with patch.object(sys, 'argv', ['upload.py', 'range', '-f', '202412', '-b', '-s']):
+            args = RangeArguments()
+            assert args.get_months() == [(2024, 12)]
+            assert args.get_kinds() == [SalaryKind.NORMAL, SalaryKind.BONUS, SalaryKind.SPECIAL]
+    
+    def test_jobs(self):
+        """ワーカー数の指定"""
+        with patch.object(sys, 'argv', ['upload.py', 'range', '-f', '202401', '-t', '202412', '-j', '3']):
+            assert RangeArguments().get_jobs() == 3
+    
+    def test_approval(self):
+        """登録日の確認の省略と給料日の指定（watch・rangeも同じ）"""
+        with patch.object(sys, 'argv', ['upload.py', 'range', '-f', '202401', '-y', '--payday', '25', '--adjust', 'before']):
+            approval = RangeArguments().get_approval()
+        assert approval.is_auto_approved() is True
+        assert approval.get_payday() == 25
+        assert approval.get_adjustment() == "before"
+        
+        with patch.object(sys, 'argv', ['upload.py', 'watch', '--yes']):
+            approval = WatchArguments().get_approval()
+        assert approval.is_auto_approved() is True
+        assert approval.get_payday() is None
+        assert approval.get_adjustment() is None
+    
+    @pytest.mark.parametrize("argv", [
+        ['upload.py', 'range'],
+        ['upload.py', 'range', '--from', '2024'],
+        ['upload.py', 'range', '--from', '202413'],
+        ['upload.py', 'range', '--from', '202412', '--to', '202401'],
+        ['upload.py', 'range', '--from', '202412', '--jobs', '0'],
+        ['upload.py', 'range', '--from', '202412', '-y', '--payday', '32'],
+        ['upload.py', 'range', '--from', '202412', '-y', '--adjust', 'nearest'],
+    ])
+    def test_invalid(self, argv):
+        """不正な引数"""
+        with patch.object(sys, 'argv', argv):
+            with patch('argument.Logger.logWarning') as mock_warn:
+                args = RangeArguments()
+                assert args.is_valid() is False
+                assert mock_warn.call_count == 2
+
+
+class TestDaemonArguments:
+    """DaemonArgumentsクラスのテスト"""
+    
+    def test_is_requested(self):
+        """常駐ブラウザのサブコマンド判定"""
+        with patch.object(sys, 'argv', ['upload.py', 'daemon']):
+            assert DaemonArguments.is_requested() is True
+        with patch.object(sys, 'argv', ['upload.py', 'watch']):
+            assert DaemonArguments.is_requested() is False
+    
+    def test_default(self):
+        """引数なしの場合は設定の時間で常駐する"""
+        with patch.object(sys, 'argv', ['upload.py', 'daemon']):
+            args = DaemonArguments()
+            assert args.is_valid() is True
+            assert args.get_idle_minutes() is None
+            assert args.is_stop() is False
+            assert args.is_status() is False
+    
+    def test_options(self):
+        """終了までの分数・終了・状態表示の指定"""
+        with patch.object(sys, 'argv', ['upload.py', 'daemon', '--idle', '0']):
+            assert DaemonArguments().get_idle_minutes() == 0
+        with patch.object(sys, 'argv', ['upload.py', 'daemon', '--stop']):
+            assert DaemonArguments().is_stop() is True
+        with patch.object(sys, 'argv', ['upload.py', 'daemon', '--status']):
+            assert DaemonArguments().is_status() is True
+    
+    @pytest.mark.parametrize("argv", [
+        ['upload.py', 'daemon', '--idle', '-1'],
+        ['upload.py', 'daemon', '--stop', '--status'],
+        ['upload.py', 'daemon', '--unknown'],
+    ])
+    def test_invalid(self, argv):
+        """不正な引数"""
+        with patch.object(sys, 'argv', argv):
+            with patch('argument.Logger.logWarning') as mock_warn:
+                args = DaemonArguments()
+                assert args.is_valid() is False
+                assert mock_warn.call_count == 2
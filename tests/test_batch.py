@@ -0,0 +1,398 @@
+"""
+test_batch.py
+batch.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+import os
+import sys
+from unittest.mock import patch, MagicMock
+import batch
+from batch import BatchReader, BatchTarget, BatchResult
+from common import SalaryKind, ItemNames
+from item import Item
+
+
+class InlineExecutor:
+    """ProcessPoolExecutorの代わりに同一プロセスで実行するテスト用Executor"""
+    
+    def __init__(self, max_workers=None, initializer=None, initargs=()):
+        self.max_workers = max_workers
+        if initializer:
+            initializer(*initargs)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        return False
+    
+    def map(self, fn, iterable):
+        return [fn(x) for x in iterable]
+
+
+@pytest.fixture(autouse=True)
+def mock_config():
+    """全テストでconfig.dataをモック"""
+    with patch('batch.config.data') as mock_data:
+        mock_data.get_pdf_password.return_value = "test_password"
+        mock_data.get_employee_number.return_value = "12345"
+        mock_data.is_extraction_cache_enabled.return_value = False
+        mock_data.get_worker_max_rss_bytes.return_value = 0
+        yield mock_data
+
+
+def _read_ok(target):
+    """ワーカー内で常に成功する読み取り"""
+    return BatchResult(target, [Item(ItemNames.DEDUCTION_SUM, target.month)])
+
+
+def _read_crash_on_february(target):
+    """2月の明細でワーカーを異常終了させる読み取り"""
+    if target.month == 2:
+        os._exit(3)
+    return _read_ok(target)
+
+
+# RSS上限モードは実際にワーカープロセスを起動する（fork前のパッチをワーカーへ引き継ぐ）
+requires_fork = pytest.mark.skipif(
+    sys.platform == "win32", reason="ワーカーへパッチを引き継ぐためforkが必要"
+)
+
+
+class TestBatchTarget:
+    """BatchTargetのテスト"""
+    
+    def test_str(self):
+        """文字列表現"""
+        target = BatchTarget(2024, 3, SalaryKind.NORMAL, "12345")
+        assert str(target) == "2024年03月の給与明細(12345)"
+    
+    def test_result_is_ok(self):
+        """成功/失敗の判定"""
+        target = BatchTarget(2024, 3, SalaryKind.NORMAL, "12345")
+        assert BatchResult(target, []).is_ok() is True
+        assert BatchResult(target, [], "error").is_ok() is False
+
+
+class TestBatchReaderInitialization:
+    """BatchReaderの初期化テスト"""
+    
+    def test_targets_sorted_and_deduplicated(self):
+        """対象が重複排除され年月順に並ぶ"""
+        targets = [
+            BatchTarget(2024, 12, SalaryKind.NORMAL, "1"),
+            BatchTarget(2024, 1, SalaryKind.BONUS, "1"),
+            BatchTarget(2024, 12, SalaryKind.NORMAL, "1"),
+        ]
+        reader = BatchReader(targets, max_workers=2)
+        
+        assert reader.targets == [
+            BatchTarget(2024, 1, SalaryKind.BONUS, "1"),
+            BatchTarget(2024, 12, SalaryKind.NORMAL, "1"),
+        ]
+        assert reader.maxWorkers == 2
+        assert reader.maxRssBytes == 0
+    
+    def test_default_workers(self):
+        """最大プロセス数の既定値はCPU数"""
+        with patch('batch.os.cpu_count', return_value=6):
+            reader = BatchReader([])
+            assert reader.maxWorkers == 6
+    
+    def test_from_directory(self, tmp_path):
+        """ディレクトリ内の給与明細PDFを対象にする"""
+        salary_dir = tmp_path / "salaryData"
+        salary_dir.mkdir()
+        for name in ["202401_kyuyo_1.pdf", "202406_syoyo_1.pdf", "202402_kyuyo_2.pdf", "memo.txt"]:
+            (salary_dir / name).touch()
+        
+        reader = BatchReader.from_directory(str(salary_dir))
+        assert len(reader.targets) == 3
+        
+        reader = BatchReader.from_directory(str(salary_dir), numbers=["1"], max_rss_bytes=100)
+        assert reader.maxRssBytes == 100
+        assert reader.targets == [
+            BatchTarget(2024, 1, SalaryKind.NORMAL, "1"),
+            BatchTarget(2024, 6, SalaryKind.BONUS, "1"),
+        ]
+        # 索引は給与明細ディレクトリと同じ階層のcacheに保存される
+        assert (tmp_path / "cache" / "salary_index.json").exists()
+
+
+class TestBatchReaderArchive:
+    """ZIPファイルからの一括読み取りテスト"""
+    
+    def _make_zip(self, tmp_path):
+        import zipfile
+        zip_path = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(zip_path, "w") as bundle:
+            for name in ["2024/202401_kyuyo_1.pdf", "2024/202401_kyuyo_2.pdf", "memo.txt"]:
+                bundle.writestr(name, b"%PDF")
+        return str(zip_path)
+    
+    def test_from_archive(self, tmp_path):
+        """ZIPファイル内の給与明細PDFを対象にする"""
+        zip_path = self._make_zip(tmp_path)
+        reader = BatchReader.from_archive(zip_path, numbers=["2"], max_rss_bytes=10)
+        
+        assert reader.targets == [BatchTarget(
+            2024, 1, SalaryKind.NORMAL, "2", archive=zip_path, member="2024/202401_kyuyo_2.pdf"
+        )]
+        assert reader.maxRssBytes == 10
+        assert str(reader.targets[0]) == "2024年01月の給与明細(2)"
+    
+    def test_read_target_from_archive(self, tmp_path):
+        """ZIPファイル内の明細はワーカー内で開いたZIPファイルから読み取る"""
+        zip_path = self._make_zip(tmp_path)
+        target = BatchTarget(2024, 1, SalaryKind.NORMAL, "1", zip_path, "2024/202401_kyuyo_1.pdf")
+        
+        with patch.dict(BatchReader._worker_archives, clear=True):
+            with patch('batch.SalaryReader') as mock_reader_class:
+                mock_reader_class.return_value.readDeduction.return_value = []
+                assert BatchReader._read_target(target).is_ok() is True
+                assert BatchReader._read_target(target).is_ok() is True
+                
+                _, kwargs = mock_reader_class.call_args
+                assert kwargs["source"].closed is True
+                assert list(BatchReader._worker_archives) == [zip_path]
+            BatchReader._worker_archives[zip_path].close()
+
+
+class TestBatchReaderReadAll:
+    """read_allメソッドのテスト"""
+    
+    def test_read_all_empty(self):
+        """対象がない場合はプールを起動しない"""
+        with patch('batch.ProcessPoolExecutor') as mock_pool:
+            assert BatchReader([]).read_all() == []
+            mock_pool.assert_not_called()
+    
+    def test_read_all_loads_definitions_once(self):
+        """項目定義はワーカー起動時に1度だけ読み込まれる"""
+        targets = [BatchTarget(2024, m, SalaryKind.NORMAL, "1") for m in (1, 2, 3)]
+        definitions = {"deduction": []}
+        
+        with patch('batch.ProcessPoolExecutor', InlineExecutor):
+            with patch('batch.SalaryReader.load_item_definitions_file', return_value=definitions) as mock_load:
+                with patch('batch.SalaryReader.readDeduction', return_value=[Item(ItemNames.DEDUCTION_SUM, 0)]):
+                    with patch('batch.Logger.logInfo'):
+                        results = BatchReader(targets, max_workers=2).read_all()
+        
+        mock_load.assert_called_once()
+        assert [r.target for r in results] == targets
+        assert all(r.is_ok() for r in results)
+    
+    def test_read_target_uses_worker_definitions(self):
+        """ワーカーは読み込み済みの項目定義を使う"""
+        definitions = {"deduction": []}
+        with patch.object(BatchReader, '_worker_definitions', definitions):
+            with patch('batch.SalaryReader') as mock_reader_class:
+                mock_reader_class.return_value.readDeduction.return_value = []
+                BatchReader._read_target(BatchTarget(2024, 1, SalaryKind.NORMAL, "1"))
+                
+                _, kwargs = mock_reader_class.call_args
+                assert kwargs["item_definitions"] is definitions
+    
+    def test_read_target_error(self):
+        """読み取り失敗はエラーメッセージとして返す"""
+        with patch('batch.SalaryReader') as mock_reader_class:
+            mock_reader_class.return_value.readDeduction.side_effect = FileNotFoundError("not found")
+            result = BatchReader._read_target(BatchTarget(2024, 1, SalaryKind.NORMAL, "1"))
+            
+            assert result.is_ok() is False
+            assert result.error == "not found"
+            assert result.items == []
+    
+    def test_read_target_resets_timer(self):
+        """ワーカーは明細ごとに計測結果を破棄する"""
+        with patch('batch.SalaryReader') as mock_reader_class, patch('batch.Timer') as mock_timer:
+            mock_reader_class.return_value.readDeduction.return_value = []
+            BatchReader._read_target(BatchTarget(2024, 1, SalaryKind.NORMAL, "1"))
+            BatchReader._read_target(BatchTarget(2024, 2, SalaryKind.NORMAL, "1"))
+            
+            assert mock_timer.reset.call_count == 2
+
+
+@requires_fork
+class TestBatchReaderBounded:
+    """RSS上限モードのテスト"""
+    
+    TARGETS = [BatchTarget(2024, m, SalaryKind.NORMAL, "1") for m in (1, 2, 3, 4)]
+    
+    def _read_all(self, read_target, rss, workers=2):
+        with patch.object(BatchReader, '_init_worker'):
+            with patch.object(BatchReader, '_read_target', staticmethod(read_target)):
+                with patch('batch.MemoryUsage.current_rss', return_value=rss):
+                    with patch('batch.Logger.logInfo') as mock_info:
+                        results = BatchReader(self.TARGETS, workers, max_rss_bytes=1000).read_all()
+        return results, mock_info
+    
+    def test_read_all_under_limit(self):
+        """上限以下ではワーカーを再起動しない"""
+        results, mock_info = self._read_all(_read_ok, rss=10)
+        
+        assert [r.target for r in results] == self.TARGETS
+        assert [r.items[0].amount for r in results] == [1, 2, 3, 4]
+        assert not any("再起動" in c.args[0] for c in mock_info.call_args_list)
+    
+    def test_read_all_recycles_workers(self):
+        """上限を超えたワーカーは置き換えて残りの明細を読み取る"""
+        results, mock_info = self._read_all(_read_ok, rss=2000, workers=1)
+        
+        assert [r.target for r in results] == self.TARGETS
+        assert all(r.is_ok() for r in results)
+        recycled = [c for c in mock_info.call_args_list if "再起動" in c.args[0]]
+        assert len(recycled) == len(self.TARGETS)
+    
+    def test_read_all_worker_crash(self):
+        """読み取り中に異常終了した明細は失敗とし、残りは読み取る"""
+        with patch.object(BatchReader, 'POLL_INTERVAL', 0.05):
+            results, _ = self._read_all(_read_crash_on_february, rss=10)
+        
+        assert [r.is_ok() for r in results] == [True, False, True, True]
+        assert "3" in results[1].error
+    
+    def test_bounded_worker_loop(self):
+        """ワーカーはRSSを報告し、上限を超えたら終了する"""
+        import queue
+        tasks, outputs = queue.Queue(), queue.Queue()
+        tasks.put((0, self.TARGETS[0]))
+        tasks.put((1, self.TARGETS[1]))
+        current = [BatchReader.IDLE]
+        
+        with patch.object(BatchReader, '_init_worker') as mock_init:
+            with patch.object(BatchReader, '_read_target', staticmethod(_read_ok)):
+                with patch('batch.MemoryUsage.current_rss', side_effect=[10, 2000]):
+                    BatchReader._bounded_worker("items.yml", 1000, 0, current, tasks, outputs)
+        
+        mock_init.assert_called_once_with("items.yml")
+        messages = [outputs.get_nowait() for _ in range(outputs.qsize())]
+        assert [(m[0], m[1], m[3], m[4]) for m in messages] == [(0, 0, 10, False), (0, 1, 2000, True)]
+        assert current == [BatchReader.IDLE]
+    
+    def test_bounded_worker_stops_on_sentinel(self):
+        """終了の合図(None)でワーカーを終了する"""
+        import queue
+        tasks, outputs = queue.Queue(), queue.Queue()
+        tasks.put(None)
+        with patch.object(BatchReader, '_init_worker'):
+            BatchReader._bounded_worker("items.yml", 1000, 0, [BatchReader.IDLE], tasks, outputs)
+        assert outputs.empty()
+    
+    def test_read_all_worker_init_failure(self):
+        """明細の読み取り以外でワーカーが異常終了した場合は例外"""
+        with patch.object(BatchReader, 'POLL_INTERVAL', 0.05):
+            with patch.object(BatchReader, '_init_worker', staticmethod(lambda _: os._exit(2))):
+                with patch('batch.Logger.logInfo'):
+                    with pytest.raises(RuntimeError):
+                        BatchReader(self.TARGETS, 1, max_rss_bytes=1000).read_all()
+    
+    def test_reap_dead_workers(self):
+        """異常終了したワーカーのみ管理対象から外す"""
+        alive = MagicMock(exitcode=None)
+        alive.is_alive.return_value = True
+        finished = MagicMock(exitcode=0)
+        finished.is_alive.return_value = False
+        crashed = MagicMock(exitcode=-9)
+        crashed.is_alive.return_value = False
+        processes = {1: alive, 2: finished, 3: crashed}
+        
+        assert BatchReader._reap_dead_workers(processes) == [(3, -9)]
+        assert set(processes) == {1, 2}
+
+
+class TestBatchMain:
+    """mainメソッドのテスト"""
+    
+    def test_main_range(self):
+        """期間指定での一括読み取り"""
+        test_args = ['batch.py', '--from', '202411', '--to', '202502']
+        result_items = [Item("所得税", 100), Item(ItemNames.DEDUCTION_SUM, 100)]
+        
+        with patch.object(sys, 'argv', test_args):
+            with patch('batch.BatchReader.read_all') as mock_read_all:
+                mock_read_all.return_value = [
+                    BatchResult(BatchTarget(2024, 11, SalaryKind.NORMAL, "12345"), result_items)
+                ]
+                with patch('batch.BatchReader.__init__', return_value=None) as mock_init:
+                    with patch('batch.SalaryIndex') as mock_index_class:
+                        # 2024年12月のPDFはない
+                        mock_index_class.return_value.lookup.side_effect = \
+                            lambda year, month, kind, number: None if month == 12 else "found.pdf"
+                        with patch('batch.Logger.logInfo') as mock_info:
+                            with patch('batch.Logger.logWarning') as mock_warning:
+                                batch.main()
+                
+                mock_index_class.return_value.refresh.assert_called_once()
+                targets, _, max_rss = mock_init.call_args[0]
+                assert max_rss == 0
+                assert [(t.year, t.month) for t in targets] == [
+                    (2024, 11), (2025, 1), (2025, 2)
+                ]
+                mock_warning.assert_called_once()
+                assert all(t.number == "12345" for t in targets)
+                assert "100" in mock_info.call_args[0][0]
+    
+    def test_main_all_with_error(self):
+        """--all指定で失敗が含まれる場合は終了コード1"""
+        test_args = ['batch.py', '--all', '-e', '1']
+        
+        with patch.object(sys, 'argv', test_args):
+            with patch('batch.BatchReader.from_directory') as mock_from_dir:
+                mock_from_dir.return_value.read_all.return_value = [
+                    BatchResult(BatchTarget(2024, 1, SalaryKind.NORMAL, "1"), [], "error")
+                ]
+                with patch('batch.Logger.logError') as mock_error:
+                    with pytest.raises(SystemExit) as exc_info:
+                        batch.main()
+                
+                assert exc_info.value.code == 1
+                mock_from_dir.assert_called_once_with(numbers=["1"], max_workers=None, max_rss_bytes=0)
+                mock_error.assert_called_once()
+    
+    def test_main_max_rss_argument(self):
+        """起動引数のRSS上限は設定ファイルより優先する"""
+        test_args = ['batch.py', '--all', '--max-rss', '64']
+        
+        with patch.object(sys, 'argv', test_args):
+            with patch('batch.BatchReader.from_directory') as mock_from_dir:
+                mock_from_dir.return_value.read_all.return_value = []
+                batch.main()
+        
+        _, kwargs = mock_from_dir.call_args
+        assert kwargs["max_rss_bytes"] == 64 * 1024 * 1024
+    
+    def test_main_archive(self):
+        """--zip指定ではZIPファイル内の明細を読み取る"""
+        test_args = ['batch.py', '--zip', '2024.zip', '-j', '2']
+        
+        with patch.object(sys, 'argv', test_args):
+            with patch('batch.BatchReader.from_archive') as mock_from_archive:
+                mock_from_archive.return_value.read_all.return_value = []
+                batch.main()
+        
+        mock_from_archive.assert_called_once_with(
+            '2024.zip', numbers=[], max_workers=2, max_rss_bytes=0
+        )
+    
+    def test_main_invalid_args(self):
+        """引数不正の場合は終了コード1"""
+        with patch.object(sys, 'argv', ['batch.py']):
+            with patch('argument.Logger.logWarning'):
+                with pytest.raises(SystemExit) as exc_info:
+                    batch.main()
+        assert exc_info.value.code == 1
+    
+    def test_main_exception(self):
+        """読み取り中の例外は終了コード1"""
+        with patch.object(sys, 'argv', ['batch.py', '--all']):
+            with patch('batch.BatchReader.from_directory', side_effect=FileNotFoundError("no dir")):
+                with patch('batch.Logger.logError') as mock_error:
+                    with patch('batch.traceback.print_exc'):
+                        with pytest.raises(SystemExit) as exc_info:
+                            batch.main()
+        
+        assert exc_info.value.code == 1
+        mock_error.assert_called_once_with("no dir")
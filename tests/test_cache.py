@@ -0,0 +1,154 @@
+"""
+test_cache.py
+cache.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+import os
+from unittest.mock import patch
+import cache
+from cache import ExtractionCache
+from item import Item
+
+
+@pytest.fixture
+def extraction_cache(tmp_path):
+    """一時ディレクトリを使う抽出キャッシュ"""
+    return ExtractionCache("secret", cache_dir=str(tmp_path))
+
+
+def _items():
+    return [Item("所得税", 1200, "税・社会保障", "所得税・住民税"), Item("控除合計", 1200, "収入", "給与")]
+
+
+class TestMakeKey:
+    """make_keyメソッドのテスト"""
+    
+    def test_key_depends_on_all_inputs(self, tmp_path):
+        """PDF・項目定義・パーサーバージョンのいずれかが変わるとキーが変わる"""
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"pdf")
+        
+        base = ExtractionCache.make_key(str(pdf), "items", "1")
+        assert base == ExtractionCache.make_key(str(pdf), "items", "1")
+        assert base != ExtractionCache.make_key(str(pdf), "items", "2")
+        assert base != ExtractionCache.make_key(str(pdf), "other", "1")
+        
+        pdf.write_bytes(b"pdf2")
+        assert base != ExtractionCache.make_key(str(pdf), "items", "1")
+    
+    def test_key_from_memory_source(self, tmp_path):
+        """メモリ上のPDFはファイルと同じ内容なら同じキーになる"""
+        import io
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"pdf")
+        
+        base = ExtractionCache.make_key(str(pdf), "items", "1")
+        assert ExtractionCache.make_key(b"pdf", "items", "1") == base
+        assert ExtractionCache.make_key(memoryview(bytearray(b"pdf")), "items", "1") == base
+        
+        # ファイルオブジェクトは読み取り後に先頭へ戻す
+        stream = io.BytesIO(b"pdf")
+        stream.seek(2)
+        assert ExtractionCache.make_key(stream, "items", "1") == base
+        assert stream.tell() == 0
+    
+    def test_key_missing_file(self, tmp_path):
+        """ファイルがない場合はOSError"""
+        with pytest.raises(OSError):
+            ExtractionCache.make_key(str(tmp_path / "none.pdf"), str(tmp_path / "none.yml"), "1")
+
+
+class TestGetPut:
+    """get/putメソッドのテスト"""
+    
+    def test_roundtrip(self, extraction_cache):
+        """保存した内容を取得できる"""
+        extraction_cache.put("key", ["所得税", "1,200"], _items())
+        lines, items = extraction_cache.get("key")
+        
+        assert lines == ["所得税", "1,200"]
+        assert [(i.name, i.amount, i.category, i.subcategory) for i in items] == \
+            [(i.name, i.amount, i.category, i.subcategory) for i in _items()]
+    
+    def test_miss(self, extraction_cache):
+        """保存されていないキー"""
+        assert extraction_cache.get("unknown") is None
+    
+    def test_stored_encrypted(self, extraction_cache, tmp_path):
+        """保存内容は平文を含まない"""
+        extraction_cache.put("key", ["所得税"], _items())
+        data = (tmp_path / "key.bin").read_bytes()
+        assert "所得税".encode() not in data
+        assert b"1200" not in data
+    
+    def test_wrong_password(self, extraction_cache, tmp_path):
+        """異なるパスワードでは復号できず破棄される"""
+        extraction_cache.put("key", ["所得税"], _items())
+        other = ExtractionCache("other", cache_dir=str(tmp_path))
+        
+        with patch('cache.Logger.logWarning') as mock_warn:
+            assert other.get("key") is None
+            mock_warn.assert_called_once()
+        assert not (tmp_path / "key.bin").exists()
+    
+    def test_salt_reused(self, extraction_cache, tmp_path):
+        """ソルトは作成後に再利用される"""
+        extraction_cache.put("key", [], [])
+        salt = (tmp_path / ExtractionCache.SALT_FILENAME).read_bytes()
+        
+        again = ExtractionCache("secret", cache_dir=str(tmp_path))
+        assert again._load_salt() == salt
+        assert again.get("key") == ([], [])
+
+
+class TestEviction:
+    """サイズ上限による削除のテスト"""
+    
+    def test_evicts_least_recently_used(self, tmp_path):
+        """上限を超えた場合は最終利用日時が古いものから削除する"""
+        extraction_cache = ExtractionCache("secret", cache_dir=str(tmp_path), max_bytes=10 ** 6)
+        for index, key in enumerate(["a", "b", "c"]):
+            extraction_cache.put(key, ["x" * 100], [])
+            os.utime(tmp_path / f"{key}.bin", (index, index))
+        
+        # aを参照して最終利用日時を更新
+        assert extraction_cache.get("a") is not None
+        
+        entry_size = (tmp_path / "a.bin").stat().st_size
+        extraction_cache.maxBytes = entry_size * 2
+        extraction_cache._evict()
+        
+        assert (tmp_path / "a.bin").exists()
+        assert not (tmp_path / "b.bin").exists()
+        assert (tmp_path / "c.bin").exists()
+    
+    def test_ignores_other_files(self, extraction_cache, tmp_path):
+        """キャッシュエントリ以外のファイルは削除しない"""
+        extraction_cache.maxBytes = 1
+        extraction_cache.put("key", ["x"], [])
+        
+        assert not (tmp_path / "key.bin").exists()
+        assert (tmp_path / ExtractionCache.SALT_FILENAME).exists()
+
+
+class TestDisabled:
+    """キャッシュ無効時のテスト"""
+    
+    def test_disabled_without_cryptography(self, tmp_path):
+        """cryptographyがない場合は何も保存しない"""
+        with patch.object(cache, 'Fernet', None):
+            with patch('cache.Logger.logWarning') as mock_warn:
+                extraction_cache = ExtractionCache("secret", cache_dir=str(tmp_path))
+                mock_warn.assert_called_once()
+            
+            assert extraction_cache.is_enabled() is False
+            extraction_cache.put("key", ["x"], [])
+            assert extraction_cache.get("key") is None
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_disabled_with_zero_size(self, tmp_path):
+        """上限サイズが0の場合は無効"""
+        extraction_cache = ExtractionCache("secret", cache_dir=str(tmp_path), max_bytes=0)
+        assert extraction_cache.is_enabled() is False
@@ -0,0 +1,104 @@
+"""
+test_categories.py
+categories.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import json
+import time
+from unittest.mock import patch
+from categories import CategoryTree, CategoryCache
+from item import Item
+
+
+def _tree():
+    return CategoryTree({
+        "税・社会保障": {"id": "1", "middles": {"健康保険": "101", "所得税・住民税": "102"}},
+        "収入": {"id": "2", "middles": {"給与": "201"}},
+    })
+
+
+class TestCategoryTree:
+    """CategoryTreeクラスのテスト"""
+    
+    def test_ids(self):
+        """大項目・中項目の組でIDを取得する"""
+        tree = _tree()
+        assert tree.ids("税・社会保障", "健康保険") == ("1", "101")
+        assert tree.ids("税・社会保障", "給与") is None
+        assert tree.ids("食費", "外食") is None
+    
+    def test_find_unknown(self):
+        """存在しないカテゴリを重複なく返す（カテゴリのない項目は対象外）"""
+        items = [
+            Item("控除合計", 1000, "収入", "給与"),
+            Item("組合費", 100, "税・社会保障", "組合費"),
+            Item("組合費2", 100, "税・社会保障", "組合費"),
+            Item("その他", 100),
+        ]
+        assert _tree().find_unknown(items) == [("税・社会保障", "組合費")]
+    
+    def test_is_valid(self):
+        """IDがすべて取得できている場合のみ有効"""
+        assert _tree().is_valid() is True
+        assert CategoryTree({}).is_valid() is False
+        assert CategoryTree({"収入": {"id": "", "middles": {"給与": "201"}}}).is_valid() is False
+        assert CategoryTree({"収入": {"id": "2", "middles": {"給与": ""}}}).is_valid() is False
+
+
+class TestCategoryCache:
+    """CategoryCacheクラスのテスト"""
+    
+    def test_round_trip(self, tmp_path):
+        """保存したカテゴリを有効期間内は読み込める"""
+        CategoryCache(3600, cache_dir=str(tmp_path)).save(_tree())
+        tree = CategoryCache(3600, cache_dir=str(tmp_path)).load()
+        assert tree.categories == _tree().categories
+    
+    def test_expired(self, tmp_path):
+        """有効期間を過ぎたカテゴリは使わない"""
+        cache = CategoryCache(3600, cache_dir=str(tmp_path))
+        cache.save(_tree())
+        with patch('categories.time.time', return_value=time.time() + 3601):
+            assert cache.load() is None
+    
+    def test_disabled(self, tmp_path):
+        """有効期間が0の場合は保存も読み込みもしない"""
+        cache = CategoryCache(0, cache_dir=str(tmp_path))
+        cache.save(_tree())
+        assert cache.load() is None
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_not_saved(self, tmp_path):
+        """保存していない場合はNone"""
+        assert CategoryCache(3600, cache_dir=str(tmp_path)).load() is None
+    
+    def test_broken(self, tmp_path):
+        """壊れたキャッシュは警告して使わない"""
+        cache = CategoryCache(3600, cache_dir=str(tmp_path))
+        with patch('categories.Logger.logWarning') as mock_warn:
+            (tmp_path / CategoryCache.CACHE_FILENAME).write_text("{", encoding="utf-8")
+            assert cache.load() is None
+            (tmp_path / CategoryCache.CACHE_FILENAME).write_text(json.dumps({"version": 1}), encoding="utf-8")
+            assert cache.load() is None
+        assert mock_warn.call_count == 2
+    
+    def test_other_version(self, tmp_path):
+        """形式のバージョンが異なるキャッシュは使わない"""
+        data = {"version": 0, "saved_at": time.time(), "categories": _tree().categories}
+        (tmp_path / CategoryCache.CACHE_FILENAME).write_text(json.dumps(data), encoding="utf-8")
+        assert CategoryCache(3600, cache_dir=str(tmp_path)).load() is None
+    
+    def test_clear(self, tmp_path):
+        """保存したカテゴリを削除する（保存していなくてもエラーにしない）"""
+        cache = CategoryCache(3600, cache_dir=str(tmp_path))
+        cache.save(_tree())
+        cache.clear()
+        cache.clear()
+        assert cache.load() is None
+    
+    def test_save_failure_ignored(self, tmp_path):
+        """保存できない場合は無視する"""
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        CategoryCache(3600, cache_dir=str(blocker / "cache")).save(_tree())
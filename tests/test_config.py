@@ -246,3 +246,93 @@ class TestConfigConstants:
     def test_config_filename(self):
         """設定ファイル名"""
         assert Config.CONFIG_FILENAME == "config.ini"
+
+
+class TestExtractionCacheSettings:
+    """抽出キャッシュ設定のテスト"""
+    
+    def _make_config(self, lines):
+        with patch.object(Config, '_load_config'):
+            config = Config()
+        config.config.read_string("[DEFAULT]\n" + "\n".join(lines))
+        return config
+    
+    def test_defaults(self):
+        """未設定の場合の既定値"""
+        config = self._make_config([])
+        assert config.is_extraction_cache_enabled() is True
+        assert config.get_extraction_cache_max_bytes() == 32 * 1024 * 1024
+        assert config.get_worker_max_rss_bytes() == 0
+    
+    def test_configured(self):
+        """設定値の読み込み"""
+        config = self._make_config(["UseExtractionCache = false", "ExtractionCacheMaxMB = 4"])
+        assert config.is_extraction_cache_enabled() is False
+        assert config.get_extraction_cache_max_bytes() == 4 * 1024 * 1024
+    
+    def test_worker_max_rss(self):
+        """ワーカーのRSS上限の読み込み"""
+        config = self._make_config(["WorkerMaxRssMB = 256"])
+        assert config.get_worker_max_rss_bytes() == 256 * 1024 * 1024
+    
+    def test_timing_report_file(self):
+        """処理時間の出力先の読み込み（未設定・空欄はNone）"""
+        assert self._make_config([]).get_timing_report_file() is None
+        assert self._make_config(["TimingReportFile = "]).get_timing_report_file() is None
+        config = self._make_config(["TimingReportFile = ../userdata/timing.jsonl"])
+        assert config.get_timing_report_file() == "../userdata/timing.jsonl"
+    
+    def test_wait_timeout(self):
+        """画面の待機上限時間の読み込み（既定値は5秒）"""
+        assert self._make_config([]).get_wait_timeout() == 5.0
+        assert self._make_config(["WaitTimeoutSeconds = 1.5"]).get_wait_timeout() == 1.5
+    
+    def test_session_kept(self):
+        """ログインセッションの保存設定の読み込み（既定値は保存する）"""
+        assert self._make_config([]).is_session_kept() is True
+        assert self._make_config(["KeepLoginSession = false"]).is_session_kept() is False
+    
+    def test_upload_items_per_minute(self):
+        """複数ワーカーでの登録の流量上限の読み込み（既定値は60項目/分）"""
+        assert self._make_config([]).get_upload_items_per_minute() == 60.0
+        assert self._make_config(["UploadItemsPerMinute = 0"]).get_upload_items_per_minute() == 0.0
+    
+    def test_category_cache_ttl(self):
+        """カテゴリのキャッシュの有効期間の読み込み（既定値は168時間）"""
+        assert self._make_config([]).get_category_cache_ttl_seconds() == 168 * 3600
+        assert self._make_config(["CategoryCacheTtlHours = 0.5"]).get_category_cache_ttl_seconds() == 1800
+    
+    def test_lean_browser(self):
+        """省メモリのブラウザ設定の読み込み（既定値は使用しない）"""
+        assert self._make_config([]).is_lean_browser() is False
+        assert self._make_config(["UseLeanBrowser = true"]).is_lean_browser() is True
+    
+    def test_browser_daemon(self):
+        """常駐ブラウザの設定の読み込み（既定値は起動していれば使用し、60分で終了する）"""
+        assert self._make_config([]).is_browser_daemon_used() is True
+        assert self._make_config(["UseBrowserDaemon = false"]).is_browser_daemon_used() is False
+        assert self._make_config([]).get_browser_daemon_idle_seconds() == 3600
+        assert self._make_config(["BrowserDaemonIdleMinutes = 0"]).get_browser_daemon_idle_seconds() == 0
+    
+    def test_moneyforward_url(self):
+        """登録先のURLの読み込み（既定値はmoneyforward.com、末尾の/は除く）"""
+        assert self._make_config([]).get_moneyforward_url() == "https://moneyforward.com"
+        assert self._make_config(["MoneyForwardUrl = http://127.0.0.1:8000/"]).get_moneyforward_url() == \
+            "http://127.0.0.1:8000"
+    
+    def test_registration_journal(self):
+        """登録済みの項目の記録設定の読み込み（既定値は記録する）"""
+        assert self._make_config([]).is_registration_journal_used() is True
+        assert self._make_config(["UseRegistrationJournal = false"]).is_registration_journal_used() is False
+    
+    def test_skip_existing_entries(self):
+        """登録済みの入出金を省略する設定の読み込み（既定値は省略する）"""
+        assert self._make_config([]).is_existing_entry_skipped() is True
+        assert self._make_config(["SkipExistingEntries = false"]).is_existing_entry_skipped() is False
+    
+    def test_auto_approve(self):
+        """自動承認と給料日の調整の読み込み（既定値は確認する・調整しない）"""
+        assert self._make_config([]).is_auto_approved() is False
+        assert self._make_config(["AutoApprove = true"]).is_auto_approved() is True
+        assert self._make_config([]).get_payday_adjustment() == "none"
+        assert self._make_config(["PaydayAdjustment = before"]).get_payday_adjustment() == "before"
@@ -0,0 +1,185 @@
+"""
+test_daemon.py
+daemon.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import json
+import os
+import socket
+import stat
+import threading
+import time
+from unittest.mock import MagicMock, PropertyMock, patch
+import pytest
+from daemon import BrowserDaemon, DaemonClient
+
+
+def _uploader():
+    uploader = MagicMock()
+    uploader.driver = MagicMock()
+    return uploader
+
+
+@pytest.fixture
+def running(tmp_path):
+    """常駐ブラウザを別スレッドで起動し、終了まで待つ"""
+    state_file = str(tmp_path / "daemon.json")
+    uploaders = []
+    
+    def create_uploader():
+        uploader = _uploader()
+        uploaders.append(uploader)
+        return uploader
+    
+    daemon = BrowserDaemon(create_uploader, idle_seconds=0, state_file=state_file, check_seconds=0.05)
+    with patch('daemon.Logger'):
+        thread = threading.Thread(target=daemon.serve)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not os.path.exists(state_file) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        yield daemon, DaemonClient(state_file), uploaders
+        daemon.stopEvent.set()
+        thread.join(5)
+
+
+class TestBrowserDaemon:
+    """BrowserDaemonクラスのテスト"""
+    
+    def test_start(self, running):
+        """リモートデバッグを有効にしたChromeでログインし、状態ファイルを所有者のみに書き出す"""
+        daemon, client, uploaders = running
+        uploaders[0]._start_session.assert_called_once()
+        assert uploaders[0].debugPort == daemon.debugPort > 0
+        assert uploaders[0].profileDir == daemon.profileDir
+        assert stat.S_IMODE(os.stat(daemon.stateFile).st_mode) == 0o600
+        
+        state = client.ping()
+        assert state["ok"] is True and state["alive"] is True and state["busy"] is False
+    
+    def test_acquire_release(self, running):
+        """貸し出し中は他の実行に貸し出さず、返却後は貸し出す"""
+        daemon, client, _ = running
+        other = DaemonClient(daemon.stateFile)
+        
+        assert client.acquire() == f"127.0.0.1:{daemon.debugPort}"
+        assert other.acquire() is None
+        assert client.ping()["busy"] is True
+        client.release()
+        assert other.acquire() is not None
+        other.release()
+    
+    def test_release_on_disconnect(self, running):
+        """借りた実行が終了（切断）した場合は返却されたものとみなす"""
+        daemon, client, _ = running
+        assert client.acquire() is not None
+        client._close(client.connection, client.stream)
+        
+        deadline = time.monotonic() + 5
+        while daemon.busy and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert daemon.busy is False
+    
+    def test_restart_on_acquire(self, running):
+        """Chromeが応答しない場合は起動し直してから貸し出す"""
+        daemon, client, uploaders = running
+        with daemon.lock:
+            type(uploaders[0].driver).window_handles = PropertyMock(side_effect=ConnectionError("closed"))
+        
+        assert client.acquire() is not None
+        client.release()
+        assert len(uploaders) >= 2
+        uploaders[-1]._start_session.assert_called_once()
+    
+    def test_restart_on_check(self, running):
+        """貸し出していない間もChromeの応答を確認し、終了していれば起動し直す"""
+        daemon, client, uploaders = running
+        uploaders[0].driver = None
+        
+        deadline = time.monotonic() + 5
+        while len(uploaders) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(uploaders) >= 2
+    
+    def test_stop(self, running):
+        """終了を要求するとChromeを終了して状態ファイルを削除する"""
+        daemon, client, uploaders = running
+        driver = uploaders[0].driver
+        
+        assert client.stop() is True
+        deadline = time.monotonic() + 5
+        while os.path.exists(daemon.stateFile) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not os.path.exists(daemon.stateFile)
+        driver.quit.assert_called_once()
+        assert client.ping() is None
+    
+    def test_invalid_requests(self, running):
+        """トークンが一致しない要求と不明な要求は受け付けない"""
+        daemon, client, _ = running
+        assert client._request_once("unknown")["ok"] is False
+        
+        port = json.load(open(daemon.stateFile))["port"]
+        with socket.create_connection(("127.0.0.1", port), timeout=1) as connection:
+            stream = connection.makefile("rwb")
+            stream.write(b'{"token": "wrong", "command": "stop"}\n')
+            stream.flush()
+            assert json.loads(stream.readline())["error"] == BrowserDaemon.ERROR_TOKEN
+        assert not daemon.stopEvent.is_set()
+    
+    def test_idle_shutdown(self, tmp_path):
+        """一定時間貸し出しがない場合は終了する"""
+        uploader = _uploader()
+        driver = uploader.driver
+        daemon = BrowserDaemon(
+            lambda: uploader, idle_seconds=0.1, state_file=str(tmp_path / "daemon.json"), check_seconds=0.05
+        )
+        with patch('daemon.Logger'):
+            daemon.serve()
+        driver.quit.assert_called_once()
+        assert not os.path.exists(tmp_path / "daemon.json")
+    
+    def test_start_failure(self, tmp_path):
+        """Chromeを起動・ログインできない場合は起動したChromeを終了してエラーとする"""
+        uploader = _uploader()
+        uploader._start_session.side_effect = Exception("ログイン失敗")
+        driver = uploader.driver
+        daemon = BrowserDaemon(lambda: uploader, idle_seconds=0, state_file=str(tmp_path / "daemon.json"))
+        
+        with pytest.raises(Exception, match="ログイン失敗"):
+            daemon.serve()
+        driver.quit.assert_called_once()
+        assert not os.path.exists(tmp_path / "daemon.json")
+    
+    def test_restart_failure(self, tmp_path):
+        """起動し直せない場合は貸し出さない"""
+        daemon = BrowserDaemon(MagicMock(side_effect=Exception("起動失敗")), idle_seconds=0)
+        with patch('daemon.Logger'):
+            assert daemon.handle("acquire") == {"ok": False, "error": "起動失敗"}
+            daemon._check()
+        assert daemon.busy is False
+
+
+class TestDaemonClient:
+    """DaemonClientクラスのテスト"""
+    
+    def test_not_running(self, tmp_path):
+        """常駐ブラウザが起動していない場合は何もしない"""
+        client = DaemonClient(str(tmp_path / "daemon.json"))
+        assert client.ping() is None
+        assert client.acquire() is None
+        assert client.stop() is False
+        client.release()
+    
+    def test_stale_state(self, tmp_path):
+        """状態ファイルが残っていても接続できない場合は起動していないものとする"""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        state_file = tmp_path / "daemon.json"
+        state_file.write_text(json.dumps({"pid": 1, "port": port, "token": "x"}), encoding="utf-8")
+        
+        client = DaemonClient(str(state_file))
+        assert client.ping() is None
+        assert client.acquire() is None
@@ -0,0 +1,239 @@
+"""
+test_definitions.py
+definitions.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+import os
+from unittest.mock import patch
+import yaml
+from definitions import ItemDefinitions
+
+
+RAW_DEFINITIONS = {
+    "deduction": [
+        {"name": "控除合計", "category": "収入", "subcategory": "給与"},
+        {"name": "所得税", "category": "税・社会保障", "subcategory": "所得税・住民税"},
+        {"name": "住民税", "category": "税・社会保障", "subcategory": "所得税・住民税"},
+    ]
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_loaded():
+    """テストごとにプロセス内の読み込み済み定義を破棄する"""
+    ItemDefinitions._loaded.clear()
+    yield
+    ItemDefinitions._loaded.clear()
+
+
+@pytest.fixture
+def items_file(tmp_path):
+    """項目定義ファイルを作成する"""
+    path = tmp_path / "items.yml"
+    path.write_text(yaml.safe_dump(RAW_DEFINITIONS, allow_unicode=True), encoding="utf-8")
+    return str(path)
+
+
+class TestItemDefinitionsInitialization:
+    """ItemDefinitionsの初期化テスト"""
+    
+    def test_index_built(self):
+        """項目名の索引が作成される"""
+        definitions = ItemDefinitions(RAW_DEFINITIONS)
+        assert len(definitions) == 3
+        assert definitions.names() == {"控除合計", "所得税", "住民税"}
+        assert definitions.deductions == RAW_DEFINITIONS["deduction"]
+    
+    def test_first_definition_wins(self):
+        """同名の定義は先のものを優先する"""
+        raw = {"deduction": [
+            {"name": "A", "category": "1", "subcategory": "1"},
+            {"name": "A", "category": "2", "subcategory": "2"},
+        ]}
+        definitions = ItemDefinitions(raw)
+        assert len(definitions) == 1
+        assert definitions.find("A")["category"] == "1"
+    
+    def test_empty_deduction(self):
+        """deductionが空の場合"""
+        definitions = ItemDefinitions({"deduction": None})
+        assert len(definitions) == 0
+    
+    def test_missing_deduction(self):
+        """deductionキーがない場合はKeyError"""
+        with pytest.raises(KeyError):
+            ItemDefinitions({})
+
+
+class TestCompile:
+    """compileメソッドのテスト"""
+    
+    def test_compile_dict(self):
+        """辞書は索引化される"""
+        definitions = ItemDefinitions.compile(RAW_DEFINITIONS)
+        assert isinstance(definitions, ItemDefinitions)
+        assert definitions.raw is RAW_DEFINITIONS
+    
+    def test_compile_compiled(self):
+        """索引化済みのものはそのまま返す"""
+        definitions = ItemDefinitions(RAW_DEFINITIONS)
+        assert ItemDefinitions.compile(definitions) is definitions
+
+
+class TestDigest:
+    """digestメソッドのテスト"""
+    
+    def test_digest_by_content(self, items_file):
+        """読み込み元によらず内容が同じであれば同じハッシュになる"""
+        digest = ItemDefinitions(RAW_DEFINITIONS).digest()
+        assert ItemDefinitions.load(items_file).digest() == digest
+        
+        changed = {"deduction": RAW_DEFINITIONS["deduction"][:2]}
+        assert ItemDefinitions(changed).digest() != digest
+
+
+class TestMatch:
+    """find/matchメソッドのテスト"""
+    
+    def test_find(self):
+        """項目名での検索"""
+        definitions = ItemDefinitions(RAW_DEFINITIONS)
+        assert definitions.find("所得税")["subcategory"] == "所得税・住民税"
+        assert definitions.find("総支給額") is None
+    
+    def test_match(self):
+        """一致した行のインデックスと定義を列挙する"""
+        definitions = ItemDefinitions(RAW_DEFINITIONS)
+        lines = ["氏名", "所得税", "1,000", "住民税", "2,000", "控除合計", "3,000"]
+        
+        matched = [(idx, item_def["name"]) for idx, item_def in definitions.match(lines)]
+        assert matched == [(1, "所得税"), (3, "住民税"), (5, "控除合計")]
+    
+    def test_match_generator(self):
+        """照合はイテレータとして遅延評価される"""
+        definitions = ItemDefinitions(RAW_DEFINITIONS)
+        
+        def lines():
+            yield "所得税"
+            raise AssertionError("必要以上に読み進めている")
+        
+        assert next(definitions.match(lines()))[0] == 0
+
+
+class TestDictCompatibility:
+    """辞書互換の参照テスト"""
+    
+    def test_contains_and_getitem(self):
+        """読み込んだ辞書と同様に参照できる"""
+        definitions = ItemDefinitions(RAW_DEFINITIONS)
+        assert "deduction" in definitions
+        assert "other" not in definitions
+        assert len(definitions["deduction"]) == 3
+
+
+class TestLoad:
+    """loadメソッドのテスト"""
+    
+    def test_load_parses_and_validates(self, items_file, tmp_path):
+        """初回はYAMLを解析し、スナップショットを保存する"""
+        snapshot_dir = str(tmp_path / "cache")
+        definitions = ItemDefinitions.load(items_file, snapshot_dir)
+        
+        assert definitions.raw == RAW_DEFINITIONS
+        assert definitions.find("所得税") is not None
+        assert len(os.listdir(snapshot_dir)) == 1
+    
+    def test_load_reuses_in_memory(self, items_file, tmp_path):
+        """更新されていなければ同じ定義を返す"""
+        snapshot_dir = str(tmp_path / "cache")
+        first = ItemDefinitions.load(items_file, snapshot_dir)
+        
+        with patch('definitions.yaml.safe_load') as mock_yaml:
+            with patch('builtins.open') as mock_open:
+                assert ItemDefinitions.load(items_file, snapshot_dir) is first
+                mock_yaml.assert_not_called()
+                mock_open.assert_not_called()
+    
+    def test_load_from_snapshot(self, items_file, tmp_path):
+        """新しいプロセスではスナップショットから読み込みYAMLを解析しない"""
+        snapshot_dir = str(tmp_path / "cache")
+        ItemDefinitions.load(items_file, snapshot_dir)
+        ItemDefinitions._loaded.clear()
+        
+        with patch('definitions.yaml.safe_load') as mock_yaml:
+            definitions = ItemDefinitions.load(items_file, snapshot_dir)
+            mock_yaml.assert_not_called()
+        assert definitions.raw == RAW_DEFINITIONS
+    
+    def test_load_touched_file_same_content(self, items_file, tmp_path):
+        """更新日時だけ変わった場合は内容のハッシュで再利用する"""
+        snapshot_dir = str(tmp_path / "cache")
+        first = ItemDefinitions.load(items_file, snapshot_dir)
+        stat = os.stat(items_file)
+        os.utime(items_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        with patch('definitions.yaml.safe_load') as mock_yaml:
+            assert ItemDefinitions.load(items_file, snapshot_dir) is first
+            mock_yaml.assert_not_called()
+        
+        # 新しいプロセスでもスナップショットのハッシュで再利用できる
+        ItemDefinitions._loaded.clear()
+        os.utime(items_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+        with patch('definitions.yaml.safe_load') as mock_yaml:
+            assert ItemDefinitions.load(items_file, snapshot_dir).raw == RAW_DEFINITIONS
+            mock_yaml.assert_not_called()
+    
+    def test_load_modified_file(self, items_file, tmp_path):
+        """内容が変わった場合は再解析する"""
+        snapshot_dir = str(tmp_path / "cache")
+        ItemDefinitions.load(items_file, snapshot_dir)
+        
+        raw = {"deduction": RAW_DEFINITIONS["deduction"][:1]}
+        with open(items_file, "w", encoding="utf-8") as f:
+            f.write(yaml.safe_dump(raw, allow_unicode=True) + "\n")
+        
+        assert ItemDefinitions.load(items_file, snapshot_dir).raw == raw
+        ItemDefinitions._loaded.clear()
+        assert ItemDefinitions.load(items_file, snapshot_dir).raw == raw
+    
+    def test_load_broken_snapshot(self, items_file, tmp_path):
+        """壊れたスナップショットは無視して再作成する"""
+        snapshot_dir = str(tmp_path / "cache")
+        ItemDefinitions.load(items_file, snapshot_dir)
+        ItemDefinitions._loaded.clear()
+        snapshot = os.path.join(snapshot_dir, os.listdir(snapshot_dir)[0])
+        with open(snapshot, "wb") as f:
+            f.write(b"broken")
+        
+        with patch('definitions.Logger.logWarning') as mock_warning:
+            assert ItemDefinitions.load(items_file, snapshot_dir).raw == RAW_DEFINITIONS
+            mock_warning.assert_called_once()
+    
+    def test_load_missing_file(self, tmp_path):
+        """項目定義ファイルがない場合は例外"""
+        with pytest.raises(FileNotFoundError):
+            ItemDefinitions.load(str(tmp_path / "none.yml"), str(tmp_path))
+
+
+class TestValidate:
+    """validateメソッドのテスト"""
+    
+    def test_validate_ok(self):
+        """正しい形式"""
+        ItemDefinitions.validate(RAW_DEFINITIONS)
+        ItemDefinitions.validate({"deduction": None})
+    
+    @pytest.mark.parametrize("raw", [
+        None,
+        {"other": []},
+        {"deduction": {"name": "所得税"}},
+        {"deduction": ["所得税"]},
+        {"deduction": [{"name": "所得税", "category": "税・社会保障"}]},
+        {"deduction": [{"name": 1, "category": "a", "subcategory": "b"}]},
+    ])
+    def test_validate_invalid(self, raw):
+        """不正な形式は例外"""
+        with pytest.raises(ValueError):
+            ItemDefinitions.validate(raw)
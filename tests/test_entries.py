@@ -0,0 +1,48 @@
+"""
+test_entries.py
+entries.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+from entries import EntryIndex
+
+
+class TestEntryIndex:
+    """EntryIndexクラスのテスト"""
+    
+    def test_take(self):
+        """同じ日付・金額・内容の入出金を1件ずつ消し込む"""
+        index = EntryIndex([
+            {"date": "2024/11/25-1234", "amount": "-1,000", "content": "所得税"},
+            {"date": "2024/11/25-1235", "amount": "-1,000", "content": "所得税"},
+            {"date": "2024/11/25-1236", "amount": "5,000", "content": "控除合計"},
+        ], 2024)
+        assert len(index) == 3
+        
+        assert index.take("2024/11/25", -1000, "所得税") is True
+        assert index.take("2024/11/25", -1000, "所得税") is True
+        assert index.take("2024/11/25", -1000, "所得税") is False
+        assert index.take("2024/11/25", 5000, "控除合計") is True
+        assert len(index) == 0
+    
+    def test_mismatch(self):
+        """日付・金額（収入/支出）・内容のいずれかが異なる場合は登録済みとしない"""
+        index = EntryIndex([{"date": "2024/11/25", "amount": "-1,000", "content": "所得税"}], 2024)
+        assert index.take("2024/11/26", -1000, "所得税") is False
+        assert index.take("2024/11/25", 1000, "所得税") is False
+        assert index.take("2024/11/25", -1000, "住民税") is False
+        assert len(index) == 1
+    
+    def test_display_date(self):
+        """年のない表示の日付は一覧の年で補い、内容の空白は無視する"""
+        index = EntryIndex([{"date": "\n 1/5(金) ", "amount": "\n -300円 ", "content": "  雇用 \n 保険料 "}], 2025)
+        assert index.take("2025/01/05", -300, "雇用 保険料") is True
+    
+    def test_unreadable_rows(self):
+        """日付・金額を読めない行（見出しなど）は無視する"""
+        index = EntryIndex([
+            {"date": "", "amount": "-1,000", "content": "所得税"},
+            {"date": "2024/11/25", "amount": "", "content": "所得税"},
+            {"date": None, "amount": None, "content": None},
+        ], 2024)
+        assert len(index) == 0
@@ -0,0 +1,157 @@
+"""
+test_index.py
+index.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+import json
+import os
+from unittest.mock import patch
+from index import SalaryIndex
+from reader import SalaryReader
+from common import SalaryKind
+
+
+@pytest.fixture
+def salary_dir(tmp_path):
+    """給与明細ディレクトリを作成する"""
+    directory = tmp_path / "salaryData"
+    directory.mkdir()
+    for name in ["202401_kyuyo_1.pdf", "202406_syoyo_1.pdf", "202412_tokubetsu_2.pdf", "memo.txt"]:
+        (directory / name).touch()
+    (directory / "202402_kyuyo_9.pdf").mkdir()
+    return directory
+
+
+def _age_directory(directory):
+    """ディレクトリの更新日時を走査時刻より十分前にする"""
+    stat = os.stat(directory)
+    old = stat.st_mtime_ns - 10 * SalaryIndex.RACY_WINDOW_NS
+    os.utime(directory, ns=(old, old))
+
+
+class TestRefresh:
+    """refreshメソッドのテスト"""
+    
+    def test_scan(self, salary_dir, tmp_path):
+        """ファイル名を解析して索引化し、cacheへ保存する"""
+        index = SalaryIndex(str(salary_dir))
+        assert index.refresh() is True
+        
+        assert len(index) == 3
+        assert index.lookup(2024, 1, SalaryKind.NORMAL, "1") == "202401_kyuyo_1.pdf"
+        assert index.lookup(2024, 12, SalaryKind.SPECIAL, "2") == "202412_tokubetsu_2.pdf"
+        assert index.lookup(2024, 2, SalaryKind.NORMAL, "9") is None
+        assert index.indexFile == str(tmp_path / "cache" / "salary_index.json")
+        assert os.path.exists(index.indexFile)
+    
+    def test_unchanged_directory_not_scanned(self, salary_dir):
+        """ディレクトリが変わっていなければ走査しない"""
+        _age_directory(salary_dir)
+        index = SalaryIndex(str(salary_dir))
+        index.refresh()
+        
+        with patch('index.os.scandir') as mock_scandir:
+            assert index.refresh() is False
+            mock_scandir.assert_not_called()
+    
+    def test_recently_modified_directory_rescanned(self, salary_dir):
+        """走査直前に更新されたディレクトリは次回も走査する（同じ更新日時での追加を見逃さない）"""
+        index = SalaryIndex(str(salary_dir))
+        index.refresh()
+        (salary_dir / "202402_kyuyo_1.pdf").touch()
+        os.utime(salary_dir, ns=(index.mtimeNs, index.mtimeNs))
+        
+        assert index.refresh() is True
+        assert index.lookup(2024, 2, SalaryKind.NORMAL, "1") == "202402_kyuyo_1.pdf"
+    
+    def test_incremental_update(self, salary_dir):
+        """追加・削除されたファイルだけを反映し、既存の解析結果を再利用する"""
+        index = SalaryIndex(str(salary_dir))
+        index.refresh()
+        (salary_dir / "202401_kyuyo_1.pdf").unlink()
+        (salary_dir / "202403_kyuyo_1.pdf").touch()
+        _age_directory(salary_dir)
+        
+        with patch('index.SalaryReader.parse_pdf_filename', wraps=SalaryReader.parse_pdf_filename) as mock_parse:
+            assert index.refresh() is True
+            parsed = [call.args[0] for call in mock_parse.call_args_list]
+        
+        assert "202406_syoyo_1.pdf" not in parsed
+        assert "202403_kyuyo_1.pdf" in parsed
+        assert index.lookup(2024, 1, SalaryKind.NORMAL, "1") is None
+        assert index.lookup(2024, 3, SalaryKind.NORMAL, "1") == "202403_kyuyo_1.pdf"
+    
+    def test_missing_directory(self, tmp_path):
+        """ディレクトリがない場合は空の索引"""
+        index = SalaryIndex(str(tmp_path / "none"))
+        assert index.refresh() is False
+        assert len(index) == 0
+    
+    def test_directory_removed(self, salary_dir):
+        """索引作成後にディレクトリが削除された場合は空にする"""
+        index = SalaryIndex(str(salary_dir))
+        index.refresh()
+        with patch('index.os.stat', side_effect=FileNotFoundError):
+            assert index.refresh() is True
+        assert len(index) == 0
+
+
+class TestPersistence:
+    """ディスク上の索引のテスト"""
+    
+    def test_loaded_by_new_instance(self, salary_dir):
+        """別のプロセス（インスタンス）は保存された索引を使い、走査しない"""
+        _age_directory(salary_dir)
+        SalaryIndex(str(salary_dir)).refresh()
+        
+        index = SalaryIndex(str(salary_dir))
+        assert len(index) == 3
+        with patch('index.os.scandir') as mock_scandir:
+            assert index.refresh() is False
+            mock_scandir.assert_not_called()
+    
+    def test_other_directory_ignored(self, salary_dir, tmp_path):
+        """別のディレクトリの索引は使わない"""
+        SalaryIndex(str(salary_dir)).refresh()
+        other = SalaryIndex(str(tmp_path / "other"), index_file=str(tmp_path / "cache" / "salary_index.json"))
+        assert len(other) == 0
+    
+    @pytest.mark.parametrize("content", ["broken", json.dumps({"version": 1})])
+    def test_broken_index(self, salary_dir, tmp_path, content):
+        """壊れた索引ファイルは使わない"""
+        index_file = tmp_path / "cache" / "salary_index.json"
+        index_file.parent.mkdir()
+        index_file.write_text(content)
+        
+        with patch('index.Logger.logWarning') as mock_warning:
+            index = SalaryIndex(str(salary_dir))
+            mock_warning.assert_called_once()
+        assert len(index) == 0
+        index.refresh()
+        assert len(index) == 3
+    
+    def test_save_failure_ignored(self, salary_dir):
+        """索引を保存できなくても処理を続ける"""
+        index = SalaryIndex(str(salary_dir))
+        with patch('index.os.makedirs', side_effect=PermissionError):
+            assert index.refresh() is True
+        assert len(index) == 3
+
+
+class TestTargets:
+    """targetsメソッドのテスト"""
+    
+    def test_targets(self, salary_dir):
+        """社員番号・給与種別で絞り込み、年月順に並べる"""
+        index = SalaryIndex(str(salary_dir))
+        index.refresh()
+        
+        assert index.targets() == [
+            (2024, 1, SalaryKind.NORMAL, "1"),
+            (2024, 6, SalaryKind.BONUS, "1"),
+            (2024, 12, SalaryKind.SPECIAL, "2"),
+        ]
+        assert index.targets(numbers=["2"]) == [(2024, 12, SalaryKind.SPECIAL, "2")]
+        assert index.targets(kind=SalaryKind.BONUS) == [(2024, 6, SalaryKind.BONUS, "1")]
@@ -0,0 +1,86 @@
+"""
+test_journal.py
+journal.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import sqlite3
+import pytest
+from unittest.mock import patch
+from journal import RegistrationJournal
+from salary import Salary
+from item import Item
+from common import SalaryKind
+
+
+def _salary(month=11, kind=SalaryKind.NORMAL, items=None):
+    salary = Salary(2024, month, kind, items=items or [Item("所得税", 1000), Item("住民税", 2000)])
+    salary.set_date(25)
+    return salary
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return RegistrationJournal("12345", str(tmp_path / "cache" / RegistrationJournal.JOURNAL_FILENAME))
+
+
+class TestRegistrationJournal:
+    """RegistrationJournalクラスのテスト"""
+    
+    def test_record(self, journal):
+        """記録した項目だけが登録済みになる（ファイルとテーブルは初回に作成する）"""
+        salary = _salary()
+        assert journal.is_registered(salary, salary.deductionItems[0]) is False
+        
+        journal.record(salary, salary.deductionItems[0])
+        journal.record(salary, salary.deductionItems[0])
+        
+        assert journal.is_registered(salary, salary.deductionItems[0]) is True
+        assert journal.is_registered(salary, salary.deductionItems[1]) is False
+        with sqlite3.connect(journal.journalFile) as connection:
+            rows = connection.execute("SELECT name, payday FROM registrations").fetchall()
+        assert rows == [("所得税", "2024/11/25")]
+    
+    def test_persisted(self, journal):
+        """記録は別のインスタンス（再実行）からも参照できる"""
+        salary = _salary()
+        journal.record(salary, salary.deductionItems[1])
+        
+        reopened = RegistrationJournal("12345", journal.journalFile)
+        rerun = _salary()
+        assert reopened.is_registered(rerun, rerun.deductionItems[1]) is True
+        assert RegistrationJournal("99999", journal.journalFile).is_registered(salary, salary.deductionItems[1]) is False
+    
+    def test_key(self, journal):
+        """社員番号・年月・給与種別・項目名・金額で区別する"""
+        salary = _salary()
+        journal.record(salary, salary.deductionItems[0])
+        
+        other_month = _salary(month=12)
+        bonus = _salary(kind=SalaryKind.BONUS)
+        changed = _salary(items=[Item("所得税", 1500)])
+        assert journal.is_registered(other_month, other_month.deductionItems[0]) is False
+        assert journal.is_registered(bonus, bonus.deductionItems[0]) is False
+        assert journal.is_registered(changed, changed.deductionItems[0]) is False
+    
+    def test_same_items(self, journal):
+        """項目名・金額が同じ項目は出現順で区別する"""
+        salary = _salary(items=[Item("その他", 500), Item("所得税", 1000), Item("その他", 500)])
+        assert journal.key(salary, salary.deductionItems[2])[-1] == 1
+        
+        journal.record(salary, salary.deductionItems[0])
+        assert journal.is_registered(salary, salary.deductionItems[0]) is True
+        assert journal.is_registered(salary, salary.deductionItems[2]) is False
+    
+    def test_unavailable(self, tmp_path):
+        """記録ファイルを使用できない場合は警告して未登録として扱う"""
+        broken = tmp_path / "broken.sqlite3"
+        broken.write_bytes(b"not a database" * 100)
+        journal = RegistrationJournal("12345", str(broken))
+        salary = _salary()
+        
+        with patch('journal.Logger.logWarning') as mock_warn:
+            assert journal.is_registered(salary, salary.deductionItems[0]) is False
+            journal.record(salary, salary.deductionItems[0])
+        
+        assert mock_warn.call_count == 2
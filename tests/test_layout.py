@@ -0,0 +1,224 @@
+"""
+test_layout.py
+layout.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+from unittest.mock import MagicMock
+import pypdfium2 as pdfium
+from definitions import ItemDefinitions
+from layout import LayoutExtractor, TextBox
+
+
+def _definitions(*names):
+    return ItemDefinitions(
+        {"deduction": [{"name": n, "category": "大", "subcategory": "中"} for n in names]}
+    )
+
+
+def _make_textpage(words, char_width=10, char_height=10):
+    """単語を(テキスト, x, y)の位置に並べたテキストページのモック"""
+    text = ""
+    boxes = []
+    for word, x, y in words:
+        if text:
+            text += "\r\n"
+            boxes.extend([(0, 0, 0, 0)] * 2)
+        for i, char in enumerate(word):
+            text += char
+            left = x + i * char_width
+            boxes.append((left, y, left + char_width - 1, y + char_height))
+    
+    textpage = MagicMock()
+    textpage.count_chars.return_value = len(text)
+    textpage.get_text_range.return_value = text
+    textpage.get_charbox.side_effect = lambda index: boxes[index]
+    return textpage
+
+
+class TestTextBox:
+    """TextBoxのテスト"""
+    
+    def test_properties(self):
+        """高さ・中心座標"""
+        box = TextBox("a", 10, 20, 30, 60)
+        assert box.height == 40
+        assert box.center_x == 20
+        assert box.center_y == 40
+    
+    def test_extend(self):
+        """連結すると外接矩形が広がる"""
+        box = TextBox("a", 10, 20, 30, 60).extend(TextBox("b", 35, 15, 50, 55))
+        assert box == TextBox("ab", 10, 15, 50, 60)
+
+
+class TestExtractPage:
+    """extract_pageメソッドのテスト"""
+    
+    def test_amount_below_label(self):
+        """項目名の直下にある金額を対応付ける"""
+        textpage = _make_textpage([
+            ("所得税", 0, 700), ("住民税", 100, 700), ("控除合計", 200, 700),
+            ("1,000", 0, 685), ("2,000", 100, 685), ("3,000", 200, 685),
+        ])
+        extractor = LayoutExtractor(_definitions("所得税", "住民税", "控除合計"))
+        
+        assert extractor.extract_page(textpage) == [
+            "所得税", "1,000", "住民税", "2,000", "控除合計", "3,000"
+        ]
+    
+    def test_right_aligned_amount_in_column(self):
+        """項目名と重ならない右寄せの金額も同じ列として対応付ける"""
+        textpage = _make_textpage([
+            ("所得税", 0, 700), ("住民税", 100, 700),
+            ("500", 50, 685), ("700", 150, 685),
+        ])
+        extractor = LayoutExtractor(_definitions("所得税", "住民税"))
+        
+        assert extractor.extract_page(textpage) == ["所得税", "500", "住民税", "700"]
+    
+    def test_amount_right_of_label(self):
+        """同じ行の右側にある金額を対応付ける"""
+        textpage = _make_textpage([
+            ("所得税", 0, 700), ("1,000", 200, 700),
+            ("住民税", 0, 680), ("2,000", 200, 680),
+        ])
+        extractor = LayoutExtractor(_definitions("所得税", "住民税"))
+        
+        assert extractor.extract_page(textpage) == ["所得税", "1,000", "住民税", "2,000"]
+    
+    def test_multi_token_label(self):
+        """空白で分かれた項目名を連結して照合する"""
+        textpage = _make_textpage([
+            ("控除", 0, 700), ("合計", 30, 700), ("9,999", 10, 685),
+        ])
+        extractor = LayoutExtractor(_definitions("控除合計"))
+        
+        assert extractor.extract_page(textpage) == ["控除合計", "9,999"]
+    
+    def test_longest_label_preferred(self):
+        """連結で長い項目名に一致する場合はそちらを優先する"""
+        textpage = _make_textpage([
+            ("介護", 0, 700), ("保険料", 30, 700), ("100", 10, 685),
+        ])
+        extractor = LayoutExtractor(_definitions("介護", "介護保険料"))
+        
+        assert extractor.extract_page(textpage) == ["介護保険料", "100"]
+    
+    def test_missing_amount(self):
+        """金額が見つからない項目は空文字"""
+        textpage = _make_textpage([("所得税", 0, 700), ("備考", 0, 685)])
+        extractor = LayoutExtractor(_definitions("所得税"))
+        
+        assert extractor.extract_page(textpage) == ["所得税", ""]
+    
+    def test_amount_too_far_below(self):
+        """項目名から離れすぎた金額は対応付けない"""
+        textpage = _make_textpage([("所得税", 0, 700), ("1,000", 0, 500)])
+        extractor = LayoutExtractor(_definitions("所得税"))
+        
+        assert extractor.extract_page(textpage) == ["所得税", ""]
+    
+    def test_amount_above_label_ignored(self):
+        """項目名より上にある金額は対応付けない"""
+        textpage = _make_textpage([("1,000", 0, 720), ("所得税", 0, 700)])
+        extractor = LayoutExtractor(_definitions("所得税"))
+        
+        assert extractor.extract_page(textpage) == ["所得税", ""]
+    
+    def test_amount_left_of_label_ignored(self):
+        """同じ行の左側にある金額は対応付けない"""
+        textpage = _make_textpage([("1,000", 0, 700), ("所得税", 100, 700)])
+        extractor = LayoutExtractor(_definitions("所得税"))
+        
+        assert extractor.extract_page(textpage) == ["所得税", ""]
+    
+    def test_amount_used_once(self):
+        """1つの金額は1つの項目にのみ対応付ける"""
+        textpage = _make_textpage([("所得税", 0, 700), ("住民税", 0, 685), ("1,000", 200, 685)])
+        extractor = LayoutExtractor(_definitions("所得税", "住民税"))
+        
+        assert extractor.extract_page(textpage) == ["所得税", "", "住民税", "1,000"]
+    
+    def test_negative_and_fullwidth_amount(self):
+        """負の金額・全角数字の金額"""
+        textpage = _make_textpage([
+            ("年調過不足額", 0, 700), ("-3,000", 0, 685),
+            ("給食費", 200, 700), ("１，５００", 200, 685),
+        ])
+        extractor = LayoutExtractor(_definitions("年調過不足額", "給食費"))
+        
+        assert extractor.extract_page(textpage) == ["年調過不足額", "-3,000", "給食費", "1,500"]
+    
+    def test_page_without_labels(self):
+        """項目名を含まないページは文字座標を取得しない"""
+        textpage = _make_textpage([("添付資料", 0, 700), ("100", 0, 685)])
+        extractor = LayoutExtractor(_definitions("所得税"))
+        
+        assert extractor.extract_page(textpage) == []
+        textpage.get_charbox.assert_not_called()
+    
+    def test_label_text_split_across_rows(self):
+        """項目名の文字が別々の行にある場合は一致しない"""
+        textpage = _make_textpage([("所得", 0, 700), ("税", 0, 600)])
+        extractor = LayoutExtractor(_definitions("所得税"))
+        
+        assert extractor.extract_page(textpage) == []
+    
+    def test_bytes_text(self):
+        """バイト文字列のテキストを返すページ"""
+        textpage = _make_textpage([("tax", 0, 700), ("10", 50, 700)])
+        textpage.get_text_range.return_value = "tax\r\n10".encode("utf-8")
+        extractor = LayoutExtractor(_definitions("tax"))
+        
+        assert extractor.extract_page(textpage) == ["tax", "10"]
+
+
+class TestContainsName:
+    """項目名索引による前処理の判定"""
+    
+    def test_name_inside_token(self):
+        """空白で区切られていない項目名も検出する"""
+        extractor = LayoutExtractor(_definitions("所得税", "住民税"))
+        
+        assert extractor._contains_name("控除所得税1,000")
+    
+    def test_names_of_different_lengths(self):
+        """長さの異なる項目名をそれぞれ検出する"""
+        extractor = LayoutExtractor(_definitions("税", "年調過不足額"))
+        
+        assert extractor._contains_name("年調過不足額")
+        assert extractor._contains_name("課税")
+    
+    def test_prefix_only(self):
+        """先頭文字だけ一致する場合は含まない"""
+        extractor = LayoutExtractor(_definitions("所得税"))
+        
+        assert not extractor._contains_name("所得100所得")
+    
+    def test_no_definitions(self):
+        """項目定義がない場合は常に含まない"""
+        extractor = LayoutExtractor(_definitions())
+        
+        assert not extractor._contains_name("所得税")
+
+
+class TestExtractFromPdf:
+    """実際のPDFからの抽出テスト"""
+    
+    def test_generated_pdf(self, make_pdf):
+        """pdfiumの文字座標から単語と金額を組み立てる"""
+        path = make_pdf([[
+            ("Income Tax", 50, 700), ("1,200", 300, 700),
+            ("Pension", 50, 680), ("34,500", 300, 680),
+        ]])
+        extractor = LayoutExtractor(_definitions("IncomeTax", "Pension"))
+        
+        pdf = pdfium.PdfDocument(str(path))
+        try:
+            lines = extractor.extract_page(pdf[0].get_textpage())
+        finally:
+            pdf.close()
+        
+        assert lines == ["IncomeTax", "1,200", "Pension", "34,500"]
@@ -5,8 +5,10 @@ logger.pyの単体試験
 C0, C1, C2カバレッジ100%を目指したテストケース
 """
 import pytest
+import json
+import threading
 from unittest.mock import patch
-from logger import Logger, FColors
+from logger import Logger, FColors, Timer
 
 
 class TestFColors:
@@ -128,3 +130,149 @@ class TestLogger:
         Logger.logInfo(message)
         expected = f"{FColors.OKCYAN}[info] {message}{FColors.ENDC}"
         mock_print.assert_called_once_with(expected)
+    
+    @patch('builtins.print')
+    def test_hold_and_release(self, mock_print):
+        """保留したスレッドのログはrelease()まで出力せず、他のスレッドのログはそのまま出力する"""
+        held = threading.Event()
+        done = threading.Event()
+        
+        def work():
+            Logger.hold(threading.get_ident())
+            held.set()
+            Logger.logInfo("background")
+            done.set()
+        
+        thread = threading.Thread(target=work)
+        thread.start()
+        held.wait(1)
+        Logger.logInfo("foreground")
+        done.wait(1)
+        thread.join()
+        mock_print.assert_called_once_with(f"{FColors.OKCYAN}[info] foreground{FColors.ENDC}")
+        
+        Logger.release(thread.ident)
+        mock_print.assert_called_with(f"{FColors.OKCYAN}[info] background{FColors.ENDC}")
+        assert mock_print.call_count == 2
+        
+        # 保留していないスレッドは何もしない
+        Logger.release(thread.ident)
+        Logger.release(None)
+        assert mock_print.call_count == 2
+
+
+@pytest.fixture
+def timer():
+    """計測結果を空にしたTimer"""
+    Timer.reset()
+    yield Timer
+    Timer.reset()
+
+
+class TestTimer:
+    """Timerクラスのテスト"""
+    
+    def test_span(self, timer):
+        """区間の所要時間と親の区間を記録する"""
+        with Logger.span("upload"):
+            with Logger.span("item", label="所得税"):
+                pass
+            with Logger.span("item", label="住民税"):
+                pass
+        
+        spans = sorted(timer.spans(), key=lambda span: span.start)
+        assert [(span.name, span.label, span.parent) for span in spans] == [
+            ("upload", None, None),
+            ("item", "所得税", "upload"),
+            ("item", "住民税", "upload"),
+        ]
+        assert spans[0].seconds >= spans[1].seconds + spans[2].seconds
+    
+    def test_span_with_exception(self, timer):
+        """例外で抜けた区間も記録し、親の区間を戻す"""
+        with pytest.raises(ValueError):
+            with timer.span("fail"):
+                raise ValueError()
+        with timer.span("next"):
+            pass
+        assert [(span.name, span.parent) for span in timer.spans()] == [("fail", None), ("next", None)]
+    
+    def test_span_per_thread(self, timer):
+        """別スレッドの区間は親の区間を共有しない"""
+        with timer.span("main"):
+            def worker():
+                with timer.span("worker"):
+                    pass
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        assert {span.name: span.parent for span in timer.spans()} == {"main": None, "worker": None}
+    
+    def test_summary(self, timer):
+        """区間名ごとに回数・合計・最大を開始順に集計する"""
+        with patch('logger.time.perf_counter', side_effect=[10.0, 10.0, 11.0, 11.0, 11.25, 11.5, 12.0]):
+            timer.reset()
+            with timer.span("open"):
+                pass
+            with timer.span("extract"):
+                pass
+            with timer.span("open"):
+                pass
+        
+        summary = timer.summary()
+        assert [(phase.name, phase.count) for phase in summary] == [("open", 2), ("extract", 1)]
+        assert summary[0].seconds == pytest.approx(1.5)
+        assert summary[0].maxSeconds == pytest.approx(1.0)
+        assert summary[1].seconds == pytest.approx(0.25)
+    
+    def test_span_limit(self, timer):
+        """上限を超えた区間は古い順に集計へ畳み込み、集計結果は変わらない"""
+        with patch.object(Timer, 'MAX_SPANS', 4):
+            for i in range(5):
+                with timer.span("page", label=str(i)):
+                    pass
+            with timer.span("done"):
+                pass
+            
+            assert [span.label for span in timer.spans()] == ["3", "4", None]
+            summary = timer.summary()
+            assert [(phase.name, phase.count) for phase in summary] == [("page", 5), ("done", 1)]
+            assert summary[0].seconds >= summary[0].maxSeconds
+            assert len(timer.to_dict()["spans"]) == 3
+        
+        timer.reset()
+        assert timer.summary() == []
+    
+    def test_report(self, timer):
+        """区間名ごとの内訳をログ出力する"""
+        with timer.span("reader.open"):
+            pass
+        with patch('logger.Logger.logFine') as mock_fine:
+            timer.report()
+        lines = [call.args[0] for call in mock_fine.call_args_list]
+        assert lines[0] == Timer.LOG_HEADER
+        assert lines[1].startswith("reader.open")
+        assert lines[-1] == Timer.LOG_FOOTER
+    
+    def test_report_empty(self, timer):
+        """区間がない場合は出力しない"""
+        with patch('logger.Logger.logFine') as mock_fine:
+            timer.report()
+        mock_fine.assert_not_called()
+    
+    def test_write_json(self, timer, tmp_path):
+        """1回の実行を1行のJSONとして追記する"""
+        path = tmp_path / "report" / "timing.jsonl"
+        with timer.span("uploader.item", label="所得税"):
+            pass
+        timer.write_json(str(path))
+        timer.write_json(str(path))
+        
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        report = json.loads(lines[0])
+        assert report["version"] == Timer.REPORT_VERSION
+        assert report["phases"][0]["name"] == "uploader.item"
+        assert report["phases"][0]["count"] == 1
+        assert report["spans"][0]["label"] == "所得税"
+        assert report["total_ms"] >= report["spans"][0]["duration_ms"]
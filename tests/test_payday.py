@@ -0,0 +1,55 @@
+"""
+test_payday.py
+payday.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import datetime
+import pytest
+from unittest.mock import patch, MagicMock
+from payday import PaydayRule
+
+
+@pytest.fixture(autouse=True)
+def no_holidays():
+    """祝日のライブラリがない環境（土日のみ休日）"""
+    with patch('payday.jpholiday', None):
+        yield
+
+
+class TestPaydayRule:
+    """PaydayRuleクラスのテスト"""
+    
+    def test_business_day(self):
+        """営業日はそのまま（調整しない場合は休日でもそのまま）"""
+        assert PaydayRule(25, "before").resolve(2024, 11) == 25
+        assert PaydayRule("25").resolve(2024, 8) == 25
+    
+    @pytest.mark.parametrize("adjustment, expected", [("before", 23), ("after", 26), (" AFTER ", 26)])
+    def test_weekend(self, adjustment, expected):
+        """土日の場合は前後の営業日へずらす（2024/08/25は日曜日）"""
+        assert PaydayRule(25, adjustment).resolve(2024, 8) == expected
+    
+    def test_end_of_month(self):
+        """月の日数を超える日にちは月末とする"""
+        assert PaydayRule(31).resolve(2024, 2) == 29
+        assert PaydayRule(31).resolve(2025, 2) == 28
+    
+    def test_stays_in_month(self):
+        """次の営業日が翌月になる場合は前の営業日とする（2024/11/30は土曜日）"""
+        assert PaydayRule(30, "after").resolve(2024, 11) == 29
+        assert PaydayRule(1, "before").resolve(2024, 6) == 3
+    
+    def test_holiday(self):
+        """祝日のライブラリがある場合は祝日も休日とする（2024/11/04は振替休日）"""
+        holidays = MagicMock()
+        holidays.is_holiday.side_effect = lambda day: day == datetime.date(2024, 11, 4)
+        with patch('payday.jpholiday', holidays):
+            assert PaydayRule(4, "before").resolve(2024, 11) == 1
+            assert PaydayRule(4, "after").resolve(2024, 11) == 5
+    
+    @pytest.mark.parametrize("date, adjustment", [(0, "none"), (32, "none"), ("x", "none"), (25, "nearest")])
+    def test_invalid(self, date, adjustment):
+        """日にち・調整方法が不正な場合"""
+        with pytest.raises(ValueError):
+            PaydayRule(date, adjustment)
@@ -0,0 +1,176 @@
+"""
+test_pool.py
+pool.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+import os
+import threading
+import time
+from unittest.mock import patch, MagicMock
+from pool import UploadPool, PoolResult, RateLimiter
+from salary import Salary
+from item import Item
+from common import SalaryKind
+
+
+def _salary(month):
+    salary = MagicMock(spec=Salary)
+    salary.kind = SalaryKind.NORMAL
+    salary.deductionItems = [Item("控除合計", 100), Item("所得税", 100)]
+    salary.get_payday.return_value = f"2024/{month:02}/25"
+    return salary
+
+
+@pytest.fixture
+def mock_uploader_class():
+    """WebDriverを起動しないUploader"""
+    with patch('pool.Uploader') as mock_class:
+        mock_class.side_effect = lambda: MagicMock()
+        yield mock_class
+
+
+class TestRateLimiter:
+    """RateLimiterクラスのテスト"""
+    
+    def test_unlimited(self):
+        """上限が0の場合は待たない"""
+        limiter = RateLimiter(0)
+        with patch('pool.time.sleep') as mock_sleep:
+            for _ in range(5):
+                limiter.acquire()
+        mock_sleep.assert_not_called()
+    
+    def test_interval_shared_by_threads(self):
+        """複数スレッドから呼び出しても開始間隔が空く"""
+        limiter = RateLimiter(60 * 20)  # 50ms間隔
+        starts = []
+        lock = threading.Lock()
+        
+        def call():
+            limiter.acquire()
+            with lock:
+                starts.append(time.monotonic())
+        
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        starts.sort()
+        assert all(b - a >= 0.045 for a, b in zip(starts, starts[1:]))
+
+
+class TestRun:
+    """runメソッドのテスト"""
+    
+    def test_register_all(self, mock_uploader_class, tmp_path):
+        """すべての明細を登録し、指定した順に結果を返す"""
+        salaries = [_salary(month) for month in range(1, 6)]
+        pool = UploadPool(salaries, workers=3, profile_root=str(tmp_path))
+        
+        with patch('pool.Logger.logInfo') as mock_info:
+            results = pool.run()
+        
+        assert [result.salary for result in results] == salaries
+        assert all(result.is_ok() for result in results)
+        # カテゴリの確認用と3ワーカー分
+        assert mock_uploader_class.call_count == 4
+        assert "成功=5件, 失敗=0件, 10項目" in mock_info.call_args_list[1].args[0]
+    
+    def test_worker_settings(self, mock_uploader_class, tmp_path):
+        """ワーカーごとに専用のプロファイルを使い、項目の登録前に流量制限を通す"""
+        pool = UploadPool([_salary(1)], workers=1, items_per_minute=30, profile_root=str(tmp_path))
+        uploader = pool._create_uploader(2)
+        assert uploader.profileDir == str(tmp_path / "worker2")
+        assert uploader.throttle == pool.limiter.acquire
+        assert pool.limiter.interval == 2.0
+    
+    def test_session_shared_when_not_kept(self, mock_uploader_class, tmp_path):
+        """セッションを保存しない設定では、実行中だけ一時的なセッションをワーカー間で共有する"""
+        checker, first, second = MagicMock(), MagicMock(), MagicMock()
+        checker.sessionStore = None
+        uploaders = iter([checker, first, second])
+        mock_uploader_class.side_effect = lambda: next(uploaders)
+        
+        with patch('pool.SessionStore') as mock_store_class, patch('pool.Logger.logInfo'):
+            results = UploadPool([_salary(1), _salary(2)], workers=2, profile_root=str(tmp_path)).run()
+        
+        assert all(result.is_ok() for result in results)
+        mock_store_class.assert_called_once()
+        session_dir = mock_store_class.call_args.kwargs["cache_dir"]
+        assert first.sessionStore is mock_store_class.return_value
+        assert second.sessionStore is mock_store_class.return_value
+        assert not os.path.exists(session_dir)
+    
+    def test_session_kept(self, mock_uploader_class, tmp_path):
+        """セッションを保存する設定では各ワーカーが保存先のセッションを使う"""
+        pool = UploadPool([_salary(1)], workers=1, profile_root=str(tmp_path))
+        with patch('pool.SessionStore') as mock_store_class, patch('pool.Logger.logInfo'):
+            pool.run()
+        mock_store_class.assert_not_called()
+        assert pool.sessionStore is None
+    
+    def test_workers_limited_by_salaries(self, tmp_path):
+        """ワーカー数は明細数を超えない"""
+        assert UploadPool([_salary(1)], workers=4, profile_root=str(tmp_path)).workers == 1
+    
+    def test_failed_salary(self, mock_uploader_class, tmp_path):
+        """登録に失敗した明細は失敗として記録し、入力モーダルを開き直して続ける"""
+        uploader = MagicMock()
+        mock_uploader_class.side_effect = None
+        mock_uploader_class.return_value = uploader
+        uploader._register_deduction_items.side_effect = [Exception("カテゴリなし"), None]
+        salaries = [_salary(1), _salary(2)]
+        
+        with patch('pool.Logger.logInfo'), patch('pool.Logger.logError') as mock_error:
+            results = UploadPool(salaries, workers=1, profile_root=str(tmp_path)).run()
+        
+        assert [result.error for result in results] == ["カテゴリなし", None]
+        assert results[0].worker == 0
+        assert uploader._navigate_to_input_page.call_count == 2
+        mock_error.assert_called_once()
+        uploader.close.assert_called_once()
+    
+    def test_worker_cannot_reopen(self, mock_uploader_class, tmp_path):
+        """入力モーダルを開き直せないワーカーは終了し、残りは未登録になる"""
+        uploader = MagicMock()
+        mock_uploader_class.side_effect = None
+        mock_uploader_class.return_value = uploader
+        uploader._register_deduction_items.side_effect = Exception("通信エラー")
+        uploader._navigate_to_input_page.side_effect = [None, Exception("ページなし")]
+        
+        with patch('pool.Logger.logInfo'), patch('pool.Logger.logError'):
+            results = UploadPool([_salary(1), _salary(2)], workers=1, profile_root=str(tmp_path)).run()
+        
+        assert results[0].error == "通信エラー"
+        assert results[1] == PoolResult(results[1].salary, None, 0.0, UploadPool.LOG_NOT_REGISTERED)
+    
+    def test_worker_start_failed(self, mock_uploader_class, tmp_path):
+        """開始できないワーカーがあっても他のワーカーが登録する"""
+        broken, working = MagicMock(), MagicMock()
+        broken._sign_in.side_effect = Exception("ログイン失敗")
+        uploaders = iter([MagicMock(), broken, working])
+        mock_uploader_class.side_effect = lambda: next(uploaders)
+        salaries = [_salary(month) for month in range(1, 4)]
+        
+        with patch('pool.Logger.logInfo'), patch('pool.Logger.logError') as mock_error:
+            results = UploadPool(salaries, workers=2, profile_root=str(tmp_path)).run()
+        
+        assert all(result.is_ok() for result in results)
+        assert len({result.worker for result in results}) == 1
+        assert "ログイン失敗" in mock_error.call_args.args[0]
+        broken.close.assert_called_once()
+    
+    def test_unknown_categories(self, mock_uploader_class, tmp_path):
+        """保存したカテゴリにない項目がある場合はワーカーを起動しない"""
+        checker = MagicMock()
+        checker.check_categories.side_effect = ValueError("カテゴリなし")
+        mock_uploader_class.side_effect = None
+        mock_uploader_class.return_value = checker
+        
+        with pytest.raises(ValueError):
+            UploadPool([_salary(1)], workers=1, profile_root=str(tmp_path)).run()
+        checker._init_webdriver.assert_not_called()
@@ -11,6 +11,10 @@ from unittest.mock import patch, MagicMock, mock_open
 from reader import SalaryReader
 from common import SalaryKind, DirectoryNames, FileNames, ItemNames
 from item import Item
+from cache import ExtractionCache
+from definitions import ItemDefinitions
+from layout import LayoutExtractor
+from logger import Timer
 
 
 @pytest.fixture(autouse=True)
@@ -18,6 +22,7 @@ def mock_config():
     """全テストでconfig.dataをモック"""
     with patch('reader.config.data') as mock_data:
         mock_data.get_pdf_password.return_value = "test_password"
+        mock_data.is_extraction_cache_enabled.return_value = False
         yield mock_data
 
 
@@ -40,6 +45,19 @@ class TestSalaryReaderInitialization:
         assert reader.number == "67890"
         assert reader.kind == SalaryKind.BONUS
     
+    def test_init_with_extraction_cache(self, mock_config):
+        """設定で抽出キャッシュが有効な場合はキャッシュを作成する"""
+        mock_config.is_extraction_cache_enabled.return_value = True
+        mock_config.get_extraction_cache_max_bytes.return_value = 1024
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        assert isinstance(reader.cache, ExtractionCache)
+        assert reader.cache.maxBytes == 1024
+    
+    def test_init_without_extraction_cache(self):
+        """設定で抽出キャッシュが無効な場合"""
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        assert reader.cache is None
+    
     def test_init_paths_set(self):
         """パスが正しく設定される"""
         reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
@@ -76,6 +94,11 @@ class TestGetPdfFilename:
         filename = reader._get_pdf_filename()
         assert filename == "202412_kyuyo_99999.pdf"
     
+    def test_special_filename(self):
+        """特別金のPDFファイル名生成（賞与とは別の接頭辞）"""
+        reader = SalaryReader(2024, 12, "12345", SalaryKind.SPECIAL)
+        assert reader._get_pdf_filename() == "202412_tokubetsu_12345.pdf"
+    
     def test_deprecated_getPdfFileName(self):
         """非推奨メソッドgetPdfFileName"""
         reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
@@ -83,6 +106,77 @@ class TestGetPdfFilename:
         assert filename == "202411_kyuyo_12345.pdf"
 
 
+class TestParsePdfFilename:
+    """parse_pdf_filenameメソッドのテスト"""
+    
+    def test_parse_normal_salary(self):
+        """給与明細のファイル名"""
+        assert SalaryReader.parse_pdf_filename("202411_kyuyo_12345.pdf") == (
+            2024, 11, SalaryKind.NORMAL, "12345"
+        )
+    
+    def test_parse_bonus(self):
+        """賞与明細のファイル名"""
+        assert SalaryReader.parse_pdf_filename("202406_syoyo_67890.pdf") == (
+            2024, 6, SalaryKind.BONUS, "67890"
+        )
+    
+    def test_parse_special(self):
+        """特別金明細のファイル名"""
+        assert SalaryReader.parse_pdf_filename("202412_tokubetsu_1.pdf") == (
+            2024, 12, SalaryKind.SPECIAL, "1"
+        )
+    
+    @pytest.mark.parametrize("filename", ["memo.txt", "2024_kyuyo_1.pdf", "202411_kyuyo_1.txt"])
+    def test_parse_other_files(self, filename):
+        """給与明細でないファイル名"""
+        assert SalaryReader.parse_pdf_filename(filename) is None
+    
+    def test_roundtrip(self):
+        """生成したファイル名を解析すると元の値に戻る"""
+        reader = SalaryReader(2024, 3, "11111", SalaryKind.BONUS)
+        assert SalaryReader.parse_pdf_filename(reader._get_pdf_filename()) == (
+            2024, 3, SalaryKind.BONUS, "11111"
+        )
+
+
+class TestResolvePdfFilename:
+    """_resolve_pdf_filenameメソッドのテスト"""
+    
+    def _reader(self, kind, tmp_path, *files):
+        for name in files:
+            (tmp_path / name).touch()
+        reader = SalaryReader(2024, 12, "1", kind)
+        reader.salaryDir = str(tmp_path)
+        return reader
+    
+    def test_normal_not_probed(self, tmp_path):
+        """旧形式のない給与種別はファイルの有無を確認しない"""
+        reader = self._reader(SalaryKind.NORMAL, tmp_path)
+        with patch('reader.os.path.exists') as mock_exists:
+            assert reader._resolve_pdf_filename() == "202412_kyuyo_1.pdf"
+            mock_exists.assert_not_called()
+    
+    def test_special_current(self, tmp_path):
+        """特別金は現行のファイル名を優先する"""
+        reader = self._reader(
+            SalaryKind.SPECIAL, tmp_path, "202412_tokubetsu_1.pdf", "202412_syoyo_1.pdf"
+        )
+        assert reader._resolve_pdf_filename() == "202412_tokubetsu_1.pdf"
+    
+    def test_special_legacy(self, tmp_path):
+        """現行のファイル名がなければ旧形式（賞与の接頭辞）を使う"""
+        reader = self._reader(SalaryKind.SPECIAL, tmp_path, "202412_syoyo_1.pdf")
+        with patch('reader.Logger.logWarning') as mock_warning:
+            assert reader._resolve_pdf_filename() == "202412_syoyo_1.pdf"
+            mock_warning.assert_called_once()
+    
+    def test_special_missing(self, tmp_path):
+        """どちらもない場合は現行のファイル名（読み込み時にエラーとなる）"""
+        reader = self._reader(SalaryKind.SPECIAL, tmp_path)
+        assert reader._resolve_pdf_filename() == "202412_tokubetsu_1.pdf"
+
+
 class TestCreateItem:
     """_create_itemメソッドのテスト"""
     
@@ -211,6 +305,38 @@ class TestExtractItems:
         
         assert len(items) == 0
         assert sum_item is None
+    
+    def test_extract_items_duplicate_definitions(self):
+        """同名の定義が複数ある場合は先の定義を使う"""
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        
+        item_defs = {
+            "deduction": [
+                {"name": "住民税", "category": "税", "subcategory": "住民税"},
+                {"name": "住民税", "category": "その他", "subcategory": "その他"}
+            ]
+        }
+        
+        items, _ = reader._extract_items(["住民税", "5000"], item_defs)
+        
+        assert len(items) == 1
+        assert items[0].category == "税"
+    
+    def test_extract_items_with_compiled_definitions(self):
+        """索引化済みの項目定義での抽出"""
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        
+        item_defs = ItemDefinitions({
+            "deduction": [
+                {"name": "所得税", "category": "税", "subcategory": "所得税"},
+                {"name": "控除合計", "category": "収入", "subcategory": "給与"}
+            ]
+        })
+        
+        items, sum_item = reader._extract_items(["所得税", "100", "控除合計", "100"], item_defs)
+        
+        assert [item.name for item in items] == ["所得税"]
+        assert sum_item.amount == 100
 
 
 class TestValidateTotalAmount:
@@ -261,9 +387,10 @@ class TestValidateTotalAmount:
 class TestLoadItemDefinitions:
     """_load_item_definitionsメソッドのテスト"""
     
-    def test_load_item_definitions(self):
+    def test_load_item_definitions(self, tmp_path):
         """項目定義ファイルの読み込み"""
         reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        reader.itemsFile = str(tmp_path / "items.yml")
         
         yaml_content = """
 deduction:
@@ -274,19 +401,33 @@ deduction:
     category: 社会保険
     subcategory: 年金
 """
+        with open(reader.itemsFile, "w", encoding="utf-8") as f:
+            f.write(yaml_content)
         
-        with patch('builtins.open', mock_open(read_data=yaml_content)):
-            with patch('yaml.safe_load') as mock_yaml:
-                mock_yaml.return_value = {
-                    "deduction": [
-                        {"name": "健康保険", "category": "社会保険", "subcategory": "健康保険"},
-                        {"name": "厚生年金", "category": "社会保険", "subcategory": "年金"}
-                    ]
-                }
-                
-                result = reader._load_item_definitions()
-                assert "deduction" in result
-                assert len(result["deduction"]) == 2
+        with patch('definitions.DirectoryNames.USERDATA', str(tmp_path)):
+            result = reader._load_item_definitions()
+            assert "deduction" in result
+            assert len(result["deduction"]) == 2
+            
+            # 2回目以降は解析済みの定義を再利用する
+            with patch('definitions.yaml.safe_load') as mock_yaml:
+                assert reader._load_item_definitions() is result
+                mock_yaml.assert_not_called()
+    
+    def test_load_item_definitions_preloaded(self):
+        """読み込み済みの項目定義が渡されている場合はファイルを読まない"""
+        definitions = {"deduction": []}
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL, item_definitions=definitions)
+        
+        with patch('builtins.open') as mock_file:
+            assert reader._load_item_definitions().raw is definitions
+            mock_file.assert_not_called()
+    
+    def test_load_item_definitions_compiled(self):
+        """索引化済みの項目定義はそのまま使う"""
+        definitions = ItemDefinitions({"deduction": []})
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL, item_definitions=definitions)
+        assert reader._load_item_definitions() is definitions
 
 
 class TestConvertPdf2Text:
@@ -339,16 +480,16 @@ class TestReadDeduction:
         # 各メソッドをモック
         with patch.object(reader, '_get_pdf_filename', return_value="test.pdf"):
             with patch.object(reader, '_load_item_definitions') as mock_load:
-                with patch.object(reader, '_convert_pdf_to_text') as mock_convert:
-                    with patch.object(reader, '_extract_items') as mock_extract:
+                with patch.object(reader, '_iter_page_lines') as mock_pages:
+                    with patch.object(reader, '_collect_items') as mock_collect:
                         with patch.object(reader, '_validate_total_amount') as mock_validate:
                             # モックの戻り値設定
-                            mock_load.return_value = {"deduction": []}
-                            mock_convert.return_value = []
+                            mock_load.return_value = ItemDefinitions({"deduction": []})
+                            mock_pages.return_value = iter([])
                             
                             item1 = Item("健康保険", 10000)
                             sum_item = Item("控除合計", 10000)
-                            mock_extract.return_value = ([item1], sum_item)
+                            mock_collect.return_value = ([item1], sum_item)
                             
                             # 実行
                             result = reader.readDeduction()
@@ -359,11 +500,168 @@ class TestReadDeduction:
                             assert result[1].name == "控除合計"
                             
                             mock_load.assert_called_once()
-                            mock_convert.assert_called_once()
-                            mock_extract.assert_called_once()
+                            mock_pages.assert_called_once()
+                            mock_collect.assert_called_once()
                             mock_validate.assert_called_once()
 
 
+class TestStreamingExtraction:
+    """ページ単位の逐次抽出と早期終了のテスト"""
+    
+    DEFINITIONS = ItemDefinitions({"deduction": [
+        {"name": "所得税", "category": "税", "subcategory": "所得税"},
+        {"name": "控除合計", "category": "収入", "subcategory": "給与"},
+    ]})
+    
+    def _pages(self, opened, *pages):
+        """開いたページ番号をopenedに記録するページ反復"""
+        for page_no, lines in enumerate(pages, start=1):
+            opened.append(page_no)
+            yield lines
+    
+    def test_stops_after_all_items_found(self):
+        """すべての項目が見つかった後のページは開かない"""
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        opened = []
+        pages = self._pages(
+            opened,
+            ["所得税", "100"],
+            ["控除合計", "100"],
+            ["添付資料"],
+            ["添付資料"],
+        )
+        
+        items, sum_item = reader._collect_items(pages, self.DEFINITIONS)
+        
+        assert opened == [1, 2]
+        assert [item.name for item in items] == ["所得税"]
+        assert sum_item.amount == 100
+    
+    def test_reads_all_pages_when_item_missing(self):
+        """見つからない項目がある場合は最後のページまで読む"""
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        opened = []
+        pages = self._pages(opened, ["所得税", "100"], ["添付資料"], ["添付資料"])
+        
+        items, sum_item = reader._collect_items(pages, self.DEFINITIONS)
+        
+        assert opened == [1, 2, 3]
+        assert sum_item is None
+    
+    def test_collects_text_lines(self):
+        """読み取ったページのテキスト行のみ格納する"""
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        text_lines = []
+        pages = iter([["所得税", "100", "控除合計", "100"], ["添付資料"]])
+        
+        reader._collect_items(pages, self.DEFINITIONS, text_lines)
+        
+        assert text_lines == ["所得税", "100", "控除合計", "100"]
+    
+    def test_closes_page_iterator(self):
+        """早期終了時にページの反復（PDF）を閉じる"""
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        pages = self._pages([], ["所得税", "1", "控除合計", "1"], ["添付資料"])
+        
+        reader._collect_items(pages, self.DEFINITIONS)
+        
+        with pytest.raises(StopIteration):
+            next(pages)
+    
+    def test_generated_pdf_stops_early(self, make_pdf):
+        """実際のPDFで項目がそろった後のページを開かない"""
+        path = make_pdf([
+            [("Tax", 50, 700), ("100", 50, 685)],
+            [("Total", 50, 700), ("100", 50, 685)],
+            [("Attachment", 50, 700)],
+        ], filename="202411_kyuyo_12345.pdf")
+        definitions = ItemDefinitions({"deduction": [
+            {"name": "Tax", "category": "税", "subcategory": "所得税"},
+            {"name": "Total", "category": "収入", "subcategory": "給与"},
+        ]})
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        reader.salaryDir = str(path.parent)
+        
+        original = LayoutExtractor.extract_page
+        with patch.object(LayoutExtractor, 'extract_page', autospec=True, side_effect=original) as mock_extract:
+            items = list(reader._iter_items(
+                reader._iter_page_lines("202411_kyuyo_12345.pdf", definitions), definitions
+            ))
+        
+        assert [item.name for item in items] == ["Tax", "Total"]
+        assert mock_extract.call_count == 2
+
+
+class TestReadDeductionCache:
+    """readDeductionの抽出キャッシュ利用テスト"""
+    
+    @pytest.fixture
+    def cached_reader(self, tmp_path):
+        """抽出キャッシュを有効にしたreader"""
+        salary_dir = tmp_path / "salaryData"
+        salary_dir.mkdir()
+        (salary_dir / "202411_kyuyo_12345.pdf").write_bytes(b"%PDF-dummy")
+        items_file = tmp_path / "items.yml"
+        items_file.write_text("deduction: []", encoding="utf-8")
+        
+        reader = SalaryReader(2024, 11, "12345", SalaryKind.NORMAL)
+        reader.cache = ExtractionCache("test_password", cache_dir=str(tmp_path / "cache"))
+        reader.salaryDir = str(salary_dir)
+        reader.itemsFile = str(items_file)
+        return reader
+    
+    def test_second_read_skips_pdf(self, cached_reader):
+        """2回目以降の読み込みはPDFを開かない"""
+        lines = ["所得税", "100", "控除合計", "100"]
+        definitions = {"deduction": [
+            {"name": "所得税", "category": "税", "subcategory": "所得税"},
+            {"name": "控除合計", "category": "収入", "subcategory": "給与"},
+        ]}
+        
+        with patch.object(cached_reader, '_load_item_definitions', return_value=definitions):
+            with patch.object(cached_reader, '_iter_page_lines', side_effect=lambda *args: iter([lines])) as mock_pages:
+                first = cached_reader.readDeduction()
+                second = cached_reader.readDeduction()
+        
+        mock_pages.assert_called_once()
+        assert [(i.name, i.amount, i.category) for i in second] == \
+            [(i.name, i.amount, i.category) for i in first]
+    
+    def test_cache_key_for_missing_pdf(self, cached_reader):
+        """PDFが存在しない場合はキャッシュキーを作らない"""
+        assert cached_reader._get_cache_key("missing.pdf", {"deduction": []}) is None
+    
+    def test_cache_key_changes_with_definitions(self, cached_reader):
+        """使用する項目定義（items.ymlではなく指定された定義を含む）が変わるとキャッシュキーも変わる"""
+        definitions = {"deduction": [{"name": "所得税", "category": "税", "subcategory": "所得税"}]}
+        changed = {"deduction": [{"name": "所得税", "category": "税", "subcategory": "住民税"}]}
+        
+        before = cached_reader._get_cache_key("202411_kyuyo_12345.pdf", definitions)
+        assert cached_reader._get_cache_key("202411_kyuyo_12345.pdf", ItemDefinitions(definitions)) == before
+        assert cached_reader._get_cache_key("202411_kyuyo_12345.pdf", changed) != before
+    
+    def test_explicit_definitions_not_stale(self, cached_reader):
+        """items.ymlと異なる定義を指定した読み込みは、items.ymlで読み込んだキャッシュを使わない"""
+        lines = ["所得税", "100", "控除合計", "100"]
+        definitions = {"deduction": [
+            {"name": "所得税", "category": "税", "subcategory": "所得税"},
+            {"name": "控除合計", "category": "収入", "subcategory": "給与"},
+        ]}
+        renamed = {"deduction": [
+            {"name": "所得税", "category": "税金", "subcategory": "所得税"},
+            {"name": "控除合計", "category": "収入", "subcategory": "給与"},
+        ]}
+        
+        with patch.object(cached_reader, '_iter_page_lines', side_effect=lambda *args: iter([lines])) as mock_pages:
+            cached_reader.itemDefinitions = definitions
+            cached_reader.readDeduction()
+            cached_reader.itemDefinitions = renamed
+            items = cached_reader.readDeduction()
+        
+        assert mock_pages.call_count == 2
+        assert items[0].category == "税金"
+
+
 class TestReaderAdditionalCoverage:
     """reader.pyの追加カバレッジテスト"""
     
@@ -376,69 +674,249 @@ class TestReaderAdditionalCoverage:
             with pytest.raises(ValueError, match="PDFファイル名の生成に失敗しました"):
                 reader._get_pdf_filename()
     
-    def test_convert_pdf_to_text_success(self):
-        """PDFからテキストへの変換成功"""
-        reader = SalaryReader(2024, 11, "test123", SalaryKind.NORMAL)
+    def _make_textpage(self, words, as_bytes=False):
+        """単語を(テキスト, x, y)の位置に1文字10pt幅で並べたテキストページのモック"""
+        text = ""
+        boxes = []
+        for word, x, y in words:
+            if text:
+                text += " "
+                boxes.append((0, 0, 0, 0))
+            for i, char in enumerate(word):
+                text += char
+                boxes.append((x + i * 10, y, x + i * 10 + 9, y + 10))
         
-        # モックPDFドキュメントの作成
-        mock_page = MagicMock()
         mock_textpage = MagicMock()
-        mock_textpage.get_text_bounded.return_value = "テスト 給与 控除"
-        mock_page.get_textpage.return_value = mock_textpage
+        mock_textpage.count_chars.return_value = len(text)
+        mock_textpage.get_text_range.return_value = text.encode('utf-8') if as_bytes else text
+        mock_textpage.get_charbox.side_effect = lambda index: boxes[index]
+        return mock_textpage
+    
+    def _make_pdf_mock(self, *textpages):
+        """テキストページを持つPDFドキュメントのモック"""
+        pages = []
+        for textpage in textpages:
+            mock_page = MagicMock()
+            mock_page.get_textpage.return_value = textpage
+            pages.append(mock_page)
         
         mock_pdf = MagicMock()
-        mock_pdf.__iter__.return_value = [mock_page]
+        mock_pdf.__len__.return_value = len(pages)
+        mock_pdf.__getitem__.side_effect = lambda index: pages[index]
+        return mock_pdf
+    
+    def _definitions(self, *names):
+        return {"deduction": [{"name": n, "category": "大", "subcategory": "中"} for n in names]}
+    
+    def test_convert_pdf_to_text_success(self):
+        """PDFからテキストへの変換成功（項目名の直下の金額を対応付ける）"""
+        reader = SalaryReader(2024, 11, "test123", SalaryKind.NORMAL)
         
-        with patch('reader.pdfium.PdfDocument', return_value=mock_pdf):
-            result = reader._convert_pdf_to_text("test.pdf")
+        textpage = self._make_textpage([
+            ("所得税", 0, 700), ("住民税", 100, 700),
+            ("1,000", 10, 680), ("2,000", 110, 680),
+        ])
+        
+        with patch('reader.pdfium.PdfDocument', return_value=self._make_pdf_mock(textpage)):
+            result = reader._convert_pdf_to_text("test.pdf", self._definitions("所得税", "住民税"))
             
-            assert len(result) == 3
-            assert "テスト" in result
-            assert "給与" in result
-            assert "控除" in result
+            assert result == ["所得税", "1,000", "住民税", "2,000"]
     
     def test_convert_pdf_to_text_with_bytes(self):
-        """PDFからバイト文字列テキストへの変換"""
+        """バイト文字列のテキストを返すページの変換"""
         reader = SalaryReader(2024, 11, "test123", SalaryKind.NORMAL)
         
-        # モックPDFドキュメントの作成（バイト文字列を返す）
-        mock_page = MagicMock()
-        mock_textpage = MagicMock()
-        mock_textpage.get_text_bounded.return_value = "テスト 給与".encode('utf-8')
-        mock_page.get_textpage.return_value = mock_textpage
-        
-        mock_pdf = MagicMock()
-        mock_pdf.__iter__.return_value = [mock_page]
+        textpage = self._make_textpage([("給与", 0, 700), ("300", 50, 700)], as_bytes=True)
         
-        with patch('reader.pdfium.PdfDocument', return_value=mock_pdf):
-            result = reader._convert_pdf_to_text("test.pdf")
+        with patch('reader.pdfium.PdfDocument', return_value=self._make_pdf_mock(textpage)):
+            result = reader._convert_pdf_to_text("test.pdf", self._definitions("給与"))
             
-            assert len(result) == 2
-            assert "テスト" in result
-            assert "給与" in result
+            assert result == ["給与", "300"]
     
     def test_convert_pdf_to_text_multiple_pages(self):
         """複数ページのPDFからテキストへの変換"""
         reader = SalaryReader(2024, 11, "test123", SalaryKind.NORMAL)
         
-        # ページ1
-        mock_page1 = MagicMock()
-        mock_textpage1 = MagicMock()
-        mock_textpage1.get_text_bounded.return_value = "ページ1 テキスト"
-        mock_page1.get_textpage.return_value = mock_textpage1
+        page1 = self._make_textpage([("所得税", 0, 700), ("100", 0, 680)])
+        page2 = self._make_textpage([("添付資料", 0, 700), ("999", 0, 680)])
+        page3 = self._make_textpage([("控除合計", 0, 700), ("100", 0, 680)])
         
-        # ページ2
-        mock_page2 = MagicMock()
-        mock_textpage2 = MagicMock()
-        mock_textpage2.get_text_bounded.return_value = "ページ2 テキスト"
-        mock_page2.get_textpage.return_value = mock_textpage2
+        with patch('reader.pdfium.PdfDocument', return_value=self._make_pdf_mock(page1, page2, page3)):
+            result = reader._convert_pdf_to_text("test.pdf", self._definitions("所得税", "控除合計"))
+            
+            assert result == ["所得税", "100", "控除合計", "100"]
+            # 項目名を含まないページは文字座標を取得しない
+            page2.get_charbox.assert_not_called()
+    
+    def test_iter_page_lines_closes_handles(self):
+        """テキストページ・ページ・ドキュメントを明示的に閉じる"""
+        reader = SalaryReader(2024, 11, "test123", SalaryKind.NORMAL)
+        page1 = self._make_textpage([("所得税", 0, 700), ("100", 0, 680)])
+        page2 = self._make_textpage([("添付資料", 0, 700)])
+        mock_pdf = self._make_pdf_mock(page1, page2)
         
-        mock_pdf = MagicMock()
-        mock_pdf.__iter__.return_value = [mock_page1, mock_page2]
+        with patch('reader.pdfium.PdfDocument', return_value=mock_pdf):
+            reader._convert_pdf_to_text("test.pdf", self._definitions("所得税"))
+        
+        page1.close.assert_called_once()
+        page2.close.assert_called_once()
+        for index in range(2):
+            mock_pdf[index].close.assert_called_once()
+        mock_pdf.close.assert_called_once()
+    
+    def test_iter_page_lines_closes_on_early_stop(self):
+        """反復を途中で止めた場合も開いたハンドルを閉じ、以降のページは開かない"""
+        reader = SalaryReader(2024, 11, "test123", SalaryKind.NORMAL)
+        page1 = self._make_textpage([("所得税", 0, 700), ("100", 0, 680)])
+        page2 = self._make_textpage([("所得税", 0, 700), ("200", 0, 680)])
+        mock_pdf = self._make_pdf_mock(page1, page2)
         
         with patch('reader.pdfium.PdfDocument', return_value=mock_pdf):
-            result = reader._convert_pdf_to_text("test.pdf")
-            
-            assert len(result) == 4
-            assert "ページ1" in result
-            assert "ページ2" in result
+            pages = reader._iter_page_lines("test.pdf", self._definitions("所得税"))
+            assert next(pages) == ["所得税", "100"]
+            pages.close()
+        
+        page1.close.assert_called_once()
+        page2.count_chars.assert_not_called()
+        mock_pdf.close.assert_called_once()
+    
+    def test_iter_page_lines_closes_on_error(self):
+        """抽出中に例外が発生した場合もハンドルを閉じる"""
+        reader = SalaryReader(2024, 11, "test123", SalaryKind.NORMAL)
+        textpage = self._make_textpage([("所得税", 0, 700)])
+        textpage.count_chars.side_effect = RuntimeError("broken")
+        mock_pdf = self._make_pdf_mock(textpage)
+        
+        with patch('reader.pdfium.PdfDocument', return_value=mock_pdf):
+            with pytest.raises(RuntimeError):
+                reader._convert_pdf_to_text("test.pdf", self._definitions("所得税"))
+        
+        textpage.close.assert_called_once()
+        mock_pdf[0].close.assert_called_once()
+        mock_pdf.close.assert_called_once()
+    
+    def test_convert_pdf_to_text_loads_definitions(self):
+        """項目定義を省略した場合はitems.ymlを読み込む"""
+        reader = SalaryReader(2024, 11, "test123", SalaryKind.NORMAL)
+        textpage = self._make_textpage([("所得税", 0, 700), ("100", 0, 680)])
+        
+        with patch('reader.pdfium.PdfDocument', return_value=self._make_pdf_mock(textpage)):
+            with patch.object(reader, '_load_item_definitions', return_value=ItemDefinitions(self._definitions("所得税"))) as mock_load:
+                assert reader._convert_pdf_to_text("test.pdf") == ["所得税", "100"]
+                mock_load.assert_called_once()
+    
+    def test_read_deduction_from_generated_pdf(self, make_pdf):
+        """実際のPDFから複数単語の項目名と金額を読み取る"""
+        path = make_pdf([[
+            ("Income Tax", 50, 700), ("Resident Tax", 150, 700), ("Total", 250, 700),
+            ("1,200", 60, 685), ("800", 160, 685), ("2,000", 255, 685),
+        ]], filename="202411_kyuyo_test123.pdf")
+        
+        reader = SalaryReader(
+            2024, 11, "test123", SalaryKind.NORMAL,
+            item_definitions={"deduction": [
+                {"name": "IncomeTax", "category": "税", "subcategory": "所得税"},
+                {"name": "ResidentTax", "category": "税", "subcategory": "住民税"},
+                {"name": "Total", "category": "収入", "subcategory": "給与"},
+            ]}
+        )
+        reader.salaryDir = str(path.parent)
+        
+        with patch('reader.ItemNames.DEDUCTION_SUM', "Total"):
+            items = reader.readDeduction()
+        
+        assert [(item.name, item.amount) for item in items] == [
+            ("IncomeTax", 1200), ("ResidentTax", 800), ("Total", 2000)
+        ]
+    
+    def test_read_deduction_records_phases(self, make_pdf):
+        """定義読み込み・PDFを開く・テキスト抽出・照合の各区間の時間を記録する"""
+        path = make_pdf([
+            [("Tax", 50, 700), ("100", 50, 685)],
+            [("Total", 50, 700), ("100", 50, 685)],
+        ], filename="202411_kyuyo_12345.pdf")
+        reader = SalaryReader(
+            2024, 11, "12345", SalaryKind.NORMAL,
+            item_definitions={"deduction": [
+                {"name": "Tax", "category": "税", "subcategory": "所得税"},
+                {"name": "Total", "category": "収入", "subcategory": "給与"},
+            ]}
+        )
+        reader.salaryDir = str(path.parent)
+        
+        Timer.reset()
+        with patch('reader.ItemNames.DEDUCTION_SUM', "Total"):
+            reader.readDeduction()
+        
+        counts = {phase.name: phase.count for phase in Timer.summary()}
+        Timer.reset()
+        assert counts == {
+            "reader.cache": 1, "reader.definitions": 1, "reader.open": 1,
+            "reader.extract": 2, "reader.match": 2,
+        }
+
+
+class TestReadFromSource:
+    """メモリ上のPDF・ZIPファイルからの読み取りテスト"""
+    
+    DEFINITIONS = {"deduction": [
+        {"name": "IncomeTax", "category": "税", "subcategory": "所得税"},
+        {"name": "Total", "category": "収入", "subcategory": "給与"},
+    ]}
+    
+    def _make_payslip(self, make_pdf):
+        return make_pdf([[
+            ("Income Tax", 50, 700), ("Total", 150, 700),
+            ("1,200", 60, 685), ("1,200", 155, 685),
+        ]], filename="202411_kyuyo_test123.pdf")
+    
+    def _read(self, source):
+        reader = SalaryReader(
+            2024, 11, "test123", SalaryKind.NORMAL,
+            item_definitions=self.DEFINITIONS, source=source
+        )
+        reader.salaryDir = "/nonexistent"
+        with patch('reader.ItemNames.DEDUCTION_SUM', "Total"):
+            return [(item.name, item.amount) for item in reader.readDeduction()]
+    
+    def test_read_from_bytes(self, make_pdf):
+        """bytesから読み取る（salaryDirのファイルは参照しない）"""
+        path = self._make_payslip(make_pdf)
+        assert self._read(path.read_bytes()) == [("IncomeTax", 1200), ("Total", 1200)]
+    
+    def test_read_from_memoryview_and_mmap(self, make_pdf):
+        """memoryview・mmapから読み取る"""
+        import mmap
+        path = self._make_payslip(make_pdf)
+        assert self._read(memoryview(bytearray(path.read_bytes()))) == [("IncomeTax", 1200), ("Total", 1200)]
+        
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            assert self._read(mapped) == [("IncomeTax", 1200), ("Total", 1200)]
+            # 読み取り後はmmapを閉じられる（参照が残っていない）
+            mapped.close()
+    
+    @pytest.mark.parametrize("compression", ["stored", "deflated"])
+    def test_read_from_zip_member(self, make_pdf, tmp_path, compression):
+        """ZIPファイル内のPDFを展開せずに読み取る"""
+        import zipfile
+        from archive import PayslipArchive
+        path = self._make_payslip(make_pdf)
+        zip_path = tmp_path / "bundle.zip"
+        mode = zipfile.ZIP_STORED if compression == "stored" else zipfile.ZIP_DEFLATED
+        with zipfile.ZipFile(zip_path, "w", mode) as bundle:
+            bundle.write(path, "2024/202411_kyuyo_test123.pdf")
+        
+        with PayslipArchive(str(zip_path)) as archive:
+            with archive.open("2024/202411_kyuyo_test123.pdf") as source:
+                assert self._read(source) == [("IncomeTax", 1200), ("Total", 1200)]
+    
+    def test_cache_key_from_source(self):
+        """読み込み元を指定した場合はその内容からキャッシュキーを作成する"""
+        reader = SalaryReader(2024, 11, "test123", SalaryKind.NORMAL, source=b"%PDF")
+        reader.cache = MagicMock()
+        reader.cache.is_enabled.return_value = True
+        
+        with patch('reader.ExtractionCache.make_key', return_value="key") as mock_make_key:
+            assert reader._get_cache_key("202411_kyuyo_test123.pdf", self.DEFINITIONS) == "key"
+            assert mock_make_key.call_args[0][0] == b"%PDF"
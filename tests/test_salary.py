@@ -91,6 +91,18 @@ class TestLoadSalaryData:
             assert salary.deductionItems[0].name == "健康保険"
             assert salary.deductionItems[1].name == "厚生年金"
 
+    
+    @patch('salary.SalaryReader')
+    def test_init_with_items_skips_reader(self, mock_reader_class):
+        """読み取り済みの控除項目を渡した場合はPDFを読み込まない"""
+        items = [Item("健康保険", 10000), Item("控除合計", 10000)]
+        
+        with patch('salary.Logger.logInfo'):
+            salary = Salary(2024, 11, SalaryKind.BONUS, items=items)
+        
+        mock_reader_class.assert_not_called()
+        assert salary.deductionItems is items
+        assert salary.kind == SalaryKind.BONUS
 
 class TestShowDeductionInfo:
     """_show_deduction_infoメソッドのテスト"""
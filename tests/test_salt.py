@@ -0,0 +1,76 @@
+"""
+test_salt.py
+salt.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+import os
+from unittest.mock import patch
+from salt import SaltFile
+
+
+SIZE = 16
+
+
+@pytest.fixture
+def salt_path(tmp_path):
+    """ソルトのパス（ディレクトリは未作成）"""
+    return tmp_path / "cache" / "test.salt"
+
+
+class TestLoad:
+    """loadメソッドのテスト"""
+    
+    def test_created_and_reused(self, salt_path):
+        """ソルトがなければ作成し、以降は同じソルトを使う"""
+        first = SaltFile(str(salt_path), SIZE).load()
+        
+        assert len(first) == SIZE
+        assert SaltFile(str(salt_path), SIZE).load() == first
+        assert list(salt_path.parent.iterdir()) == [salt_path]
+    
+    def test_created_concurrently(self, salt_path):
+        """他プロセスが先にソルトを配置した場合はそれを使う（置き換えない）"""
+        real_link = os.link
+        
+        def racing_link(src, dst):
+            salt_path.write_bytes(b"x" * SIZE)
+            return real_link(src, dst)
+        
+        with patch('salt.os.link', side_effect=racing_link):
+            assert SaltFile(str(salt_path), SIZE).load() == b"x" * SIZE
+        assert list(salt_path.parent.iterdir()) == [salt_path]
+    
+    def test_being_written(self, salt_path):
+        """書き込み途中（長さが不正）のソルトは読み込み直す"""
+        salt_path.parent.mkdir()
+        salt_path.write_bytes(b"")
+        
+        def finish_writing(seconds):
+            salt_path.write_bytes(b"y" * SIZE)
+        
+        with patch('salt.time.sleep', side_effect=finish_writing) as mock_sleep:
+            assert SaltFile(str(salt_path), SIZE).load() == b"y" * SIZE
+        mock_sleep.assert_called_once_with(SaltFile.RETRY_INTERVAL_SECONDS)
+    
+    def test_broken(self, salt_path):
+        """長さが不正なままのソルトは作成し直す"""
+        salt_path.parent.mkdir()
+        salt_path.write_bytes(b"short")
+        
+        with patch('salt.time.sleep') as mock_sleep, patch('salt.Logger.logWarning') as mock_warn:
+            salt = SaltFile(str(salt_path), SIZE).load()
+        
+        assert mock_sleep.call_count == SaltFile.READ_RETRIES
+        mock_warn.assert_called_once()
+        assert len(salt) == SIZE
+        assert salt_path.read_bytes() == salt
+        assert list(salt_path.parent.iterdir()) == [salt_path]
+    
+    def test_relative_path_without_directory(self, tmp_path, monkeypatch):
+        """ディレクトリを含まないパスはカレントディレクトリに作成する"""
+        monkeypatch.chdir(tmp_path)
+        
+        salt = SaltFile("test.salt", SIZE).load()
+        assert (tmp_path / "test.salt").read_bytes() == salt
@@ -0,0 +1,117 @@
+"""
+test_session.py
+session.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import os
+import stat
+import time
+from unittest.mock import patch
+import session
+from session import SessionStore
+
+
+def _cookies(expiry=None):
+    cookie = {"name": "_moneybook_session", "value": "abc", "domain": "moneyforward.com", "path": "/"}
+    if expiry is not None:
+        cookie["expiry"] = expiry
+    return [cookie]
+
+
+class TestSaveLoad:
+    """save/loadメソッドのテスト"""
+    
+    def test_round_trip(self, tmp_path):
+        """保存したCookieを復元できる（平文では保存しない）"""
+        store = SessionStore("secret", cache_dir=str(tmp_path))
+        store.save(_cookies())
+        
+        data = (tmp_path / SessionStore.SESSION_FILENAME).read_bytes()
+        assert b"_moneybook_session" not in data
+        assert SessionStore("secret", cache_dir=str(tmp_path)).load() == _cookies()
+    
+    def test_owner_only(self, tmp_path):
+        """保存したファイルは所有者のみ読み書きできる"""
+        SessionStore("secret", cache_dir=str(tmp_path)).save(_cookies())
+        mode = os.stat(tmp_path / SessionStore.SESSION_FILENAME).st_mode
+        assert stat.S_IMODE(mode) == 0o600
+    
+    def test_not_saved(self, tmp_path):
+        """保存していない場合は空"""
+        assert SessionStore("secret", cache_dir=str(tmp_path)).load() == []
+    
+    def test_expired_cookie(self, tmp_path):
+        """有効期限切れのCookieは復元しない"""
+        store = SessionStore("secret", cache_dir=str(tmp_path))
+        store.save(_cookies(expiry=int(time.time()) - 10) + _cookies(expiry=int(time.time()) + 3600))
+        assert [cookie["expiry"] > time.time() for cookie in store.load()] == [True]
+    
+    def test_password_changed(self, tmp_path):
+        """パスワードが変わって復号できない場合は破棄する"""
+        SessionStore("secret", cache_dir=str(tmp_path)).save(_cookies())
+        store = SessionStore("changed", cache_dir=str(tmp_path))
+        with patch('session.Logger.logWarning') as mock_warn:
+            assert store.load() == []
+        mock_warn.assert_called_once()
+        assert not (tmp_path / SessionStore.SESSION_FILENAME).exists()
+    
+    def test_clear(self, tmp_path):
+        """保存したセッションを削除する（保存していなくてもエラーにしない）"""
+        store = SessionStore("secret", cache_dir=str(tmp_path))
+        store.save(_cookies())
+        store.clear()
+        store.clear()
+        assert store.load() == []
+
+
+class TestDisabled:
+    """cryptographyがない場合のテスト"""
+    
+    def test_disabled_without_cryptography(self, tmp_path):
+        """Cookieを保存しない"""
+        with patch.object(session, 'Fernet', None):
+            with patch('session.Logger.logWarning') as mock_warn:
+                store = SessionStore("secret", cache_dir=str(tmp_path))
+                mock_warn.assert_called_once()
+            
+            assert store.is_enabled() is False
+            store.save(_cookies())
+            assert store.load() == []
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestSalt:
+    """_load_saltメソッドのテスト"""
+    
+    def test_salt_reused(self, tmp_path):
+        """同じディレクトリでは同じソルトを使う"""
+        first = SessionStore("secret", cache_dir=str(tmp_path))._load_salt()
+        assert SessionStore("secret", cache_dir=str(tmp_path))._load_salt() == first
+        assert len(first) == SessionStore.SALT_SIZE
+    
+    def test_salt_created_concurrently(self, tmp_path):
+        """他のプロセスが先にソルトを作成した場合はそれを使う（置き換えない）"""
+        store = SessionStore("secret", cache_dir=str(tmp_path))
+        salt_path = tmp_path / SessionStore.SALT_FILENAME
+        real_link = os.link
+        
+        def racing_link(src, dst):
+            salt_path.write_bytes(b"x" * SessionStore.SALT_SIZE)
+            return real_link(src, dst)
+        
+        with patch('salt.os.link', side_effect=racing_link):
+            assert store._load_salt() == b"x" * SessionStore.SALT_SIZE
+        assert list(tmp_path.iterdir()) == [salt_path]
+    
+    def test_salt_broken(self, tmp_path):
+        """長さが不正なソルトは使わずに作成し直す"""
+        salt_path = tmp_path / SessionStore.SALT_FILENAME
+        salt_path.write_bytes(b"short")
+        
+        with patch('salt.time.sleep'), patch('salt.Logger.logWarning') as mock_warn:
+            salt = SessionStore("secret", cache_dir=str(tmp_path))._load_salt()
+        
+        mock_warn.assert_called_once()
+        assert len(salt) == SessionStore.SALT_SIZE
+        assert salt_path.read_bytes() == salt
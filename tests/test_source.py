@@ -0,0 +1,90 @@
+"""
+test_source.py
+source.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+import io
+import mmap
+import os
+from source import BufferStream
+
+
+class TestBufferStream:
+    """BufferStreamのテスト"""
+    
+    def test_read_and_seek(self):
+        """バッファの内容を位置を指定して読み取る"""
+        stream = BufferStream(bytearray(b"0123456789"))
+        assert stream.read(3) == b"012"
+        assert stream.tell() == 3
+        
+        assert stream.seek(-2, os.SEEK_END) == 8
+        assert stream.read() == b"89"
+        assert stream.read(5) == b""
+        
+        assert stream.seek(-4, os.SEEK_CUR) == 6
+        buffer = bytearray(3)
+        assert stream.readinto(buffer) == 3
+        assert buffer == b"678"
+    
+    def test_read_beyond_end(self):
+        """末尾より後ろの位置からは何も読み取らない"""
+        stream = BufferStream(b"abc")
+        stream.seek(10)
+        assert stream.readinto(bytearray(4)) == 0
+    
+    @pytest.mark.parametrize("offset, whence", [(-1, os.SEEK_SET), (0, 3)])
+    def test_seek_invalid(self, offset, whence):
+        """不正な位置指定は例外"""
+        with pytest.raises(ValueError):
+            BufferStream(b"abc").seek(offset, whence)
+    
+    def test_readable_seekable(self):
+        """pdfiumのストリームとして必要な属性"""
+        stream = BufferStream(b"abc")
+        assert stream.readable() is True
+        assert stream.seekable() is True
+    
+    def test_close_releases_mmap(self, tmp_path):
+        """閉じるとmmapの参照を解放し、mmapを閉じられる"""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"payslip")
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stream = BufferStream(mapped)
+            assert stream.read() == b"payslip"
+            
+            stream.close()
+            stream.close()
+            mapped.close()
+            assert stream.closed is True
+
+
+class TestWrap:
+    """wrapメソッドのテスト"""
+    
+    def test_bytes_as_is(self):
+        """bytesはpdfiumへそのまま渡す"""
+        data = b"%PDF"
+        assert BufferStream.wrap(data) is data
+    
+    def test_stream_as_is(self):
+        """ファイルオブジェクトはpdfiumへそのまま渡す"""
+        stream = io.BytesIO(b"%PDF")
+        assert BufferStream.wrap(stream) is stream
+    
+    def test_buffers_wrapped(self, tmp_path):
+        """bytearray, memoryview, mmapはストリームで包む"""
+        assert isinstance(BufferStream.wrap(bytearray(b"%PDF")), BufferStream)
+        assert BufferStream.wrap(memoryview(b"%PDF")).read() == b"%PDF"
+        
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"%PDF")
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stream = BufferStream.wrap(mapped)
+            assert isinstance(stream, BufferStream)
+            stream.close()
+            mapped.close()
@@ -11,6 +11,7 @@ import upload
 from argument import Arguments
 from salary import Salary
 from uploader import Uploader
+from common import SalaryKind
 import config
 
 
@@ -23,6 +24,16 @@ def mock_config(mocker):
     mock_data.get_tfa_id.return_value = "tfa123"
     mock_data.get_default_date.return_value = "2024/11/25"
     mock_data.is_headless_mode.return_value = False
+    mock_data.get_wait_timeout.return_value = 0.5
+    mock_data.is_session_kept.return_value = False
+    mock_data.get_category_cache_ttl_seconds.return_value = 0
+    mock_data.is_lean_browser.return_value = False
+    mock_data.is_browser_daemon_used.return_value = False
+    mock_data.get_moneyforward_url.return_value = "https://moneyforward.com"
+    mock_data.is_registration_journal_used.return_value = False
+    mock_data.is_existing_entry_skipped.return_value = False
+    mock_data.is_auto_approved.return_value = False
+    mock_data.get_timing_report_file.return_value = None
     mocker.patch.object(config, 'data', mock_data)
     return mock_data
 
@@ -55,7 +66,47 @@ class TestMainFunction:
         # 検証
         mock_args_class.assert_called_once()
         mock_salary_class.assert_called_once()
-        mock_uploader_class.assert_called_once_with(mock_salary)
+        mock_uploader_class.assert_called_once_with()
+        mock_uploader.start_session_in_background.assert_called_once()
+        assert mock_uploader.salary is mock_salary
+        mock_uploader.upload.assert_called_once()
+    
+    @patch('upload.Arguments')
+    @patch('upload.Salary')
+    @patch('upload.Uploader')
+    def test_main_overlaps_session(self, mock_uploader_class, mock_salary_class, mock_args_class):
+        """PDFの読み込み前にWebDriverの起動・ログインを開始し、読み込みに失敗した場合は終了する"""
+        calls = []
+        mock_uploader = mock_uploader_class.return_value
+        mock_uploader.start_session_in_background.side_effect = lambda: calls.append("session")
+        
+        def read_salary(*args):
+            calls.append("salary")
+            raise FileNotFoundError("PDFがありません")
+        mock_salary_class.side_effect = read_salary
+        
+        with patch('upload.Logger.logError'), patch('upload.print_traceback'):
+            with pytest.raises(SystemExit):
+                upload.main()
+        
+        assert calls == ["session", "salary"]
+        mock_uploader.close.assert_called_once()
+        mock_uploader.upload.assert_not_called()
+    
+    @patch('upload.Salary')
+    @patch('upload.Uploader')
+    def test_main_unattended(self, mock_uploader_class, mock_salary_class):
+        """-y指定時は登録日の確認の省略と給料日の指定をUploaderへ設定する"""
+        mock_uploader = MagicMock()
+        mock_uploader.autoApprove = False
+        mock_uploader_class.return_value = mock_uploader
+        
+        with patch.object(sys, 'argv', ['upload.py', '2024', '11', '-y', '--payday', '20', '--adjust', 'after']):
+            upload.main()
+        
+        assert mock_uploader.autoApprove is True
+        assert mock_uploader.paydayDate == 20
+        assert mock_uploader.paydayAdjustment == "after"
         mock_uploader.upload.assert_called_once()
     
     @patch('upload.Arguments')
@@ -70,10 +121,11 @@ class TestMainFunction:
         
         assert exc_info.value.code == 1
     
+    @patch('upload.Uploader')
     @patch('upload.Arguments')
     @patch('upload.Salary')
     @patch('upload.Logger.logError')
-    def test_main_exception_with_trace(self, mock_log_error, mock_salary_class, mock_args_class):
+    def test_main_exception_with_trace(self, mock_log_error, mock_salary_class, mock_args_class, mock_uploader_class):
         """例外発生時（トレース表示あり）"""
         # モックの設定
         mock_args = MagicMock()
@@ -98,10 +150,11 @@ class TestMainFunction:
                 print_calls = [str(call) for call in mock_print.call_args_list]
                 assert any("traceback" in call.lower() for call in print_calls)
     
+    @patch('upload.Uploader')
     @patch('upload.Arguments')
     @patch('upload.Salary')
     @patch('upload.Logger.logError')
-    def test_main_exception_without_trace(self, mock_log_error, mock_salary_class, mock_args_class):
+    def test_main_exception_without_trace(self, mock_log_error, mock_salary_class, mock_args_class, mock_uploader_class):
         """例外発生時（トレース表示なし）"""
         # モックの設定
         mock_args = MagicMock()
@@ -167,6 +220,257 @@ class TestMainWithRealArguments:
                 mock_uploader.upload.assert_called_once()
 
 
+class TestWatch:
+    """監視モード(upload.py watch)のテスト"""
+    
+    @pytest.fixture
+    def watch_argv(self):
+        with patch.object(sys, 'argv', ['upload.py', 'watch', '--debounce', '3', '--poll']):
+            yield
+    
+    @patch('upload.SalaryWatcher')
+    @patch('upload.Uploader')
+    def test_upload_queued_salaries(self, mock_uploader_class, mock_watcher_class, watch_argv):
+        """読み取った明細を順にアップロードし、中断時に監視を終了する"""
+        first, second = MagicMock(spec=Salary), MagicMock(spec=Salary)
+        mock_watcher = mock_watcher_class.return_value
+        mock_watcher.queue.get.side_effect = [first, second, KeyboardInterrupt()]
+        mock_uploader_class.return_value.upload.side_effect = [Exception("登録失敗"), None]
+        
+        with patch('upload.Logger') as mock_logger, patch.object(upload, 'PRINT_TRACE', False):
+            upload.main()
+        
+        mock_watcher_class.assert_called_once_with(debounce=3.0, use_inotify=False)
+        mock_watcher.start.assert_called_once()
+        mock_watcher.stop.assert_called_once()
+        # 1件目の登録に失敗しても監視は続ける
+        assert [c.args[0] for c in mock_uploader_class.call_args_list] == [first, second]
+        mock_logger.logError.assert_called_once_with("登録失敗")
+    
+    @patch('upload.SalaryWatcher')
+    def test_default_debounce(self, mock_watcher_class):
+        """デバウンス時間の指定がない場合は既定値を使う"""
+        mock_watcher_class.DEBOUNCE_SECONDS = 2.0
+        mock_watcher_class.return_value.queue.get.side_effect = KeyboardInterrupt()
+        with patch.object(sys, 'argv', ['upload.py', 'watch']), patch('upload.Logger'):
+            upload.main()
+        mock_watcher_class.assert_called_once_with(debounce=2.0, use_inotify=True)
+    
+    def test_invalid_arguments(self):
+        """監視モードの引数が不正な場合"""
+        with patch.object(sys, 'argv', ['upload.py', 'watch', '--debounce', 'x']):
+            with patch('argument.Logger.logWarning'):
+                with pytest.raises(SystemExit) as exc_info:
+                    upload.main()
+        assert exc_info.value.code == 1
+
+
+class TestRange:
+    """複数月の一括登録(upload.py range)のテスト"""
+    
+    @pytest.fixture
+    def mock_index(self):
+        index = MagicMock()
+        available = {(2024, 11, SalaryKind.NORMAL), (2024, 12, SalaryKind.NORMAL), (2024, 12, SalaryKind.BONUS)}
+        index.lookup.side_effect = lambda year, month, kind, number: \
+            "found.pdf" if (year, month, kind) in available else None
+        return index
+    
+    @patch('upload.Salary')
+    def test_build_salaries(self, mock_salary_class, mock_index, mock_config):
+        """PDFがある明細だけを年月順に読み込む（給与がない月だけ警告する）"""
+        mock_config.get_employee_number.return_value = "12345"
+        with patch.object(sys, 'argv', ['upload.py', 'range', '--from', '202410', '--to', '202412', '--bonus']):
+            args = upload.RangeArguments()
+        
+        with patch('upload.Logger.logWarning') as mock_warn:
+            salaries = upload.build_salaries(args, mock_index)
+        
+        assert len(salaries) == 3
+        assert [c.args for c in mock_salary_class.call_args_list] == [
+            (2024, 11, SalaryKind.NORMAL), (2024, 12, SalaryKind.NORMAL), (2024, 12, SalaryKind.BONUS)
+        ]
+        mock_warn.assert_called_once()
+    
+    @patch('upload.SalaryIndex')
+    @patch('upload.build_salaries')
+    @patch('upload.Uploader')
+    def test_upload_all(self, mock_uploader_class, mock_build, mock_index_class):
+        """期間内の明細を1つのUploaderでまとめて登録する"""
+        salaries = [MagicMock(spec=Salary), MagicMock(spec=Salary)]
+        mock_build.return_value = salaries
+        with patch.object(sys, 'argv', ['upload.py', 'range', '--from', '202411', '--to', '202412']), \
+             patch('upload.report_timing') as mock_report:
+            upload.main()
+        
+        mock_index_class.return_value.refresh.assert_called_once()
+        mock_uploader_class.assert_called_once_with()
+        mock_uploader_class.return_value.upload_all.assert_called_once_with(salaries)
+        mock_report.assert_called_once()
+    
+    @patch('upload.SalaryIndex')
+    @patch('upload.build_salaries')
+    @patch('upload.Uploader')
+    @patch('upload.UploadPool')
+    def test_parallel(self, mock_pool_class, mock_uploader_class, mock_build, mock_index_class, mock_config):
+        """ワーカー数を指定した場合は登録日を確認してからワーカープールで登録する"""
+        salaries = [MagicMock(spec=Salary), MagicMock(spec=Salary)]
+        mock_build.return_value = salaries
+        mock_uploader_class.return_value.confirm.return_value = salaries[1:]
+        mock_config.get_upload_items_per_minute.return_value = 30.0
+        mock_pool_class.return_value.run.return_value = [MagicMock(is_ok=MagicMock(return_value=False))]
+        
+        with patch.object(sys, 'argv', ['upload.py', 'range', '--from', '202411', '--to', '202412', '-j', '2']), \
+             patch('upload.report_timing'):
+            with pytest.raises(SystemExit) as exc_info:
+                upload.main()
+        
+        assert exc_info.value.code == 1
+        mock_uploader_class.return_value.upload_all.assert_not_called()
+        mock_pool_class.assert_called_once_with(salaries[1:], 2, 30.0)
+    
+    @patch('upload.SalaryIndex')
+    @patch('upload.build_salaries', return_value=[])
+    @patch('upload.Uploader')
+    def test_no_salaries(self, mock_uploader_class, mock_build, mock_index_class):
+        """登録する明細がない場合は終了コード1で終了する"""
+        with patch.object(sys, 'argv', ['upload.py', 'range', '--from', '202411']), \
+             patch('upload.Logger.logError'), patch('upload.report_timing'):
+            with pytest.raises(SystemExit) as exc_info:
+                upload.main()
+        assert exc_info.value.code == 1
+        # 並行して開始したWebDriverは登録せずに終了する
+        mock_uploader_class.return_value.close.assert_called_once()
+        mock_uploader_class.return_value.upload_all.assert_not_called()
+    
+    def test_invalid_arguments(self):
+        """引数が不正な場合"""
+        with patch.object(sys, 'argv', ['upload.py', 'range']), patch('argument.Logger.logWarning'):
+            with pytest.raises(SystemExit) as exc_info:
+                upload.main()
+        assert exc_info.value.code == 1
+
+
+class TestDaemon:
+    """常駐ブラウザ(upload.py daemon)のテスト"""
+    
+    @patch('upload.BrowserDaemon')
+    @patch('upload.DaemonClient')
+    def test_serve(self, mock_client_class, mock_daemon_class, mock_config):
+        """起動していない場合は設定の時間で常駐する"""
+        mock_client_class.return_value.ping.return_value = None
+        mock_config.get_browser_daemon_idle_seconds.return_value = 3600.0
+        with patch.object(sys, 'argv', ['upload.py', 'daemon']):
+            upload.main()
+        mock_daemon_class.assert_called_once_with(Uploader, 3600.0)
+        mock_daemon_class.return_value.serve.assert_called_once()
+    
+    @patch('upload.BrowserDaemon')
+    @patch('upload.DaemonClient')
+    def test_serve_idle_option(self, mock_client_class, mock_daemon_class):
+        """起動引数の分数を優先する"""
+        mock_client_class.return_value.ping.return_value = None
+        with patch.object(sys, 'argv', ['upload.py', 'daemon', '--idle', '2']):
+            upload.main()
+        mock_daemon_class.assert_called_once_with(Uploader, 120.0)
+    
+    @patch('upload.BrowserDaemon')
+    @patch('upload.DaemonClient')
+    def test_already_running(self, mock_client_class, mock_daemon_class):
+        """既に起動している場合は2つ目を起動しない"""
+        mock_client_class.return_value.ping.return_value = {"ok": True, "pid": 1, "busy": False, "alive": True}
+        with patch.object(sys, 'argv', ['upload.py', 'daemon']), patch('upload.Logger.logInfo'):
+            upload.main()
+        mock_daemon_class.assert_not_called()
+    
+    @pytest.mark.parametrize("option, method, result, code", [
+        ('--status', 'ping', {"ok": True, "pid": 1, "busy": True, "alive": True}, None),
+        ('--status', 'ping', None, 1),
+        ('--stop', 'stop', True, None),
+        ('--stop', 'stop', False, 1),
+    ])
+    @patch('upload.DaemonClient')
+    def test_status_stop(self, mock_client_class, option, method, result, code):
+        """状態の表示と終了の要求（起動していない場合は終了コード1）"""
+        getattr(mock_client_class.return_value, method).return_value = result
+        with patch.object(sys, 'argv', ['upload.py', 'daemon', option]), patch('upload.Logger.logInfo'):
+            if code is None:
+                upload.main()
+            else:
+                with pytest.raises(SystemExit) as exc_info:
+                    upload.main()
+                assert exc_info.value.code == code
+    
+    @patch('upload.BrowserDaemon')
+    @patch('upload.DaemonClient')
+    def test_serve_failure(self, mock_client_class, mock_daemon_class):
+        """Chromeの起動・ログインに失敗した場合は終了コード1で終了する"""
+        mock_client_class.return_value.ping.return_value = None
+        mock_daemon_class.return_value.serve.side_effect = Exception("ログイン失敗")
+        with patch.object(sys, 'argv', ['upload.py', 'daemon']), \
+             patch('upload.Logger.logError'), patch('upload.print_traceback'):
+            with pytest.raises(SystemExit) as exc_info:
+                upload.main()
+        assert exc_info.value.code == 1
+    
+    @patch('upload.BrowserDaemon')
+    @patch('upload.DaemonClient')
+    def test_interrupted(self, mock_client_class, mock_daemon_class):
+        """Ctrl+Cで中断した場合は正常終了する"""
+        mock_client_class.return_value.ping.return_value = None
+        mock_daemon_class.return_value.serve.side_effect = KeyboardInterrupt
+        with patch.object(sys, 'argv', ['upload.py', 'daemon']), patch('upload.Logger.logInfo'):
+            upload.main()
+    
+    def test_invalid_arguments(self):
+        """引数が不正な場合"""
+        with patch.object(sys, 'argv', ['upload.py', 'daemon', '--idle', '-1']), patch('argument.Logger.logWarning'):
+            with pytest.raises(SystemExit) as exc_info:
+                upload.main()
+        assert exc_info.value.code == 1
+
+
+class TestReportTiming:
+    """report_timingメソッドのテスト"""
+    
+    @patch('upload.Timer')
+    def test_report_only(self, mock_timer, mock_config):
+        """出力先が未設定の場合は内訳の表示のみ"""
+        mock_config.get_timing_report_file.return_value = None
+        upload.report_timing()
+        mock_timer.report.assert_called_once()
+        mock_timer.write_json.assert_not_called()
+    
+    @patch('upload.Timer')
+    def test_write_json(self, mock_timer, mock_config):
+        """出力先が設定されている場合はJSON Linesで出力する"""
+        mock_config.get_timing_report_file.return_value = "timing.jsonl"
+        upload.report_timing()
+        mock_timer.write_json.assert_called_once_with("timing.jsonl")
+    
+    @patch('upload.Timer')
+    def test_write_failure(self, mock_timer, mock_config):
+        """出力に失敗しても処理は続ける"""
+        mock_config.get_timing_report_file.return_value = "/readonly/timing.jsonl"
+        mock_timer.write_json.side_effect = PermissionError("denied")
+        with patch('upload.Logger.logWarning') as mock_warning:
+            upload.report_timing()
+        mock_warning.assert_called_once()
+    
+    @patch('upload.Arguments')
+    @patch('upload.Salary')
+    @patch('upload.Uploader')
+    @patch('upload.report_timing')
+    def test_main_reports_on_failure(self, mock_report, mock_uploader_class, mock_salary_class, mock_args_class):
+        """登録に失敗した場合も内訳を出力する"""
+        mock_args_class.return_value.is_valid.return_value = True
+        mock_uploader_class.return_value.upload.side_effect = Exception("失敗")
+        with patch('upload.Logger.logError'), patch.object(upload, 'PRINT_TRACE', False):
+            with pytest.raises(SystemExit):
+                upload.main()
+        mock_report.assert_called_once()
+
+
 class TestConstants:
     """定数のテスト"""
     
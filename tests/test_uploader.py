@@ -4,11 +4,18 @@ uploader.pyの単体試験
 
 C0, C1, C2カバレッジ100%を目指したテストケース
 """
+import os
+import threading
+import time
 import pytest
 from unittest.mock import patch, MagicMock, mock_open
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from uploader import Uploader
+from categories import CategoryTree
 from salary import Salary
 from item import Item
+from logger import Logger, Timer
 from common import SalaryKind
 import config
 
@@ -22,6 +29,15 @@ def mock_config(mocker):
     mock_data.get_tfa_id.return_value = "tfa123"
     mock_data.get_default_date.return_value = "2024/11/25"
     mock_data.is_headless_mode.return_value = False
+    mock_data.get_wait_timeout.return_value = 0.5
+    mock_data.is_session_kept.return_value = False
+    mock_data.get_category_cache_ttl_seconds.return_value = 0
+    mock_data.is_lean_browser.return_value = False
+    mock_data.is_browser_daemon_used.return_value = False
+    mock_data.get_moneyforward_url.return_value = "https://moneyforward.com"
+    mock_data.is_registration_journal_used.return_value = False
+    mock_data.is_existing_entry_skipped.return_value = False
+    mock_data.is_auto_approved.return_value = False
     mocker.patch.object(config, 'data', mock_data)
     return mock_data
 
@@ -106,6 +122,57 @@ class TestConfirmRegistration:
                 assert result is False
 
 
+class TestAutoApprove:
+    """登録日の確認を省略する登録（AutoApprove、upload.py -y）のテスト"""
+    
+    @pytest.fixture
+    def salary(self):
+        return Salary(2024, 8, SalaryKind.NORMAL, items=[Item("所得税", 1000)])
+    
+    @pytest.fixture(autouse=True)
+    def no_holidays(self):
+        with patch('payday.jpholiday', None):
+            yield
+    
+    def test_config_rule(self, mock_config, salary):
+        """設定ファイルのDefaultDate・PaydayAdjustmentで登録日を決め、入力を求めない（2024/08/25は日曜日）"""
+        mock_config.is_auto_approved.return_value = True
+        mock_config.get_default_date.return_value = "25"
+        mock_config.get_payday_adjustment.return_value = "before"
+        uploader = Uploader(salary)
+        
+        with patch('builtins.input') as mock_input, patch('uploader.Logger.logInfo') as mock_info:
+            assert uploader._confirm_registration() is True
+        
+        mock_input.assert_not_called()
+        assert salary.get_payday() == "2024/08/23"
+        mock_info.assert_called_once_with(Uploader.LOG_AUTO_APPROVED.format(payday="2024/08/23"))
+    
+    def test_argument_rule(self, mock_config, salary):
+        """起動引数の給料日の指定を設定ファイルより優先する"""
+        mock_config.get_default_date.return_value = "25"
+        mock_config.get_payday_adjustment.return_value = "before"
+        uploader = Uploader(salary)
+        uploader.autoApprove = True
+        uploader.paydayDate = 31
+        uploader.paydayAdjustment = "none"
+        
+        with patch('builtins.input') as mock_input, patch('uploader.Logger.logInfo'):
+            assert uploader.confirm([salary]) == [salary]
+        
+        mock_input.assert_not_called()
+        assert salary.get_payday() == "2024/08/31"
+    
+    def test_invalid_rule(self, mock_config, salary):
+        """給料日の決め方が不正な場合は登録しない"""
+        mock_config.is_auto_approved.return_value = True
+        mock_config.get_default_date.return_value = "25"
+        mock_config.get_payday_adjustment.return_value = "nearest"
+        
+        with pytest.raises(ValueError):
+            Uploader(salary)._confirm_registration()
+
+
 class TestInitWebdriver:
     """_init_webdriverメソッドのテスト"""
     
@@ -144,6 +211,39 @@ class TestInitWebdriver:
             
             assert uploader.driver == mock_driver
     
+    @patch('uploader.webdriver.Chrome')
+    @patch('uploader.webdriver.ChromeOptions')
+    @patch('uploader.ActionChains')
+    def test_init_webdriver_profile(self, mock_actions, mock_options_class, mock_chrome, tmp_path):
+        """プロファイルディレクトリを指定した場合は専用のプロファイルで起動する"""
+        uploader = Uploader()
+        uploader.profileDir = str(tmp_path / "worker0")
+        
+        with patch('uploader.Logger.logFine'):
+            uploader._init_webdriver()
+        
+        mock_options_class.return_value.add_argument.assert_called_once_with(
+            f"--user-data-dir={tmp_path / 'worker0'}"
+        )
+    
+    @patch('uploader.webdriver.Chrome')
+    @patch('uploader.webdriver.ChromeOptions')
+    @patch('uploader.ActionChains')
+    def test_init_webdriver_lean(self, mock_actions, mock_options_class, mock_chrome, mock_config):
+        """省メモリのブラウザでは画像などを読み込まない設定で起動し、不要なURLをブロックする"""
+        mock_config.is_lean_browser.return_value = True
+        uploader = Uploader()
+        
+        with patch('uploader.Logger.logFine'):
+            uploader._init_webdriver()
+        
+        options = mock_options_class.return_value
+        options.add_experimental_option.assert_called_once_with("prefs", Uploader.LEAN_PREFS)
+        options.add_argument.assert_any_call("--blink-settings=imagesEnabled=false")
+        mock_chrome.return_value.execute_cdp_cmd.assert_any_call(
+            "Network.setBlockedURLs", {"urls": list(Uploader.LEAN_BLOCKED_URLS)}
+        )
+    
     @patch('uploader.config.data.is_headless_mode', return_value=False)
     @patch('uploader.webdriver.Chrome')
     def test_init_webdriver_failure(self, mock_chrome, mock_headless):
@@ -174,6 +274,127 @@ class TestAddHeadlessSettings:
         assert mock_options.add_argument.call_count >= 2
 
 
+class TestBrowserDaemon:
+    """常駐ブラウザ(upload.py daemon)への接続のテスト"""
+    
+    @patch('uploader.webdriver.Chrome')
+    @patch('uploader.webdriver.ChromeOptions')
+    @patch('uploader.DaemonClient')
+    def test_attach(self, mock_client_class, mock_options_class, mock_chrome, mock_config):
+        """常駐ブラウザが起動していればChromeを起動せずに接続する"""
+        mock_config.is_browser_daemon_used.return_value = True
+        mock_client_class.return_value.acquire.return_value = "127.0.0.1:9222"
+        uploader = Uploader()
+        
+        with patch('uploader.Logger'):
+            uploader._init_webdriver()
+        
+        mock_options_class.return_value.add_experimental_option.assert_called_once_with(
+            "debuggerAddress", "127.0.0.1:9222"
+        )
+        mock_options_class.return_value.add_argument.assert_not_called()
+        assert uploader.daemon is mock_client_class.return_value
+        
+        # 終了時はChromeを終了せずに返却する
+        uploader.close()
+        mock_chrome.return_value.quit.assert_called_once()
+        mock_client_class.return_value.release.assert_called_once()
+        assert uploader.daemon is None
+    
+    @patch('uploader.webdriver.Chrome')
+    @patch('uploader.DaemonClient')
+    def test_not_running(self, mock_client_class, mock_chrome, mock_config):
+        """常駐ブラウザが起動していない場合はChromeを起動する"""
+        mock_config.is_browser_daemon_used.return_value = True
+        mock_client_class.return_value.acquire.return_value = None
+        uploader = Uploader()
+        
+        with patch('uploader.Logger'):
+            uploader._init_webdriver()
+        
+        mock_chrome.assert_called_once()
+        assert uploader.daemon is None
+    
+    @patch('uploader.webdriver.Chrome')
+    @patch('uploader.DaemonClient')
+    def test_attach_failure(self, mock_client_class, mock_chrome, mock_config):
+        """常駐ブラウザに接続できない場合は返却してChromeを起動する"""
+        mock_config.is_browser_daemon_used.return_value = True
+        mock_client_class.return_value.acquire.return_value = "127.0.0.1:9222"
+        mock_chrome.side_effect = [WebDriverException("cannot connect"), MagicMock()]
+        uploader = Uploader()
+        
+        with patch('uploader.Logger'):
+            uploader._init_webdriver()
+        
+        assert mock_chrome.call_count == 2
+        mock_client_class.return_value.release.assert_called_once()
+        assert uploader.daemon is None
+    
+    @patch('uploader.DaemonClient')
+    def test_worker_profile_not_attached(self, mock_client_class, mock_config):
+        """専用のプロファイルで起動する場合（ワーカー・常駐ブラウザ自身）は接続しない"""
+        mock_config.is_browser_daemon_used.return_value = True
+        uploader = Uploader()
+        uploader.profileDir = "profile"
+        uploader.debugPort = 9222
+        
+        with patch('uploader.webdriver.Chrome'), patch('uploader.webdriver.ChromeOptions') as mock_options_class, \
+             patch('uploader.Logger'):
+            uploader._init_webdriver()
+        
+        mock_client_class.assert_not_called()
+        mock_options_class.return_value.add_argument.assert_any_call("--remote-debugging-port=9222")
+    
+    def test_sign_in_skipped(self):
+        """常駐ブラウザがログイン済みの場合はページを読み込み直さない"""
+        uploader = Uploader()
+        uploader.driver = MagicMock()
+        uploader.daemon = MagicMock()
+        
+        with patch.object(uploader, '_is_session_valid', return_value=True), \
+             patch.object(uploader, '_access_moneyforward') as mock_access, \
+             patch('uploader.Logger.logInfo'):
+            uploader._sign_in()
+        mock_access.assert_not_called()
+    
+    def test_sign_in_expired(self):
+        """常駐ブラウザのセッションが切れている場合はログインする"""
+        uploader = Uploader()
+        uploader.driver = MagicMock()
+        uploader.daemon = MagicMock()
+        
+        with patch.object(uploader, '_is_session_valid', return_value=False), \
+             patch.object(uploader, '_access_moneyforward') as mock_access, \
+             patch.object(uploader, '_login') as mock_login:
+            uploader._sign_in()
+        mock_access.assert_called_once()
+        mock_login.assert_called_once()
+
+
+class TestLeanBrowser:
+    """省メモリのブラウザ設定のテスト"""
+    
+    def test_add_lean_settings(self):
+        """画像の読み込みと登録に使わない機能を止める"""
+        uploader = Uploader()
+        mock_options = MagicMock()
+        
+        assert uploader._add_lean_settings(mock_options) is mock_options
+        mock_options.add_experimental_option.assert_called_once_with("prefs", Uploader.LEAN_PREFS)
+        mock_options.add_argument.assert_any_call("--disable-extensions")
+    
+    def test_block_resources_failure(self):
+        """ブロックできない場合は警告して続行する"""
+        uploader = Uploader()
+        uploader.driver = MagicMock()
+        uploader.driver.execute_cdp_cmd.side_effect = WebDriverException("not supported")
+        
+        with patch('uploader.Logger.logWarning') as mock_warn:
+            uploader._block_resources()
+        mock_warn.assert_called_once()
+
+
 class TestAccessMoneyforward:
     """_access_moneyforwardメソッドのテスト"""
     
@@ -189,7 +410,158 @@ class TestAccessMoneyforward:
             uploader._access_moneyforward()
             
             mock_driver.get.assert_called_once_with(Uploader.MONEYFORWARD_URL)
-            mock_driver.implicitly_wait.assert_called_once()
+            # 固定時間ではなくページの読み込み完了を待つ
+            mock_driver.execute_script.assert_called_once_with(Uploader.SCRIPT_PAGE_READY)
+            mock_driver.implicitly_wait.assert_not_called()
+    
+    def test_custom_url(self, mock_config):
+        """設定した登録先(MoneyForwardUrl)へアクセスし、入力ページもその配下を使う"""
+        mock_config.get_moneyforward_url.return_value = "http://127.0.0.1:8080"
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        
+        assert uploader.cfUrl == "http://127.0.0.1:8080/cf"
+        with patch('uploader.Logger.logFine'):
+            uploader._access_moneyforward()
+        uploader.driver.get.assert_called_once_with("http://127.0.0.1:8080")
+
+
+class TestSession:
+    """ログインセッションの復元・保存のテスト"""
+    
+    @pytest.fixture
+    def uploader(self, mock_config):
+        mock_config.is_session_kept.return_value = True
+        with patch('uploader.SessionStore') as mock_store_class:
+            uploader = Uploader(MagicMock(spec=Salary))
+        mock_store_class.assert_called_once_with("testpass")
+        uploader.driver = MagicMock()
+        return uploader
+    
+    def test_disabled(self):
+        """保存しない設定ではセッションを使わずログインする"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        assert uploader.sessionStore is None
+        assert uploader._restore_session() is False
+        uploader._save_session()
+        uploader.driver.get_cookies.assert_not_called()
+    
+    def test_not_saved(self, uploader):
+        """保存したセッションがない場合はログインする"""
+        uploader.sessionStore.load.return_value = []
+        assert uploader._restore_session() is False
+        uploader.driver.add_cookie.assert_not_called()
+    
+    def test_restore_valid(self, uploader):
+        """復元したセッションが有効であればログインを省略する"""
+        cookies = [{"name": "a", "value": "1"}, {"name": "b", "value": "2", "domain": "id.moneyforward.com"}]
+        uploader.sessionStore.load.return_value = cookies
+        uploader.driver.add_cookie.side_effect = [None, WebDriverException("invalid cookie domain")]
+        uploader.driver.execute_async_script.return_value = True
+        
+        with patch('uploader.Logger.logInfo'):
+            assert uploader._restore_session() is True
+        
+        assert uploader.driver.add_cookie.call_count == 2
+        uploader.driver.execute_async_script.assert_called_once_with(
+            Uploader.SCRIPT_SESSION_CHECK, Uploader.CF_URL
+        )
+        uploader.sessionStore.clear.assert_not_called()
+    
+    def test_restore_invalid(self, uploader):
+        """復元したセッションが無効であれば破棄してログインし直す"""
+        uploader.sessionStore.load.return_value = [{"name": "a", "value": "1"}]
+        uploader.driver.execute_async_script.return_value = False
+        
+        with patch.object(uploader, '_access_moneyforward') as mock_access, \
+             patch('uploader.Logger.logInfo'):
+            assert uploader._restore_session() is False
+        
+        uploader.sessionStore.clear.assert_called_once()
+        uploader.driver.delete_all_cookies.assert_called_once()
+        mock_access.assert_called_once()
+    
+    def test_check_failed(self, uploader):
+        """確認のリクエストに失敗した場合は無効とみなす"""
+        uploader.driver.execute_async_script.side_effect = TimeoutException()
+        assert uploader._is_session_valid() is False
+        uploader.driver.set_script_timeout.assert_called_once_with(0.5)
+    
+    def test_save(self, uploader):
+        """現在のCookieを保存する（保存できなくても処理は続ける）"""
+        uploader._save_session()
+        uploader.sessionStore.save.assert_called_once_with(uploader.driver.get_cookies.return_value)
+        
+        uploader.sessionStore.save.side_effect = OSError("disk full")
+        with patch('uploader.Logger.logWarning') as mock_warn:
+            uploader._save_session()
+        mock_warn.assert_called_once()
+    
+    def test_upload_skips_login(self, uploader):
+        """セッションを復元できた場合はログインせずに登録する"""
+        with patch.object(uploader, '_confirm_registration', return_value=True), \
+             patch.object(uploader, '_init_webdriver'), \
+             patch.object(uploader, '_access_moneyforward'), \
+             patch.object(uploader, '_restore_session', return_value=True), \
+             patch.object(uploader, '_login') as mock_login, \
+             patch.object(uploader, '_save_session') as mock_save, \
+             patch.object(uploader, '_register_deductions'):
+            uploader.upload()
+        
+        mock_login.assert_not_called()
+        mock_save.assert_called_once()
+    
+    def test_upload_login_and_save(self, uploader):
+        """セッションを復元できない場合はログインしてセッションを保存する"""
+        with patch.object(uploader, '_confirm_registration', return_value=True), \
+             patch.object(uploader, '_init_webdriver'), \
+             patch.object(uploader, '_access_moneyforward'), \
+             patch.object(uploader, '_restore_session', return_value=False), \
+             patch.object(uploader, '_login') as mock_login, \
+             patch.object(uploader, '_save_session') as mock_save, \
+             patch.object(uploader, '_register_deductions'):
+            uploader.upload()
+        
+        mock_login.assert_called_once()
+        assert mock_save.call_count == 2
+
+
+class TestNextTotpCode:
+    """_next_totp_codeメソッドのテスト"""
+    
+    @pytest.fixture(autouse=True)
+    def last_step(self):
+        with patch.object(Uploader, '_lastTotpStep', -1):
+            yield
+    
+    def test_first_login(self):
+        """最初のログインは待たずに現在のコードを使う"""
+        uploader = Uploader()
+        with patch('uploader.time.time', return_value=3015.0), patch('uploader.time.sleep') as mock_sleep, \
+             patch('uploader.pyotp.TOTP') as mock_totp:
+            mock_totp.return_value.interval = 30
+            code = uploader._next_totp_code()
+        
+        mock_sleep.assert_not_called()
+        mock_totp.return_value.at.assert_called_once_with(3015)
+        assert code is mock_totp.return_value.at.return_value
+        assert Uploader._lastTotpStep == 100
+    
+    def test_same_step_waits_for_next(self):
+        """直前のログインと同じステップでは次のステップまで待つ"""
+        uploader = Uploader()
+        with patch('uploader.time.time', side_effect=[3015.0, 3020.0, 3030.0]), \
+             patch('uploader.time.sleep') as mock_sleep, \
+             patch('uploader.Logger.logInfo'), \
+             patch('uploader.pyotp.TOTP') as mock_totp:
+            mock_totp.return_value.interval = 30
+            uploader._next_totp_code()
+            uploader._next_totp_code()
+        
+        mock_sleep.assert_called_once_with(10.0)
+        assert mock_totp.return_value.at.call_args_list[-1].args == (3030,)
+        assert Uploader._lastTotpStep == 101
 
 
 class TestSetIncomeExpenseType:
@@ -223,6 +595,525 @@ class TestSetIncomeExpenseType:
         call_args = mock_driver.execute_script.call_args[0][0]
         assert "value = '0'" in call_args
 
+    
+    def test_wait_until_tab_selected(self):
+        """クリックしたタブが選択状態になるまで待つ（同じクラスの他のタブは待たない）"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        mock_tab = MagicMock(spec=WebElement)
+        mock_tab.is_selected.side_effect = [False, True]
+        uploader.driver = MagicMock()
+        uploader.driver.execute_script.return_value = mock_tab
+        
+        uploader._set_income_expense_type(is_income=True)
+        
+        assert "input.plus-payment" in uploader.driver.execute_script.call_args[0][0]
+        assert mock_tab.is_selected.call_count == 2
+        uploader.driver.find_elements.assert_not_called()
+    
+    def test_without_tab(self):
+        """タブがない画面では待たない"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        uploader.driver.execute_script.return_value = None
+        
+        with patch.object(uploader, '_wait') as mock_wait:
+            uploader._set_income_expense_type(is_income=True)
+        
+        mock_wait.assert_not_called()
+    
+    def test_tab_not_selected_timeout(self):
+        """上限時間内にタブが切り替わらない場合はタイムアウトする"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.waitTimeout = 0.1
+        mock_tab = MagicMock(spec=WebElement)
+        mock_tab.is_selected.return_value = False
+        uploader.driver = MagicMock()
+        uploader.driver.execute_script.return_value = mock_tab
+        
+        with pytest.raises(TimeoutException):
+            uploader._set_income_expense_type(is_income=False)
+
+
+class TestWaitConditions:
+    """待機条件のテスト"""
+    
+    def test_wait_uses_configured_timeout(self, mock_config):
+        """待機の上限時間は設定値を使う"""
+        mock_config.get_wait_timeout.return_value = 12.5
+        uploader = Uploader(MagicMock(spec=Salary))
+        assert uploader._wait()._timeout == 12.5
+    
+    def test_wait_until_ready(self):
+        """ページの読み込みと通信が終わるまで待つ"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        uploader.waitTimeout = 5
+        uploader.driver.execute_script.side_effect = [False, True]
+        
+        uploader._wait_until_ready()
+        
+        assert uploader.driver.execute_script.call_count == 2
+        uploader.driver.execute_script.assert_called_with(Uploader.SCRIPT_PAGE_READY)
+    
+    def test_set_categories_waits_for_selection(self):
+        """カテゴリのリンクの表示と選択の反映を待ってから次へ進む"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        mock_wait = MagicMock()
+        
+        with patch('uploader.EC') as mock_ec:
+            uploader._set_categories(mock_wait, Item("健康保険", 1000, "税・社会保障", "健康保険"))
+        
+        mock_ec.visibility_of_element_located.assert_any_call(
+            ("xpath", '//a[text()="税・社会保障" and @class="l_c_name"]')
+        )
+        mock_ec.text_to_be_present_in_element.assert_any_call(("id", Uploader.ID_LARGE_CATEGORY), "税・社会保障")
+        mock_ec.text_to_be_present_in_element.assert_any_call(("id", Uploader.ID_MIDDLE_CATEGORY), "健康保険")
+        assert mock_wait.until.call_count == 6
+        assert uploader.driver.execute_script.call_count == 4
+    
+    def test_submit_and_continue_waits_for_next_form(self):
+        """続けて入力するボタンが消え、通信が終わるまで待つ"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        mock_wait = MagicMock()
+        
+        with patch('uploader.EC') as mock_ec, \
+             patch.object(uploader, '_wait_until_ready') as mock_ready, \
+             patch('uploader.Logger.logFine'):
+            uploader._submit_and_continue(mock_wait, "健康保険", False)
+        
+        mock_wait.until.return_value.submit.assert_called_once()
+        mock_wait.until.return_value.click.assert_called_once()
+        mock_ec.invisibility_of_element_located.assert_called_once_with(("id", Uploader.ID_CONFIRMATION_BTN))
+        mock_ready.assert_called_once()
+
+class TestFillItem:
+    """_fill_itemメソッド（一括入力）のテスト"""
+    
+    @pytest.fixture
+    def uploader(self):
+        salary = MagicMock(spec=Salary)
+        salary.get_payday.return_value = "2024/11/25"
+        uploader = Uploader(salary)
+        uploader.driver = MagicMock()
+        return uploader
+    
+    def test_fill_in_one_call(self, uploader):
+        """項目のすべての入力値を1回のスクリプト実行で渡し、送信まで行う"""
+        uploader.driver.execute_async_script.return_value = {"ok": True}
+        item = Item("健康保険", -12345, "税・社会保障", "健康保険")
+        
+        with patch('uploader.Logger.logFine'):
+            assert uploader._fill_item(item, is_income=True) is True
+        
+        script, args = uploader.driver.execute_async_script.call_args.args
+        assert script == Uploader.SCRIPT_FILL_ITEM
+        assert args["isIncome"] == "1"
+        assert args["tabClass"] == Uploader.CLASS_PLUS_PAYMENT
+        assert args["amount"] == "12345"
+        assert (args["category"], args["subcategory"], args["content"]) == ("税・社会保障", "健康保険", "健康保険")
+        assert args["date"] == "2024/11/25"
+        assert args["timeoutMs"] == 500
+        assert args["ids"]["large"] == Uploader.ID_LARGE_CATEGORY
+        assert args["ids"]["confirmation"] == Uploader.ID_CONFIRMATION_BTN
+        uploader.driver.set_script_timeout.assert_called_once_with(2.0)
+        assert uploader.fastFill is True
+    
+    @pytest.mark.parametrize("outcome", [
+        {"ok": False, "step": "large", "error": "timeout", "submitted": False},
+        None,
+    ])
+    def test_fallback(self, uploader, outcome):
+        """送信前に一括入力に失敗した場合は以降1項目ずつ入力する"""
+        uploader.driver.execute_async_script.return_value = outcome
+        
+        with patch('uploader.Logger.logFine') as mock_fine:
+            assert uploader._fill_item(Item("所得税", 1000), is_income=False) is False
+            assert uploader._fill_item(Item("住民税", 1000), is_income=False) is False
+        
+        uploader.driver.execute_async_script.assert_called_once()
+        mock_fine.assert_called_once()
+        assert uploader.fastFill is False
+    
+    def test_not_confirmed_after_submit(self, uploader):
+        """送信後に登録の完了を確認できない場合は入力し直さない（二重登録を避ける）"""
+        uploader.driver.execute_async_script.return_value = {
+            "ok": False, "step": "submit", "error": "timeout", "submitted": True
+        }
+        
+        with pytest.raises(TimeoutException):
+            uploader._fill_item(Item("所得税", 1000), is_income=False)
+        assert uploader.fastFill is True
+    
+    def test_script_error(self, uploader):
+        """スクリプトを実行できない場合は送信したか分からないため入力し直さない"""
+        uploader.driver.execute_async_script.side_effect = WebDriverException("script timeout")
+        
+        with pytest.raises(WebDriverException):
+            uploader._fill_item(Item("所得税", 1000), is_income=False)
+    
+    def test_register_item_fast_path(self, uploader):
+        """一括入力できた場合は1つずつの入力・送信を行わず、続けて入力する"""
+        with patch.object(uploader, '_fill_item', return_value=True) as mock_fill, \
+             patch.object(uploader, '_fill_item_step_by_step') as mock_steps, \
+             patch.object(uploader, '_submit_and_continue') as mock_submit, \
+             patch.object(uploader, '_continue_input') as mock_continue:
+            uploader._register_item_internal(Item("所得税", 1000), False)
+        
+        mock_fill.assert_called_once()
+        mock_steps.assert_not_called()
+        mock_submit.assert_not_called()
+        mock_continue.assert_called_once_with()
+    
+    def test_register_item_step_by_step(self, uploader):
+        """一括入力できない場合は1つずつ入力して送信する"""
+        with patch.object(uploader, '_fill_item', return_value=False), \
+             patch.object(uploader, '_fill_item_step_by_step') as mock_steps, \
+             patch.object(uploader, '_submit_and_continue') as mock_submit, \
+             patch.object(uploader, '_continue_input') as mock_continue:
+            uploader._register_item_internal(Item("所得税", 1000), False)
+        
+        mock_steps.assert_called_once()
+        mock_submit.assert_called_once()
+        mock_continue.assert_not_called()
+
+
+class TestContinueInput:
+    """_continue_inputメソッドのテスト"""
+    
+    def test_continue_in_one_call(self):
+        """続けて入力するボタンを押し、次の入力フォームの表示を1回のスクリプト実行で待つ"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        uploader.driver.execute_async_script.return_value = {"ok": True}
+        
+        uploader._continue_input()
+        
+        uploader.driver.execute_async_script.assert_called_once_with(
+            Uploader.SCRIPT_CONTINUE_INPUT, {"buttonId": Uploader.ID_CONFIRMATION_BTN, "timeoutMs": 500}
+        )
+        uploader.driver.set_script_timeout.assert_called_once_with(1.5)
+    
+    @pytest.mark.parametrize("outcome", [{"ok": False, "error": "timeout"}, None])
+    def test_timeout(self, outcome):
+        """次の入力フォームが表示されない場合はタイムアウトする"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        uploader.driver.execute_async_script.return_value = outcome
+        
+        with pytest.raises(TimeoutException):
+            uploader._continue_input()
+
+
+class TestRegistrationJournal:
+    """登録済みの項目の記録を使った登録のテスト"""
+    
+    @pytest.fixture
+    def uploader(self, mock_config, tmp_path):
+        mock_config.is_registration_journal_used.return_value = True
+        mock_config.get_employee_number.return_value = "12345"
+        salary = Salary(2024, 11, SalaryKind.NORMAL, items=[Item("所得税", 1000), Item("住民税", 2000)])
+        salary.set_date(25)
+        uploader = Uploader(salary)
+        uploader.journal.journalFile = str(tmp_path / "registrations.sqlite3")
+        uploader.driver = MagicMock()
+        return uploader
+    
+    def test_disabled(self):
+        """記録しない設定では記録を使わない"""
+        assert Uploader(MagicMock(spec=Salary)).journal is None
+    
+    def test_resume(self, uploader):
+        """途中で失敗した明細の再実行では登録済みの項目を省略し、未登録の項目から再開する"""
+        with patch.object(uploader, '_fill_item', side_effect=[True, TimeoutException("timeout")]), \
+             patch.object(uploader, '_continue_input'):
+            with pytest.raises(TimeoutException):
+                uploader._register_deduction_items()
+        
+        assert uploader.journal.is_registered(uploader.salary, uploader.salary.deductionItems[0]) is True
+        assert uploader.journal.is_registered(uploader.salary, uploader.salary.deductionItems[1]) is False
+        
+        with patch.object(uploader, '_fill_item', return_value=True) as mock_fill, \
+             patch.object(uploader, '_continue_input') as mock_continue, \
+             patch('uploader.Logger.logInfo') as mock_info:
+            uploader._register_deduction_items()
+        
+        mock_fill.assert_called_once_with(uploader.salary.deductionItems[1], False)
+        mock_continue.assert_called_once()
+        mock_info.assert_called_once_with(Uploader.LOG_ALREADY_REGISTERED.format(name="所得税"))
+    
+    def test_recorded_before_continue(self, uploader):
+        """登録の完了を確認した後、次の入力フォームの待機が失敗しても登録済みとして記録する"""
+        item = uploader.salary.deductionItems[0]
+        with patch.object(uploader, '_fill_item', return_value=True), \
+             patch.object(uploader, '_continue_input', side_effect=TimeoutException("timeout")):
+            with pytest.raises(TimeoutException):
+                uploader._register_item_internal(item, False)
+        
+        assert uploader.journal.is_registered(uploader.salary, item) is True
+    
+    def test_recorded_before_continue_step_by_step(self, uploader):
+        """1項目ずつ入力する場合も続けて入力するボタンの表示を確認した時点で記録する"""
+        item = uploader.salary.deductionItems[0]
+        mock_wait = MagicMock()
+        mock_wait.until.side_effect = [MagicMock(), MagicMock(), TimeoutException("timeout")]
+        with patch.object(uploader, '_fill_item', return_value=False), \
+             patch.object(uploader, '_fill_item_step_by_step'), \
+             patch.object(uploader, '_wait', return_value=mock_wait), \
+             patch('uploader.Logger.logFine'):
+            with pytest.raises(TimeoutException):
+                uploader._register_item_internal(item, False)
+        
+        assert uploader.journal.is_registered(uploader.salary, item) is True
+    
+    def test_not_recorded_without_confirmation(self, uploader):
+        """登録の完了を確認できない場合は記録しない"""
+        item = uploader.salary.deductionItems[0]
+        with patch.object(uploader, '_fill_item', side_effect=TimeoutException("timeout")):
+            with pytest.raises(TimeoutException):
+                uploader._register_item_internal(item, False)
+        
+        assert uploader.journal.is_registered(uploader.salary, item) is False
+
+
+class TestExistingEntries:
+    """MoneyForwardに登録済みの入出金の確認のテスト"""
+    
+    @pytest.fixture
+    def uploader(self, mock_config):
+        mock_config.is_existing_entry_skipped.return_value = True
+        salary = Salary(2024, 11, SalaryKind.NORMAL, items=[
+            Item("控除合計", 3000, "収入", "給与"), Item("所得税", 1000), Item("住民税", 2000)
+        ])
+        salary.set_date(25)
+        uploader = Uploader(salary)
+        uploader.driver = MagicMock()
+        uploader.driver.execute_async_script.return_value = [
+            {"date": "2024/11/25-1", "amount": "3,000", "content": "控除合計"},
+            {"date": "2024/11/25-2", "amount": "-1,000", "content": "所得税"},
+        ]
+        return uploader
+    
+    def test_skip_existing(self, uploader):
+        """月の一覧を1回だけ取得し、同じ入出金がある項目は登録しない"""
+        with patch.object(uploader, '_fill_item', return_value=True) as mock_fill, \
+             patch.object(uploader, '_continue_input'), \
+             patch('uploader.Logger.logInfo') as mock_info:
+            uploader._register_deduction_sum_as_income()
+            uploader._register_deduction_items()
+        
+        uploader.driver.execute_async_script.assert_called_once_with(
+            Uploader.SCRIPT_EXISTING_ENTRIES, "https://moneyforward.com/cf?from=2024/11/01&month=11&year=2024"
+        )
+        mock_fill.assert_called_once_with(uploader.salary.deductionItems[2], False)
+        mock_info.assert_any_call(Uploader.LOG_ALREADY_EXISTS.format(name="控除合計"))
+        mock_info.assert_any_call(Uploader.LOG_ALREADY_EXISTS.format(name="所得税"))
+    
+    def test_income_expense_distinguished(self, uploader):
+        """同じ金額・内容でも収入と支出は区別する"""
+        item = uploader.salary.deductionItems[1]
+        assert uploader._is_existing_entry(item, is_income=True) is False
+        assert uploader._is_existing_entry(item, is_income=False) is True
+        assert uploader._is_existing_entry(item, is_income=False) is False
+    
+    @pytest.mark.parametrize("outcome", [None, WebDriverException("script timeout")])
+    def test_unavailable(self, uploader, outcome):
+        """一覧を取得できない場合は警告してすべての項目を登録する（再取得しない）"""
+        if isinstance(outcome, Exception):
+            uploader.driver.execute_async_script.side_effect = outcome
+        else:
+            uploader.driver.execute_async_script.return_value = outcome
+        
+        with patch('uploader.Logger.logWarning') as mock_warn:
+            for item in uploader.salary.deductionItems:
+                assert uploader._is_existing_entry(item, is_income=False) is False
+        
+        mock_warn.assert_called_once()
+        uploader.driver.execute_async_script.assert_called_once()
+    
+    def test_disabled(self):
+        """確認しない設定では一覧を取得しない"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        assert uploader._is_existing_entry(Item("所得税", 1000), is_income=False) is False
+        uploader.driver.execute_async_script.assert_not_called()
+
+
+class TestWaitForInputForm:
+    """入力フォームの表示確認のテスト"""
+    
+    @pytest.fixture
+    def uploader(self, tmp_path):
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        uploader.formSelectorFile = str(tmp_path / "cache" / Uploader.FORM_SELECTOR_FILENAME)
+        return uploader
+    
+    def test_first_match_saved(self, uploader):
+        """すべての候補を1回のスクリプトで確認し、一致したセレクタを次回のために保存する"""
+        uploader.driver.execute_script.side_effect = [None, "form[action*='user_asset_act']"]
+        
+        assert uploader._wait_for_input_form() == "form[action*='user_asset_act']"
+        
+        script, selectors = uploader.driver.execute_script.call_args.args
+        assert script == Uploader.SCRIPT_FIND_FORM
+        assert selectors == list(Uploader.FORM_SELECTORS)
+        assert uploader._ordered_form_selectors()[0] == "form[action*='user_asset_act']"
+        assert sorted(uploader._ordered_form_selectors()) == sorted(Uploader.FORM_SELECTORS)
+    
+    def test_preferred_first(self, uploader):
+        """前回一致したセレクタを先に確認し、同じ場合は保存し直さない"""
+        uploader._save_form_selector("#user_asset_act_new .modal-body")
+        uploader.driver.execute_script.return_value = "#user_asset_act_new .modal-body"
+        
+        with patch.object(uploader, '_save_form_selector') as mock_save:
+            uploader._wait_for_input_form()
+        
+        assert uploader.driver.execute_script.call_args.args[1][0] == "#user_asset_act_new .modal-body"
+        mock_save.assert_not_called()
+    
+    def test_unknown_saved_selector(self, uploader):
+        """保存したセレクタが候補にない場合は既定の順で確認する"""
+        uploader._save_form_selector("#removed")
+        assert uploader._ordered_form_selectors() == list(Uploader.FORM_SELECTORS)
+    
+    def test_timeout(self, uploader):
+        """フォームが表示されない場合は上限時間1回分でNoneを返す"""
+        uploader.waitTimeout = 0.2
+        uploader.driver.execute_script.return_value = None
+        
+        start = time.perf_counter()
+        assert uploader._wait_for_input_form() is None
+        assert time.perf_counter() - start < 1.0
+        assert not os.path.exists(uploader.formSelectorFile)
+    
+    def test_navigate_without_form(self, uploader):
+        """フォームが表示されない場合はHTMLを保存してエラーとする"""
+        with patch.object(uploader, '_wait_until_ready'), \
+             patch.object(uploader, '_wait_for_input_form', return_value=None), \
+             patch.object(uploader, '_save_debug_html') as mock_save, \
+             patch('uploader.Logger'):
+            with pytest.raises(Exception, match="モーダルフォーム"):
+                uploader._navigate_to_input_page()
+        mock_save.assert_called()
+
+
+class TestCategories:
+    """カテゴリの確認・取得のテスト"""
+    
+    @pytest.fixture
+    def tree(self):
+        return CategoryTree({"税・社会保障": {"id": "1", "middles": {"健康保険": "101"}}})
+    
+    @pytest.fixture
+    def salary(self):
+        salary = MagicMock(spec=Salary)
+        salary.deductionItems = [Item("健康保険", 1000, "税・社会保障", "健康保険")]
+        return salary
+    
+    def test_check_with_cache(self, tree, salary):
+        """保存したカテゴリにある場合はそのまま使う"""
+        uploader = Uploader()
+        uploader.categoryCache = MagicMock()
+        uploader.categoryCache.load.return_value = tree
+        uploader.check_categories([salary])
+        assert uploader.categoryTree is tree
+    
+    def test_check_unknown(self, tree, salary):
+        """保存したカテゴリにない場合はブラウザの起動前にエラーとし、次回は取得し直す"""
+        salary.deductionItems.append(Item("組合費", 100, "税・社会保障", "組合費"))
+        uploader = Uploader()
+        uploader.categoryCache = MagicMock()
+        uploader.categoryCache.load.return_value = tree
+        
+        with pytest.raises(ValueError, match="税・社会保障/組合費"):
+            uploader.check_categories([salary])
+        uploader.categoryCache.clear.assert_called_once()
+    
+    def test_check_without_cache(self, salary):
+        """保存したカテゴリがない場合は確認しない"""
+        uploader = Uploader()
+        uploader.check_categories([salary])
+        assert uploader.categoryTree is None
+    
+    def test_upload_checks_before_browser(self, salary):
+        """カテゴリに誤りがある場合はWebDriverを起動しない"""
+        uploader = Uploader(salary)
+        with patch.object(uploader, '_confirm_registration', return_value=True), \
+             patch.object(uploader, 'check_categories', side_effect=ValueError("カテゴリなし")), \
+             patch.object(uploader, '_init_webdriver') as mock_init:
+            with pytest.raises(ValueError):
+                uploader.upload()
+        mock_init.assert_not_called()
+    
+    def test_prepare_scrapes_and_saves(self, tree, salary):
+        """保存していない場合は入力フォームから取得して保存する"""
+        uploader = Uploader()
+        uploader.driver = MagicMock()
+        uploader.driver.execute_script.return_value = tree.categories
+        uploader.categoryCache = MagicMock()
+        
+        with patch('uploader.Logger.logFine'):
+            uploader._prepare_categories([salary])
+        
+        uploader.driver.execute_script.assert_called_once_with(Uploader.SCRIPT_CATEGORY_TREE)
+        assert uploader.categoryTree.categories == tree.categories
+        uploader.categoryCache.save.assert_called_once_with(uploader.categoryTree)
+        
+        # 取得済みの場合は取得しない
+        uploader._prepare_categories([salary])
+        uploader.driver.execute_script.assert_called_once()
+    
+    def test_prepare_unknown(self, tree, salary):
+        """取得したカテゴリにない場合は登録前にエラーとする"""
+        salary.deductionItems = [Item("組合費", 100, "税・社会保障", "組合費")]
+        uploader = Uploader()
+        uploader.driver = MagicMock()
+        uploader.driver.execute_script.return_value = tree.categories
+        uploader.categoryCache = MagicMock()
+        
+        with patch('uploader.Logger.logFine'), pytest.raises(ValueError, match="組合費"):
+            uploader._prepare_categories([salary])
+        uploader.categoryCache.clear.assert_not_called()
+    
+    @pytest.mark.parametrize("outcome", [
+        WebDriverException("no page"),
+        None,
+        {"税・社会保障": {"id": "", "middles": {}}},
+    ])
+    def test_prepare_not_available(self, salary, outcome):
+        """カテゴリのIDを取得できない場合はドロップダウンから選択する"""
+        uploader = Uploader()
+        uploader.driver = MagicMock()
+        if isinstance(outcome, Exception):
+            uploader.driver.execute_script.side_effect = outcome
+        else:
+            uploader.driver.execute_script.return_value = outcome
+        uploader.categoryCache = MagicMock()
+        
+        with patch('uploader.Logger.logFine'):
+            uploader._prepare_categories([salary])
+        
+        assert uploader.categoryTree is None
+        uploader.categoryCache.save.assert_not_called()
+    
+    def test_fill_with_category_ids(self, tree):
+        """カテゴリのIDが分かっている場合は一括入力にIDを渡す"""
+        salary = MagicMock(spec=Salary)
+        salary.get_payday.return_value = "2024/11/25"
+        uploader = Uploader(salary)
+        uploader.driver = MagicMock()
+        uploader.driver.execute_async_script.return_value = {"ok": True}
+        uploader.categoryTree = tree
+        
+        uploader._fill_item(Item("健康保険", 1000, "税・社会保障", "健康保険"), False)
+        uploader._fill_item(Item("組合費", 100, "税・社会保障", "組合費"), False)
+        
+        calls = uploader.driver.execute_async_script.call_args_list
+        assert calls[0].args[1]["categoryIds"] == ("1", "101")
+        assert calls[1].args[1]["categoryIds"] is None
+
 
 class TestSetSubAccount:
     """_set_sub_accountメソッドのテスト"""
@@ -390,15 +1281,16 @@ class TestCloseModalIfPresent:
         uploader = Uploader(mock_salary)
         
         mock_driver = MagicMock()
-        mock_button = MagicMock()
-        mock_button.is_displayed.return_value = True
+        mock_button = MagicMock(spec=WebElement)
+        mock_button.is_displayed.side_effect = [True, False]
         mock_driver.find_elements.return_value = [mock_button]
         uploader.driver = mock_driver
         
-        with patch('time.sleep'):
-            uploader._close_modal_if_present()
-            
-            mock_button.click.assert_called_once()
+        uploader._close_modal_if_present()
+        
+        mock_button.click.assert_called_once()
+        # クリック後にモーダルが閉じたことを確認している
+        assert mock_button.is_displayed.call_count == 2
     
     def test_close_modal_not_present(self):
         """モーダルが表示されていない場合"""
@@ -500,6 +1392,222 @@ class TestUploaderFullCoverage:
             uploader._login.assert_called_once()
             uploader._register_deductions.assert_called_once()
     
+    def test_upload_records_phases(self):
+        """WebDriver起動・ログイン・登録の各区間の時間を記録する"""
+        mock_salary = MagicMock(spec=Salary)
+        uploader = Uploader(mock_salary)
+        
+        Timer.reset()
+        with patch.object(uploader, '_confirm_registration', return_value=True), \
+             patch.object(uploader, '_init_webdriver'), \
+             patch.object(uploader, '_access_moneyforward'), \
+             patch.object(uploader, '_login'), \
+             patch.object(uploader, '_register_deductions'):
+            uploader.upload()
+        
+        names = [phase.name for phase in Timer.summary()]
+        Timer.reset()
+        assert names == ["uploader.webdriver", "uploader.access", "uploader.login", "uploader.register"]
+    
+    def test_upload_background_session(self):
+        """別スレッドで開始したWebDriverの起動・ログインの完了を待ってから登録する"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        started = threading.Event()
+        calls = []
+        
+        def start_session():
+            started.wait(1)
+            uploader.driver = MagicMock()
+            calls.append("session")
+        
+        with patch.object(uploader, '_start_session', side_effect=start_session), \
+             patch.object(uploader, '_confirm_registration', side_effect=lambda: calls.append("confirm") or True), \
+             patch.object(uploader, '_register_deductions', side_effect=lambda: calls.append("register")):
+            uploader.start_session_in_background()
+            uploader.start_session_in_background()
+            started.set()
+            uploader.upload()
+        
+        assert calls == ["confirm", "session", "register"]
+        uploader.driver.quit.assert_called_once()
+        assert uploader.sessionThread is None
+    
+    def test_upload_background_session_failure(self):
+        """別スレッドでの起動・ログインの失敗は登録時に送出し、WebDriverを終了する"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        driver = MagicMock()
+        
+        def start_session():
+            uploader.driver = driver
+            raise TimeoutException("login")
+        
+        with patch.object(uploader, '_start_session', side_effect=start_session), \
+             patch.object(uploader, '_confirm_registration', return_value=True), \
+             patch.object(uploader, '_register_deductions') as mock_register:
+            uploader.start_session_in_background()
+            with pytest.raises(TimeoutException):
+                uploader.upload()
+        
+        mock_register.assert_not_called()
+        driver.quit.assert_called_once()
+    
+    def test_upload_cancelled_after_background_session(self):
+        """登録をキャンセルした場合も別スレッドで起動したWebDriverを終了する"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        driver = MagicMock()
+        
+        with patch.object(uploader, '_start_session', side_effect=lambda: setattr(uploader, 'driver', driver)), \
+             patch.object(uploader, '_confirm_registration', return_value=False):
+            uploader.start_session_in_background()
+            uploader.upload()
+        
+        driver.quit.assert_called_once()
+    
+    def test_cancel_skips_login(self):
+        """キャンセルした場合は起動中のWebDriverの次の段階（ページへのアクセス・ログイン）へ進まずに終了する"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        driver = MagicMock()
+        
+        def init_webdriver():
+            uploader.driver = driver
+            uploader.sessionCancel.wait(1)
+        
+        with patch.object(uploader, '_init_webdriver', side_effect=init_webdriver), \
+             patch.object(uploader, '_access_moneyforward') as mock_access, \
+             patch.object(uploader, '_login') as mock_login, \
+             patch.object(uploader, '_confirm_registration', return_value=False):
+            uploader.start_session_in_background()
+            uploader.upload()
+        
+        mock_access.assert_not_called()
+        mock_login.assert_not_called()
+        driver.quit.assert_called_once()
+    
+    def test_cancel_does_not_wait_for_login(self):
+        """中止した段階が上限時間内に終わらない場合は待たずに戻り、別スレッドでWebDriverを終了する"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.SESSION_CANCEL_TIMEOUT_SECONDS = 0.01
+        driver = MagicMock()
+        proceed = threading.Event()
+        
+        def access_moneyforward():
+            uploader.driver = driver
+            proceed.wait(1)
+        
+        with patch.object(uploader, '_init_webdriver'), \
+             patch.object(uploader, '_access_moneyforward', side_effect=access_moneyforward), \
+             patch.object(uploader, '_login') as mock_login, \
+             patch.object(uploader, '_confirm_registration', return_value=False):
+            uploader.start_session_in_background()
+            thread = uploader.sessionThread
+            uploader.upload()
+            
+            assert thread.is_alive()
+            driver.quit.assert_not_called()
+            proceed.set()
+            thread.join(1)
+        
+        mock_login.assert_not_called()
+        driver.quit.assert_called_once()
+    
+    def test_background_logs_after_prompt(self):
+        """別スレッドのログは登録日の確認中は出力せず、完了を待った後に出力する"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        logged = threading.Event()
+        during_prompt = []
+        
+        def start_session():
+            Logger.logInfo("ログインしています。")
+            uploader.driver = MagicMock()
+            logged.set()
+        
+        def confirm():
+            logged.wait(1)
+            during_prompt.extend(mock_print.call_args_list)
+            return True
+        
+        with patch('builtins.print') as mock_print, \
+             patch.object(uploader, '_start_session', side_effect=start_session), \
+             patch.object(uploader, '_confirm_registration', side_effect=confirm), \
+             patch.object(uploader, '_register_deductions'):
+            uploader.start_session_in_background()
+            uploader.upload()
+        
+        assert not any("ログインしています。" in str(call) for call in during_prompt)
+        assert any("ログインしています。" in str(call) for call in mock_print.call_args_list)
+    
+    def test_upload_all_single_session(self):
+        """複数月の給与情報を1回のログイン・1回のモーダル表示で登録する"""
+        first, second, cancelled = (MagicMock(spec=Salary) for _ in range(3))
+        for salary, payday in [(first, "2024/11/25"), (second, "2024/12/10"), (cancelled, "2025/01/25")]:
+            salary.get_payday.return_value = payday
+            salary.kind = SalaryKind.NORMAL
+        uploader = Uploader()
+        registered = []
+        
+        with patch.object(uploader, '_confirm_registration', side_effect=[True, True, False]), \
+             patch.object(uploader, '_init_webdriver') as mock_init, \
+             patch.object(uploader, '_access_moneyforward'), \
+             patch.object(uploader, '_login') as mock_login, \
+             patch.object(uploader, '_close_modal_if_present'), \
+             patch.object(uploader, '_navigate_to_input_page') as mock_navigate, \
+             patch.object(uploader, '_prepare_categories'), \
+             patch.object(uploader, '_register_deduction_sum_as_income',
+                          side_effect=lambda: registered.append(uploader.salary)), \
+             patch.object(uploader, '_register_deduction_items'):
+            Timer.reset()
+            uploader.upload_all([first, second, cancelled])
+            labels = [span.label for span in Timer.spans() if span.name == "uploader.salary"]
+            Timer.reset()
+        
+        mock_init.assert_called_once()
+        mock_login.assert_called_once()
+        mock_navigate.assert_called_once()
+        # キャンセルした月は登録しない
+        assert registered == [first, second]
+        assert labels == ["2024/11/25", "2024/12/10"]
+    
+    def test_throttle_before_item(self):
+        """流量制限が設定されている場合は項目の登録前に呼び出す"""
+        uploader = Uploader(MagicMock(spec=Salary))
+        uploader.driver = MagicMock()
+        calls = []
+        uploader.throttle = lambda: calls.append("throttle")
+        
+        with patch.object(uploader, '_set_income_expense_type', side_effect=lambda _: calls.append("type")), \
+             patch.object(uploader, '_set_sub_account'), \
+             patch.object(uploader, '_set_amount'), \
+             patch.object(uploader, '_set_categories'), \
+             patch.object(uploader, '_set_content'), \
+             patch.object(uploader, '_set_date'), \
+             patch.object(uploader, '_confirm_income_expense_field'), \
+             patch.object(uploader, '_submit_and_continue'):
+            uploader._register_item_internal(Item("所得税", 1000), False)
+        
+        assert calls == ["throttle", "type"]
+    
+    def test_confirm(self):
+        """給与情報ごとに登録日を確認し、キャンセルしたものを除く"""
+        first, second = MagicMock(spec=Salary), MagicMock(spec=Salary)
+        uploader = Uploader()
+        confirmed = []
+        
+        def confirm_registration():
+            confirmed.append(uploader.salary)
+            return uploader.salary is second
+        
+        with patch.object(uploader, '_confirm_registration', side_effect=confirm_registration):
+            assert uploader.confirm([first, second]) == [second]
+        assert confirmed == [first, second]
+    
+    def test_upload_all_cancelled(self):
+        """すべてキャンセルした場合はWebDriverを起動しない"""
+        uploader = Uploader()
+        with patch.object(uploader, '_confirm_registration', return_value=False), \
+             patch.object(uploader, '_init_webdriver') as mock_init:
+            uploader.upload_all([MagicMock(spec=Salary)])
+        mock_init.assert_not_called()
+    
     def test_upload_with_exception_cleanup(self):
         """upload例外時のクリーンアップ"""
         mock_salary = MagicMock(spec=Salary)
@@ -539,11 +1647,11 @@ class TestUploaderFullCoverage:
         
         with patch('uploader.WebDriverWait', return_value=mock_wait), \
              patch('uploader.EC'), \
-             patch('uploader.time.sleep'), \
              patch('uploader.pyotp.TOTP') as mock_totp:
             
             mock_totp_instance = MagicMock()
-            mock_totp_instance.now.return_value = "123456"
+            mock_totp_instance.interval = 30
+            mock_totp_instance.at.return_value = "123456"
             mock_totp.return_value = mock_totp_instance
             
             mock_wait.until.side_effect = [
@@ -551,10 +1659,13 @@ class TestUploaderFullCoverage:
                 mock_login_link,  # login link
                 mock_email_elem,  # email field
                 mock_pw_elem,     # password field
-                mock_otp_elem     # OTP field
+                mock_otp_elem,    # OTP field
+                True,             # ログイン後のページへの遷移
+                True              # ページの読み込み完了
             ]
             
-            uploader._login()
+            with patch.object(Uploader, '_lastTotpStep', -1):
+                uploader._login()
             
             uploader.actions.move_to_element.assert_called_once_with(mock_menu)
             mock_login_link.click.assert_called_once()
@@ -562,8 +1673,7 @@ class TestUploaderFullCoverage:
             mock_pw_elem.send_keys.assert_called_once()
             mock_otp_elem.send_keys.assert_called_once_with("123456")
     
-    @patch('uploader.time.sleep')
-    def test_register_deductions_full_flow(self, mock_sleep):
+    def test_register_deductions_full_flow(self):
         """控除登録完全フロー"""
         mock_salary = MagicMock(spec=Salary)
         mock_item1 = Item("健康保険", 10000)
@@ -666,13 +1776,12 @@ class TestUploaderFullCoverage:
         uploader = Uploader(mock_salary)
         uploader.driver = MagicMock()
         
-        mock_button = MagicMock()
-        mock_button.is_displayed.return_value = True
+        mock_button = MagicMock(spec=WebElement)
+        mock_button.is_displayed.side_effect = [True, False]
         uploader.driver.find_elements.return_value = [mock_button]
         
-        with patch('uploader.time.sleep'):
-            uploader._close_modal_if_present()
-            mock_button.click.assert_called_once()
+        uploader._close_modal_if_present()
+        mock_button.click.assert_called_once()
         
         # モーダルが存在しない場合
         uploader.driver.find_elements.return_value = []
@@ -0,0 +1,274 @@
+"""
+test_watcher.py
+watcher.pyの単体試験
+
+C0, C1, C2カバレッジ100%を目指したテストケース
+"""
+import pytest
+import os
+import sys
+import time
+from unittest.mock import patch, MagicMock
+from watcher import SalaryWatcher, Inotify, PendingFile
+from common import SalaryKind
+from item import Item
+
+
+@pytest.fixture(autouse=True)
+def mock_config():
+    """全テストでconfig.dataをモック"""
+    with patch('watcher.config.data') as mock_data:
+        mock_data.get_employee_number.return_value = "12345"
+        mock_data.get_pdf_password.return_value = ""
+        yield mock_data
+
+
+@pytest.fixture
+def salary_dir(tmp_path):
+    """監視対象のディレクトリ（既存の明細を1件含む）"""
+    directory = tmp_path / "salaryData"
+    directory.mkdir()
+    (directory / "202401_kyuyo_12345.pdf").write_bytes(b"old")
+    return directory
+
+
+@pytest.fixture
+def pdf_bytes(make_pdf):
+    """PDFとして開けるデータ"""
+    return make_pdf([[("Total", 40, 700)]]).read_bytes()
+
+
+def _watcher(salary_dir, **kwargs):
+    return SalaryWatcher(str(salary_dir), debounce=0.5, **kwargs)
+
+
+class TestInit:
+    """初期化のテスト"""
+    
+    def test_existing_files_known(self, salary_dir):
+        """監視開始時点のPDFは既知とし、取り込み待ちにしない"""
+        watcher = _watcher(salary_dir)
+        assert list(watcher.known) == ["202401_kyuyo_12345.pdf"]
+        assert watcher.pending == {}
+        assert watcher.number == "12345"
+    
+    def test_missing_directory(self, tmp_path):
+        """ディレクトリがなくても初期化できる"""
+        watcher = _watcher(tmp_path / "none")
+        assert watcher.known == {}
+
+
+class TestTouch:
+    """_touchメソッドのテスト"""
+    
+    def test_target_file(self, salary_dir):
+        """対象の社員番号の明細は取り込み待ちになる"""
+        (salary_dir / "202402_kyuyo_12345.pdf").write_bytes(b"abc")
+        watcher = _watcher(salary_dir)
+        watcher._touch("202402_kyuyo_12345.pdf")
+        assert watcher.pending["202402_kyuyo_12345.pdf"].size == 3
+    
+    @pytest.mark.parametrize("name", ["202402_kyuyo_99999.pdf", "memo.txt", "202402_kyuyo_12345.pdf.part"])
+    def test_ignored_file(self, salary_dir, name):
+        """他の社員番号や明細以外のファイルは無視する"""
+        (salary_dir / name).write_bytes(b"abc")
+        watcher = _watcher(salary_dir)
+        watcher._touch(name)
+        assert watcher.pending == {}
+    
+    def test_deleted_file(self, salary_dir):
+        """削除されたファイルは取り込み待ちから外す"""
+        watcher = _watcher(salary_dir)
+        watcher.pending["202402_kyuyo_12345.pdf"] = PendingFile(0, 1, 1)
+        watcher._touch("202402_kyuyo_12345.pdf")
+        assert watcher.pending == {}
+    
+    def test_keep_attempts(self, salary_dir):
+        """再度変更されても開けなかった回数は引き継ぐ"""
+        watcher = _watcher(salary_dir)
+        watcher.pending["202401_kyuyo_12345.pdf"] = PendingFile(0, 1, 1, 2)
+        watcher._touch("202401_kyuyo_12345.pdf")
+        assert watcher.pending["202401_kyuyo_12345.pdf"].attempts == 2
+
+
+class TestPoll:
+    """_pollメソッドのテスト"""
+    
+    def test_detect_new_and_modified(self, salary_dir):
+        """追加・更新されたPDFだけを取り込み待ちにする"""
+        watcher = _watcher(salary_dir)
+        (salary_dir / "202402_kyuyo_12345.pdf").write_bytes(b"new")
+        (salary_dir / "202401_kyuyo_12345.pdf").write_bytes(b"modified")
+        (salary_dir / "202403_kyuyo_99999.pdf").write_bytes(b"other")
+        
+        watcher._poll()
+        assert sorted(watcher.pending) == ["202401_kyuyo_12345.pdf", "202402_kyuyo_12345.pdf"]
+        
+        watcher.pending.clear()
+        watcher._poll()
+        assert watcher.pending == {}
+
+
+class TestProcessPending:
+    """_process_pendingメソッドのテスト"""
+    
+    def test_debounce(self, salary_dir, pdf_bytes):
+        """デバウンス時間が経過するまで読み取らない"""
+        (salary_dir / "202402_kyuyo_12345.pdf").write_bytes(pdf_bytes)
+        watcher = _watcher(salary_dir)
+        watcher._touch("202402_kyuyo_12345.pdf")
+        since = watcher.pending["202402_kyuyo_12345.pdf"].since
+        
+        with patch.object(watcher, '_read') as mock_read:
+            watcher._process_pending(since + 0.1)
+            mock_read.assert_not_called()
+            watcher._process_pending(since + 0.5)
+            mock_read.assert_called_once_with("202402_kyuyo_12345.pdf")
+        assert watcher.pending == {}
+    
+    def test_growing_file(self, salary_dir, pdf_bytes):
+        """前回からサイズが変わったファイルは書き込み中として待ち直す"""
+        path = salary_dir / "202402_kyuyo_12345.pdf"
+        path.write_bytes(pdf_bytes[:100])
+        watcher = _watcher(salary_dir)
+        watcher._touch(path.name)
+        path.write_bytes(pdf_bytes)
+        
+        with patch.object(watcher, '_read') as mock_read:
+            watcher._process_pending(time.monotonic() + 1)
+            mock_read.assert_not_called()
+            assert watcher.pending[path.name].size == len(pdf_bytes)
+            
+            watcher._process_pending(time.monotonic() + 2)
+            mock_read.assert_called_once_with(path.name)
+    
+    def test_truncated_pdf(self, salary_dir, pdf_bytes):
+        """PDFとして開けないファイルは一定回数まで再確認し、その後は諦める"""
+        path = salary_dir / "202402_kyuyo_12345.pdf"
+        path.write_bytes(pdf_bytes[:len(pdf_bytes) // 2])
+        watcher = _watcher(salary_dir)
+        watcher._touch(path.name)
+        
+        now = time.monotonic()
+        with patch.object(watcher, '_read') as mock_read, \
+                patch('watcher.Logger.logError') as mock_error:
+            for attempt in range(1, SalaryWatcher.MAX_ATTEMPTS):
+                now += 1
+                watcher._process_pending(now)
+                assert watcher.pending[path.name].attempts == attempt
+            watcher._process_pending(now + 1)
+            
+            mock_read.assert_not_called()
+            mock_error.assert_called_once()
+        assert watcher.pending == {}
+    
+    def test_deleted_before_read(self, salary_dir):
+        """読み取り前に削除されたファイルは取り込み待ちから外す"""
+        watcher = _watcher(salary_dir)
+        watcher.pending["202402_kyuyo_12345.pdf"] = PendingFile(0, 1, 1)
+        watcher._process_pending(10)
+        assert watcher.pending == {}
+
+
+class TestRead:
+    """_readメソッドのテスト"""
+    
+    @patch('watcher.Salary')
+    @patch('watcher.SalaryReader')
+    def test_queue(self, mock_reader_class, mock_salary_class, salary_dir):
+        """読み取った明細はSalaryとしてキューへ追加する（PDFは再読み込みしない）"""
+        mock_reader_class.parse_pdf_filename.return_value = (2024, 6, SalaryKind.BONUS, "12345")
+        items = [Item("所得税", 1000), Item("控除合計", 1000)]
+        mock_reader_class.return_value.readDeduction.return_value = items
+        
+        watcher = _watcher(salary_dir)
+        watcher._read("202406_syoyo_12345.pdf")
+        
+        mock_reader_class.assert_called_once_with(2024, 6, "12345", SalaryKind.BONUS)
+        assert mock_reader_class.return_value.salaryDir == str(salary_dir)
+        mock_salary_class.assert_called_once_with(2024, 6, SalaryKind.BONUS, items=items)
+        assert watcher.queue.get_nowait() is mock_salary_class.return_value
+    
+    @patch('watcher.SalaryReader')
+    def test_total_mismatch(self, mock_reader_class, salary_dir):
+        """控除合計が一致しない明細はキューへ追加しない"""
+        mock_reader_class.parse_pdf_filename.return_value = (2024, 2, SalaryKind.NORMAL, "12345")
+        mock_reader_class.return_value.readDeduction.side_effect = ValueError("不一致")
+        
+        watcher = _watcher(salary_dir)
+        with patch('watcher.Logger.logError') as mock_error:
+            watcher._read("202402_kyuyo_12345.pdf")
+        
+        assert watcher.queue.empty()
+        assert "不一致" in mock_error.call_args[0][0]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotifyはLinuxのみ")
+class TestInotify:
+    """Inotifyクラスのテスト"""
+    
+    def test_events(self, tmp_path):
+        """書き込み完了と移動による追加を検知する"""
+        inotify = Inotify(str(tmp_path))
+        try:
+            assert inotify.read(0) == []
+            (tmp_path / "a.pdf").write_bytes(b"abc")
+            (tmp_path / "b.tmp").write_bytes(b"abc")
+            os.rename(tmp_path / "b.tmp", tmp_path / "b.pdf")
+            
+            names = set()
+            deadline = time.monotonic() + 5
+            while "b.pdf" not in names and time.monotonic() < deadline:
+                names.update(inotify.read(0.5))
+            assert {"a.pdf", "b.pdf"} <= names
+        finally:
+            inotify.close()
+        assert inotify.fd == -1
+    
+    def test_missing_directory(self, tmp_path):
+        """存在しないディレクトリは監視できない"""
+        with pytest.raises(OSError):
+            Inotify(str(tmp_path / "none"))
+
+
+class TestRun:
+    """start/stop（監視スレッド）のテスト"""
+    
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_detect_new_pdf(self, salary_dir, pdf_bytes, use_inotify):
+        """監視中に追加されたPDFを読み取ってキューへ追加する"""
+        watcher = _watcher(salary_dir, use_inotify=use_inotify)
+        with patch.object(SalaryWatcher, 'POLL_INTERVAL', 0.1), \
+                patch('watcher.SalaryReader.readDeduction', return_value=[Item("控除合計", 0)]), \
+                patch('watcher.Salary') as mock_salary_class, \
+                patch('watcher.Logger.logInfo'):
+            watcher.start()
+            try:
+                tmp = salary_dir / "upload.tmp"
+                tmp.write_bytes(pdf_bytes)
+                os.rename(tmp, salary_dir / "202402_kyuyo_12345.pdf")
+                salary = watcher.queue.get(timeout=10)
+            finally:
+                watcher.stop()
+        
+        assert salary is mock_salary_class.return_value
+        assert mock_salary_class.call_args[0] == (2024, 2, SalaryKind.NORMAL)
+        assert watcher.thread is None
+    
+    def test_fallback_to_polling(self, salary_dir):
+        """inotifyを開けない場合は走査に切り替える"""
+        watcher = _watcher(salary_dir)
+        with patch('watcher.Inotify', side_effect=OSError("unsupported")), \
+                patch('watcher.Logger.logWarning') as mock_warning:
+            assert watcher._open_inotify() is None
+        mock_warning.assert_called_once()
+        
+        assert _watcher(salary_dir, use_inotify=False)._open_inotify() is None
+    
+    def test_run_until_stopped(self, salary_dir):
+        """run()は停止済みであればすぐに戻る"""
+        watcher = _watcher(salary_dir, use_inotify=False)
+        watcher.stopEvent.set()
+        with patch('watcher.Logger.logInfo') as mock_info:
+            watcher.run()
+        assert mock_info.call_count == 2